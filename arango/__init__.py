@@ -3,10 +3,16 @@
 from datetime import datetime
 
 from arango.database import Database
+from arango.cursor import Cursor, cursor_counts
 from arango.api import API
 from arango.exceptions import *
 from arango.constants import HTTP_OK, LOG_LEVELS, DEFAULT_DATABASE
-from arango.clients import DefaultClient
+from arango.clients import DefaultClient, UnixSocketClient
+from arango.codec import get_codec
+from arango.compression import check_compression
+from arango.endpoints import EndpointPool, endpoint_url
+from arango.hooks import Hooks
+from arango.tracing import NOOP_TRACER
 from arango.utils import uncamelify
 
 
@@ -20,14 +26,25 @@ class Arango(object):
     """
 
     def __init__(self, protocol="http", host="localhost", port=8529,
-                 username="root", password="", client=None):
+                 username="root", password="", client=None,
+                 pool_connections=10, pool_maxsize=10, pool_block=False,
+                 pool_warm_up=0, endpoints=None,
+                 load_balancing="round_robin", probe_interval=10,
+                 codec="json", compression=None,
+                 compression_threshold=1024, retry_policy=None,
+                 connect_timeout=None, read_timeout=None, limits=None,
+                 hooks=None, metrics=None, tracer=None,
+                 singleflight=None, jwt=None):
         """Initialize the wrapper object.
 
-        :param protocol: the internet transfer protocol (default: 'http')
+        :param protocol: the internet transfer protocol: 'http' (default),
+            'https' or 'unix' (Unix domain socket)
         :type protocol: str
-        :param host: ArangoDB host (default: 'localhost')
+        :param host: ArangoDB host (default: 'localhost'), or the path of
+            the socket if ``protocol`` is 'unix'
         :type host: str
-        :param port: ArangoDB port (default: 8529)
+        :param port: ArangoDB port (default: 8529), ignored if ``protocol``
+            is 'unix'
         :type port: int or str
         :param username: ArangoDB username (default: 'root')
         :type username: str
@@ -35,7 +52,96 @@ class Arango(object):
         :type password: str
         :param client: HTTP client for this wrapper to use
         :type client: arango.clients.base.BaseClient or None
-        :raises: ConnectionError
+        :param pool_connections: the number of per-host connection pools
+        :type pool_connections: int
+        :param pool_maxsize: the max number of pooled connections per host
+        :type pool_maxsize: int
+        :param pool_block: block instead of opening extra connections when
+            all pooled connections to a host are in use
+        :type pool_block: bool
+        :param pool_warm_up: the number of connections to open upfront
+        :type pool_warm_up: int
+        :param endpoints: the base URLs of the servers (e.g. the cluster
+            coordinators) to spread the requests over, which overrides
+            ``protocol``, ``host`` and ``port``; Unix domain sockets are
+            given as 'unix:///path/to/arangodb.sock'
+        :type endpoints: list or None
+        :param load_balancing: 'round_robin', 'random' or
+            'least_outstanding' (default: 'round_robin')
+        :type load_balancing: str
+        :param probe_interval: the seconds before re-probing an endpoint
+            which was taken out of rotation after a failed request
+        :type probe_interval: int or float
+        :param codec: the JSON codec encoding the payloads and decoding the
+            responses: 'json' (default), 'ujson', 'orjson' or 'auto' (the
+            fastest installed); falls back to 'json' when the library is
+            not installed. 'vpack' exchanges VelocyPack instead, which
+            shrinks the payloads but is encoded and decoded in pure Python,
+            several times slower than 'json': it only pays off when the
+            bandwidth rather than the CPU is the bottleneck
+        :type codec: str or arango.codec.JSONCodec
+        :param compression: 'gzip' or 'deflate' to compress the request
+            bodies and accept compressed responses by default, or None (the
+            default); can be overridden per call for the bulk operations
+        :type compression: str or None
+        :param compression_threshold: the min size in bytes of the request
+            bodies to compress (default: 1024)
+        :type compression_threshold: int
+        :param retry_policy: the policy for retrying the requests which
+            failed transiently (e.g. connection errors, 503 responses or
+            lock timeouts), or None (default) to never retry; its counters
+            are available through ``self.retry_policy.stats``
+        :type retry_policy: arango.retry.RetryPolicy or None
+        :param connect_timeout: the seconds to wait for a connection to be
+            made, or None (default) to wait forever
+        :type connect_timeout: int or float or None
+        :param read_timeout: the seconds to wait for a response once the
+            request is sent, or None (default) to wait forever
+        :type read_timeout: int or float or None
+        :param limits: the admission control capping the requests in
+            flight per endpoint and per database and their rate, or None
+            (default) for no limits; the waits are available through
+            ``self.limits.stats``
+        :type limits: arango.limits.Limits or None
+        :param hooks: the hooks observing every request (e.g. to time
+            them), or None (default) for a new registry; callbacks are
+            registered with ``self.hooks.add``
+        :type hooks: arango.hooks.Hooks or None
+        :param metrics: the registry to record the latencies and errors of
+            the requests into, or None (default) to record nothing; they
+            are rendered for Prometheus by ``self.metrics.render()``
+        :type metrics: arango.metrics.Metrics or None
+        :param tracer: the tracer emitting a span per operation (e.g.
+            ``execute_query`` with the fetches of its batches, or
+            ``execute_batch``) and a child span per HTTP round trip, whose
+            trace context is sent in the request headers, or None (default)
+            for no tracing; see ``arango.tracing.Tracer``
+        :type tracer: arango.tracing.Tracer or None
+        :param singleflight: the coalescing of the identical concurrent
+            GET requests (e.g. of the same document), which then share a
+            single request in flight, or None (default) to send every
+            request; the counters are available through
+            ``self.singleflight.stats``
+        :type singleflight: arango.singleflight.SingleFlight or None
+        :param jwt: the JWT authentication obtaining a token for the
+            credentials once and sending it instead of them, so that the
+            server does not verify the password of every request, or None
+            (default) for basic authentication; see ``arango.auth.JWTAuth``
+        :type jwt: arango.auth.JWTAuth or None
+        :raises: ConnectionError, AuthenticationError, InvalidArgumentError
+
+        The connection pool and timeout settings only apply to the default
+        client, i.e. when ``client`` is not given. The pool usage counters
+        of the default client are available through
+        ``self.client.pool_stats``. If any endpoint is a Unix domain socket,
+        the default client is ``arango.clients.UnixSocketClient`` instead.
+
+        Cursor follow-up requests are always sent to the endpoint which
+        created the cursor.
+
+        Besides these timeouts, ``execute_query``, ``export_documents`` and
+        the calls of the API wrapper take a ``deadline`` bounding the whole
+        operation, i.e. every attempt, retry and cursor batch it takes.
         """
         self.protocol = protocol
         self.host = host
@@ -43,12 +149,47 @@ class Arango(object):
         self.username = username
         self.password = password
 
+        # JSON codec shared by the API wrapper objects of every database
+        self.codec = get_codec(codec)
+        self.compression = check_compression(compression)
+        self.compression_threshold = compression_threshold
+        self.retry_policy = retry_policy
+        self.limits = limits
+        self.hooks = Hooks() if hooks is None else hooks
+        self.tracer = NOOP_TRACER if tracer is None else tracer
+        self.singleflight = singleflight
+        self.jwt = jwt
+        self.metrics = metrics
+        if metrics is not None:
+            metrics.install(self.hooks)
+
+        # Endpoints shared by the API wrapper objects of every database
+        self.endpoints = EndpointPool(
+            endpoints or [endpoint_url(protocol, host, port)],
+            strategy=load_balancing,
+            probe_interval=probe_interval
+        )
+
         # Initialize the ArangoDB HTTP Client if not given
         if client is not None:
             self.client = client
+        elif any(endpoint.is_unix for endpoint in self.endpoints.endpoints):
+            self.client = UnixSocketClient({
+                "auth": (self.username, self.password),
+                "timeout": (connect_timeout, read_timeout),
+            })
         else:
-            client_init_data = {"auth": (self.username, self.password)}
+            client_init_data = {
+                "auth": (self.username, self.password),
+                "pool_connections": pool_connections,
+                "pool_maxsize": pool_maxsize,
+                "pool_block": pool_block,
+                "timeout": (connect_timeout, read_timeout),
+            }
             self.client = DefaultClient(client_init_data)
+            if pool_warm_up:
+                for endpoint in self.endpoints.endpoints:
+                    self.client.warm_up(endpoint.url, pool_warm_up)
 
         # Initialize the ArangoDB API wrapper object
         self.api = API(
@@ -58,6 +199,16 @@ class Arango(object):
             username=self.username,
             password=self.password,
             client=self.client,
+            endpoints=self.endpoints,
+            codec=self.codec,
+            compression=self.compression,
+            compression_threshold=self.compression_threshold,
+            retry_policy=self.retry_policy,
+            limits=self.limits,
+            hooks=self.hooks,
+            tracer=self.tracer,
+            singleflight=self.singleflight,
+            jwt=self.jwt,
         )
 
         # Check the connection by requesting a header
@@ -101,7 +252,17 @@ class Arango(object):
                     username=self.username,
                     password=self.password,
                     database=db_name,
-                    client=self.client
+                    client=self.client,
+                    endpoints=self.endpoints,
+                    codec=self.codec,
+                    compression=self.compression,
+                    compression_threshold=self.compression_threshold,
+                    retry_policy=self.retry_policy,
+                    limits=self.limits,
+                    hooks=self.hooks,
+                    tracer=self.tracer,
+                    singleflight=self.singleflight,
+                    jwt=self.jwt
                 )
             )
 
@@ -0,0 +1,332 @@
+"""ArangoDB's Top-Level Asynchronous API.
+
+Requires Python 3.7 or later.
+"""
+
+from arango.aio.api import AsyncAPI
+from arango.aio.database import AsyncDatabase
+from arango.aio.collection import AsyncCollection
+from arango.aio.graph import AsyncGraph
+from arango.aio.cursor import AsyncCursor
+from arango.clients.aio import AsyncClient
+from arango.constants import HTTP_OK, DEFAULT_DATABASE
+from arango.codec import get_codec
+from arango.compression import check_compression
+from arango.endpoints import EndpointPool, endpoint_url
+from arango.hooks import Hooks
+from arango.tracing import NOOP_TRACER
+from arango.exceptions import *
+
+
+class AsyncArango(object):
+    """Asynchronous wrapper for ArangoDB's top-level APIs.
+
+    Covers database management and the server version. Attributes not
+    found on this object are looked up on the default ("_system") database.
+    All methods are coroutines. Use ``AsyncArango.connect`` to create an
+    instance and verify the connection in one step.
+    """
+
+    def __init__(self, protocol="http", host="localhost", port=8529,
+                 username="root", password="", client=None,
+                 max_connections=100, endpoints=None,
+                 load_balancing="round_robin", probe_interval=10,
+                 codec="json", compression=None,
+                 compression_threshold=1024, retry_policy=None,
+                 connect_timeout=None, read_timeout=None, limits=None,
+                 hooks=None, metrics=None, tracer=None,
+                 singleflight=None, jwt=None):
+        """Initialize the wrapper object.
+
+        No connection is made until the first request is awaited.
+
+        :param protocol: the internet transfer protocol: 'http' (default),
+            'https' or 'unix' (Unix domain socket)
+        :type protocol: str
+        :param host: ArangoDB host (default: 'localhost'), or the path of
+            the socket if ``protocol`` is 'unix'
+        :type host: str
+        :param port: ArangoDB port (default: 8529), ignored if ``protocol``
+            is 'unix'
+        :type port: int or str
+        :param username: ArangoDB username (default: 'root')
+        :type username: str
+        :param password: ArangoDB password (default: '')
+        :type password: str
+        :param client: asynchronous HTTP client for this wrapper to use
+        :type client: arango.clients.aio.AsyncClient or None
+        :param max_connections: max requests in flight to the server
+        :type max_connections: int
+        :param endpoints: the base URLs of the servers (e.g. the cluster
+            coordinators) to spread the requests over, which overrides
+            ``protocol``, ``host`` and ``port``; Unix domain sockets are
+            given as 'unix:///path/to/arangodb.sock'
+        :type endpoints: list or None
+        :param load_balancing: 'round_robin', 'random' or
+            'least_outstanding' (default: 'round_robin')
+        :type load_balancing: str
+        :param probe_interval: the seconds before re-probing an endpoint
+            which was taken out of rotation after a failed request
+        :type probe_interval: int or float
+        :param codec: the JSON codec encoding the payloads and decoding the
+            responses: 'json' (default), 'ujson', 'orjson' or 'auto' (the
+            fastest installed); falls back to 'json' when the library is
+            not installed. 'vpack' exchanges VelocyPack instead, which
+            shrinks the payloads but is encoded and decoded in pure Python,
+            several times slower than 'json': it only pays off when the
+            bandwidth rather than the CPU is the bottleneck
+        :type codec: str or arango.codec.JSONCodec
+        :param compression: 'gzip' or 'deflate' to compress the request
+            bodies and accept compressed responses by default, or None (the
+            default); can be overridden per call for the bulk operations
+        :type compression: str or None
+        :param compression_threshold: the min size in bytes of the request
+            bodies to compress (default: 1024)
+        :type compression_threshold: int
+        :param retry_policy: the policy for retrying the requests which
+            failed transiently (e.g. connection errors, 503 responses or
+            lock timeouts), or None (default) to never retry; its counters
+            are available through ``self.retry_policy.stats``
+        :type retry_policy: arango.retry.RetryPolicy or None
+        :param connect_timeout: the seconds to wait for a connection to be
+            made, or None (default) to wait forever
+        :type connect_timeout: int or float or None
+        :param read_timeout: the seconds to wait for a response once the
+            request is sent, or None (default) to wait forever
+        :type read_timeout: int or float or None
+        :param limits: the admission control capping the requests in
+            flight per endpoint and per database and their rate, or None
+            (default) for no limits; the waits are available through
+            ``self.limits.stats``
+        :type limits: arango.limits.Limits or None
+        :param hooks: the hooks observing every request (e.g. to time
+            them), or None (default) for a new registry; callbacks are
+            registered with ``self.hooks.add``
+        :type hooks: arango.hooks.Hooks or None
+        :param metrics: the registry to record the latencies and errors of
+            the requests into, or None (default) to record nothing; they
+            are rendered for Prometheus by ``self.metrics.render()``
+        :type metrics: arango.metrics.Metrics or None
+        :param tracer: the tracer emitting a span per operation (e.g.
+            ``execute_query`` with the fetches of its batches, or
+            ``execute_batch``) and a child span per HTTP round trip, whose
+            trace context is sent in the request headers, or None (default)
+            for no tracing; see ``arango.tracing.Tracer``
+        :type tracer: arango.tracing.Tracer or None
+        :param singleflight: the coalescing of the identical concurrent
+            GET requests (e.g. of the same document), which then share a
+            single request in flight, or None (default) to send every
+            request; the counters are available through
+            ``self.singleflight.stats``
+        :type singleflight: arango.singleflight.SingleFlight or None
+        :param jwt: the JWT authentication obtaining a token for the
+            credentials once and sending it instead of them, so that the
+            server does not verify the password of every request, or None
+            (default) for basic authentication; see ``arango.auth.JWTAuth``
+        :type jwt: arango.auth.JWTAuth or None
+        :raises: InvalidArgumentError
+        """
+        self.protocol = protocol
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+
+        # JSON codec shared by the API wrapper objects of every database
+        self.codec = get_codec(codec)
+        self.compression = check_compression(compression)
+        self.compression_threshold = compression_threshold
+        self.retry_policy = retry_policy
+        self.limits = limits
+        self.hooks = Hooks() if hooks is None else hooks
+        self.tracer = NOOP_TRACER if tracer is None else tracer
+        self.singleflight = singleflight
+        self.jwt = jwt
+        self.metrics = metrics
+        if metrics is not None:
+            metrics.install(self.hooks)
+
+        # Endpoints shared by the API wrapper objects of every database
+        self.endpoints = EndpointPool(
+            endpoints or [endpoint_url(protocol, host, port)],
+            strategy=load_balancing,
+            probe_interval=probe_interval
+        )
+
+        # Initialize the asynchronous HTTP client if not given
+        if client is not None:
+            self.client = client
+        else:
+            self.client = AsyncClient({
+                "auth": (self.username, self.password),
+                "max_connections": max_connections,
+                "timeout": (connect_timeout, read_timeout),
+            })
+
+        # Initialize the asynchronous ArangoDB API wrapper object
+        self.api = AsyncAPI(
+            protocol=self.protocol,
+            host=self.host,
+            port=self.port,
+            username=self.username,
+            password=self.password,
+            client=self.client,
+            endpoints=self.endpoints,
+            codec=self.codec,
+            compression=self.compression,
+            compression_threshold=self.compression_threshold,
+            retry_policy=self.retry_policy,
+            limits=self.limits,
+            hooks=self.hooks,
+            tracer=self.tracer,
+            singleflight=self.singleflight,
+            jwt=self.jwt,
+        )
+
+        # Default ArangoDB database wrapper object
+        self._default_database = AsyncDatabase(DEFAULT_DATABASE, self.api)
+
+        # Cache for AsyncDatabase objects
+        self._database_cache = {
+            DEFAULT_DATABASE: self._default_database
+        }
+
+    @classmethod
+    async def connect(cls, *args, **kwargs):
+        """Create the wrapper object and check the connection.
+
+        Takes the same arguments as the constructor.
+
+        :returns: the wrapper object
+        :rtype: arango.aio.AsyncArango
+        :raises: ConnectionError
+        """
+        arango = cls(*args, **kwargs)
+        res = await arango.api.head("/_api/version")
+        if res.status_code not in HTTP_OK:
+            raise ConnectionError(res)
+        return arango
+
+    def __repr__(self):
+        """Return a descriptive string of this instance."""
+        return "<ArangoDB async API driver pointing to '{}'>".format(
+            self.host
+        )
+
+    def __getattr__(self, attr):
+        """Call __getattr__ of the default database."""
+        return getattr(self._default_database, attr)
+
+    async def close(self):
+        """Close the idle connections of the HTTP client."""
+        await self.client.close()
+
+    async def version(self):
+        """Return the version of the ArangoDB server.
+
+        :returns: the version number
+        :rtype: str
+        :raises: VersionGetError
+        """
+        res = await self.api.get("/_api/version", params={"details": True})
+        if res.status_code not in HTTP_OK:
+            raise VersionGetError(res)
+        return res.body["details"]
+
+    #######################
+    # Database Management #
+    #######################
+
+    async def databases(self):
+        """Return the database names.
+
+        :returns: the database names
+        :rtype: dict
+        :raises: DatabaseListError
+        """
+        res = await self.api.get("/_api/database/user")
+        if res.status_code not in HTTP_OK:
+            raise DatabaseListError(res)
+        user_databases = res.body["result"]
+
+        res = await self.api.get("/_api/database")
+        if res.status_code not in HTTP_OK:
+            raise DatabaseListError(res)
+        all_databases = res.body["result"]
+
+        return {"all": all_databases, "user": user_databases}
+
+    def _database_object(self, name):
+        """Return a new AsyncDatabase object sharing this client."""
+        return AsyncDatabase(
+            name=name,
+            api=AsyncAPI(
+                protocol=self.protocol,
+                host=self.host,
+                port=self.port,
+                username=self.username,
+                password=self.password,
+                database=name,
+                client=self.client,
+                endpoints=self.endpoints,
+                codec=self.codec,
+                compression=self.compression,
+                compression_threshold=self.compression_threshold,
+                retry_policy=self.retry_policy,
+                limits=self.limits,
+                hooks=self.hooks,
+                tracer=self.tracer,
+                singleflight=self.singleflight,
+                jwt=self.jwt
+            )
+        )
+
+    async def db(self, name):
+        """Alias for self.database."""
+        return await self.database(name)
+
+    async def database(self, name):
+        """Return the ``AsyncDatabase`` object of the specified name.
+
+        :returns: the database object
+        :rtype: arango.aio.database.AsyncDatabase
+        :raises: DatabaseNotFoundError
+        """
+        if name not in self._database_cache:
+            if name not in (await self.databases())["all"]:
+                raise DatabaseNotFoundError(name)
+            self._database_cache[name] = self._database_object(name)
+        return self._database_cache[name]
+
+    async def create_database(self, name, users=None):
+        """Create a new database.
+
+        :param name: the name of the new database
+        :type name: str
+        :param users: the users configurations
+        :type users: dict
+        :returns: the AsyncDatabase object
+        :rtype: arango.aio.database.AsyncDatabase
+        :raises: DatabaseCreateError
+        """
+        data = {"name": name, "users": users} if users else {"name": name}
+        res = await self.api.post("/_api/database", data=data)
+        if res.status_code not in HTTP_OK:
+            raise DatabaseCreateError(res)
+        self._database_cache[name] = self._database_object(name)
+        return self._database_cache[name]
+
+    async def delete_database(self, name, safe_delete=False):
+        """Remove the database of the specified name.
+
+        :param name: the name of the database to delete
+        :type name: str
+        :param safe_delete: whether to execute a safe delete (ignore 404)
+        :type safe_delete: bool
+        :raises: DatabaseDeleteError
+        """
+        res = await self.api.delete("/_api/database/{}".format(name))
+        if res.status_code not in HTTP_OK:
+            if not (res.status_code == 404 and safe_delete):
+                raise DatabaseDeleteError(res)
+        self._database_cache.pop(name, None)
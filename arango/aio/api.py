@@ -0,0 +1,127 @@
+"""Wrapper for making asynchronous REST API calls to ArangoDB."""
+
+import asyncio
+
+from arango.aio.pipeline import run
+from arango.api import API
+from arango.clients.aio import AsyncClient
+
+# The probes of the ejected endpoints in progress
+_probes = set()
+
+
+class AsyncAPI(API):
+    """Wrapper object which makes asynchronous REST API calls to ArangoDB.
+
+    The methods are the same as those of ``arango.api.API`` but return
+    awaitables resolving to ``arango.response.Response`` objects.
+
+    :param protocol: the internet transfer protocol (default: 'http')
+    :type protocol: str
+    :param host: ArangoDB host (default: 'localhost')
+    :type host: str
+    :param port: ArangoDB port (default: 8529)
+    :type port: int or str
+    :param username: ArangoDB username (default: 'root')
+    :type username: str
+    :param password: ArangoDB password (default: '')
+    :type password: str
+    :param database: the ArangoDB database to point the API calls to
+    :type database: str
+    :param client: asynchronous HTTP client for this wrapper to use
+    :type client: arango.clients.aio.AsyncClient or None
+    :param endpoints: the base URLs of the servers to spread the requests
+        over, or the endpoint pool to share
+    :type endpoints: list or arango.endpoints.EndpointPool or None
+    :param load_balancing: 'round_robin', 'random' or 'least_outstanding'
+    :type load_balancing: str
+    :param probe_interval: the seconds before re-probing a failed endpoint
+    :type probe_interval: int or float
+    :param codec: the JSON codec: 'json', 'ujson', 'orjson' or 'auto', or
+        'vpack' (pure Python VelocyPack, slower than 'json' and only worth
+        it to save bandwidth)
+    :type codec: str or arango.codec.JSONCodec
+    :param compression: 'gzip', 'deflate' or None (default)
+    :type compression: str or None
+    :param compression_threshold: the min size in bytes of the request
+        bodies to compress
+    :type compression_threshold: int
+    :param retry_policy: the policy for retrying the requests which failed
+        transiently, or None (default) to never retry
+    :type retry_policy: arango.retry.RetryPolicy or None
+    :param connect_timeout: the seconds to wait for a connection, or None
+        (default) to wait forever
+    :type connect_timeout: int or float or None
+    :param read_timeout: the seconds to wait for a response, or None
+        (default) to wait forever
+    :type read_timeout: int or float or None
+    :param limits: the admission control capping the requests in flight
+        and their rate, or None (default) for no limits
+    :type limits: arango.limits.Limits or None
+    :param hooks: the hooks observing the requests, or None (default) for
+        a new registry
+    :type hooks: arango.hooks.Hooks or None
+    :param tracer: the tracer of the requests, or None (default) for no
+        tracing
+    :type tracer: arango.tracing.Tracer or None
+    :param singleflight: the coalescing of the identical concurrent GET
+        requests, or None (default) to send every request
+    :type singleflight: arango.singleflight.SingleFlight or None
+    :param jwt: the JWT authentication sending a cached token instead of
+        the credentials, or None (default) for basic authentication
+    :type jwt: arango.auth.JWTAuth or None
+    """
+
+    def __init__(self, protocol="http", host="localhost", port=8529,
+                 username="root", password="", database=None, client=None,
+                 endpoints=None, load_balancing="round_robin",
+                 probe_interval=10, codec="json", compression=None,
+                 compression_threshold=1024, retry_policy=None,
+                 connect_timeout=None, read_timeout=None, limits=None,
+                 hooks=None, tracer=None, singleflight=None, jwt=None):
+        if client is None:
+            client = AsyncClient({
+                "auth": (username, password),
+                "timeout": (connect_timeout, read_timeout),
+            })
+        super(AsyncAPI, self).__init__(
+            protocol=protocol,
+            host=host,
+            port=port,
+            username=username,
+            password=password,
+            database=database,
+            client=client,
+            endpoints=endpoints,
+            load_balancing=load_balancing,
+            probe_interval=probe_interval,
+            codec=codec,
+            compression=compression,
+            compression_threshold=compression_threshold,
+            retry_policy=retry_policy,
+            limits=limits,
+            hooks=hooks,
+            tracer=tracer,
+            singleflight=singleflight,
+            jwt=jwt
+        )
+
+    def run(self, steps):
+        """Run the steps of a request or an operation on the event loop.
+
+        :param steps: the steps, see ``arango.pipeline``
+        :type steps: generator
+        :returns: the awaitable of the result of the steps
+        :rtype: collections.Awaitable
+        """
+        return run(steps)
+
+    def _start_probe(self, endpoint):
+        """Probe the ejected endpoint in a task of the event loop.
+
+        See ``arango.api.API._start_probe``.
+        """
+        task = asyncio.ensure_future(run(self._probe(endpoint)))
+        # The event loop only holds weak references to the tasks
+        _probes.add(task)
+        task.add_done_callback(_probes.discard)
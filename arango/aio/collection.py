@@ -0,0 +1,49 @@
+"""ArangoDB Asynchronous Collection."""
+
+from arango.aio.cursor import AsyncCursor
+from arango.collection import Collection
+
+
+class AsyncCollection(Collection):
+    """Asynchronous wrapper for ArangoDB's collection-specific APIs.
+
+    It has the methods and properties of ``arango.collection.Collection``,
+    which return awaitables of their results (e.g. ``await col.count()``
+    or ``await col.properties``). The documents are iterated, counted and
+    looked up with ``all``, ``count`` and ``has`` instead of ``iter``,
+    ``len`` and ``in``, which cannot await.
+    """
+
+    _cursor = AsyncCursor
+
+    def __init__(self, name, api, is_edge=False):
+        """Initialize the wrapper object.
+
+        :param name: the name of this collection
+        :type name: str
+        :param api: ArangoDB asynchronous API object
+        :type api: arango.aio.api.AsyncAPI
+        :param is_edge: whether or not this is an edge collection
+        :type is_edge: bool
+        """
+        super(AsyncCollection, self).__init__(name, api, is_edge=is_edge)
+
+    def __repr__(self):
+        """Return a descriptive string of this instance."""
+        return "<ArangoDB async collection '{}'>".format(self.name)
+
+    def __iter__(self):
+        raise TypeError("Use 'async for' over 'await collection.all()'.")
+
+    def __len__(self):
+        raise TypeError("Use 'await collection.count()'.")
+
+    def __contains__(self, key):
+        raise TypeError("Use 'await collection.has(key)'.")
+
+    def __setattr__(self, attr, value):
+        if attr in {"wait_for_sync", "journal_size"}:
+            raise AttributeError(
+                "Use 'await collection.set_properties({}=...)'.".format(attr)
+            )
+        object.__setattr__(self, attr, value)
@@ -0,0 +1,339 @@
+"""ArangoDB Asynchronous Cursor."""
+
+import asyncio
+import weakref
+
+from arango.columns import ColumnBuilder
+from arango.constants import HTTP_OK
+from arango.cursor import registry, results
+from arango.exceptions import (
+    CursorGetNextError,
+    CursorDeleteError,
+)
+from arango.streaming import raw_headers
+
+
+class AsyncCursor(object):
+    """Asynchronous iterator over the results of a server cursor.
+
+    By default, the next batch is fetched from the server only once the
+    current batch has been consumed. With ``prefetch``, the next batches
+    are fetched by a background task while the current one is consumed,
+    up to ``prefetch`` of them being held ahead. The server cursor is
+    deleted once the last batch has arrived.
+
+    The results can also be consumed batch by batch with ``batches``,
+    while ``batch_index`` is the index of the current batch (from 0) and
+    ``result_count`` the number of results ``batches`` has yielded. The
+    results can also be read into NumPy columns with ``to_columns``.
+
+    A cursor stopped before its last batch holds the server cursor until
+    ``close`` is awaited, e.g. on exiting the ``async with`` block of the
+    cursor. A cursor left open is closed once garbage collected while its
+    event loop runs; past that, the server cursor is left to expire. See
+    ``arango.cursor.cursor_counts`` for the number of server cursors held.
+
+    :param api: ArangoDB asynchronous API wrapper object
+    :type api: arango.aio.api.AsyncAPI
+    :param response: ArangoDB response object
+    :type response: arango.response.Response
+    :param compress: whether to accept compressed batches (default: the
+        setting of the API wrapper)
+    :type compress: str or bool or None
+    :param deadline: the deadline of the operation which created the
+        cursor, bounding the fetches of the next batches too
+    :type deadline: arango.deadline.Deadline or None
+    :param span: the span of the operation which created the cursor,
+        parenting the fetches of the next batches and ended once the last
+        batch has arrived (or right away if there is none to fetch), once
+        a fetch fails or once the cursor is garbage collected, so that it
+        does not time the application
+    :type span: arango.tracing.Span or None
+    :param stream: whether to stream the next batches, which the
+        asynchronous clients read whole (see ``arango.streaming``)
+    :type stream: bool
+    :param raw: whether to return the results as raw JSON (bytes or
+        memoryview), never decoded; ``response`` must be JSON
+    :type raw: bool
+    :param prefetch: the max number of batches to fetch ahead in the
+        background, or 0 to fetch them on demand
+    :type prefetch: int
+    """
+
+    def __init__(self, api, response, compress=None, deadline=None,
+                 span=None, stream=False, raw=False, prefetch=0):
+        self._api = api
+        self._compress = compress
+        self._deadline = deadline
+        self._stream = stream
+        self._raw = raw
+        self._span = span
+        envelope = {}
+        # The results of the current batch, until they start being consumed
+        # through the iterator of ``_batch``
+        self._pending = results(response, envelope, raw)
+        self._batch = iter(())
+        self.batch_index = 0
+        self.result_count = 0
+        # The total number of results, if the query was run with ``count``
+        self.count = envelope.get("count")
+        self._has_more = envelope["hasMore"]
+        self._id = envelope["id"] if self._has_more else None
+        # Follow-up requests must go to the coordinator holding the cursor
+        self._endpoint = response.endpoint
+        if self._has_more:
+            registry.opened()
+        else:
+            self._end_span()
+        self._batches = self._task = None
+        if prefetch and self._has_more:
+            self._batches = asyncio.Queue(maxsize=prefetch)
+            self._task = asyncio.ensure_future(
+                _prefetch(weakref.ref(self), self._batches)
+            )
+
+    def __del__(self):
+        try:
+            self._stop()
+            self._end_span()
+            cursor_id, self._id = self._id, None
+            if cursor_id is None:
+                return
+            asyncio.get_running_loop()
+            task = asyncio.ensure_future(_delete_cursor(
+                self._api, self._endpoint, cursor_id, "collected"
+            ))
+        except Exception:
+            # Left to expire on the server
+            return
+        # The event loop only holds weak references to the tasks
+        _deleting.add(task)
+        task.add_done_callback(_deleted)
+
+    def __repr__(self):
+        """Return a descriptive string of this instance."""
+        return "<ArangoDB async cursor '{}'>".format(self._id)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        """Return the next item, fetching the next batch if necessary.
+
+        :raises: CursorGetNextError, CursorDeleteError,
+            DeadlineExceededError
+        """
+        while True:
+            for item in self._batch:
+                return item
+            items = await self._take()
+            if items is None:
+                raise StopAsyncIteration
+            self._batch = iter(items)
+
+    async def batches(self):
+        """Iterate over the rest of the results batch by batch.
+
+        Each batch is the list of its results as the server sent them
+        (decoded, or raw JSON with ``raw``), which is not copied unless its
+        first results were already consumed one at a time.
+
+        :returns: the asynchronous generator of the lists of results
+        :rtype: async_generator
+        :raises: CursorGetNextError, CursorDeleteError,
+            DeadlineExceededError
+        """
+        # The results left in the batch being consumed one at a time
+        items = list(self._batch)
+        self._batch = iter(())
+        while True:
+            if not items:
+                items = await self._take()
+                if items is None:
+                    return
+            self.result_count += len(items)
+            yield items
+            items = None
+
+    async def to_columns(self, fields=None, dtypes=None, structured=False):
+        """Read the rest of the results into NumPy columns.
+
+        See ``arango.columns.to_columns``, whose arguments it takes but the
+        cursor.
+
+        :returns: the masked columns by field, or the masked structured
+            array
+        :rtype: dict or numpy.ma.MaskedArray
+        :raises: ImportError if NumPy is not installed, CursorGetNextError,
+            CursorDeleteError, DeadlineExceededError
+        """
+        builder = ColumnBuilder(fields, dtypes, self.count or 0)
+        async for documents in self.batches():
+            builder.add(documents)
+        return builder.build(structured)
+
+    async def close(self):
+        """Stop the cursor, deleting the server cursor unless exhausted.
+
+        Closing a closed cursor does nothing.
+
+        :raises: CursorDeleteError
+        """
+        self._stop()
+        self._pending = None
+        self._batch = iter(())
+        self._has_more = False
+        try:
+            await self._delete("closed")
+        finally:
+            self._end_span()
+
+    async def _take(self):
+        """Take the results of the next batch, fetching it if necessary.
+
+        :returns: the results (see ``arango.cursor.results``), or None if
+            there are none
+        :rtype: list or None
+        """
+        if self._pending is not None:
+            items, self._pending = self._pending, None
+            return items
+        if not self._has_more:
+            return None
+        try:
+            if self._batches is None:
+                items, self._has_more = await self._fetch()
+            else:
+                batch, error = await self._batches.get()
+                if error is not None:
+                    raise error
+                items, self._has_more = batch
+        except Exception as error:
+            if self._batches is not None:
+                # The task has stopped, so is the cursor
+                self._has_more = False
+            self._end_span(error)
+            raise
+        if not self._has_more:
+            self._end_span()
+        self.batch_index += 1
+        return items
+
+    async def _fetch(self):
+        """Fetch the next batch.
+
+        :returns: the results of the batch, and whether there is another one
+        :rtype: tuple
+        """
+        with self._api.tracer.activate(self._span):
+            res = await self._api.put(
+                "/_api/cursor/{}".format(self._id),
+                endpoint=self._endpoint,
+                compress=self._compress,
+                deadline=self._deadline,
+                # Sending it again would skip a batch
+                retry=False,
+                stream=self._stream,
+                headers=raw_headers() if self._raw else None
+            )
+        if res.status_code not in HTTP_OK:
+            raise CursorGetNextError(res)
+        envelope = {}
+        batch = results(res, envelope, self._raw)
+        if not envelope["hasMore"]:
+            # The last batch is in, which ends the operation
+            await self._delete()
+        return batch, envelope["hasMore"]
+
+    async def _delete(self, reason="exhausted"):
+        """Delete the server cursor, if still held.
+
+        :param reason: the reason of the deletion, see
+            ``arango.cursor.CursorRegistry``
+        :type reason: str
+        """
+        if self._id is None:
+            return
+        cursor_id, self._id = self._id, None
+        try:
+            await _delete_cursor(self._api, self._endpoint, cursor_id,
+                                 reason, self._span)
+        except BaseException:
+            # Still held, and released again on close or on garbage
+            # collection
+            self._id = cursor_id
+            raise
+
+    def _end_span(self, error=None):
+        """End the span of the operation, once, recording its exception."""
+        span, self._span = self._span, None
+        if span is None:
+            return
+        if error is not None:
+            span.record_error(error)
+        span.end()
+
+    def _stop(self):
+        """Cancel the prefetching task, if any."""
+        task, self._task = self._task, None
+        if task is not None and not task.done():
+            try:
+                task.cancel()
+            except RuntimeError:
+                # The event loop is closed
+                pass
+
+
+# The deletions of the server cursors of the collected cursors
+_deleting = set()
+
+
+async def _delete_cursor(api, endpoint, cursor_id, reason, span=None):
+    """Delete a server cursor.
+
+    :raises: CursorDeleteError
+    """
+    with api.tracer.activate(span):
+        res = await api.delete(
+            "/_api/cursor/{}".format(cursor_id),
+            endpoint=endpoint
+        )
+    if res.status_code not in {404, 202}:
+        raise CursorDeleteError(res)
+    registry.released(reason)
+
+
+def _deleted(task):
+    """Forget the deletion of a server cursor once done."""
+    _deleting.discard(task)
+    if not task.cancelled():
+        # Retrieved for the event loop not to log it
+        task.exception()
+
+
+async def _prefetch(ref, batches):
+    """Fetch the next batches of a cursor into the queue.
+
+    The task only holds a weak reference to the cursor while it waits for
+    room in the queue, so that the cursor can be collected (which cancels
+    the task). It stops after the last batch or the first failure.
+    """
+    has_more = True
+    while has_more:
+        cursor = ref()
+        if cursor is None:
+            return
+        try:
+            batch, has_more = await cursor._fetch()
+        except Exception as error:
+            entry, has_more = (None, error), False
+        else:
+            entry = ((batch, has_more), None)
+        del cursor
+        await batches.put(entry)
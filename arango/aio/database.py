@@ -0,0 +1,23 @@
+"""ArangoDB Asynchronous Database."""
+
+from arango.aio.collection import AsyncCollection
+from arango.aio.cursor import AsyncCursor
+from arango.aio.graph import AsyncGraph
+from arango.database import Database
+
+
+class AsyncDatabase(Database):
+    """Asynchronous wrapper for ArangoDB's database-specific APIs.
+
+    It has the methods and properties of ``arango.database.Database``,
+    which return awaitables of their results (e.g. ``await
+    db.collection("students")`` or ``await db.properties``).
+    """
+
+    _collection_class = AsyncCollection
+    _graph_class = AsyncGraph
+    _cursor = AsyncCursor
+
+    def __repr__(self):
+        """Return a descriptive string of this instance."""
+        return "<ArangoDB async database '{}'>".format(self.name)
@@ -0,0 +1,15 @@
+"""ArangoDB Asynchronous Graph."""
+
+from arango.graph import Graph
+
+
+class AsyncGraph(Graph):
+    """Asynchronous wrapper for ArangoDB's graph-specific APIs.
+
+    It has the methods and properties of ``arango.graph.Graph``, which
+    return awaitables of their results (e.g. ``await graph.properties``).
+    """
+
+    def __repr__(self):
+        """Return a descriptive string of this instance."""
+        return "<ArangoDB async graph '{}'>".format(self.name)
@@ -0,0 +1,61 @@
+"""Running the steps of a request on the event loop, see arango.pipeline."""
+
+import asyncio
+
+from arango.pipeline import Call, Runner, Sleep
+
+
+class LoopEvent(object):
+    """Event of the running event loop, which any thread may set."""
+
+    def __init__(self):
+        self._loop = asyncio.get_running_loop()
+        self._future = self._loop.create_future()
+
+    def set(self):
+        """Wake the task waiting for the event."""
+        self._loop.call_soon_threadsafe(_wake, self._future)
+
+    async def wait(self, timeout=None):
+        """Wait until the event is set.
+
+        :param timeout: the max seconds to wait, or None to wait forever
+        :type timeout: int or float or None
+        :returns: True if the event was set, False on timeout
+        :rtype: bool
+        """
+        try:
+            await asyncio.wait_for(self._future, timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+
+def _wake(future):
+    """Resolve the future of a set event."""
+    if not future.done():
+        future.set_result(None)
+
+
+async def run(steps):
+    """Run the steps on the event loop, awaiting the calls they yield.
+
+    :param steps: the steps, see ``arango.pipeline``
+    :type steps: generator
+    :returns: the result of the steps
+    """
+    runner = Runner(steps)
+    effect = runner.send()
+    while effect is not None:
+        try:
+            if isinstance(effect, Call):
+                value = await effect.function(*effect.args, **effect.kwargs)
+            elif isinstance(effect, Sleep):
+                value = await asyncio.sleep(effect.seconds)
+            else:
+                value = LoopEvent()
+        except BaseException as error:
+            effect = runner.send(error=error)
+        else:
+            effect = runner.send(value)
+    return runner.result
@@ -1,20 +1,62 @@
 """Wrapper for making REST API calls to ArangoDB."""
 
-import json
+from threading import Thread
 
 from arango.constants import DEFAULT_DATABASE
-from arango.clients import DefaultClient
+from arango.clients import DefaultClient, UnixSocketClient
+from arango.codec import get_codec
+from arango.compression import (
+    ACCEPT_ENCODING,
+    check_compression,
+    compress as compress_body
+)
+from arango.endpoints import EndpointPool, endpoint_url
+from arango.deadline import Deadline, monotonic
+from arango.exceptions import (
+    AuthenticationError,
+    CircuitOpenError,
+    DeadlineExceededError,
+)
+from arango.hooks import (
+    Hooks,
+    path_template,
+    payload_size,
+    request_collection,
+)
+from arango.pipeline import Call, Return, Sleep, run
+from arango.tracing import NOOP_TRACER
 from arango.utils import is_string
 
+# The seconds to wait for the response to the probe of an ejected endpoint
+PROBE_TIMEOUT = 5.0
+
+
+def bearer(kwargs, token):
+    """Return the request arguments with the token in the headers.
+
+    :param kwargs: the arguments of the HTTP client call
+    :type kwargs: dict
+    :param token: the JSON web token
+    :type token: str
+    :returns: a copy of the arguments
+    :rtype: dict
+    """
+    headers = dict(kwargs.get("headers") or {})
+    headers["Authorization"] = "bearer " + token
+    return dict(kwargs, headers=headers)
+
 
 class API(object):
     """Wrapper object which makes REST API calls to ArangoDB.
 
-    :param protocol: the internet transfer protocol (default: 'http')
+    :param protocol: the internet transfer protocol: 'http' (default),
+        'https' or 'unix' (Unix domain socket)
     :type protocol: str
-    :param host: ArangoDB host (default: 'localhost')
+    :param host: ArangoDB host (default: 'localhost'), or the path of the
+        socket if ``protocol`` is 'unix'
     :type host: str
-    :param port: ArangoDB port (default: 8529)
+    :param port: ArangoDB port (default: 8529), ignored if ``protocol`` is
+        'unix'
     :type port: int or str
     :param username: ArangoDB username (default: 'root')
     :type username: str
@@ -24,29 +66,568 @@ class API(object):
     :type database: str
     :param client: HTTP client for this wrapper to use
     :type client: arango.clients.base.BaseClient or None
+    :param pool_connections: the number of per-host connection pools
+    :type pool_connections: int
+    :param pool_maxsize: the max number of pooled connections per host
+    :type pool_maxsize: int
+    :param pool_block: block instead of opening extra connections when all
+        pooled connections to a host are in use
+    :type pool_block: bool
+    :param pool_warm_up: the number of connections to open upfront
+    :type pool_warm_up: int
+    :param endpoints: the base URLs of the servers to spread the requests
+        over (e.g. ['http://host1:8529', 'http://host2:8529']), or the
+        endpoint pool to share; overrides ``protocol``, ``host`` and ``port``
+    :type endpoints: list or arango.endpoints.EndpointPool or None
+    :param load_balancing: 'round_robin', 'random' or 'least_outstanding'
+    :type load_balancing: str
+    :param probe_interval: the seconds before re-probing a failed endpoint
+    :type probe_interval: int or float
+    :param codec: the JSON codec encoding the payloads and decoding the
+        responses: 'json', 'ujson', 'orjson' or 'auto' (the fastest
+        installed), 'vpack' (pure Python VelocyPack, slower than 'json' and
+        only worth it to save bandwidth), or a codec object
+    :type codec: str or arango.codec.JSONCodec
+    :param compression: 'gzip' or 'deflate' to compress the request bodies
+        and accept compressed responses by default, or None (default)
+    :type compression: str or None
+    :param compression_threshold: the min size in bytes of the request
+        bodies to compress
+    :type compression_threshold: int
+    :param retry_policy: the policy for retrying the requests which failed
+        transiently, or None (default) to never retry
+    :type retry_policy: arango.retry.RetryPolicy or None
+    :param connect_timeout: the seconds to wait for a connection, or None
+        (default) to wait forever
+    :type connect_timeout: int or float or None
+    :param read_timeout: the seconds to wait for a response, or None
+        (default) to wait forever
+    :type read_timeout: int or float or None
+    :param limits: the admission control capping the requests in flight
+        and their rate, or None (default) for no limits
+    :type limits: arango.limits.Limits or None
+    :param hooks: the hooks observing the requests, or None (default) for
+        a new registry
+    :type hooks: arango.hooks.Hooks or None
+    :param tracer: the tracer of the requests, or None (default) for no
+        tracing
+    :type tracer: arango.tracing.Tracer or None
+    :param singleflight: the coalescing of the identical concurrent GET
+        requests, or None (default) to send every request
+    :type singleflight: arango.singleflight.SingleFlight or None
+    :param jwt: the JWT authentication sending a cached token instead of
+        the credentials, or None (default) for basic authentication
+    :type jwt: arango.auth.JWTAuth or None
+
+    The connection pool and timeout settings only apply to the default
+    client, i.e. when ``client`` is not given. If any endpoint is a Unix
+    domain socket, the default client is
+    ``arango.clients.UnixSocketClient`` instead.
     """
 
     def __init__(self, protocol="http", host="localhost", port=8529,
-                 username="root", password="", database=None, client=None):
+                 username="root", password="", database=None, client=None,
+                 pool_connections=10, pool_maxsize=10, pool_block=False,
+                 pool_warm_up=0, endpoints=None,
+                 load_balancing="round_robin", probe_interval=10,
+                 codec="json", compression=None,
+                 compression_threshold=1024, retry_policy=None,
+                 connect_timeout=None, read_timeout=None, limits=None,
+                 hooks=None, tracer=None, singleflight=None, jwt=None):
         self.protocol = protocol
         self.host = host
         self.port = port
         self.username = username
         self.password = password
         self.database = DEFAULT_DATABASE if database is None else database
-        self.url_prefix = "{protocol}://{host}:{port}/_db/{database}".format(
-            protocol=self.protocol,
-            host=self.host,
-            port=self.port,
-            database=self.database,
-        )
+        if isinstance(endpoints, EndpointPool):
+            self.endpoints = endpoints
+        else:
+            self.endpoints = EndpointPool(
+                endpoints or [
+                    endpoint_url(self.protocol, self.host, self.port)
+                ],
+                strategy=load_balancing,
+                probe_interval=probe_interval
+            )
+        self.codec = get_codec(codec)
+        self.compression = check_compression(compression)
+        self.compression_threshold = compression_threshold
+        self.retry_policy = retry_policy
+        self.limits = limits
+        self.hooks = Hooks() if hooks is None else hooks
+        self.tracer = NOOP_TRACER if tracer is None else tracer
+        self.singleflight = singleflight
+        self.jwt = jwt
+        self.path_prefix = "/_db/{}".format(self.database)
+        # URL prefix of the first (or only) endpoint
+        self.url_prefix = self.endpoints.endpoints[0].url + self.path_prefix
         if client is not None:
             self.client = client
+        elif any(endpoint.is_unix for endpoint in self.endpoints.endpoints):
+            self.client = UnixSocketClient({
+                "auth": (self.username, self.password),
+                "timeout": (connect_timeout, read_timeout),
+            })
         else:
-            client_init_data = {"auth": (self.username, self.password)}
+            client_init_data = {
+                "auth": (self.username, self.password),
+                "pool_connections": pool_connections,
+                "pool_maxsize": pool_maxsize,
+                "pool_block": pool_block,
+                "timeout": (connect_timeout, read_timeout),
+            }
             self.client = DefaultClient(client_init_data)
+            if pool_warm_up:
+                for endpoint in self.endpoints.endpoints:
+                    self.client.warm_up(endpoint.url, pool_warm_up)
+
+    def _start_probe(self, endpoint):
+        """Probe the ejected endpoint on a background thread.
+
+        The request which found the endpoint due for a probe does not wait
+        for it, so that it is not held up (past its deadline, if any) by an
+        endpoint which may still be unreachable.
+
+        :param endpoint: the endpoint handed out by ``due_for_probe``
+        :type endpoint: arango.endpoints.Endpoint
+        """
+        thread = Thread(
+            target=run,
+            args=(self._probe(endpoint),),
+            name="arango-endpoint-probe"
+        )
+        thread.daemon = True
+        thread.start()
+
+    def _probe(self, endpoint):
+        """Probe the ejected endpoint and restore it if it is reachable.
+
+        :returns: the steps of the probe, see ``arango.pipeline``
+        :rtype: generator
+        """
+        try:
+            res = yield Call(
+                self.client.head,
+                url=endpoint.url + "/_api/version",
+                auth=(self.username, self.password),
+                timeout=PROBE_TIMEOUT
+            )
+        except Exception:
+            self.endpoints.eject(endpoint)
+        except BaseException:
+            # E.g. the cancellation of the probe, which must not leave the
+            # endpoint out of the probes for good
+            self.endpoints.eject(endpoint)
+            raise
+        else:
+            if res.status_code < 500:
+                self.endpoints.restore(endpoint)
+            else:
+                self.endpoints.eject(endpoint)
+
+    def _request(self, method, path, endpoint=None, compress=None,
+                 retry=None, deadline=None, stream=False, **kwargs):
+        """Send the request to an endpoint using the HTTP client.
+
+        Transport level failures (i.e. exceptions raised by the client)
+        eject the endpoint from the rotation before being re-raised. With a
+        retry policy, the requests which failed transiently are sent again
+        (see ``arango.retry.RetryPolicy``) and the last response or
+        exception is returned or raised once the attempts are used up.
+
+        With a deadline, every attempt is bounded by the time left, no
+        retry is made which would wait past it, and DeadlineExceededError
+        is raised once it has passed.
+
+        With a single flight, the request is not sent if an identical one
+        is in flight, whose response is returned instead.
+
+        A streamed response is only returned if the HTTP client supports
+        streaming, see ``arango.clients.base.BaseClient``.
+
+        :param method: the name of the HTTP client method (e.g. 'get')
+        :type method: str
+        :param path: the API path (e.g. '/_api/version')
+        :type path: str
+        :param endpoint: the endpoint to send the request to, if it must not
+            be chosen by the load balancer
+        :type endpoint: arango.endpoints.Endpoint or None
+        :param compress: whether to compress the request and accept a
+            compressed response ('gzip', 'deflate' or True for the default
+            method), or None to use the default set on this wrapper
+        :type compress: str or bool or None
+        :param retry: whether the request may be retried, or None to let
+            the retry policy decide based on the method
+        :type retry: bool or None
+        :param deadline: the deadline of the operation, or the seconds it
+            may take
+        :type deadline: arango.deadline.Deadline or int or float or None
+        :param stream: whether to stream the response content
+        :type stream: bool
+        :returns: the ArangoDB http response
+        :rtype: arango.response.Response
+        :raises: CircuitOpenError, DeadlineExceededError
+        """
+        if stream and getattr(self.client, "streaming", False):
+            kwargs["stream"] = True
+        return self.run(self._steps(method, path, endpoint, compress, retry,
+                                    deadline, kwargs))
+
+    def run(self, steps):
+        """Run the steps of a request or an operation.
+
+        :param steps: the steps, see ``arango.pipeline``
+        :type steps: generator
+        :returns: the result of the steps
+        """
+        return run(steps)
+
+    def _steps(self, method, path, endpoint, compress, retry, deadline,
+               kwargs):
+        """Return the steps of ``_request``, see ``arango.pipeline``.
+
+        :returns: the steps, whose result is the response
+        :rtype: generator
+        """
+        singleflight = self.singleflight
+        if singleflight is not None and method in singleflight.methods and \
+                not kwargs.get("stream"):
+            key = self._flight_key(method, path, endpoint, compress, kwargs)
+            if key is not None:
+                deadline = Deadline.of(deadline)
+                return singleflight.do(
+                    key,
+                    lambda: self._dispatch(method, path, endpoint, compress,
+                                           retry, deadline, kwargs),
+                    deadline
+                )
+        return self._dispatch(method, path, endpoint, compress, retry,
+                              deadline, kwargs)
+
+    def _flight_key(self, method, path, endpoint, compress, kwargs):
+        """Return the identity of a request to coalesce, see ``_request``.
+
+        :returns: the hashable key, or None if the request cannot be
+            coalesced (e.g. its parameters are not hashable)
+        :rtype: tuple or None
+        """
+        params = kwargs.get("params")
+        headers = kwargs.get("headers")
+        key = (
+            self.endpoints, self.username, self.password, self.path_prefix,
+            method, path, endpoint, compress, kwargs.get("data"),
+            frozenset(params.items()) if params else None,
+            frozenset(headers.items()) if headers else None,
+        )
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def _dispatch(self, method, path, endpoint, compress, retry, deadline,
+                  kwargs):
+        """Send the request, retrying it if need be, see ``_request``."""
+        start = monotonic() if self.hooks.active else None
+        self._encode(kwargs)
+        self._compress(kwargs, compress)
+        encode_time = None if start is None else monotonic() - start
+        deadline = Deadline.of(deadline)
+        policy = self.retry_policy
+        if policy is None:
+            res = yield self._send(
+                method, path, endpoint, kwargs, deadline, encode_time
+            )
+            raise Return(res)
+
+        attempts = policy.attempts(method, retry)
+        attempt = 1
+        while True:
+            try:
+                res = yield self._send(
+                    method, path, endpoint, kwargs, deadline, encode_time
+                )
+            except (AuthenticationError, CircuitOpenError,
+                    DeadlineExceededError):
+                raise
+            except Exception:
+                delay = self._retry_delay(attempt, attempts, deadline)
+                if delay is None:
+                    raise
+            else:
+                delay = None
+                if policy.is_retryable(res):
+                    delay = self._retry_delay(attempt, attempts, deadline, res)
+                elif attempt > 1:
+                    policy.count("recovered")
+                if delay is None:
+                    raise Return(res)
+            policy.count("retries")
+            yield Sleep(delay)
+            attempt += 1
 
-    def head(self, path, params=None, headers=None):
+    def _retry_delay(self, attempt, attempts, deadline, res=None):
+        """Return the seconds to wait before retrying, or None to give up.
+
+        :param attempt: the number of attempts made so far
+        :type attempt: int
+        :param attempts: the max number of attempts
+        :type attempts: int
+        :param deadline: the deadline of the request, if any
+        :type deadline: arango.deadline.Deadline or None
+        :param res: the response to the last attempt, if any
+        :type res: arango.response.Response or None
+        :returns: the seconds to wait, or None
+        :rtype: float or None
+        """
+        policy = self.retry_policy
+        if attempt < attempts:
+            delay = policy.delay(attempt, res)
+            if deadline is None or delay < deadline.remaining():
+                return delay
+        if attempts > 1:
+            policy.count("exhausted")
+        return None
+
+    def _send(self, method, path, endpoint, kwargs, deadline=None,
+              encode_time=None):
+        """Send the prepared request once, see ``_request``."""
+        if deadline is not None and deadline.expired:
+            raise DeadlineExceededError(deadline)
+        for ejected in self.endpoints.due_for_probe():
+            self._start_probe(ejected)
+        endpoint = self.endpoints.acquire(endpoint)
+        breaker = self._breaker(endpoint)
+        held = yield self._admit(endpoint, deadline)
+        if deadline is not None:
+            kwargs = dict(kwargs, timeout=deadline.remaining())
+        try:
+            if self.tracer.enabled:
+                res = yield self._send_traced(
+                    method, path, endpoint, kwargs, encode_time
+                )
+            elif self.hooks.active:
+                res = yield self._send_hooked(
+                    method, path, endpoint, kwargs, encode_time
+                )
+            else:
+                res = yield self._call(method, path, endpoint, kwargs)
+        except AuthenticationError:
+            # Rejected credentials say nothing about the endpoint either
+            self.endpoints.release(endpoint)
+            raise
+        except Exception:
+            if deadline is not None and deadline.expired:
+                # Out of time, which says nothing about the endpoint either
+                self.endpoints.release(endpoint)
+                raise DeadlineExceededError(deadline)
+            self.endpoints.release(endpoint, failed=True)
+            self._record(breaker, endpoint, None)
+            raise
+        except BaseException:
+            # Interrupted or cancelled, which says nothing about the endpoint
+            self.endpoints.release(endpoint)
+            raise
+        finally:
+            if held:
+                self.limits.release(held)
+        self.endpoints.release(endpoint)
+        res.endpoint = endpoint
+        res.codec = self.codec
+        self._record(breaker, endpoint, res)
+        raise Return(res)
+
+    def _call(self, method, path, endpoint, kwargs):
+        """Return the call of the HTTP client sending the request.
+
+        With JWT authentication, return the steps of ``_call_with_token``
+        instead.
+        """
+        if self.jwt is not None:
+            return self._call_with_token(method, path, endpoint, kwargs)
+        return Call(
+            getattr(self.client, method),
+            url=endpoint.url + self.path_prefix + path,
+            auth=(self.username, self.password),
+            **kwargs
+        )
+
+    def _call_with_token(self, method, path, endpoint, kwargs):
+        """Call the HTTP client with the token of the credentials.
+
+        A request the server rejects (401) is sent again once, with a new
+        token, in case the cached one is no longer valid.
+
+        :raises: AuthenticationError
+        """
+        send = getattr(self.client, method)
+        url = endpoint.url + self.path_prefix + path
+        timeout = kwargs.get("timeout")
+        token = yield self.jwt.token(self, endpoint, timeout)
+        res = yield Call(send, url=url, **bearer(kwargs, token))
+        if res.status_code == 401:
+            token = yield self.jwt.token(self, endpoint, timeout, token)
+            res = yield Call(send, url=url, **bearer(kwargs, token))
+        raise Return(res)
+
+    def _send_traced(self, method, path, endpoint, kwargs, encode_time):
+        """Call the HTTP client within a span, see ``_start_span``."""
+        span, kwargs = self._start_span(method, path, endpoint, kwargs)
+        try:
+            if self.hooks.active:
+                res = yield self._send_hooked(
+                    method, path, endpoint, kwargs, encode_time
+                )
+            else:
+                res = yield self._call(method, path, endpoint, kwargs)
+        except Exception as error:
+            span.record_error(error)
+            raise
+        else:
+            span.set_attribute("http.status_code", res.status_code)
+            length = res.content_length
+            if length is not None:
+                span.set_attribute("http.response_content_length", length)
+        finally:
+            span.end()
+        raise Return(res)
+
+    def _start_span(self, method, path, endpoint, kwargs):
+        """Start the span of an HTTP round trip, child of the current span.
+
+        :returns: the span and the request arguments with its trace context
+            added to the headers
+        :rtype: tuple
+        """
+        template = path_template(path)
+        attributes = {
+            "db.system": "arangodb",
+            "db.name": self.database,
+            "http.method": method.upper(),
+            "http.route": template,
+            "http.request_content_length": payload_size(kwargs.get("data")),
+            "server.address": endpoint.url,
+        }
+        collection = request_collection(path, kwargs.get("params"))
+        if collection:
+            attributes["db.collection"] = collection
+        span = self.tracer.start_span(
+            "ArangoDB {} {}".format(method.upper(), template), attributes
+        )
+        headers = dict(kwargs.get("headers") or {})
+        headers.update(span.headers())
+        return span, dict(kwargs, headers=headers)
+
+    def _send_hooked(self, method, path, endpoint, kwargs, encode_time):
+        """Call the HTTP client, firing the hooks around the call."""
+        event = self.hooks.start(
+            method, path, self.database, endpoint,
+            kwargs.get("params"), kwargs.get("data"), encode_time
+        )
+        try:
+            res = yield self._call(method, path, endpoint, kwargs)
+        except Exception as error:
+            self.hooks.fail(event, error)
+            raise
+        res.codec = self.codec
+        self.hooks.finish(event, res)
+        raise Return(res)
+
+    def _admit(self, endpoint, deadline):
+        """Wait for the limits to let the request to the endpoint through.
+
+        :returns: the steps whose result is the limiters holding a slot for
+            the request, if any
+        :rtype: generator
+        :raises: DeadlineExceededError
+        """
+        limits = self.limits
+        if limits is None:
+            raise Return(None)
+        try:
+            held = yield limits.acquire_steps(
+                endpoint, self.database, deadline
+            )
+        except BaseException:
+            self.endpoints.release(endpoint)
+            raise
+        raise Return(held)
+
+    def _breaker(self, endpoint):
+        """Return the circuit breaker of the acquired endpoint, if any.
+
+        :raises: CircuitOpenError
+        """
+        if self.retry_policy is None:
+            return None
+        breaker = self.retry_policy.breaker(endpoint)
+        if breaker is not None and not breaker.allow():
+            self.endpoints.release(endpoint)
+            self.retry_policy.count("rejected")
+            raise CircuitOpenError(endpoint)
+        return breaker
+
+    def _record(self, breaker, endpoint, res):
+        """Record the outcome of the request in the circuit breaker.
+
+        A transport level failure is recorded with ``res`` set to None.
+        """
+        if breaker is None:
+            return
+        if res is None or self.retry_policy.is_retryable(res):
+            if breaker.record_failure():
+                self.retry_policy.count("opened")
+                # Route the other requests around the endpoint meanwhile
+                self.endpoints.eject(endpoint)
+        else:
+            breaker.record_success()
+
+    def _compress(self, kwargs, compress):
+        """Compress the request payload in ``kwargs`` if enabled.
+
+        The payload is compressed only if it reaches the size threshold,
+        but compressed responses are accepted regardless.
+        """
+        if compress is None:
+            compress = self.compression
+        if not compress:
+            return
+        method = check_compression(
+            (self.compression or "gzip") if compress is True else compress
+        )
+        headers = dict(kwargs.get("headers") or {})
+        headers["Accept-Encoding"] = ACCEPT_ENCODING
+        data = kwargs.get("data")
+        if data is not None and len(data) >= self.compression_threshold:
+            if not isinstance(data, bytes):
+                data = data.encode("utf-8")
+            kwargs["data"] = compress_body(data, method)
+            headers["Content-Encoding"] = method
+        kwargs["headers"] = headers
+
+    def _encode(self, kwargs):
+        """Serialize the request payload in ``kwargs`` with the codec.
+
+        Payloads which are already serialized are sent as is. With a binary
+        codec, the content type of the payload and of the accepted responses
+        are set in the headers.
+        """
+        codec = self.codec
+        data = kwargs.get("data")
+        encode = "data" in kwargs and \
+            not (is_string(data) or isinstance(data, bytes))
+        if encode:
+            kwargs["data"] = codec.encode(data)
+        if codec.binary:
+            headers = dict(kwargs.get("headers") or {})
+            headers.setdefault("Accept", codec.content_type)
+            if encode:
+                headers.setdefault("Content-Type", codec.content_type)
+            kwargs["headers"] = headers
+
+    def head(self, path, params=None, headers=None, endpoint=None,
+             retry=None, deadline=None):
         """Call a HEAD method in ArangoDB's REST API.
 
         :param path: the API path (e.g. '/_api/version')
@@ -55,17 +636,28 @@ class API(object):
         :type params: dict or None
         :param headers: the request headers
         :type headers: dict or None
+        :param endpoint: the endpoint to send the request to
+        :type endpoint: arango.endpoints.Endpoint or None
+        :param retry: whether the request may be retried (default: if the
+            retry policy of this wrapper retries its method)
+        :type retry: bool or None
+        :param deadline: the deadline of the request, or the seconds it
+            may take (default: none)
+        :type deadline: arango.deadline.Deadline or int or float or None
         :returns: the ArangoDB http response
         :rtype: arango.response.Response
         """
-        return self.client.head(
-            url=self.url_prefix + path,
+        return self._request(
+            "head", path,
+            endpoint=endpoint,
+            retry=retry,
+            deadline=deadline,
             params=params,
-            headers=headers,
-            auth=(self.username, self.password)
+            headers=headers
         )
 
-    def get(self, path, params=None, headers=None):
+    def get(self, path, params=None, headers=None, endpoint=None,
+            compress=None, retry=None, deadline=None, stream=False):
         """Call a GET method in ArangoDB's REST API.
 
         :param path: the API path (e.g. '/_api/version')
@@ -74,17 +666,36 @@ class API(object):
         :type params: dict or None
         :param headers: the request headers
         :type headers: dict or None
+        :param endpoint: the endpoint to send the request to
+        :type endpoint: arango.endpoints.Endpoint or None
+        :param compress: whether to compress the request and accept a
+            compressed response (default: the setting of this wrapper)
+        :type compress: str or bool or None
+        :param retry: whether the request may be retried (default: if the
+            retry policy of this wrapper retries its method)
+        :type retry: bool or None
+        :param deadline: the deadline of the request, or the seconds it
+            may take (default: none)
+        :type deadline: arango.deadline.Deadline or int or float or None
+        :param stream: whether to stream the response content, if the HTTP
+            client supports it (default: read it whole)
+        :type stream: bool
         :returns: the ArangoDB http response
         :rtype: arango.response.Response
         """
-        return self.client.get(
-            url=self.url_prefix + path,
+        return self._request(
+            "get", path,
+            endpoint=endpoint,
+            retry=retry,
+            deadline=deadline,
+            stream=stream,
+            compress=compress,
             params=params,
-            headers=headers,
-            auth=(self.username, self.password),
+            headers=headers
         )
 
-    def put(self, path, data=None, params=None, headers=None):
+    def put(self, path, data=None, params=None, headers=None, endpoint=None,
+            compress=None, retry=None, deadline=None, stream=False):
         """Call a PUT method in ArangoDB's REST API.
 
         :param path: the API path (e.g. '/_api/version')
@@ -95,18 +706,38 @@ class API(object):
         :type params: dict or None
         :param headers: the request headers
         :type headers: dict or None
+        :param endpoint: the endpoint to send the request to
+        :type endpoint: arango.endpoints.Endpoint or None
+        :param compress: whether to compress the request and accept a
+            compressed response (default: the setting of this wrapper)
+        :type compress: str or bool or None
+        :param retry: whether the request may be retried (default: if the
+            retry policy of this wrapper retries its method)
+        :type retry: bool or None
+        :param deadline: the deadline of the request, or the seconds it
+            may take (default: none)
+        :type deadline: arango.deadline.Deadline or int or float or None
+        :param stream: whether to stream the response content, if the HTTP
+            client supports it (default: read it whole)
+        :type stream: bool
         :returns: the ArangoDB http response
         :rtype: arango.response.Response
         """
-        return self.client.put(
-            url=self.url_prefix + path,
-            data=data if is_string(data) else json.dumps(data),
+        return self._request(
+            "put", path,
+            endpoint=endpoint,
+            retry=retry,
+            deadline=deadline,
+            stream=stream,
+            compress=compress,
+            data=data,
             params=params,
-            headers=headers,
-            auth=(self.username, self.password)
+            headers=headers
         )
 
-    def post(self, path, data=None, params=None, headers=None):
+    def post(self, path, data=None, params=None, headers=None,
+             endpoint=None, compress=None, retry=None, deadline=None,
+             stream=False):
         """Call a POST method in ArangoDB's REST API.
 
         :param path: the API path (e.g. '/_api/version')
@@ -117,18 +748,37 @@ class API(object):
         :type params: dict or None
         :param headers: the request headers
         :type headers: dict or None
+        :param endpoint: the endpoint to send the request to
+        :type endpoint: arango.endpoints.Endpoint or None
+        :param compress: whether to compress the request and accept a
+            compressed response (default: the setting of this wrapper)
+        :type compress: str or bool or None
+        :param retry: whether the request may be retried (default: if the
+            retry policy of this wrapper retries its method)
+        :type retry: bool or None
+        :param deadline: the deadline of the request, or the seconds it
+            may take (default: none)
+        :type deadline: arango.deadline.Deadline or int or float or None
+        :param stream: whether to stream the response content, if the HTTP
+            client supports it (default: read it whole)
+        :type stream: bool
         :returns: the ArangoDB http response
         :rtype: arango.response.Response
         """
-        return self.client.post(
-            url=self.url_prefix + path,
-            data=data if is_string(data) else json.dumps(data),
+        return self._request(
+            "post", path,
+            endpoint=endpoint,
+            retry=retry,
+            deadline=deadline,
+            stream=stream,
+            compress=compress,
+            data=data,
             params=params,
-            headers=headers,
-            auth=(self.username, self.password)
+            headers=headers
         )
 
-    def patch(self, path, data=None, params=None, headers=None):
+    def patch(self, path, data=None, params=None, headers=None,
+              endpoint=None, compress=None, retry=None, deadline=None):
         """Call a PATCH method in ArangoDB's REST API.
 
         :param path: the API path (e.g. '/_api/version')
@@ -139,18 +789,33 @@ class API(object):
         :type params: dict or None
         :param headers: the request headers
         :type headers: dict or None
+        :param endpoint: the endpoint to send the request to
+        :type endpoint: arango.endpoints.Endpoint or None
+        :param compress: whether to compress the request and accept a
+            compressed response (default: the setting of this wrapper)
+        :type compress: str or bool or None
+        :param retry: whether the request may be retried (default: if the
+            retry policy of this wrapper retries its method)
+        :type retry: bool or None
+        :param deadline: the deadline of the request, or the seconds it
+            may take (default: none)
+        :type deadline: arango.deadline.Deadline or int or float or None
         :returns: the ArangoDB http response
         :rtype: arango.response.Response
         """
-        return self.client.patch(
-            url=self.url_prefix + path,
-            data=data if is_string(data) else json.dumps(data),
+        return self._request(
+            "patch", path,
+            endpoint=endpoint,
+            retry=retry,
+            deadline=deadline,
+            compress=compress,
+            data=data,
             params=params,
-            headers=headers,
-            auth=(self.username, self.password)
+            headers=headers
         )
 
-    def delete(self, path, params=None, headers=None):
+    def delete(self, path, params=None, headers=None, endpoint=None,
+               retry=None, deadline=None):
         """Call a DELETE method in ArangoDB's REST API.
 
         :param path: the API path (e.g. '/_api/version')
@@ -159,17 +824,28 @@ class API(object):
         :type params: dict or None
         :param headers: the request headers
         :type headers: dict or None
+        :param endpoint: the endpoint to send the request to
+        :type endpoint: arango.endpoints.Endpoint or None
+        :param retry: whether the request may be retried (default: if the
+            retry policy of this wrapper retries its method)
+        :type retry: bool or None
+        :param deadline: the deadline of the request, or the seconds it
+            may take (default: none)
+        :type deadline: arango.deadline.Deadline or int or float or None
         :returns: the ArangoDB http response
         :rtype: arango.response.Response
         """
-        return self.client.delete(
-            url=self.url_prefix + path,
+        return self._request(
+            "delete", path,
+            endpoint=endpoint,
+            retry=retry,
+            deadline=deadline,
             params=params,
-            headers=headers,
-            auth=(self.username, self.password)
+            headers=headers
         )
 
-    def options(self, path, data=None, params=None, headers=None):
+    def options(self, path, data=None, params=None, headers=None,
+                endpoint=None, retry=None, deadline=None):
         """Call an OPTIONS method in ArangoDB's REST API.
 
         :param path: the API path (e.g. '/_api/version')
@@ -180,13 +856,23 @@ class API(object):
         :type params: dict or None
         :param headers: the request headers
         :type headers: dict or None
+        :param endpoint: the endpoint to send the request to
+        :type endpoint: arango.endpoints.Endpoint or None
+        :param retry: whether the request may be retried (default: if the
+            retry policy of this wrapper retries its method)
+        :type retry: bool or None
+        :param deadline: the deadline of the request, or the seconds it
+            may take (default: none)
+        :type deadline: arango.deadline.Deadline or int or float or None
         :returns: the ArangoDB http response
         :rtype: arango.response.Response
         """
-        return self.client.options(
-            url=self.url_prefix + path,
-            data=data if is_string(data) else json.dumps(data),
+        return self._request(
+            "options", path,
+            endpoint=endpoint,
+            retry=retry,
+            deadline=deadline,
+            data=data,
             params=params,
-            headers=headers,
-            auth=(self.username, self.password)
-        )
\ No newline at end of file
+            headers=headers
+        )
@@ -0,0 +1,128 @@
+"""Authentication with JSON web tokens cached in memory."""
+
+import base64
+import json
+from threading import Lock
+from time import time
+
+from arango.constants import HTTP_OK
+from arango.deadline import Deadline, monotonic
+from arango.exceptions import AuthenticationError
+from arango.pipeline import Call, Return
+from arango.singleflight import SingleFlight
+
+
+def token_expiry(token):
+    """Return the monotonic time at which a JSON web token expires.
+
+    :param token: the encoded token
+    :type token: str
+    :returns: the expiry as ``arango.deadline.monotonic`` time, or None if
+        the token does not expire (or its payload cannot be read)
+    :rtype: float or None
+    """
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        claims = json.loads(
+            base64.urlsafe_b64decode(payload.encode("ascii")).decode("utf-8")
+        )
+        expires_at = float(claims["exp"])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
+    return monotonic() + expires_at - time()
+
+
+class JWTAuth(object):
+    """Authentication with JSON web tokens, cached in memory.
+
+    With basic authentication the server verifies the password of every
+    request. Instead, a token is obtained once per credentials from the
+    ``/_open/auth`` endpoint, and sent as a bearer token with every request
+    made by the API wrappers using this object. The token is obtained again
+    ``refresh_margin`` seconds before it expires, and once the server
+    rejects it (e.g. after a restart with another secret), in which case
+    the rejected request is sent again once.
+
+    The instance can be shared by the API wrappers of every database, and
+    by the threads and event loops using them. The concurrent requests for
+    the token of the same credentials are coalesced into one.
+
+    :param refresh_margin: the seconds before its expiry to replace a token
+    :type refresh_margin: int or float
+    """
+
+    def __init__(self, refresh_margin=60):
+        self.refresh_margin = refresh_margin
+        # Token and refresh time by (username, password)
+        self._tokens = {}
+        self._lock = Lock()
+        self._logins = SingleFlight(methods=("post",))
+
+    def __repr__(self):
+        """Return a descriptive string of this instance."""
+        return "<ArangoDB JWT auth ({} cached)>".format(len(self._tokens))
+
+    def clear(self):
+        """Drop the cached tokens, which are obtained again when needed."""
+        with self._lock:
+            self._tokens.clear()
+
+    def token(self, api, endpoint, timeout=None, rejected=None):
+        """Return the token of the credentials of an API wrapper.
+
+        :param api: the API wrapper sending the request
+        :type api: arango.api.API
+        :param endpoint: the endpoint to obtain a new token from
+        :type endpoint: arango.endpoints.Endpoint
+        :param timeout: the seconds left for the request, if bounded
+        :type timeout: int or float or None
+        :param rejected: the token the server rejected, not to be returned
+        :type rejected: str or None
+        :returns: the steps whose result is the token, see
+            ``arango.pipeline``
+        :rtype: generator
+        :raises: AuthenticationError
+        """
+        credentials = (api.username, api.password)
+        with self._lock:
+            cached = self._tokens.get(credentials)
+        if cached is not None:
+            token, refresh_at = cached
+            if token != rejected and \
+                    (refresh_at is None or monotonic() < refresh_at):
+                raise Return(token)
+        res = yield self._logins.do(
+            credentials,
+            lambda: self._login(api, endpoint, timeout),
+            Deadline.of(timeout)
+        )
+        if res.status_code not in HTTP_OK:
+            raise AuthenticationError(res)
+        token = res.body["jwt"]
+        expiry = token_expiry(token)
+        with self._lock:
+            self._tokens[credentials] = (
+                token,
+                None if expiry is None else expiry - self.refresh_margin
+            )
+        raise Return(token)
+
+    @staticmethod
+    def _login(api, endpoint, timeout):
+        """Return the steps requesting a token, whose result is the response.
+
+        The request goes straight to the HTTP client: it must neither carry
+        a token nor count against the limits of the request it is made for.
+        """
+        kwargs = {} if timeout is None else {"timeout": timeout}
+        res = yield Call(
+            api.client.post,
+            url=endpoint.url + "/_open/auth",
+            data=api.codec.json_codec.encode({
+                "username": api.username,
+                "password": api.password,
+            }),
+            **kwargs
+        )
+        raise Return(res)
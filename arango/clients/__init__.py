@@ -1 +1,3 @@
 from arango.clients.default import DefaultClient
+from arango.clients.httpclient import HTTPClient
+from arango.clients.unixsocket import UnixSocketClient
@@ -0,0 +1,430 @@
+"""Asyncio based client using persistent HTTP/1.1 connections.
+
+Requires Python 3.7 or later.
+"""
+
+import asyncio
+import base64
+from collections import deque
+from urllib.parse import urlsplit, urlencode
+
+from requests.structures import CaseInsensitiveDict
+
+from arango.response import Response
+from arango.clients.base import BaseClient, resolve_timeout
+from arango.compression import COMPRESSION_METHODS, Decompressor
+from arango.endpoints import UNIX_SCHEME, unix_socket_path
+
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# The max number of bytes read off the wire at once
+CHUNK_SIZE = 65536
+
+
+class _StaleConnectionError(ConnectionResetError):
+    """The server closed an idle connection before answering."""
+
+
+class _Connection(object):
+    """A single keep-alive connection to an ArangoDB server."""
+
+    __slots__ = ("reader", "writer")
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    def close(self):
+        self.writer.close()
+
+
+class AsyncClient(BaseClient):
+    """Asyncio based HTTP client for ArangoDB.
+
+    The methods are coroutines resolving to ``arango.response.Response``
+    objects, so a single event loop can keep many requests in flight.
+    Connections are kept alive and reused, and at most ``max_connections``
+    requests are in flight per host at any time (the rest wait their turn).
+    Endpoints with 'http+unix' URLs are reached through their Unix domain
+    socket.
+    """
+
+    def __init__(self, init_data):
+        """Initialize the client with the credentials.
+
+        :param init_data: data for client initialization, with the keys
+            ``auth`` (username and password tuple) and optionally
+            ``max_connections`` (default: 100) and ``timeout`` (the seconds
+            to wait for a connection and for a response, or a (connect,
+            read) tuple)
+        :type init_data: dict
+        """
+        username, password = init_data["auth"]
+        credentials = "{}:{}".format(username, password).encode("utf-8")
+        self._auth_header = "Basic " + base64.b64encode(credentials).decode()
+        self._max_connections = init_data.get("max_connections", 100)
+        self._timeout = init_data.get("timeout")
+        self._idle = {}
+        self._limits = {}
+
+    def _limit(self, key):
+        """Return the semaphore bounding the requests in flight to a host."""
+        if key not in self._limits:
+            self._limits[key] = asyncio.Semaphore(self._max_connections)
+        return self._limits[key]
+
+    async def _connect(self, key):
+        """Return an idle connection for ``key``, opening one if needed.
+
+        :returns: the connection and whether it was reused
+        :rtype: tuple
+        """
+        idle = self._idle.get(key)
+        while idle:
+            conn = idle.pop()
+            if not conn.reader.at_eof():
+                return conn, True
+            conn.close()
+        scheme, host, port = key
+        if scheme == UNIX_SCHEME:
+            reader, writer = await asyncio.open_unix_connection(
+                unix_socket_path(host)
+            )
+        else:
+            reader, writer = await asyncio.open_connection(
+                host, port, ssl=True if scheme == "https" else None
+            )
+        return _Connection(reader, writer), False
+
+    def _release(self, key, conn):
+        """Return a connection to the idle pool."""
+        self._idle.setdefault(key, deque()).append(conn)
+
+    async def _read_response(self, reader, method):
+        """Read one HTTP/1.1 response off the wire.
+
+        :returns: status, reason, headers, content and whether the
+            connection may be reused
+        :rtype: tuple
+        """
+        line = await reader.readline()
+        if not line:
+            raise _StaleConnectionError("connection closed by the server")
+        status_line = line.decode("latin-1").rstrip("\r\n").split(" ", 2)
+        version, status_code = status_line[0], int(status_line[1])
+        reason = status_line[2] if len(status_line) > 2 else None
+
+        headers = CaseInsensitiveDict()
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip()] = value.strip()
+
+        keep_alive = (
+            version == "HTTP/1.1" and
+            headers.get("Connection", "").lower() != "close"
+        )
+        encoding = headers.get("Content-Encoding", "").lower()
+        decompressor = Decompressor(encoding) \
+            if encoding in COMPRESSION_METHODS else None
+        chunks = []
+
+        def consume(chunk):
+            # Decompress the body as it comes in rather than all at once
+            if decompressor is not None:
+                chunk = decompressor.decompress(chunk)
+            chunks.append(chunk)
+
+        if method == "HEAD" or status_code in (204, 304) or \
+                100 <= status_code < 200:
+            decompressor = None
+        elif headers.get("Transfer-Encoding", "").lower() == "chunked":
+            while True:
+                size_line = await reader.readline()
+                size = int(size_line.split(b";", 1)[0].strip(), 16)
+                if size == 0:
+                    # Skip the trailers up to the final empty line
+                    while (await reader.readline()) not in (b"\r\n", b""):
+                        pass
+                    break
+                consume(await reader.readexactly(size))
+                await reader.readexactly(2)
+        elif "Content-Length" in headers:
+            remaining = int(headers["Content-Length"])
+            if decompressor is None:
+                chunks.append(await reader.readexactly(remaining))
+                remaining = 0
+            while remaining:
+                chunk = await reader.readexactly(min(remaining, CHUNK_SIZE))
+                remaining -= len(chunk)
+                consume(chunk)
+        else:
+            while True:
+                chunk = await reader.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                consume(chunk)
+            keep_alive = False
+        if decompressor is not None:
+            chunks.append(decompressor.flush())
+        content = b"".join(chunks)
+        return status_code, reason, headers, content, keep_alive
+
+    async def _request(self, method, url, data=None, params=None,
+                       headers=None, timeout=None):
+        """Send an HTTP request and return the ArangoDB response.
+
+        A request failing on a reused connection before any response bytes
+        arrive is retried on a fresh connection, since the server may have
+        closed the idle connection in the meantime.
+        """
+        parts = urlsplit(url)
+        if parts.scheme == UNIX_SCHEME:
+            # The hostname is lowercased, unlike the path of the socket
+            key = (parts.scheme, parts.netloc, None)
+        else:
+            key = (
+                parts.scheme,
+                parts.hostname,
+                parts.port or DEFAULT_PORTS.get(parts.scheme, 80)
+            )
+        target = parts.path or "/"
+        query = parts.query
+        if params:
+            query = (query + "&" if query else "") + urlencode(params)
+        if query:
+            target += "?" + query
+
+        if data is None:
+            body = b""
+        elif isinstance(data, bytes):
+            body = data
+        else:
+            body = data.encode("utf-8")
+        lines = [
+            "{} {} HTTP/1.1".format(method, target),
+            "Host: {}".format(
+                "localhost" if key[0] == UNIX_SCHEME else parts.netloc
+            ),
+            "Content-Length: {}".format(len(body)),
+        ]
+        if not headers or "Authorization" not in headers:
+            lines.append("Authorization: {}".format(self._auth_header))
+        if headers:
+            lines.extend(
+                "{}: {}".format(name, value)
+                for name, value in headers.items()
+            )
+        request = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body
+
+        connect_timeout, read_timeout = resolve_timeout(self._timeout, timeout)
+        async with self._limit(key):
+            while True:
+                conn, reused = await asyncio.wait_for(
+                    self._connect(key), connect_timeout
+                )
+                try:
+                    conn.writer.write(request)
+                    await conn.writer.drain()
+                    status_code, reason, res_headers, content, keep_alive = \
+                        await asyncio.wait_for(
+                            self._read_response(conn.reader, method),
+                            read_timeout
+                        )
+                except (_StaleConnectionError, BrokenPipeError):
+                    conn.close()
+                    if reused:
+                        continue
+                    raise
+                except BaseException:
+                    conn.close()
+                    raise
+                if keep_alive:
+                    self._release(key, conn)
+                else:
+                    conn.close()
+                break
+
+        return Response(
+            method=method.lower(),
+            url=url,
+            headers=res_headers,
+            status_code=status_code,
+            content=content,
+            status_text=reason
+        )
+
+    async def head(self, url, params=None, headers=None, auth=None,
+                   timeout=None):
+        """HTTP HEAD method.
+
+        :param url: request URL
+        :type url: str
+        :param params: request parameters
+        :type params: dict or None
+        :param headers: request headers
+        :type headers: dict or None
+        :param auth: username and password tuple (unused)
+        :type auth: tuple or None
+        :param timeout: the seconds left for the request, capping the
+            timeouts of the client
+        :type timeout: int or float or None
+        :returns: ArangoDB http response object
+        :rtype: arango.response.Response
+        """
+        return await self._request("HEAD", url, params=params,
+                                   headers=headers,
+                                   timeout=timeout)
+
+    async def get(self, url, params=None, headers=None, auth=None,
+                  timeout=None):
+        """HTTP GET method.
+
+        :param url: request URL
+        :type url: str
+        :param params: request parameters
+        :type params: dict or None
+        :param headers: request headers
+        :type headers: dict or None
+        :param auth: username and password tuple (unused)
+        :type auth: tuple or None
+        :param timeout: the seconds left for the request, capping the
+            timeouts of the client
+        :type timeout: int or float or None
+        :returns: ArangoDB http response object
+        :rtype: arango.response.Response
+        """
+        return await self._request("GET", url, params=params,
+                                   headers=headers,
+                                   timeout=timeout)
+
+    async def put(self, url, data=None, params=None, headers=None,
+                  auth=None,
+                  timeout=None):
+        """HTTP PUT method.
+
+        :param url: request URL
+        :type url: str
+        :param data: request payload
+        :type data: str or None
+        :param params: request parameters
+        :type params: dict or None
+        :param headers: request headers
+        :type headers: dict or None
+        :param auth: username and password tuple (unused)
+        :type auth: tuple or None
+        :param timeout: the seconds left for the request, capping the
+            timeouts of the client
+        :type timeout: int or float or None
+        :returns: ArangoDB http response object
+        :rtype: arango.response.Response
+        """
+        return await self._request("PUT", url, data=data, params=params,
+                                   headers=headers,
+                                   timeout=timeout)
+
+    async def post(self, url, data=None, params=None, headers=None,
+                   auth=None,
+                   timeout=None):
+        """HTTP POST method.
+
+        :param url: request URL
+        :type url: str
+        :param data: request payload
+        :type data: str or None
+        :param params: request parameters
+        :type params: dict or None
+        :param headers: request headers
+        :type headers: dict or None
+        :param auth: username and password tuple (unused)
+        :type auth: tuple or None
+        :param timeout: the seconds left for the request, capping the
+            timeouts of the client
+        :type timeout: int or float or None
+        :returns: ArangoDB http response object
+        :rtype: arango.response.Response
+        """
+        return await self._request("POST", url, data=data, params=params,
+                                   headers=headers,
+                                   timeout=timeout)
+
+    async def patch(self, url, data=None, params=None, headers=None,
+                    auth=None,
+                    timeout=None):
+        """HTTP PATCH method.
+
+        :param url: request URL
+        :type url: str
+        :param data: request payload
+        :type data: str or None
+        :param params: request parameters
+        :type params: dict or None
+        :param headers: request headers
+        :type headers: dict or None
+        :param auth: username and password tuple (unused)
+        :type auth: tuple or None
+        :param timeout: the seconds left for the request, capping the
+            timeouts of the client
+        :type timeout: int or float or None
+        :returns: ArangoDB http response object
+        :rtype: arango.response.Response
+        """
+        return await self._request("PATCH", url, data=data, params=params,
+                                   headers=headers,
+                                   timeout=timeout)
+
+    async def delete(self, url, params=None, headers=None, auth=None,
+                     timeout=None):
+        """HTTP DELETE method.
+
+        :param url: request URL
+        :type url: str
+        :param params: request parameters
+        :type params: dict or None
+        :param headers: request headers
+        :type headers: dict or None
+        :param auth: username and password tuple (unused)
+        :type auth: tuple or None
+        :param timeout: the seconds left for the request, capping the
+            timeouts of the client
+        :type timeout: int or float or None
+        :returns: ArangoDB http response object
+        :rtype: arango.response.Response
+        """
+        return await self._request("DELETE", url, params=params,
+                                   headers=headers,
+                                   timeout=timeout)
+
+    async def options(self, url, data=None, params=None, headers=None,
+                      auth=None,
+                      timeout=None):
+        """HTTP OPTIONS method.
+
+        :param url: request URL
+        :type url: str
+        :param data: request payload
+        :type data: str or None
+        :param params: request parameters
+        :type params: dict or None
+        :param headers: request headers
+        :type headers: dict or None
+        :param auth: username and password tuple (unused)
+        :type auth: tuple or None
+        :param timeout: the seconds left for the request, capping the
+            timeouts of the client
+        :type timeout: int or float or None
+        :returns: ArangoDB http response object
+        :rtype: arango.response.Response
+        """
+        return await self._request("OPTIONS", url, data=data, params=params,
+                                   headers=headers,
+                                   timeout=timeout)
+
+    async def close(self):
+        """Close all idle connections."""
+        for idle in self._idle.values():
+            while idle:
+                idle.pop().close()
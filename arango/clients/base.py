@@ -3,16 +3,53 @@
 from abc import ABCMeta, abstractmethod
 
 
+def resolve_timeout(default, timeout=None):
+    """Return the connect and read timeouts of a request.
+
+    :param default: the timeouts of the client, as seconds for both or a
+        (connect, read) tuple, or None for no timeouts
+    :type default: int or float or tuple or None
+    :param timeout: the seconds left for the request (e.g. until the
+        deadline of the operation), capping both timeouts
+    :type timeout: int or float or None
+    :returns: the connect and read timeouts in seconds (None for no
+        timeout)
+    :rtype: tuple
+    """
+    if isinstance(default, tuple):
+        connect, read = default
+    else:
+        connect = read = default
+    if timeout is not None:
+        connect = timeout if connect is None else min(connect, timeout)
+        read = timeout if read is None else min(read, timeout)
+    return connect, read
+
+
 class BaseClient(object):
     """Base class for ArangoDB clients.
 
-    The methods MUST return an ``arango.response.Response`` object.
+    The methods MUST return an ``arango.response.Response`` object. The
+    ``timeout`` argument is only passed when the call has a deadline, so
+    that clients without timeout support keep working otherwise. A request
+    whose headers carry an ``Authorization`` header (e.g. the bearer token
+    of ``arango.auth.JWTAuth``) MUST be sent with it instead of the
+    credentials of the client.
+
+    Clients which can stream the responses set ``streaming``, in which case
+    their ``get``, ``put`` and ``post`` methods take a ``stream`` argument
+    (only passed when True) and return the response with the iterator of
+    its content chunks as ``stream`` instead of its ``content``.
     """
 
     __metaclass__ = ABCMeta
 
+    # Whether the client can stream the response content
+    streaming = False
+
     @abstractmethod
-    def head(self, url, params=None, headers=None, auth=None):
+    def head(self, url, params=None, headers=None, auth=None,
+             timeout=None):
         """HTTP HEAD method.
 
         :param url: request URL
@@ -23,13 +60,17 @@ class BaseClient(object):
         :type headers: dict or None
         :param auth: username and password tuple
         :type auth: tuple or None
+        :param timeout: the seconds left for the request, capping the
+            timeouts of the client
+        :type timeout: int or float or None
         :returns: ArangoDB http response object
         :rtype: arango.response.Response
         """
         raise NotImplementedError
 
     @abstractmethod
-    def get(self, url, params=None, headers=None, auth=None):
+    def get(self, url, params=None, headers=None, auth=None,
+            timeout=None):
         """HTTP GET method.
 
         :param url: request URL
@@ -40,13 +81,17 @@ class BaseClient(object):
         :type headers: dict or None
         :param auth: username and password tuple
         :type auth: tuple or None
+        :param timeout: the seconds left for the request, capping the
+            timeouts of the client
+        :type timeout: int or float or None
         :returns: ArangoDB http response object
         :rtype: arango.response.Response
         """
         raise NotImplementedError
 
     @abstractmethod
-    def post(self, url, data=None, params=None, headers=None, auth=None):
+    def post(self, url, data=None, params=None, headers=None, auth=None,
+             timeout=None):
         """HTTP POST method.
 
         :param url: request URL
@@ -59,13 +104,17 @@ class BaseClient(object):
         :type headers: dict or None
         :param auth: username and password tuple
         :type auth: tuple or None
+        :param timeout: the seconds left for the request, capping the
+            timeouts of the client
+        :type timeout: int or float or None
         :returns: ArangoDB http response object
         :rtype: arango.response.Response
         """
         raise NotImplementedError
 
     @abstractmethod
-    def put(self, url, data=None, params=None, headers=None, auth=None):
+    def put(self, url, data=None, params=None, headers=None, auth=None,
+            timeout=None):
         """HTTP PUT method.
 
         :param url: request URL
@@ -78,13 +127,17 @@ class BaseClient(object):
         :type headers: dict or None
         :param auth: username and password tuple
         :type auth: tuple or None
+        :param timeout: the seconds left for the request, capping the
+            timeouts of the client
+        :type timeout: int or float or None
         :returns: ArangoDB http response object
         :rtype: arango.response.Response
         """
         raise NotImplementedError
 
     @abstractmethod
-    def patch(self, url, data=None, params=None, headers=None, auth=None):
+    def patch(self, url, data=None, params=None, headers=None, auth=None,
+              timeout=None):
         """HTTP PATCH method.
 
         :param url: request URL
@@ -97,13 +150,17 @@ class BaseClient(object):
         :type headers: dict or None
         :param auth: username and password tuple
         :type auth: tuple or None
+        :param timeout: the seconds left for the request, capping the
+            timeouts of the client
+        :type timeout: int or float or None
         :returns: ArangoDB http response object
         :rtype: arango.response.Response
         """
         raise NotImplementedError
 
     @abstractmethod
-    def delete(self, url, params=None, headers=None, auth=None):
+    def delete(self, url, params=None, headers=None, auth=None,
+               timeout=None):
         """HTTP DELETE method.
 
         :param url: request URL
@@ -114,13 +171,17 @@ class BaseClient(object):
         :type headers: dict or None
         :param auth: username and password tuple
         :type auth: tuple or None
+        :param timeout: the seconds left for the request, capping the
+            timeouts of the client
+        :type timeout: int or float or None
         :returns: ArangoDB http response object
         :rtype: arango.response.Response
         """
         raise NotImplementedError
 
     @abstractmethod
-    def options(self, url, data=None, params=None, headers=None, auth=None):
+    def options(self, url, data=None, params=None, headers=None, auth=None,
+                timeout=None):
         """HTTP OPTIONS method.
 
         :param url: request URL
@@ -133,6 +194,9 @@ class BaseClient(object):
         :type headers: dict or None
         :param auth: username and password tuple
         :type auth: tuple or None
+        :param timeout: the seconds left for the request, capping the
+            timeouts of the client
+        :type timeout: int or float or None
         :returns: ArangoDB http response object
         :rtype: arango.response.Response
         """
@@ -1,24 +1,220 @@
 """Session based client using requests."""
 
-from requests import Session
+from threading import Lock
+
+from requests import Request, Session
+from requests.adapters import HTTPAdapter
+from requests.auth import HTTPBasicAuth
+from requests.packages.urllib3.connectionpool import (
+    HTTPConnectionPool,
+    HTTPSConnectionPool,
+)
 
 from arango.response import Response
-from arango.clients.base import BaseClient
+from arango.clients.base import BaseClient, resolve_timeout
+from arango.clients.httpclient import CHUNK_SIZE
+
+
+class PoolStats(object):
+    """Thread-safe counters for connection pool usage.
+
+    ``hits`` counts requests served by an already open pooled connection,
+    ``misses`` counts requests which had to open a new connection and
+    ``discarded`` counts connections closed because the pool was full.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self.reset()
+
+    def reset(self):
+        """Reset all counters to zero."""
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.discarded = 0
+
+    def increment(self, counter):
+        """Increment the given counter by one.
+
+        :param counter: ``hits``, ``misses`` or ``discarded``
+        :type counter: str
+        """
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def to_dict(self):
+        """Return a snapshot of the counters.
+
+        :returns: the counters by name
+        :rtype: dict
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "discarded": self.discarded,
+            }
+
+
+class _CountingPoolMixin(object):
+    """Connection pool mixin recording usage into ``self.stats``."""
+
+    stats = None
+
+    def _get_conn(self, timeout=None):
+        conn = super(_CountingPoolMixin, self)._get_conn(timeout=timeout)
+        if getattr(conn, "sock", None) is None:
+            self.stats.increment("misses")
+        else:
+            self.stats.increment("hits")
+        return conn
+
+    def _put_conn(self, conn):
+        if conn is not None and self.pool is not None and self.pool.full():
+            self.stats.increment("discarded")
+        super(_CountingPoolMixin, self)._put_conn(conn)
+
+
+class PoolAdapter(HTTPAdapter):
+    """Transport adapter whose connection pools record usage statistics.
+
+    :param stats: the counters to record the pool usage into
+    :type stats: arango.clients.default.PoolStats
+    """
+
+    def __init__(self, stats, **kwargs):
+        self.stats = stats
+        super(PoolAdapter, self).__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super(PoolAdapter, self).init_poolmanager(*args, **kwargs)
+        attrs = {"stats": self.stats}
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": type(
+                "CountingHTTPConnectionPool",
+                (_CountingPoolMixin, HTTPConnectionPool),
+                attrs
+            ),
+            "https": type(
+                "CountingHTTPSConnectionPool",
+                (_CountingPoolMixin, HTTPSConnectionPool),
+                attrs
+            ),
+        }
+
+
+class BasicAuth(HTTPBasicAuth):
+    """Basic authentication of the requests not carrying a token."""
+
+    def __call__(self, request):
+        if "Authorization" in request.headers:
+            return request
+        return super(BasicAuth, self).__call__(request)
+
+
+def iter_chunks(res):
+    """Yield the content chunks of a streamed response.
+
+    The connection goes back to the pool once the content has been read,
+    or once the generator is closed.
+
+    :param res: the response sent with ``stream=True``
+    :type res: requests.Response
+    :returns: the generator of the (decompressed) content chunks
+    :rtype: generator
+    """
+    try:
+        for chunk in res.iter_content(CHUNK_SIZE):
+            yield chunk
+    finally:
+        res.close()
 
 
 class DefaultClient(BaseClient):
     """Session based HTTP (default) client for ArangoDB."""
 
+    streaming = True
+
     def __init__(self, init_data):
         """Initialize the session with the credentials.
 
+        Besides ``auth`` (the username and password tuple), ``init_data``
+        may contain the following connection pool settings:
+
+        ``pool_connections``: the number of per-host pools to keep
+        ``pool_maxsize``: the max number of connections kept per host
+        ``pool_block``: whether to block when all connections to a host are
+        in use instead of opening (and afterwards discarding) extra ones
+
+        and the ``timeout`` of the requests, as seconds or a (connect, read)
+        tuple (default: None, i.e. wait forever).
+
         :param init_data: data for client initialization
         :type init_data: dict
         """
         self.session = Session()
-        self.session.auth = init_data["auth"]
+        self.session.auth = BasicAuth(*init_data["auth"])
+        self.timeout = init_data.get("timeout")
+        self.pool_maxsize = init_data.get("pool_maxsize", 10)
+        self._pool_stats = PoolStats()
+        self._adapter = PoolAdapter(
+            stats=self._pool_stats,
+            pool_connections=init_data.get("pool_connections", 10),
+            pool_maxsize=self.pool_maxsize,
+            pool_block=init_data.get("pool_block", False),
+        )
+        self.session.mount("http://", self._adapter)
+        self.session.mount("https://", self._adapter)
 
-    def head(self, url, params=None, headers=None, auth=None):
+    @property
+    def pool_stats(self):
+        """Return the connection pool usage counters.
+
+        :returns: the ``hits``, ``misses`` and ``discarded`` counts
+        :rtype: dict
+        """
+        return self._pool_stats.to_dict()
+
+    def warm_up(self, url, connections):
+        """Open pooled connections to the host of ``url`` ahead of time.
+
+        At most ``pool_maxsize`` connections are opened. The pool usage
+        counters are reset afterwards.
+
+        :param url: a URL on the host to connect to
+        :type url: str
+        :param connections: the number of connections to open
+        :type connections: int
+        """
+        adapter = self._adapter
+        if hasattr(adapter, "build_connection_pool_key_attributes"):
+            # Newer versions of requests key the pools on the TLS settings
+            request = self.session.prepare_request(Request("HEAD", url))
+            settings = self.session.merge_environment_settings(
+                url, {}, None, None, None
+            )
+            host_params, pool_kwargs = \
+                adapter.build_connection_pool_key_attributes(
+                    request, settings["verify"]
+                )
+            pool = adapter.poolmanager.connection_from_host(
+                pool_kwargs=pool_kwargs, **host_params
+            )
+        else:
+            pool = adapter.get_connection(url)
+        count = min(connections, self.pool_maxsize)
+        conns = [pool._get_conn() for _ in range(count)]
+        try:
+            for conn in conns:
+                conn.connect()
+        finally:
+            for conn in conns:
+                pool._put_conn(conn)
+        self._pool_stats.reset()
+
+    def head(self, url, params=None, headers=None, auth=None,
+             timeout=None):
         """HTTP HEAD method.
 
         :param url: request URL
@@ -29,6 +225,9 @@ class DefaultClient(BaseClient):
         :type headers: dict or None
         :param auth: username and password tuple
         :type auth: tuple or None
+        :param timeout: the seconds left for the request, capping the
+            timeouts of the client
+        :type timeout: int or float or None
         :returns: ArangoDB http response object
         :rtype: arango.response.Response
         """
@@ -36,17 +235,19 @@ class DefaultClient(BaseClient):
             url=url,
             params=params,
             headers=headers,
+            timeout=resolve_timeout(self.timeout, timeout),
         )
         return Response(
             method="head",
             url=url,
             headers=res.headers,
             status_code=res.status_code,
-            content=res.text,
+            content=res.content,
             status_text=res.reason
         )
 
-    def get(self, url, params=None, headers=None, auth=None):
+    def get(self, url, params=None, headers=None, auth=None,
+            timeout=None, stream=False):
         """HTTP GET method.
 
         :param url: request URL
@@ -57,6 +258,11 @@ class DefaultClient(BaseClient):
         :type headers: dict or None
         :param auth: username and password tuple
         :type auth: tuple or None
+        :param timeout: the seconds left for the request, capping the
+            timeouts of the client
+        :type timeout: int or float or None
+        :param stream: whether to stream the response content
+        :type stream: bool
         :returns: ArangoDB http response object
         :rtype: arango.response.Response
         """
@@ -64,17 +270,21 @@ class DefaultClient(BaseClient):
             url=url,
             params=params,
             headers=headers,
+            timeout=resolve_timeout(self.timeout, timeout),
+            stream=stream,
         )
         return Response(
             method="get",
             url=url,
             headers=res.headers,
             status_code=res.status_code,
-            content=res.text,
-            status_text=res.reason
+            content=None if stream else res.content,
+            status_text=res.reason,
+            stream=iter_chunks(res) if stream else None
         )
 
-    def put(self, url, data=None, params=None, headers=None, auth=None):
+    def put(self, url, data=None, params=None, headers=None, auth=None,
+            timeout=None, stream=False):
         """HTTP PUT method.
 
         :param url: request URL
@@ -87,6 +297,11 @@ class DefaultClient(BaseClient):
         :type headers: dict or None
         :param auth: username and password tuple
         :type auth: tuple or None
+        :param timeout: the seconds left for the request, capping the
+            timeouts of the client
+        :type timeout: int or float or None
+        :param stream: whether to stream the response content
+        :type stream: bool
         :returns: ArangoDB http response object
         :rtype: arango.response.Response
         """
@@ -95,17 +310,21 @@ class DefaultClient(BaseClient):
             data=data,
             params=params,
             headers=headers,
+            timeout=resolve_timeout(self.timeout, timeout),
+            stream=stream,
         )
         return Response(
             method="put",
             url=url,
             headers=res.headers,
             status_code=res.status_code,
-            content=res.text,
-            status_text=res.reason
+            content=None if stream else res.content,
+            status_text=res.reason,
+            stream=iter_chunks(res) if stream else None
         )
 
-    def post(self, url, data=None, params=None, headers=None, auth=None):
+    def post(self, url, data=None, params=None, headers=None, auth=None,
+             timeout=None, stream=False):
         """HTTP POST method.
 
         :param url: request URL
@@ -118,6 +337,11 @@ class DefaultClient(BaseClient):
         :type headers: dict or None
         :param auth: username and password tuple
         :type auth: tuple or None
+        :param timeout: the seconds left for the request, capping the
+            timeouts of the client
+        :type timeout: int or float or None
+        :param stream: whether to stream the response content
+        :type stream: bool
         :returns: ArangoDB http response object
         :rtype: arango.response.Response
         """
@@ -126,17 +350,21 @@ class DefaultClient(BaseClient):
             data="" if data is None else data,
             params={} if params is None else params,
             headers={} if headers is None else headers,
+            timeout=resolve_timeout(self.timeout, timeout),
+            stream=stream,
         )
         return Response(
             method="post",
             url=url,
             headers=res.headers,
             status_code=res.status_code,
-            content=res.text,
-            status_text=res.reason
+            content=None if stream else res.content,
+            status_text=res.reason,
+            stream=iter_chunks(res) if stream else None
         )
 
-    def patch(self, url, data=None, params=None, headers=None, auth=None):
+    def patch(self, url, data=None, params=None, headers=None, auth=None,
+              timeout=None):
         """HTTP PATCH method.
 
         :param url: request URL
@@ -149,6 +377,9 @@ class DefaultClient(BaseClient):
         :type headers: dict or None
         :param auth: username and password tuple
         :type auth: tuple or None
+        :param timeout: the seconds left for the request, capping the
+            timeouts of the client
+        :type timeout: int or float or None
         :returns: ArangoDB http response object
         :rtype: arango.response.Response
         """
@@ -157,17 +388,19 @@ class DefaultClient(BaseClient):
             data=data,
             params=params,
             headers=headers,
+            timeout=resolve_timeout(self.timeout, timeout),
         )
         return Response(
             method="patch",
             url=url,
             headers=res.headers,
             status_code=res.status_code,
-            content=res.text,
+            content=res.content,
             status_text=res.reason
         )
 
-    def delete(self, url, params=None, headers=None, auth=None):
+    def delete(self, url, params=None, headers=None, auth=None,
+               timeout=None):
         """HTTP DELETE method.
 
         :param url: request URL
@@ -178,6 +411,9 @@ class DefaultClient(BaseClient):
         :type headers: dict or None
         :param auth: username and password tuple
         :type auth: tuple or None
+        :param timeout: the seconds left for the request, capping the
+            timeouts of the client
+        :type timeout: int or float or None
         :returns: ArangoDB http response object
         :rtype: arango.response.Response
         """
@@ -186,17 +422,19 @@ class DefaultClient(BaseClient):
             params=params,
             headers=headers,
             auth=auth,
+            timeout=resolve_timeout(self.timeout, timeout),
         )
         return Response(
             method="delete",
             url=url,
             headers=res.headers,
             status_code=res.status_code,
-            content=res.text,
+            content=res.content,
             status_text=res.reason
         )
 
-    def options(self, url, data=None, params=None, headers=None, auth=None):
+    def options(self, url, data=None, params=None, headers=None, auth=None,
+                timeout=None):
         """HTTP OPTIONS method.
 
         :param url: request URL
@@ -209,6 +447,9 @@ class DefaultClient(BaseClient):
         :type headers: dict or None
         :param auth: username and password tuple
         :type auth: tuple or None
+        :param timeout: the seconds left for the request, capping the
+            timeouts of the client
+        :type timeout: int or float or None
         :returns: ArangoDB http response object
         :rtype: arango.response.Response
         """
@@ -217,13 +458,14 @@ class DefaultClient(BaseClient):
             data="" if data is None else data,
             params={} if params is None else params,
             headers={} if headers is None else headers,
+            timeout=resolve_timeout(self.timeout, timeout),
         )
         return Response(
             method="options",
             url=url,
             headers=res.headers,
             status_code=res.status_code,
-            content=res.text,
+            content=res.content,
             status_text=res.reason
         )
 
@@ -0,0 +1,602 @@
+"""Client multiplexing concurrent requests over HTTP/2 connections.
+
+Requires Python 3 and the h2 library (``pip install h2``).
+"""
+
+import asyncio
+import base64
+import socket
+import ssl
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from http.client import responses
+
+from requests.structures import CaseInsensitiveDict
+
+try:
+    import h2.config
+    import h2.connection
+    import h2.events
+    from h2.errors import ErrorCodes
+    from h2.settings import SettingCodes
+except ImportError:  # h2 is an optional dependency
+    h2 = None
+
+from arango.response import Response
+from arango.clients.base import BaseClient, resolve_timeout
+from arango.clients.httpclient import split_url
+from arango.compression import COMPRESSION_METHODS, Decompressor
+
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# The max number of bytes read off the wire at once
+CHUNK_SIZE = 65536
+
+# The flow control window granted to the server, per stream and for the
+# connection, so that large responses are not throttled by the default
+# 64KB window
+WINDOW_SIZE = 2 ** 24
+
+
+class _Stream(object):
+    """The state of a request in flight."""
+
+    __slots__ = ("future", "status_code", "headers", "chunks")
+
+    def __init__(self):
+        self.future = Future()
+        # Only the reader thread completes the future, so that it is never
+        # cancelled (e.g. by an awaiting coroutine) behind its back
+        self.future.set_running_or_notify_cancel()
+        self.status_code = None
+        self.headers = CaseInsensitiveDict()
+        self.chunks = []
+
+
+class _H2Connection(object):
+    """A single HTTP/2 connection shared by the requests of every thread.
+
+    The calling threads write their requests under the connection lock,
+    while a reader thread dispatches the response frames to the futures
+    of the streams waiting for them.
+    """
+
+    def __init__(self, scheme, netloc, timeout=None):
+        if netloc.startswith("["):  # IPv6 address
+            host, _, port = netloc[1:].partition("]")
+            port = port.lstrip(":")
+        else:
+            host, _, port = netloc.partition(":")
+        port = int(port) if port else DEFAULT_PORTS.get(scheme, 80)
+        sock = socket.create_connection((host, port), timeout=timeout)
+        try:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            if scheme == "https":
+                context = ssl.create_default_context()
+                context.set_alpn_protocols(["h2"])
+                sock = context.wrap_socket(sock, server_hostname=host)
+                if sock.selected_alpn_protocol() != "h2":
+                    raise ConnectionError(
+                        "{} does not support HTTP/2".format(netloc)
+                    )
+            # The reader thread blocks until the server sends something
+            sock.settimeout(None)
+        except BaseException:
+            sock.close()
+            raise
+
+        self.closed = False
+        self._sock = sock
+        self._cond = threading.Condition()
+        self._streams = {}
+        self._h2 = h2.connection.H2Connection(
+            config=h2.config.H2Configuration(
+                client_side=True,
+                header_encoding="utf-8"
+            )
+        )
+        with self._cond:
+            self._h2.initiate_connection()
+            self._h2.update_settings(
+                {SettingCodes.INITIAL_WINDOW_SIZE: WINDOW_SIZE}
+            )
+            self._h2.increment_flow_control_window(
+                WINDOW_SIZE - self._h2.inbound_flow_control_window
+            )
+            self._flush()
+
+        reader = threading.Thread(target=self._read_loop)
+        reader.daemon = True
+        reader.start()
+
+    def _flush(self):
+        """Write the pending frames to the socket (lock held)."""
+        data = self._h2.data_to_send()
+        if data:
+            self._sock.sendall(data)
+
+    def _check_open(self):
+        """Raise ConnectionError if the connection is closed (lock held)."""
+        if self.closed:
+            raise ConnectionError("HTTP/2 connection closed")
+
+    def submit(self, headers, body):
+        """Send a request on a new stream.
+
+        Blocks while the server's limit of concurrent streams is reached,
+        and while the flow control window is exhausted during the upload of
+        the body.
+
+        :param headers: the request headers, pseudo-headers first
+        :type headers: list
+        :param body: the request body
+        :type body: bytes
+        :returns: the stream ID and the future of the status code, headers
+            and body of the response
+        :rtype: tuple
+        :raises: ConnectionError
+        """
+        stream = _Stream()
+        with self._cond:
+            self._check_open()
+            while self._h2.open_outbound_streams >= \
+                    self._h2.remote_settings.max_concurrent_streams:
+                self._cond.wait()
+                self._check_open()
+            stream_id = self._h2.get_next_available_stream_id()
+            self._streams[stream_id] = stream
+            try:
+                self._send(stream_id, headers, body)
+            except Exception as exc:
+                self._fail(exc)
+                raise
+        return stream_id, stream.future
+
+    def _send(self, stream_id, headers, body):
+        """Write the headers and body of the request (lock held)."""
+        self._h2.send_headers(stream_id, headers, end_stream=not body)
+        self._flush()
+        offset = 0
+        # The server may reset the stream before the upload is complete
+        while offset < len(body) and stream_id in self._streams:
+            size = min(
+                self._h2.local_flow_control_window(stream_id),
+                self._h2.max_outbound_frame_size
+            )
+            if size <= 0:
+                # Wait for the server to open the window
+                self._cond.wait()
+                self._check_open()
+                continue
+            chunk = body[offset:offset + size]
+            offset += len(chunk)
+            self._h2.send_data(
+                stream_id, chunk, end_stream=offset >= len(body)
+            )
+            self._flush()
+
+    def cancel(self, stream_id):
+        """Reset the stream, e.g. after its response timed out.
+
+        :param stream_id: the stream ID
+        :type stream_id: int
+        """
+        with self._cond:
+            stream = self._streams.pop(stream_id, None)
+            if stream is None or self.closed:
+                return
+            try:
+                self._h2.reset_stream(stream_id, ErrorCodes.CANCEL)
+                self._flush()
+            except Exception as exc:
+                self._fail(exc)
+
+    def _read_loop(self):
+        """Dispatch the frames sent by the server until disconnected."""
+        try:
+            while True:
+                data = self._sock.recv(CHUNK_SIZE)
+                if not data:
+                    raise ConnectionError("connection closed by the server")
+                with self._cond:
+                    for event in self._h2.receive_data(data):
+                        self._handle(event)
+                    self._flush()
+                    self._cond.notify_all()
+        except Exception as exc:
+            with self._cond:
+                self._fail(exc)
+
+    def _handle(self, event):
+        """Process a single h2 event (lock held)."""
+        if isinstance(event, h2.events.ResponseReceived):
+            stream = self._streams.get(event.stream_id)
+            if stream is not None:
+                for name, value in event.headers:
+                    if name == ":status":
+                        stream.status_code = int(value)
+                    elif not name.startswith(":"):
+                        stream.headers[name] = value
+        elif isinstance(event, h2.events.DataReceived):
+            self._h2.acknowledge_received_data(
+                event.flow_controlled_length, event.stream_id
+            )
+            stream = self._streams.get(event.stream_id)
+            if stream is not None:
+                stream.chunks.append(event.data)
+        elif isinstance(event, h2.events.StreamEnded):
+            stream = self._streams.pop(event.stream_id, None)
+            if stream is not None:
+                stream.future.set_result((
+                    stream.status_code,
+                    stream.headers,
+                    b"".join(stream.chunks)
+                ))
+        elif isinstance(event, h2.events.StreamReset):
+            stream = self._streams.pop(event.stream_id, None)
+            if stream is not None:
+                stream.future.set_exception(ConnectionError(
+                    "stream reset by the server (error code {})".format(
+                        event.error_code
+                    )
+                ))
+        elif isinstance(event, h2.events.ConnectionTerminated):
+            raise ConnectionError(
+                "connection terminated by the server (error code {})".format(
+                    event.error_code
+                )
+            )
+
+    def _fail(self, exc):
+        """Close the connection and fail the pending streams (lock held)."""
+        if not self.closed:
+            self.closed = True
+            self._sock.close()
+        for stream in self._streams.values():
+            stream.future.set_exception(exc)
+        self._streams.clear()
+        self._cond.notify_all()
+
+    def close(self):
+        """Close the connection, failing the requests still in flight."""
+        with self._cond:
+            if self.closed:
+                return
+            try:
+                self._h2.close_connection()
+                self._flush()
+                # Wake the reader thread up
+                self._sock.shutdown(socket.SHUT_RDWR)
+            except EnvironmentError:
+                pass
+            self._fail(ConnectionError("HTTP/2 connection closed"))
+
+
+class HTTP2Client(BaseClient):
+    """HTTP/2 client for ArangoDB built on the h2 library.
+
+    Concurrent requests, from any number of threads, are multiplexed as
+    streams over a single connection per host instead of each needing its
+    own connection. A reader thread per connection dispatches the responses
+    as they arrive, so a slow response does not hold up the others.
+
+    Plain 'http' URLs use HTTP/2 over cleartext with prior knowledge, and
+    'https' URLs negotiate HTTP/2 through ALPN. A connection lost is
+    re-opened by the next request; the requests in flight on it fail with
+    ConnectionError.
+    """
+
+    def __init__(self, init_data):
+        """Initialize the client with the credentials.
+
+        :param init_data: data for client initialization, with the keys
+            ``auth`` (username and password tuple) and optionally
+            ``timeout`` (the seconds to wait for a connection or response,
+            or a (connect, read) tuple)
+        :type init_data: dict
+        :raises: ImportError
+        """
+        if h2 is None:
+            raise ImportError("HTTP2Client requires the h2 library")
+        username, password = init_data["auth"]
+        credentials = "{}:{}".format(username, password).encode("utf-8")
+        self._auth_header = "Basic " + base64.b64encode(credentials).decode()
+        self._timeout = init_data.get("timeout")
+        self._lock = threading.Lock()
+        self._connections = {}
+
+    def _connection(self, scheme, netloc, connect_timeout=None):
+        """Return the open connection to the host, opening one if needed."""
+        with self._lock:
+            conn = self._connections.get((scheme, netloc))
+            if conn is None or conn.closed:
+                conn = _H2Connection(scheme, netloc, connect_timeout)
+                self._connections[(scheme, netloc)] = conn
+            return conn
+
+    def _submit(self, method, url, data=None, params=None, headers=None,
+                connect_timeout=None):
+        """Send the request and return its connection, stream and future."""
+        scheme, netloc, path = split_url(url, params)
+        if data is None:
+            body = b""
+        elif isinstance(data, bytes):
+            body = data
+        else:
+            body = data.encode("utf-8")
+        request_headers = [
+            (":method", method),
+            (":scheme", scheme),
+            (":authority", netloc),
+            (":path", path),
+        ]
+        if not headers or "Authorization" not in headers:
+            request_headers.append(("authorization", self._auth_header))
+        if headers:
+            request_headers.extend(
+                (name.lower(), str(value)) for name, value in headers.items()
+            )
+        if body or method in ("POST", "PUT", "PATCH"):
+            request_headers.append(("content-length", str(len(body))))
+        conn = self._connection(scheme, netloc, connect_timeout)
+        stream_id, future = conn.submit(request_headers, body)
+        return conn, stream_id, future
+
+    @staticmethod
+    def _response(method, url, result):
+        """Build the ArangoDB response from the result of a stream."""
+        status_code, headers, content = result
+        encoding = headers.get("Content-Encoding", "").lower()
+        if encoding in COMPRESSION_METHODS:
+            decompressor = Decompressor(encoding)
+            content = decompressor.decompress(content) + decompressor.flush()
+        return Response(
+            method=method.lower(),
+            url=url,
+            headers=headers,
+            status_code=status_code,
+            content=content,
+            status_text=responses.get(status_code)
+        )
+
+    def _request(self, method, url, data=None, params=None, headers=None,
+                 timeout=None):
+        """Send an HTTP request and return the ArangoDB response.
+
+        :param method: the HTTP method (e.g. 'GET')
+        :type method: str
+        :param url: request URL
+        :type url: str
+        :param data: request payload
+        :type data: str or bytes or None
+        :param params: request parameters
+        :type params: dict or None
+        :param headers: request headers
+        :type headers: dict or None
+        :param timeout: the seconds left for the request
+        :type timeout: int or float or None
+        :returns: ArangoDB http response object
+        :rtype: arango.response.Response
+        :raises: ConnectionError, socket.timeout
+        """
+        connect_timeout, read_timeout = resolve_timeout(self._timeout, timeout)
+        conn, stream_id, future = self._submit(
+            method, url, data, params, headers, connect_timeout
+        )
+        try:
+            result = future.result(read_timeout)
+        except FutureTimeoutError:
+            conn.cancel(stream_id)
+            raise socket.timeout("no response within the timeout")
+        return self._response(method, url, result)
+
+    def head(self, url, params=None, headers=None, auth=None,
+             timeout=None):
+        """HTTP HEAD method.
+
+        :param url: request URL
+        :type url: str
+        :param params: request parameters
+        :type params: dict or None
+        :param headers: request headers
+        :type headers: dict or None
+        :param auth: ignored (the credentials are set on initialization)
+        :type auth: tuple or None
+        :param timeout: the seconds left for the request, capping the
+            timeouts of the client
+        :type timeout: int or float or None
+        :returns: ArangoDB http response object
+        :rtype: arango.response.Response
+        """
+        return self._request("HEAD", url, params=params, headers=headers,
+                             timeout=timeout)
+
+    def get(self, url, params=None, headers=None, auth=None,
+            timeout=None):
+        """HTTP GET method.
+
+        :param url: request URL
+        :type url: str
+        :param params: request parameters
+        :type params: dict or None
+        :param headers: request headers
+        :type headers: dict or None
+        :param auth: ignored (the credentials are set on initialization)
+        :type auth: tuple or None
+        :param timeout: the seconds left for the request, capping the
+            timeouts of the client
+        :type timeout: int or float or None
+        :returns: ArangoDB http response object
+        :rtype: arango.response.Response
+        """
+        return self._request("GET", url, params=params, headers=headers,
+                             timeout=timeout)
+
+    def put(self, url, data=None, params=None, headers=None, auth=None,
+            timeout=None):
+        """HTTP PUT method.
+
+        :param url: request URL
+        :type url: str
+        :param data: request payload
+        :type data: str or bytes or None
+        :param params: request parameters
+        :type params: dict or None
+        :param headers: request headers
+        :type headers: dict or None
+        :param auth: ignored (the credentials are set on initialization)
+        :type auth: tuple or None
+        :param timeout: the seconds left for the request, capping the
+            timeouts of the client
+        :type timeout: int or float or None
+        :returns: ArangoDB http response object
+        :rtype: arango.response.Response
+        """
+        return self._request("PUT", url, data=data, params=params,
+                             headers=headers, timeout=timeout)
+
+    def post(self, url, data=None, params=None, headers=None, auth=None,
+             timeout=None):
+        """HTTP POST method.
+
+        :param url: request URL
+        :type url: str
+        :param data: request payload
+        :type data: str or bytes or None
+        :param params: request parameters
+        :type params: dict or None
+        :param headers: request headers
+        :type headers: dict or None
+        :param auth: ignored (the credentials are set on initialization)
+        :type auth: tuple or None
+        :param timeout: the seconds left for the request, capping the
+            timeouts of the client
+        :type timeout: int or float or None
+        :returns: ArangoDB http response object
+        :rtype: arango.response.Response
+        """
+        return self._request("POST", url, data=data, params=params,
+                             headers=headers, timeout=timeout)
+
+    def patch(self, url, data=None, params=None, headers=None, auth=None,
+              timeout=None):
+        """HTTP PATCH method.
+
+        :param url: request URL
+        :type url: str
+        :param data: request payload
+        :type data: str or bytes or None
+        :param params: request parameters
+        :type params: dict or None
+        :param headers: request headers
+        :type headers: dict or None
+        :param auth: ignored (the credentials are set on initialization)
+        :type auth: tuple or None
+        :param timeout: the seconds left for the request, capping the
+            timeouts of the client
+        :type timeout: int or float or None
+        :returns: ArangoDB http response object
+        :rtype: arango.response.Response
+        """
+        return self._request("PATCH", url, data=data, params=params,
+                             headers=headers, timeout=timeout)
+
+    def delete(self, url, params=None, headers=None, auth=None,
+               timeout=None):
+        """HTTP DELETE method.
+
+        :param url: request URL
+        :type url: str
+        :param params: request parameters
+        :type params: dict or None
+        :param headers: request headers
+        :type headers: dict or None
+        :param auth: ignored (the credentials are set on initialization)
+        :type auth: tuple or None
+        :param timeout: the seconds left for the request, capping the
+            timeouts of the client
+        :type timeout: int or float or None
+        :returns: ArangoDB http response object
+        :rtype: arango.response.Response
+        """
+        return self._request("DELETE", url, params=params, headers=headers,
+                             timeout=timeout)
+
+    def options(self, url, data=None, params=None, headers=None, auth=None,
+                timeout=None):
+        """HTTP OPTIONS method.
+
+        :param url: request URL
+        :type url: str
+        :param data: request payload
+        :type data: str or bytes or None
+        :param params: request parameters
+        :type params: dict or None
+        :param headers: request headers
+        :type headers: dict or None
+        :param auth: ignored (the credentials are set on initialization)
+        :type auth: tuple or None
+        :param timeout: the seconds left for the request, capping the
+            timeouts of the client
+        :type timeout: int or float or None
+        :returns: ArangoDB http response object
+        :rtype: arango.response.Response
+        """
+        return self._request("OPTIONS", url, data=data, params=params,
+                             headers=headers, timeout=timeout)
+
+    def close(self):
+        """Close the connections to every host."""
+        with self._lock:
+            connections = list(self._connections.values())
+            self._connections.clear()
+        for conn in connections:
+            conn.close()
+
+
+class AsyncHTTP2Client(HTTP2Client):
+    """HTTP/2 client for ``arango.aio.AsyncArango``.
+
+    The methods are coroutines resolving to ``arango.response.Response``
+    objects. The requests share the connections and reader threads of
+    ``HTTP2Client``, and the event loop awaits their responses without
+    blocking, so one client can also serve threads and event loops at once.
+
+    The requests are written from the default executor of the event loop,
+    since connecting and waiting for the stream and flow control limits of
+    the server block.
+    """
+
+    async def _request(self, method, url, data=None, params=None,
+                       headers=None, timeout=None):
+        connect_timeout, read_timeout = resolve_timeout(self._timeout, timeout)
+        submitted = asyncio.get_running_loop().run_in_executor(
+            None, self._submit, method, url, data, params, headers,
+            connect_timeout
+        )
+        try:
+            conn, stream_id, future = await asyncio.shield(submitted)
+        except asyncio.CancelledError:
+            # The request is written anyway, so reset its stream once it is
+            submitted.add_done_callback(_cancel_stream)
+            raise
+        try:
+            result = await asyncio.wait_for(
+                asyncio.wrap_future(future), read_timeout
+            )
+        except asyncio.TimeoutError:
+            conn.cancel(stream_id)
+            raise socket.timeout("no response within the timeout")
+        return self._response(method, url, result)
+
+    async def close(self):
+        """Close the connections to every host."""
+        super(AsyncHTTP2Client, self).close()
+
+
+def _cancel_stream(submitted):
+    """Reset the stream of a request submitted for a cancelled caller."""
+    if not submitted.cancelled() and submitted.exception() is None:
+        conn, stream_id, _ = submitted.result()
+        conn.cancel(stream_id)
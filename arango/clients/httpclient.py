@@ -0,0 +1,447 @@
+"""Lightweight client using persistent http.client connections."""
+
+import base64
+import select
+import socket
+import threading
+
+try:
+    from http.client import HTTPConnection, HTTPSConnection, HTTPException
+    from urllib.parse import urlencode
+except ImportError:  # Python 2
+    from httplib import HTTPConnection, HTTPSConnection, HTTPException
+    from urllib import urlencode
+
+from arango.response import Response
+from arango.clients.base import BaseClient, resolve_timeout
+from arango.compression import COMPRESSION_METHODS, Decompressor
+from arango.retry import IDEMPOTENT_METHODS
+
+
+# The max number of bytes read at once from a compressed or streamed response
+CHUNK_SIZE = 65536
+
+
+def split_url(url, params=None):
+    """Split the URL into its scheme, network location and request target.
+
+    :param url: request URL
+    :type url: str
+    :param params: request parameters to append as the query string
+    :type params: dict or None
+    :returns: the scheme, network location and target (path and query)
+    :rtype: tuple
+    """
+    scheme, _, rest = url.partition("://")
+    netloc, _, path = rest.partition("/")
+    path = "/" + path
+    if params:
+        # Drop the parameters set to None like requests does
+        query = urlencode(
+            [(k, v) for k, v in params.items() if v is not None],
+            doseq=True
+        )
+        if query:
+            path += "?" + query
+    return scheme, netloc, path
+
+
+def read_chunks(res):
+    """Read the content of the response in chunks, decompressing it.
+
+    :param res: the response, whose content is not read yet
+    :type res: http.client.HTTPResponse
+    :returns: the generator of the (decompressed) content chunks
+    :rtype: generator
+    """
+    encoding = (res.getheader("Content-Encoding") or "").lower()
+    if encoding in COMPRESSION_METHODS:
+        decompressor = Decompressor(encoding)
+    else:
+        decompressor = None
+    while True:
+        chunk = res.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        if decompressor is not None:
+            chunk = decompressor.decompress(chunk)
+        yield chunk
+    if decompressor is not None:
+        yield decompressor.flush()
+
+
+def is_dropped(sock):
+    """Return True if the idle connection can no longer be used.
+
+    An idle connection has nothing to read unless the server closed it
+    (or sent something unexpected).
+
+    :param sock: the socket of the idle connection
+    :type sock: socket.socket
+    :returns: whether the connection must be re-opened
+    :rtype: bool
+    """
+    try:
+        if hasattr(select, "poll"):
+            poller = select.poll()
+            poller.register(sock, select.POLLIN)
+            return bool(poller.poll(0))
+        return bool(select.select([sock], [], [], 0)[0])
+    except (ValueError, EnvironmentError):
+        return True
+
+
+class HTTPClient(BaseClient):
+    """HTTP/1.1 client for ArangoDB built directly on http.client.
+
+    Compared to ``arango.clients.DefaultClient`` it skips the per-request
+    work done by requests (hooks, environment settings, header merging,
+    charset detection), which dominates the latency of small requests.
+    Each thread keeps one persistent connection per host, and the
+    authorization header is computed once upfront.
+
+    A streamed response keeps its connection busy until it is read, so the
+    other requests of the thread meanwhile use another connection.
+
+    Connections which the server closed while idle are transparently
+    re-opened. A request failing on a reused connection is sent again on a
+    new one if it was not fully written, or if its method is idempotent
+    (since the server may have processed it otherwise).
+    """
+
+    streaming = True
+
+    def __init__(self, init_data):
+        """Initialize the client with the credentials.
+
+        :param init_data: data for client initialization, with the keys
+            ``auth`` (username and password tuple) and optionally
+            ``timeout`` (the socket timeouts, as seconds or a (connect,
+            read) tuple)
+        :type init_data: dict
+        """
+        username, password = init_data["auth"]
+        credentials = "{}:{}".format(username, password).encode("utf-8")
+        self._auth_header = "Basic " + base64.b64encode(credentials).decode()
+        self._timeout = init_data.get("timeout")
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = []
+
+    def _connection(self, scheme, netloc):
+        """Return the connection of the current thread to the host."""
+        try:
+            connections = self._local.connections
+        except AttributeError:
+            connections = self._local.connections = {}
+        conn = connections.get((scheme, netloc))
+        if conn is None:
+            conn = self._new_connection(scheme, netloc)
+            connections[(scheme, netloc)] = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def _new_connection(self, scheme, netloc):
+        """Return a new (not yet connected) connection to the host.
+
+        :param scheme: the URL scheme (e.g. 'http')
+        :type scheme: str
+        :param netloc: the network location of the URL
+        :type netloc: str
+        :returns: the connection
+        :rtype: http.client.HTTPConnection
+        """
+        conn_class = HTTPSConnection if scheme == "https" else HTTPConnection
+        return conn_class(netloc)
+
+    def _send(self, conn, method, path, data, headers, read_timeout):
+        """Write the request to the connection."""
+        if conn.sock is None:
+            # Connect within the connect timeout set on the connection
+            conn.connect()
+        conn.sock.settimeout(read_timeout)
+        conn.putrequest(method, path, skip_accept_encoding=True)
+        if not headers or "Authorization" not in headers:
+            conn.putheader("Authorization", self._auth_header)
+        if headers:
+            for name, value in headers.items():
+                conn.putheader(name, value)
+        if data is not None:
+            if not isinstance(data, bytes):
+                data = data.encode("utf-8")
+            conn.putheader("Content-Length", str(len(data)))
+        elif method in ("POST", "PUT", "PATCH"):
+            conn.putheader("Content-Length", "0")
+        conn.endheaders(data)
+
+    def _request(self, method, url, data=None, params=None, headers=None,
+                 timeout=None, stream=False):
+        """Send an HTTP request and return the ArangoDB response.
+
+        :param method: the HTTP method (e.g. 'GET')
+        :type method: str
+        :param url: request URL
+        :type url: str
+        :param data: request payload
+        :type data: str or bytes or None
+        :param params: request parameters
+        :type params: dict or None
+        :param headers: request headers
+        :type headers: dict or None
+        :param timeout: the seconds left for the request
+        :type timeout: int or float or None
+        :param stream: whether to stream the response content
+        :type stream: bool
+        :returns: ArangoDB http response object
+        :rtype: arango.response.Response
+        """
+        scheme, netloc, path = split_url(url, params)
+        conn = self._connection(scheme, netloc)
+        conn.timeout, read_timeout = resolve_timeout(self._timeout, timeout)
+        reused = conn.sock is not None
+        if reused and is_dropped(conn.sock):
+            conn.close()
+            reused = False
+        while True:
+            written = False
+            try:
+                self._send(conn, method, path, data, headers, read_timeout)
+                written = True
+                res = conn.getresponse()
+                break
+            except socket.timeout:
+                conn.close()
+                raise
+            except (HTTPException, EnvironmentError):
+                conn.close()
+                # The server may have closed the connection meanwhile, but
+                # it may also have processed the request if it was written
+                if not reused or \
+                        written and method.lower() not in IDEMPOTENT_METHODS:
+                    raise
+                reused = False
+
+        if stream:
+            # Hand the connection over to the stream until it has been read
+            connections = self._local.connections
+            connections.pop((scheme, netloc), None)
+            return Response(
+                method=method.lower(),
+                url=url,
+                headers=res.msg,
+                status_code=res.status,
+                content=None,
+                status_text=res.reason,
+                stream=self._stream(conn, res, connections, (scheme, netloc))
+            )
+        try:
+            encoding = (res.getheader("Content-Encoding") or "").lower()
+            if encoding in COMPRESSION_METHODS:
+                content = b"".join(read_chunks(res))
+            else:
+                content = res.read()
+        except BaseException:
+            conn.close()
+            raise
+        if res.will_close:
+            conn.close()
+
+        return Response(
+            method=method.lower(),
+            url=url,
+            headers=res.msg,
+            status_code=res.status,
+            content=content,
+            status_text=res.reason
+        )
+
+    def _stream(self, conn, res, connections, key):
+        """Yield the content chunks of a streamed response.
+
+        The connection is then handed back to the thread which sent the
+        request, unless it opened another one meanwhile.
+        """
+        try:
+            for chunk in read_chunks(res):
+                yield chunk
+        except BaseException:
+            self._discard(conn)
+            raise
+        if res.will_close or connections.setdefault(key, conn) is not conn:
+            self._discard(conn)
+
+    def _discard(self, conn):
+        """Close the connection taken out of its thread for a stream."""
+        conn.close()
+        with self._lock:
+            if conn in self._connections:
+                self._connections.remove(conn)
+
+    def head(self, url, params=None, headers=None, auth=None,
+             timeout=None):
+        """HTTP HEAD method.
+
+        :param url: request URL
+        :type url: str
+        :param params: request parameters
+        :type params: dict or None
+        :param headers: request headers
+        :type headers: dict or None
+        :param auth: ignored (the credentials are set on initialization)
+        :type auth: tuple or None
+        :param timeout: the seconds left for the request, capping the
+            timeouts of the client
+        :type timeout: int or float or None
+        :returns: ArangoDB http response object
+        :rtype: arango.response.Response
+        """
+        return self._request("HEAD", url, params=params, headers=headers,
+                             timeout=timeout)
+
+    def get(self, url, params=None, headers=None, auth=None,
+            timeout=None, stream=False):
+        """HTTP GET method.
+
+        :param url: request URL
+        :type url: str
+        :param params: request parameters
+        :type params: dict or None
+        :param headers: request headers
+        :type headers: dict or None
+        :param auth: ignored (the credentials are set on initialization)
+        :type auth: tuple or None
+        :param timeout: the seconds left for the request, capping the
+            timeouts of the client
+        :type timeout: int or float or None
+        :param stream: whether to stream the response content
+        :type stream: bool
+        :returns: ArangoDB http response object
+        :rtype: arango.response.Response
+        """
+        return self._request("GET", url, params=params, headers=headers,
+                             timeout=timeout, stream=stream)
+
+    def put(self, url, data=None, params=None, headers=None, auth=None,
+            timeout=None, stream=False):
+        """HTTP PUT method.
+
+        :param url: request URL
+        :type url: str
+        :param data: request payload
+        :type data: str or bytes or None
+        :param params: request parameters
+        :type params: dict or None
+        :param headers: request headers
+        :type headers: dict or None
+        :param auth: ignored (the credentials are set on initialization)
+        :type auth: tuple or None
+        :param timeout: the seconds left for the request, capping the
+            timeouts of the client
+        :type timeout: int or float or None
+        :param stream: whether to stream the response content
+        :type stream: bool
+        :returns: ArangoDB http response object
+        :rtype: arango.response.Response
+        """
+        return self._request("PUT", url, data=data, params=params,
+                             headers=headers, timeout=timeout, stream=stream)
+
+    def post(self, url, data=None, params=None, headers=None, auth=None,
+             timeout=None, stream=False):
+        """HTTP POST method.
+
+        :param url: request URL
+        :type url: str
+        :param data: request payload
+        :type data: str or bytes or None
+        :param params: request parameters
+        :type params: dict or None
+        :param headers: request headers
+        :type headers: dict or None
+        :param auth: ignored (the credentials are set on initialization)
+        :type auth: tuple or None
+        :param timeout: the seconds left for the request, capping the
+            timeouts of the client
+        :type timeout: int or float or None
+        :param stream: whether to stream the response content
+        :type stream: bool
+        :returns: ArangoDB http response object
+        :rtype: arango.response.Response
+        """
+        return self._request("POST", url, data=data, params=params,
+                             headers=headers, timeout=timeout, stream=stream)
+
+    def patch(self, url, data=None, params=None, headers=None, auth=None,
+              timeout=None):
+        """HTTP PATCH method.
+
+        :param url: request URL
+        :type url: str
+        :param data: request payload
+        :type data: str or bytes or None
+        :param params: request parameters
+        :type params: dict or None
+        :param headers: request headers
+        :type headers: dict or None
+        :param auth: ignored (the credentials are set on initialization)
+        :type auth: tuple or None
+        :param timeout: the seconds left for the request, capping the
+            timeouts of the client
+        :type timeout: int or float or None
+        :returns: ArangoDB http response object
+        :rtype: arango.response.Response
+        """
+        return self._request("PATCH", url, data=data, params=params,
+                             headers=headers, timeout=timeout)
+
+    def delete(self, url, params=None, headers=None, auth=None,
+               timeout=None):
+        """HTTP DELETE method.
+
+        :param url: request URL
+        :type url: str
+        :param params: request parameters
+        :type params: dict or None
+        :param headers: request headers
+        :type headers: dict or None
+        :param auth: ignored (the credentials are set on initialization)
+        :type auth: tuple or None
+        :param timeout: the seconds left for the request, capping the
+            timeouts of the client
+        :type timeout: int or float or None
+        :returns: ArangoDB http response object
+        :rtype: arango.response.Response
+        """
+        return self._request("DELETE", url, params=params, headers=headers,
+                             timeout=timeout)
+
+    def options(self, url, data=None, params=None, headers=None, auth=None,
+                timeout=None):
+        """HTTP OPTIONS method.
+
+        :param url: request URL
+        :type url: str
+        :param data: request payload
+        :type data: str or bytes or None
+        :param params: request parameters
+        :type params: dict or None
+        :param headers: request headers
+        :type headers: dict or None
+        :param auth: ignored (the credentials are set on initialization)
+        :type auth: tuple or None
+        :param timeout: the seconds left for the request, capping the
+            timeouts of the client
+        :type timeout: int or float or None
+        :returns: ArangoDB http response object
+        :rtype: arango.response.Response
+        """
+        return self._request("OPTIONS", url, data=data, params=params,
+                             headers=headers, timeout=timeout)
+
+    def close(self):
+        """Close the connections of all threads."""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
@@ -0,0 +1,55 @@
+"""Client connecting to ArangoDB over Unix domain sockets."""
+
+import socket
+
+try:
+    from http.client import HTTPConnection
+except ImportError:  # Python 2
+    from httplib import HTTPConnection
+
+from arango.clients.httpclient import HTTPClient
+from arango.endpoints import UNIX_SCHEME, unix_socket_path
+
+
+class UnixHTTPConnection(HTTPConnection):
+    """HTTP connection over a Unix domain socket.
+
+    :param path: the path of the socket
+    :type path: str
+    :param timeout: the socket timeout in seconds
+    :type timeout: int or float or None
+    """
+
+    def __init__(self, path, timeout=None):
+        HTTPConnection.__init__(self, "localhost")
+        self.path = path
+        self.timeout = timeout
+
+    def connect(self):
+        """Connect to the Unix domain socket."""
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if self.timeout is not None:
+            sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.path)
+        except BaseException:
+            sock.close()
+            raise
+        self.sock = sock
+
+
+class UnixSocketClient(HTTPClient):
+    """HTTP/1.1 client for ArangoDB servers listening on Unix sockets.
+
+    The endpoints reached through a Unix domain socket have URLs of the
+    form 'http+unix://<percent-encoded socket path>' (see
+    ``arango.endpoints.endpoint_url``). Local traffic then skips the TCP
+    stack entirely. The other URLs are sent over TCP as with
+    ``arango.clients.HTTPClient``, whose connection handling this client
+    shares.
+    """
+
+    def _new_connection(self, scheme, netloc):
+        if scheme == UNIX_SCHEME:
+            return UnixHTTPConnection(unix_socket_path(netloc))
+        return super(UnixSocketClient, self)._new_connection(scheme, netloc)
@@ -0,0 +1,179 @@
+"""JSON codecs used to encode the requests and decode the responses."""
+
+import importlib
+import json
+
+from arango import vpack
+from arango.exceptions import InvalidArgumentError
+
+
+class JSONCodec(object):
+    """JSON codec backed by the standard library's json module.
+
+    Subclasses plugging in other JSON libraries must override ``encode``
+    and ``decode``. Binary codecs (i.e. not producing JSON) must also set
+    ``binary`` and ``content_type``, and provide in ``json_codec`` the codec
+    for the payloads which must remain JSON (e.g. document imports).
+    """
+
+    name = "json"
+    binary = False
+    content_type = "application/json"
+
+    def __repr__(self):
+        """Return a descriptive string of this instance."""
+        return "<ArangoDB JSON codec '{}'>".format(self.name)
+
+    @property
+    def json_codec(self):
+        """Return the codec for the payloads which must be JSON.
+
+        :returns: the JSON codec
+        :rtype: arango.codec.JSONCodec
+        """
+        return self
+
+    def encode(self, obj):
+        """Serialize the object into UTF-8 encoded JSON.
+
+        :param obj: the object to serialize
+        :type obj: object
+        :returns: the JSON document
+        :rtype: bytes
+        """
+        return json.dumps(obj).encode("utf-8")
+
+    def decode(self, content):
+        """Deserialize the JSON document.
+
+        :param content: the JSON document (UTF-8 encoded if bytes)
+        :type content: bytes or str
+        :returns: the deserialized object
+        :rtype: object
+        :raises: ValueError
+        """
+        if isinstance(content, bytes):
+            content = content.decode("utf-8")
+        return json.loads(content)
+
+    def dumps(self, obj):
+        """Serialize the object into a JSON string.
+
+        :param obj: the object to serialize
+        :type obj: object
+        :returns: the JSON document
+        :rtype: str
+        """
+        return self.encode(obj).decode("utf-8")
+
+
+class StdlibCodec(JSONCodec):
+    """JSON codec backed by the standard library's json module."""
+
+    def dumps(self, obj):
+        return json.dumps(obj)
+
+
+class UJSONCodec(JSONCodec):
+    """JSON codec backed by ujson."""
+
+    name = "ujson"
+
+    def __init__(self):
+        self._ujson = importlib.import_module("ujson")
+
+    def encode(self, obj):
+        return self._ujson.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+    def decode(self, content):
+        return self._ujson.loads(content)
+
+
+class OrjsonCodec(JSONCodec):
+    """JSON codec backed by orjson."""
+
+    name = "orjson"
+
+    def __init__(self):
+        self._orjson = importlib.import_module("orjson")
+
+    def encode(self, obj):
+        return self._orjson.dumps(obj)
+
+    def decode(self, content):
+        return self._orjson.loads(content)
+
+
+class VPackCodec(JSONCodec):
+    """VelocyPack codec backed by the pure Python ``arango.vpack`` module.
+
+    The payloads are smaller than in JSON, but encoding and decoding them in
+    pure Python is several times slower than with the json module (see
+    benchmarks/bench_vpack.py), so this codec only helps when the bandwidth
+    rather than the CPU is the bottleneck.
+
+    :param json_codec: the codec for the payloads which must be JSON
+    :type json_codec: arango.codec.JSONCodec or None
+    """
+
+    name = "vpack"
+    binary = True
+    content_type = "application/x-velocypack"
+
+    def __init__(self, json_codec=None):
+        self._json_codec = json_codec or StdlibCodec()
+
+    @property
+    def json_codec(self):
+        return self._json_codec
+
+    def encode(self, obj):
+        return vpack.encode(obj)
+
+    def decode(self, content):
+        return vpack.decode(content)
+
+    def dumps(self, obj):
+        return self._json_codec.dumps(obj)
+
+
+# The JSON codecs by name, fastest first
+CODECS = [
+    ("orjson", OrjsonCodec),
+    ("ujson", UJSONCodec),
+    ("json", StdlibCodec),
+]
+
+
+def get_codec(codec="json"):
+    """Return the codec of the specified name.
+
+    If the library backing the codec is not installed, the codec backed by
+    the standard library is returned instead. If ``codec`` is 'auto', the
+    fastest installed JSON codec is returned. If ``codec`` is 'vpack', the
+    VelocyPack codec is returned, which is slower than the JSON codecs and
+    only saves bandwidth (see ``VPackCodec``).
+
+    :param codec: 'json', 'ujson', 'orjson', 'auto' or 'vpack', or a codec
+        object
+    :type codec: str or arango.codec.JSONCodec
+    :returns: the codec object
+    :rtype: arango.codec.JSONCodec
+    :raises: InvalidArgumentError
+    """
+    if isinstance(codec, JSONCodec):
+        return codec
+    if codec == "vpack":
+        return VPackCodec()
+    names = [name for name, _ in CODECS]
+    if codec != "auto" and codec not in names:
+        raise InvalidArgumentError(
+            "codec must be 'auto', 'vpack' or one of {}".format(names)
+        )
+    for name, codec_class in CODECS:
+        if codec in (name, "auto"):
+            try:
+                return codec_class()
+            except ImportError:
+                pass
+    return StdlibCodec()
@@ -1,10 +1,11 @@
 """ArangoDB Collection."""
 
-import json
-
-from arango.utils import camelify, uncamelify
+from arango.utils import uncamelify
 from arango.exceptions import *
-from arango.cursor import cursor
+from arango.cursor import Cursor
+from arango.pipeline import Call, Return, steps
+from arango.streaming import raw_headers, raw_results
+from arango.deadline import Deadline
 from arango.constants import COLLECTION_STATUSES, HTTP_OK
 
 
@@ -18,17 +19,25 @@ class Collection(object):
     5. Index Management
     """
 
-    def __init__(self, name, api):
+    # The iterator of the cursor results, see ``Database._cursor``
+    _cursor = Cursor
+
+    def __init__(self, name, api, is_edge=None):
         """Initialize the wrapper object.
 
         :param name: the name of this collection
         :type name: str
         :param api: ArangoDB API object
         :type api: arango.api.API
+        :param is_edge: whether this is an edge collection (default: ask
+            the server)
+        :type is_edge: bool or None
         """
         self.name = name
         self.api = api
-        self.type = "edge" if self.is_edge else "document"
+        if is_edge is None:
+            is_edge = self.is_edge
+        self.type = "edge" if is_edge else "document"
 
     def __repr__(self):
         """Return a descriptive string of this instance."""
@@ -45,12 +54,7 @@ class Collection(object):
         :rtype: int
         :raises: CollectionGetError
         """
-        res = self.api.get(
-            "/_api/collection/{}/count".format(self.name)
-        )
-        if res.status_code not in HTTP_OK:
-            raise CollectionGetError(res)
-        return res.body["count"]
+        return self.count()
 
     def __setattr__(self, attr, value):
         """Update the properties of this collection.
@@ -58,12 +62,7 @@ class Collection(object):
         Only ``wait_for_sync`` and ``journal_size`` attributes are mutable.
         """
         if attr in {"wait_for_sync", "journal_size"}:
-            res = self.api.put(
-                "/_api/collection/{}/properties".format(self.name),
-                data={camelify(attr): value}
-            )
-            if res.status_code not in HTTP_OK:
-                raise CollectionUpdateError(res)
+            self.set_properties(**{attr: value})
         else:
             super(Collection, self).__setattr__(attr, value)
 
@@ -89,16 +88,68 @@ class Collection(object):
         :rtype: bool
         :raises: DocumentGetError
         """
-        res = self.api.head(
+        return self.has(key)
+
+    @steps
+    def count(self):
+        """Return the number of documents present in this collection.
+
+        :returns: the number of documents
+        :rtype: int
+        :raises: CollectionGetError
+        """
+        res = yield Call(
+            self.api.get,
+            "/_api/collection/{}/count".format(self.name)
+        )
+        if res.status_code not in HTTP_OK:
+            raise CollectionGetError(res)
+        raise Return(res.body["count"])
+
+    @steps
+    def has(self, key):
+        """Return True if the document exists in this collection.
+
+        :param key: the document key
+        :type key: str
+        :returns: True if the document exists, else False
+        :rtype: bool
+        :raises: DocumentGetError
+        """
+        res = yield Call(
+            self.api.head,
             "/_api/{}/{}/{}".format(self.type, self.name, key)
         )
         if res.status_code == 200:
-            return True
+            raise Return(True)
         elif res.status_code == 404:
-            return False
+            raise Return(False)
         else:
             raise DocumentGetError(res)
 
+    @steps
+    def set_properties(self, wait_for_sync=None, journal_size=None):
+        """Update the mutable properties of this collection.
+
+        :param wait_for_sync: wait for the changes to sync to disk
+        :type wait_for_sync: bool or None
+        :param journal_size: the size of the journal in bytes
+        :type journal_size: int or None
+        :raises: CollectionUpdateError
+        """
+        data = {}
+        if wait_for_sync is not None:
+            data["waitForSync"] = wait_for_sync
+        if journal_size is not None:
+            data["journalSize"] = journal_size
+        res = yield Call(
+            self.api.put,
+            "/_api/collection/{}/properties".format(self.name),
+            data=data
+        )
+        if res.status_code not in HTTP_OK:
+            raise CollectionUpdateError(res)
+
     @property
     def properties(self):
         """Return the properties of this collection.
@@ -107,12 +158,17 @@ class Collection(object):
         :rtype: dict
         :raises: CollectionGetError
         """
-        res = self.api.get(
+        return self.api.run(self._properties())
+
+    def _properties(self):
+        """Return the steps fetching the properties of this collection."""
+        res = yield Call(
+            self.api.get,
             "/_api/collection/{}/properties".format(self.name)
         )
         if res.status_code not in HTTP_OK:
             raise CollectionGetError(res)
-        return {
+        raise Return({
             "id": res.body["id"],
             "name": res.body["name"],
             "is_edge": res.body["type"] == 3,
@@ -126,7 +182,12 @@ class Collection(object):
             "journal_size": res.body["journalSize"],
             "wait_for_sync": res.body["waitForSync"],
             "key_options": uncamelify(res.body["keyOptions"])
-        }
+        })
+
+    def _property(self, name):
+        """Return the steps fetching one of this collection's properties."""
+        properties = yield self._properties()
+        raise Return(properties[name])
 
     @property
     def id(self):
@@ -136,7 +197,7 @@ class Collection(object):
         :rtype: str
         :raises: CollectionGetError
         """
-        return self.properties["id"]
+        return self.api.run(self._property("id"))
 
     @property
     def status(self):
@@ -146,7 +207,7 @@ class Collection(object):
         :rtype: str
         :raises: CollectionGetError
         """
-        return self.properties["status"]
+        return self.api.run(self._property("status"))
 
     @property
     def key_options(self):
@@ -156,7 +217,7 @@ class Collection(object):
         :rtype: dict
         :raises: CollectionGetError
         """
-        return self.properties["key_options"]
+        return self.api.run(self._property("key_options"))
 
     @property
     def wait_for_sync(self):
@@ -166,7 +227,7 @@ class Collection(object):
         :rtype: bool
         :raises: CollectionGetError
         """
-        return self.properties["wait_for_sync"]
+        return self.api.run(self._property("wait_for_sync"))
 
     @property
     def journal_size(self):
@@ -176,7 +237,7 @@ class Collection(object):
         :rtype: str
         :raises: CollectionGetError
         """
-        return self.properties["journal_size"]
+        return self.api.run(self._property("journal_size"))
 
     @property
     def is_volatile(self):
@@ -186,7 +247,7 @@ class Collection(object):
         :rtype: bool
         :raises: CollectionGetError
         """
-        return self.properties["is_volatile"]
+        return self.api.run(self._property("is_volatile"))
 
     @property
     def is_system(self):
@@ -196,7 +257,7 @@ class Collection(object):
         :rtype: bool
         :raises: CollectionGetError
         """
-        return self.properties["is_system"]
+        return self.api.run(self._property("is_system"))
 
     @property
     def is_edge(self):
@@ -206,7 +267,7 @@ class Collection(object):
         :rtype: bool
         :raises: CollectionGetError
         """
-        return self.properties["is_edge"]
+        return self.api.run(self._property("is_edge"))
 
     @property
     def is_compacted(self):
@@ -216,9 +277,10 @@ class Collection(object):
         :rtype: bool
         :raises: CollectionGetError
         """
-        return self.properties["do_compact"]
+        return self.api.run(self._property("do_compact"))
 
     @property
+    @steps
     def statistics(self):
         """Return the statistics of this collection.
 
@@ -226,14 +288,16 @@ class Collection(object):
         :rtype: dict
         :raises: CollectionGetError
         """
-        res = self.api.get(
+        res = yield Call(
+            self.api.get,
             "/_api/collection/{}/figures".format(self.name)
         )
         if res.status_code not in HTTP_OK:
             raise CollectionGetError(res)
-        return uncamelify(res.body["figures"])
+        raise Return(uncamelify(res.body["figures"]))
 
     @property
+    @steps
     def revision(self):
         """Return the revision of this collection.
 
@@ -241,13 +305,15 @@ class Collection(object):
         :rtype: str
         :raises: CollectionGetError
         """
-        res = self.api.get(
+        res = yield Call(
+            self.api.get,
             "/_api/collection/{}/revision".format(self.name)
         )
         if res.status_code not in HTTP_OK:
             raise CollectionGetError(res)
-        return res.body["revision"]
+        raise Return(res.body["revision"])
 
+    @steps
     def load(self):
         """Load this collection into memory.
 
@@ -255,16 +321,18 @@ class Collection(object):
         :rtype: str
         :raises: CollectionLoadError
         """
-        res = self.api.put(
+        res = yield Call(
+            self.api.put,
             "/_api/collection/{}/load".format(self.name)
         )
         if res.status_code not in HTTP_OK:
             raise CollectionLoadError(res)
-        return COLLECTION_STATUSES.get(
+        raise Return(COLLECTION_STATUSES.get(
             res.body["status"],
             "corrupted ({})".format(res.body["status"])
-        )
+        ))
 
+    @steps
     def unload(self):
         """Unload this collection from memory.
 
@@ -272,28 +340,32 @@ class Collection(object):
         :rtype: str
         :raises: CollectionUnloadError
         """
-        res = self.api.put(
+        res = yield Call(
+            self.api.put,
             "/_api/collection/{}/unload".format(self.name)
         )
         if res.status_code not in HTTP_OK:
             raise CollectionUnloadError(res)
-        return COLLECTION_STATUSES.get(
+        raise Return(COLLECTION_STATUSES.get(
             res.body["status"],
             "corrupted ({})".format(res.body["status"])
-        )
+        ))
 
+    @steps
     def rotate_journal(self):
         """Rotate the journal of this collection.
 
         :raises: CollectionRotateJournalError
         """
-        res = self.api.put(
+        res = yield Call(
+            self.api.put,
             "/_api/collection/{}/rotate".format(self.name)
         )
         if res.status_code not in HTTP_OK:
             raise CollectionRotateJournalError(res)
-        return res.body["result"]
+        raise Return(res.body["result"])
 
+    @steps
     def checksum(self, with_rev=False, with_data=False):
         """Return the checksum of this collection.
 
@@ -305,20 +377,23 @@ class Collection(object):
         :rtype: int
         :raises: CollectionGetChecksumError
         """
-        res = self.api.get(
+        res = yield Call(
+            self.api.get,
             "/_api/collection/{}/checksum".format(self.name),
             params={"withRevision": with_rev, "withData": with_data}
         )
         if res.status_code not in HTTP_OK:
             raise CollectionGetError(res)
-        return res.body["checksum"]
+        raise Return(res.body["checksum"])
 
+    @steps
     def truncate(self):
         """Delete all documents from this collection.
 
         :raises: CollectionTruncateError
         """
-        res = self.api.put(
+        res = yield Call(
+            self.api.put,
             "/_api/collection/{}/truncate".format(self.name)
         )
         if res.status_code not in HTTP_OK:
@@ -328,11 +403,12 @@ class Collection(object):
     # Document Management #
     #######################
 
-    def doc(self, key, rev=None, match=True):
+    def doc(self, key, rev=None, match=True, raw=False):
         """Alias for self.document."""
-        return self.document(key, rev, match)
+        return self.document(key, rev, match, raw)
 
-    def document(self, key, rev=None, match=True):
+    @steps
+    def document(self, key, rev=None, match=True, raw=False):
         """Return the document of the given key.
 
         If the document revision ``rev`` is specified, it is compared
@@ -346,24 +422,30 @@ class Collection(object):
         :type rev: str or None
         :param match: whether or not the revision should match
         :type match: bool
+        :param raw: whether to return the document as raw JSON rather than
+            decoding it, e.g. to relay it as is
+        :type raw: bool
         :returns: the requested document or None if not found
-        :rtype: dict or None
+        :rtype: dict or bytes or None
         :raises: DocumentRevisionError, DocumentGetError
         """
-        res = self.api.get(
+        headers = {
+            "If-Match" if match else "If-None-Match": rev
+        } if rev else {}
+        res = yield Call(
+            self.api.get,
             "/_api/{}/{}/{}".format(self.type, self.name, key),
-            headers={
-                "If-Match" if match else "If-None-Match": rev
-            } if rev else {}
+            headers=raw_headers(headers) if raw else headers
         )
         if res.status_code in {412, 304}:
             raise DocumentRevisionError(res)
         elif res.status_code == 404:
-            return None
+            raise Return(None)
         elif res.status_code not in HTTP_OK:
             raise DocumentGetError(res)
-        return res.body
+        raise Return(res.content if raw else res.body)
 
+    @steps
     def create_document(self, data, wait_for_sync=False, _batch=False):
         """Create a new document to this collection.
 
@@ -379,7 +461,7 @@ class Collection(object):
         :rtype: dict
         :raises: DocumentInvalidError, DocumentCreateError
         """
-        if self.type is "edge":
+        if self.type == "edge":
             if "_to" not in data:
                 raise DocumentInvalidError(
                     "the new document data is missing the '_to' key")
@@ -396,17 +478,18 @@ class Collection(object):
         if "_to" in data:
             params["to"] = data["_to"]
         if _batch:
-            return {
+            raise Return({
                 "method": "post",
                 "path": path,
                 "data": data,
                 "params": params,
-            }
-        res = self.api.post(path=path, data=data, params=params)
+            })
+        res = yield Call(self.api.post, path=path, data=data, params=params)
         if res.status_code not in HTTP_OK:
             raise DocumentCreateError(res)
-        return res.body
+        raise Return(res.body)
 
+    @steps
     def update_document(self, key, data, rev=None, keep_none=True,
                         wait_for_sync=False, _batch=False):
         """Update the specified document in this collection.
@@ -449,20 +532,21 @@ class Collection(object):
             params["rev"] = data["_rev"]
             params["policy"] = "error"
         if _batch:
-            return {
+            raise Return({
                 "method": "patch",
                 "path": path,
                 "data": data,
                 "params": params,
-            }
-        res = self.api.patch(path=path, data=data, params=params)
+            })
+        res = yield Call(self.api.patch, path=path, data=data, params=params)
         if res.status_code == 412:
             raise DocumentRevisionError(res)
         if res.status_code not in HTTP_OK:
             raise DocumentUpdateError(res)
         del res.body["error"]
-        return res.body
+        raise Return(res.body)
 
+    @steps
     def replace_document(self, key, data, rev=None, wait_for_sync=False,
                          _batch=False):
         """Replace the specified document in this collection.
@@ -497,20 +581,21 @@ class Collection(object):
             params["policy"] = "error"
         path = "/_api/{}/{}/{}".format(self.type, self.name, key)
         if _batch:
-            return {
+            raise Return({
                 "method": "put",
                 "path": path,
                 "data": data,
                 "params": params,
-            }
-        res = self.api.put(path=path, params=params, data=data)
+            })
+        res = yield Call(self.api.put, path=path, params=params, data=data)
         if res.status_code == 412:
             raise DocumentRevisionError(res)
         elif res.status_code not in HTTP_OK:
             raise DocumentReplaceError(res)
         del res.body["error"]
-        return res.body
+        raise Return(res.body)
 
+    @steps
     def delete_document(self, key, rev=None, wait_for_sync=False,
                         _batch=False):
         """Delete the specified document from this collection.
@@ -531,24 +616,26 @@ class Collection(object):
             params["policy"] = "error"
         path = "/_api/{}/{}/{}".format(self.type, self.name, key)
         if _batch:
-            return {
+            raise Return({
                 "method": "delete",
                 "path": path,
                 "params": params
-            }
-        res = self.api.delete(path=path, params=params)
+            })
+        res = yield Call(self.api.delete, path=path, params=params)
         if res.status_code == 412:
             raise DocumentRevisionError(res)
         elif res.status_code not in {200, 202}:
             raise DocumentDeleteError(res)
         del res.body["error"]
-        return res.body
+        raise Return(res.body)
 
     ############################
     # Document Import & Export #
     ############################
 
-    def import_documents(self, documents, complete=True, details=True):
+    @steps
+    def import_documents(self, documents, complete=True, details=True,
+                         compress=None):
         """Import documents into this collection in bulk.
 
         If ``complete`` is set to a value other than True, valid documents
@@ -564,28 +651,39 @@ class Collection(object):
         :type complete: bool
         :param details: return details about invalid documents
         :type details: bool
+        :param compress: whether to compress the request and accept a
+            compressed response ('gzip', 'deflate' or True/False), or None
+            to use the setting of the API wrapper
+        :type compress: str or bool or None
         :returns: the import results
         :rtype: dict
         :raises: DocumentsImportError
         """
-        res = self.api.post(
+        res = yield Call(
+            self.api.post,
             "/_api/import",
-            data="\r\n".join([json.dumps(d) for d in documents]),
+            data=b"\r\n".join(
+                [self.api.codec.json_codec.encode(d) for d in documents]
+            ),
             params={
                 "type": "documents",
                 "collection": self.name,
                 "complete": complete,
                 "details": details
-            }
+            },
+            compress=compress
         )
         if res.status_code not in HTTP_OK:
             raise DocumentsImportError(res)
         del res.body["error"]
-        return res.body
+        raise Return(res.body)
 
     # TODO look into this endpoint for better documentation and testing
+    @steps
     def export_documents(self, flush=None, flush_wait=None, count=None,
-                         batch_size=None, limit=None, ttl=None, restrict=None):
+                         batch_size=None, limit=None, ttl=None, restrict=None,
+                         compress=None, deadline=None, stream=False,
+                         raw=False, prefetch=0):
         """"Export all documents from this collection using a cursor.
 
         :param flush: trigger a WAL flush operation prior to the export
@@ -602,10 +700,27 @@ class Collection(object):
         :type ttl: int or None
         :param restrict: object with attributes to be excluded/included
         :type restrict: dict
-        :return: the generator of documents in this collection
-        :rtype: generator
-        :raises: DocumentsExportError
+        :param compress: whether to compress the request and accept a
+            compressed response ('gzip', 'deflate' or True/False), or None
+            to use the setting of the API wrapper
+        :type compress: str or bool or None
+        :param deadline: the seconds the export and the fetches of all its
+            batches may take, or the deadline to share with other calls
+        :type deadline: arango.deadline.Deadline or int or float or None
+        :param stream: whether to parse the batches one result at a time
+            as they are received rather than whole (see ``arango.streaming``)
+        :type stream: bool
+        :param raw: whether to return the results as raw JSON (bytes or
+            memoryview) rather than decoding them, e.g. to relay them as is
+        :type raw: bool
+        :param prefetch: the max number of batches to fetch ahead while
+            the current one is consumed (default: fetch them on demand)
+        :type prefetch: int
+        :return: the cursor over the documents in this collection
+        :rtype: arango.cursor.Cursor
+        :raises: DocumentsExportError, DeadlineExceededError
         """
+        deadline = Deadline.of(deadline)
         params = {"collection": self.name}
         options = {}
         if flush is not None:
@@ -624,15 +739,38 @@ class Collection(object):
             options["restrict"] = restrict
         data = {"options": options} if options else {}
 
-        res = self.api.post("/_api/export", params=params, data=data)
-        if res.status_code not in HTTP_OK:
-            raise DocumentsExportError(res)
-        return cursor(self.api, res)
+        with self.api.tracer.span(
+            "ArangoDB export_documents",
+            {
+                "db.system": "arangodb",
+                "db.name": self.api.database,
+                "db.operation": "export_documents",
+                "db.collection": self.name,
+            },
+            end=False
+        ) as span:
+            res = yield Call(
+                self.api.post,
+                "/_api/export",
+                params=params,
+                data=data,
+                headers=raw_headers() if raw else None,
+                compress=compress,
+                deadline=deadline,
+                stream=stream
+            )
+            if res.status_code not in HTTP_OK:
+                raise DocumentsExportError(res)
+        raise Return(self._cursor(
+            self.api, res, compress=compress, deadline=deadline, span=span,
+            stream=stream, raw=raw, prefetch=prefetch
+        ))
 
     ##################
     # Simple Queries #
     ##################
 
+    @steps
     def first(self, count=1):
         """Return the first ``count`` number of documents in this collection.
 
@@ -642,14 +780,16 @@ class Collection(object):
         :rtype: list
         :raises: SimpleQueryFirstError
         """
-        res = self.api.put(
+        res = yield Call(
+            self.api.put,
             "/_api/simple/first",
             data={"collection": self.name, "count": count}
         )
         if res.status_code not in HTTP_OK:
             raise SimpleQueryFirstError(res)
-        return res.body["result"]
+        raise Return(res.body["result"])
 
+    @steps
     def last(self, count=1):
         """Return the last ``count`` number of documents in this collection.
 
@@ -659,15 +799,17 @@ class Collection(object):
         :rtype: list
         :raises: SimpleQueryLastError
         """
-        res = self.api.put(
+        res = yield Call(
+            self.api.put,
             "/_api/simple/last",
             data={"collection": self.name, "count": count}
         )
         if res.status_code not in HTTP_OK:
             raise SimpleQueryLastError(res)
-        return res.body["result"]
+        raise Return(res.body["result"])
 
-    def all(self, skip=None, limit=None):
+    @steps
+    def all(self, skip=None, limit=None, stream=False, prefetch=0):
         """Return all documents in this collection.
 
         ``skip`` is applied before ``limit`` if both are provided.
@@ -676,6 +818,12 @@ class Collection(object):
         :type skip: int
         :param limit: maximum number of documents to return
         :type limit: int
+        :param stream: whether to parse the batches one result at a time
+            as they are received rather than whole (see ``arango.streaming``)
+        :type stream: bool
+        :param prefetch: the max number of batches to fetch ahead while
+            the current one is consumed (default: fetch them on demand)
+        :type prefetch: int
         :returns: the list of all documents
         :rtype: list
         :raises: SimpleQueryAllError
@@ -685,11 +833,15 @@ class Collection(object):
             data["skip"] = skip
         if limit is not None:
             data["limit"] = limit
-        res = self.api.put("/_api/simple/all", data=data)
+        res = yield Call(
+            self.api.put, "/_api/simple/all", data=data, stream=stream
+        )
         if res.status_code not in HTTP_OK:
             raise SimpleQueryAllError(res)
-        return cursor(self.api, res)
+        raise Return(self._cursor(self.api, res, stream=stream,
+                                  prefetch=prefetch))
 
+    @steps
     def any(self):
         """Return a random document from this collection.
 
@@ -697,14 +849,16 @@ class Collection(object):
         :rtype: dict
         :raises: SimpleQueryAnyError
         """
-        res = self.api.put(
+        res = yield Call(
+            self.api.put,
             "/_api/simple/any",
             data={"collection": self.name}
         )
         if res.status_code not in HTTP_OK:
             raise SimpleQueryAnyError(res)
-        return res.body["document"]
+        raise Return(res.body["document"])
 
+    @steps
     def get_first_example(self, example):
         """Return the first document matching the given example document body.
 
@@ -715,13 +869,16 @@ class Collection(object):
         :raises: SimpleQueryFirstExampleError
         """
         data = {"collection": self.name, "example": example}
-        res = self.api.put("/_api/simple/first-example", data=data)
+        res = yield Call(
+            self.api.put, "/_api/simple/first-example", data=data
+        )
         if res.status_code == 404:
-            return None
+            raise Return(None)
         elif res.status_code not in HTTP_OK:
             raise SimpleQueryFirstExampleError(res)
-        return res.body["document"]
+        raise Return(res.body["document"])
 
+    @steps
     def get_by_example(self, example, skip=None, limit=None):
         """Return all documents matching the given example document body.
 
@@ -742,11 +899,14 @@ class Collection(object):
             data["skip"] = skip
         if limit is not None:
             data["limit"] = limit
-        res = self.api.put("/_api/simple/by-example", data=data)
+        res = yield Call(
+            self.api.put, "/_api/simple/by-example", data=data
+        )
         if res.status_code not in HTTP_OK:
             raise SimpleQueryGetByExampleError(res)
-        return cursor(self.api, res)
+        raise Return(self._cursor(self.api, res))
 
+    @steps
     def update_by_example(self, example, new_value, keep_none=True, limit=None,
                           wait_for_sync=False):
         """Update all documents matching the given example document body.
@@ -774,11 +934,14 @@ class Collection(object):
         }
         if limit is not None:
             data["limit"] = limit
-        res = self.api.put("/_api/simple/update-by-example", data=data)
+        res = yield Call(
+            self.api.put, "/_api/simple/update-by-example", data=data
+        )
         if res.status_code not in HTTP_OK:
             raise SimpleQueryUpdateByExampleError(res)
-        return res.body["updated"]
+        raise Return(res.body["updated"])
 
+    @steps
     def replace_by_example(self, example, new_value, limit=None,
                            wait_for_sync=False):
         """Replace all documents matching the given example.
@@ -805,11 +968,14 @@ class Collection(object):
         }
         if limit is not None:
             data["limit"] = limit
-        res = self.api.put("/_api/simple/replace-by-example", data=data)
+        res = yield Call(
+            self.api.put, "/_api/simple/replace-by-example", data=data
+        )
         if res.status_code not in HTTP_OK:
             raise SimpleQueryReplaceByExampleError(res)
-        return res.body["replaced"]
+        raise Return(res.body["replaced"])
 
+    @steps
     def remove_by_example(self, example, limit=None, wait_for_sync=False):
         """Remove all documents matching the given example.
 
@@ -830,11 +996,14 @@ class Collection(object):
         }
         if limit is not None:
             data["limit"] = limit
-        res = self.api.put("/_api/simple/remove-by-example", data=data)
+        res = yield Call(
+            self.api.put, "/_api/simple/remove-by-example", data=data
+        )
         if res.status_code not in HTTP_OK:
             raise SimpleQueryDeleteByExampleError(res)
-        return res.body["deleted"]
+        raise Return(res.body["deleted"])
 
+    @steps
     def range(self, attribute, left, right, closed=True, skip=None,
               limit=None):
         """Return all the documents within a given range.
@@ -869,11 +1038,14 @@ class Collection(object):
             data["skip"] = skip
         if limit is not None:
             data["limit"] = limit
-        res = self.api.put("/_api/simple/range", data=data)
+        res = yield Call(
+            self.api.put, "/_api/simple/range", data=data
+        )
         if res.status_code not in HTTP_OK:
             raise SimpleQueryRangeError(res)
-        return cursor(self.api, res)
+        raise Return(self._cursor(self.api, res))
 
+    @steps
     def near(self, latitude, longitude, distance=None, radius=None, skip=None,
              limit=None, geo=None):
         """Return all the documents near the given coordinate.
@@ -921,12 +1093,15 @@ class Collection(object):
         if geo is not None:
             data["geo"] = geo
 
-        res = self.api.put("/_api/simple/near", data=data)
+        res = yield Call(
+            self.api.put, "/_api/simple/near", data=data
+        )
         if res.status_code not in HTTP_OK:
             raise SimpleQueryNearError(res)
-        return cursor(self.api, res)
+        raise Return(self._cursor(self.api, res))
 
     # TODO this endpoint does not seem to work
+    @steps
     def within(self, latitude, longitude, radius, distance=None, skip=None,
                limit=None, geo=None):
         """Return all documents within the radius around the coordinate.
@@ -972,11 +1147,14 @@ class Collection(object):
         if geo is not None:
             data["geo"] = geo
 
-        res = self.api.put("/_api/simple/within", data=data)
+        res = yield Call(
+            self.api.put, "/_api/simple/within", data=data
+        )
         if res.status_code not in HTTP_OK:
             raise SimpleQueryWithinError(res)
-        return cursor(self.api, res)
+        raise Return(self._cursor(self.api, res))
 
+    @steps
     def fulltext(self, attribute, query, skip=None, limit=None, index=None):
         """Return all documents that match the specified fulltext ``query``.
 
@@ -1009,16 +1187,22 @@ class Collection(object):
             data["limit"] = limit
         if index is not None:
             data["index"] = index
-        res = self.api.put("/_api/simple/fulltext", data=data)
+        res = yield Call(
+            self.api.put, "/_api/simple/fulltext", data=data
+        )
         if res.status_code not in HTTP_OK:
             raise SimpleQueryFullTextError(res)
-        return cursor(self.api, res)
+        raise Return(self._cursor(self.api, res))
 
-    def lookup_by_keys(self, keys):
+    @steps
+    def lookup_by_keys(self, keys, raw=False):
         """Return all documents whose key is in ``keys``.
 
         :param keys: keys of documents to lookup
         :type keys: list
+        :param raw: whether to return the documents as raw JSON (memoryview
+            slices of the response) rather than decoding them
+        :type raw: bool
         :returns: the list of documents
         :rtype: list
         :raises: SimpleQueryLookupByKeysError
@@ -1027,11 +1211,21 @@ class Collection(object):
             "collection": self.name,
             "keys": keys,
         }
-        res = self.api.put("/_api/simple/lookup-by-keys", data=data)
+        res = yield Call(
+            self.api.put,
+            "/_api/simple/lookup-by-keys",
+            data=data,
+            headers=raw_headers() if raw else None
+        )
         if res.status_code not in HTTP_OK:
             raise SimpleQueryLookupByKeysError(res)
-        return res.body["documents"]
+        if raw:
+            raise Return(raw_results(
+                res.content, {}, res.codec.json_codec.decode, "documents"
+            ))
+        raise Return(res.body["documents"])
 
+    @steps
     def remove_by_keys(self, keys):
         """Remove all documents whose key is in ``keys``.
 
@@ -1045,19 +1239,22 @@ class Collection(object):
             "collection": self.name,
             "keys": keys,
         }
-        res = self.api.put("/_api/simple/remove-by-keys", data=data)
+        res = yield Call(
+            self.api.put, "/_api/simple/remove-by-keys", data=data
+        )
         if res.status_code not in HTTP_OK:
             raise SimpleQueryDeleteByKeysError(res)
-        return {
+        raise Return({
             "removed": res.body["removed"],
             "ignored": res.body["ignored"],
-        }
+        })
 
     ####################
     # Index Management #
     ####################
 
     @property
+    @steps
     def indexes(self):
         """Return the details on the indexes of this collection.
 
@@ -1065,7 +1262,8 @@ class Collection(object):
         :rtype: dict
         :raises: IndexListError
         """
-        res = self.api.get(
+        res = yield Call(
+            self.api.get,
             "/_api/index?collection={}".format(self.name)
         )
         if res.status_code not in HTTP_OK:
@@ -1075,17 +1273,19 @@ class Collection(object):
         for index_id, details in res.body["identifiers"].items():
             del details["id"]
             indexes[index_id.split("/", 1)[1]] = uncamelify(details)
-        return indexes
+        raise Return(indexes)
 
+    @steps
     def _create_index(self, data):
         """Helper method for creating new indexes."""
-        res = self.api.post(
+        res = yield Call(
+            self.api.post,
             "/_api/index?collection={}".format(self.name),
             data=data
         )
         if res.status_code not in HTTP_OK:
             raise IndexCreateError(res)
-        return res.body
+        raise Return(res.body)
 
     def create_hash_index(self, fields, unique=None, sparse=None):
         """Create a new hash index to this collection.
@@ -1202,6 +1402,7 @@ class Collection(object):
             data["minLength"] = min_length
         return self._create_index(data)
 
+    @steps
     def delete_index(self, index_id):
         """Delete an index from this collection.
 
@@ -1209,9 +1410,10 @@ class Collection(object):
         :type index_id: str
         :raises: IndexDeleteError
         """
-        res = self.api.delete(
+        res = yield Call(
+            self.api.delete,
             "/_api/index/{}/{}".format(self.name, index_id)
         )
         if res.status_code not in HTTP_OK:
             raise IndexDeleteError(res)
-        return res.body
+        raise Return(res.body)
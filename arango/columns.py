@@ -0,0 +1,223 @@
+"""Materialization of the cursor results into NumPy columns.
+
+Requires the NumPy library (``pip install numpy``).
+"""
+
+try:
+    import numpy
+except ImportError:  # numpy is an optional dependency
+    numpy = None
+
+from arango.exceptions import InvalidArgumentError
+
+try:
+    _INTEGER_TYPES = {int, long}
+except NameError:  # Python 3
+    _INTEGER_TYPES = {int}
+
+# The values standing in for the missing values, by kind of dtype
+_FILLERS = {"b": False, "i": 0, "u": 0, "f": 0.0, "c": 0j, "U": u"", "S": b""}
+# The kinds of dtypes whose values are checked to fit, while e.g. datetime
+# columns parse their strings (and raise ValueError if they cannot)
+_CHECKED_KINDS = frozenset("biufcUS")
+
+
+def infer_dtype(values):
+    """Return the NumPy dtype fitting the values of a field.
+
+    The missing values (i.e. None) are ignored. Booleans, integers and
+    numbers (integers mixed with floats) get bool, int64 and float64
+    columns, and anything else an object column.
+
+    :param values: the values of the field
+    :type values: list
+    :returns: the dtype
+    :rtype: numpy.dtype
+    """
+    types = set(type(value) for value in values if value is not None)
+    if types == {bool}:
+        return numpy.dtype(bool)
+    if types and types <= _INTEGER_TYPES:
+        return numpy.dtype("int64")
+    if types and types <= _INTEGER_TYPES | {float}:
+        return numpy.dtype("float64")
+    return numpy.dtype(object)
+
+
+class ColumnBuilder(object):
+    """NumPy columns filled with the fields of documents, batch by batch.
+
+    Each field of a batch is copied into its column with one assignment,
+    which must not lose information: e.g. a float does not fit an integer
+    column, nor an integer a boolean one. The columns are preallocated for
+    ``capacity`` documents, and grown as needed. A field which a document
+    lacks (or whose value is null) is masked.
+
+    :param fields: the fields to read (default: those of the documents of
+        the first batch, in order of appearance)
+    :type fields: list or None
+    :param dtypes: the NumPy dtypes of the columns by field (default:
+        inferred from the values of the first batch, see ``infer_dtype``)
+    :type dtypes: dict or None
+    :param capacity: the number of documents expected
+    :type capacity: int
+    :raises: ImportError if NumPy is not installed
+    """
+
+    def __init__(self, fields=None, dtypes=None, capacity=0):
+        if numpy is None:
+            raise ImportError("ColumnBuilder requires the numpy library")
+        self.fields = None if fields is None else list(fields)
+        self.dtypes = dict(dtypes or {})
+        self.size = 0
+        self._capacity = capacity
+        self._columns = None
+        self._masks = None
+
+    def __repr__(self):
+        """Return a descriptive string of this instance."""
+        return "<ArangoDB column builder ({} documents)>".format(self.size)
+
+    def add(self, documents):
+        """Append a batch of documents to the columns.
+
+        :param documents: the documents
+        :type documents: list
+        :raises: InvalidArgumentError if the results are not documents,
+            TypeError or ValueError if a value does not fit its column
+        """
+        if not all(isinstance(document, dict) for document in documents):
+            raise InvalidArgumentError("the results must be documents")
+        if self._columns is None:
+            self._allocate(documents)
+        if not documents:
+            return
+        start, end = self.size, self.size + len(documents)
+        if end > self._capacity:
+            self._grow(max(end, 2 * self._capacity))
+        for column, mask, field in zip(self._columns, self._masks,
+                                       self.fields):
+            values = [document.get(field) for document in documents]
+            missing = [value is None for value in values]
+            if any(missing):
+                mask[start:end] = missing
+                filler = _FILLERS.get(column.dtype.kind)
+                if filler is not None:
+                    values = [filler if value is None else value
+                              for value in values]
+            if column.dtype.kind in _CHECKED_KINDS:
+                values = _fitting(field, values, column.dtype)
+            column[start:end] = values
+        self.size = end
+
+    def build(self, structured=False):
+        """Return the columns filled so far.
+
+        :param structured: whether to return a structured array, with a
+            record per document, rather than the columns
+        :type structured: bool
+        :returns: the masked columns by field, or the masked structured
+            array
+        :rtype: dict or numpy.ma.MaskedArray
+        """
+        if self._columns is None:
+            self._allocate([])
+        size = self.size
+        if not structured:
+            return {
+                field: numpy.ma.MaskedArray(column[:size], mask=mask[:size])
+                for field, column, mask in zip(self.fields, self._columns,
+                                               self._masks)
+            }
+        data = numpy.empty(size, dtype=[
+            (field, column.dtype)
+            for field, column in zip(self.fields, self._columns)
+        ])
+        masks = numpy.empty(size, dtype=[(field, bool)
+                                         for field in self.fields])
+        for field, column, mask in zip(self.fields, self._columns,
+                                       self._masks):
+            data[field] = column[:size]
+            masks[field] = mask[:size]
+        return numpy.ma.MaskedArray(data, mask=masks)
+
+    def _allocate(self, documents):
+        """Allocate the columns, completing the fields and the dtypes."""
+        if self.fields is None:
+            self.fields = []
+            seen = set()
+            for document in documents:
+                for field in document:
+                    if field not in seen:
+                        seen.add(field)
+                        self.fields.append(field)
+        for field in self.fields:
+            if field in self.dtypes:
+                self.dtypes[field] = numpy.dtype(self.dtypes[field])
+            else:
+                self.dtypes[field] = infer_dtype(
+                    [document.get(field) for document in documents]
+                )
+        capacity = self._capacity = max(self._capacity, len(documents))
+        self._columns = [numpy.empty(capacity, self.dtypes[field])
+                         for field in self.fields]
+        self._masks = [numpy.zeros(capacity, bool) for _ in self.fields]
+
+    def _grow(self, capacity):
+        """Reallocate the columns for ``capacity`` documents."""
+        size = self.size
+        self._capacity = capacity
+        for i, column in enumerate(self._columns):
+            grown = numpy.empty(capacity, column.dtype)
+            grown[:size] = column[:size]
+            self._columns[i] = grown
+            mask = numpy.zeros(capacity, bool)
+            mask[:size] = self._masks[i][:size]
+            self._masks[i] = mask
+
+
+def _fitting(field, values, dtype):
+    """Return the values of a field as an array, if they fit its column.
+
+    The NumPy assignments cast silently, e.g. truncating the floats put
+    into an integer column, which is checked for here instead. The strings
+    must also fit the length of a string column.
+
+    :raises: TypeError or ValueError
+    """
+    array = numpy.asarray(values)
+    casting = "safe" if dtype.kind in "US" else "same_kind"
+    if not numpy.can_cast(array.dtype, dtype, casting):
+        raise TypeError(
+            "the values of the field '{}' ({}) do not fit its column ({})"
+            .format(field, array.dtype, dtype)
+        )
+    return array
+
+
+def to_columns(cursor, fields=None, dtypes=None, structured=False):
+    """Read the rest of the results of a cursor into NumPy columns.
+
+    The documents are read batch by batch, see ``ColumnBuilder``. The
+    columns are sized upfront to the ``count`` of the cursor if the query
+    was run with ``count=True``.
+
+    :param cursor: the cursor over the documents
+    :type cursor: arango.cursor.Cursor
+    :param fields: the fields to read (default: those of the documents of
+        the first batch)
+    :type fields: list or None
+    :param dtypes: the NumPy dtypes of the columns by field (default:
+        inferred from the values of the first batch)
+    :type dtypes: dict or None
+    :param structured: whether to return a structured array, with a
+        record per document, rather than the columns
+    :type structured: bool
+    :returns: the masked columns by field, or the masked structured array
+    :rtype: dict or numpy.ma.MaskedArray
+    :raises: ImportError if NumPy is not installed
+    """
+    builder = ColumnBuilder(fields, dtypes, cursor.count or 0)
+    for documents in cursor.batches():
+        builder.add(documents)
+    return builder.build(structured)
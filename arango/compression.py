@@ -0,0 +1,93 @@
+"""Compression of the request and response bodies."""
+
+import zlib
+
+from arango.exceptions import InvalidArgumentError
+
+
+# Valid compression methods (i.e. content codings)
+COMPRESSION_METHODS = {"gzip", "deflate"}
+
+# The Accept-Encoding header value advertised when compression is enabled
+ACCEPT_ENCODING = "gzip, deflate"
+
+# zlib window bits for each content coding
+_WBITS = {"gzip": 16 + zlib.MAX_WBITS, "deflate": zlib.MAX_WBITS}
+
+
+def check_compression(method):
+    """Check the compression method and return it.
+
+    :param method: 'gzip', 'deflate', or None for no compression
+    :type method: str or None
+    :returns: the compression method
+    :rtype: str or None
+    :raises: InvalidArgumentError
+    """
+    if method is not None and method not in COMPRESSION_METHODS:
+        raise InvalidArgumentError(
+            "compression must be None or one of {}".format(
+                sorted(COMPRESSION_METHODS)
+            )
+        )
+    return method
+
+
+def compress(data, method, level=6):
+    """Compress the request body.
+
+    :param data: the request body
+    :type data: bytes
+    :param method: 'gzip' or 'deflate'
+    :type method: str
+    :param level: the compression level from 1 (fastest) to 9 (smallest)
+    :type level: int
+    :returns: the compressed request body
+    :rtype: bytes
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, _WBITS[method])
+    return compressor.compress(data) + compressor.flush()
+
+
+class Decompressor(object):
+    """Incremental decompressor for gzip or deflate encoded responses.
+
+    The body is fed chunk by chunk as it is read off the wire, so that the
+    compressed body is never held in memory in full.
+
+    :param encoding: the Content-Encoding of the response
+    :type encoding: str
+    """
+
+    def __init__(self, encoding):
+        self._encoding = encoding
+        self._first_chunk = True
+        self._decompressor = zlib.decompressobj(_WBITS[encoding])
+
+    def decompress(self, chunk):
+        """Return the decompressed data of the next chunk.
+
+        :param chunk: the next chunk of the compressed body
+        :type chunk: bytes
+        :returns: the decompressed data (possibly empty)
+        :rtype: bytes
+        """
+        if not chunk:
+            return b""
+        if self._first_chunk and self._encoding == "deflate":
+            # Some servers send raw deflate data without the zlib header
+            self._first_chunk = False
+            try:
+                return self._decompressor.decompress(chunk)
+            except zlib.error:
+                self._decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+        self._first_chunk = False
+        return self._decompressor.decompress(chunk)
+
+    def flush(self):
+        """Return the remaining decompressed data.
+
+        :returns: the remaining data
+        :rtype: bytes
+        """
+        return self._decompressor.flush()
@@ -1,33 +1,540 @@
 """ArangoDB Cursor."""
 
+import atexit
+from threading import Event, Lock, Thread, current_thread
+
+try:
+    from queue import Empty, Queue
+except ImportError:  # Python 2
+    from Queue import Empty, Queue
+
+from arango.columns import to_columns
 from arango.constants import HTTP_OK
 from arango.exceptions import (
     CursorGetNextError,
     CursorDeleteError,
 )
+from arango.streaming import (
+    iter_results,
+    parse_results,
+    raw_headers,
+    raw_results,
+)
+
+
+class Cursor(object):
+    """Iterator over the results of a server cursor.
+
+    By default, the next batch is fetched from the server only once the
+    current batch has been consumed. With ``prefetch``, the next batches
+    are fetched on a background thread while the current one is consumed,
+    up to ``prefetch`` of them being held ahead, so that the network and
+    the application overlap. The server cursor is deleted once the last
+    batch has arrived.
 
+    The span of the operation is ended once the last batch has arrived (or
+    right away if there is none to fetch), whether or not the items are
+    consumed, so that it does not time the application. The end of a
+    streamed batch only arrives once its items are consumed though. The
+    span is also ended once a fetch fails or the cursor is garbage
+    collected.
 
-def cursor(api, response):
-    """Continuously read from the server cursor and yield the result.
+    The results can also be consumed batch by batch with ``batches``,
+    while ``batch_index`` is the index of the current batch (from 0) and
+    ``result_count`` the number of results ``batches`` has yielded. The
+    results can also be read into NumPy columns with ``to_columns``.
+
+    A cursor stopped before its last batch holds the server cursor (and its
+    memory) until ``close`` is called, e.g. on exiting the ``with`` block
+    of the cursor. A cursor left open is closed once garbage collected, or
+    at interpreter exit at the latest. See ``cursor_counts`` for the number
+    of server cursors held.
 
     :param api: ArangoDB API wrapper object
     :type api: arango.api.API
     :param response: ArangoDB response object
     :type response: arango.response.Response
-    :raises: CursorExecuteError, CursorDeleteError
+    :param compress: whether to accept compressed batches (default: the
+        setting of the API wrapper)
+    :type compress: str or bool or None
+    :param deadline: the deadline of the operation which created the
+        cursor, bounding the fetches of the next batches too
+    :type deadline: arango.deadline.Deadline or None
+    :param span: the span of the operation which created the cursor,
+        parenting the fetches of the next batches
+    :type span: arango.tracing.Span or None
+    :param stream: whether the batches are streamed (see
+        ``arango.streaming``), including ``response``
+    :type stream: bool
+    :param raw: whether to return the results as raw JSON (bytes or
+        memoryview), never decoded; ``response`` must be JSON
+    :type raw: bool
+    :param prefetch: the max number of batches to fetch ahead in the
+        background, or 0 to fetch them on demand; streamed batches are
+        fetched on demand, since whether there is another one is only
+        known once they are consumed
+    :type prefetch: int
+    """
+
+    def __init__(self, api, response, compress=None, deadline=None,
+                 span=None, stream=False, raw=False, prefetch=0):
+        self._fetcher = _Fetcher(api, response.endpoint, compress, deadline,
+                                 span, stream, raw)
+        self._envelope = {}
+        # The results of the current batch, until they start being consumed
+        # through the iterator of ``_batch``
+        self._pending = results(response, self._envelope, raw)
+        self._batch = iter(())
+        self._done = False
+        self.batch_index = 0
+        self.result_count = 0
+        # The total number of results, if the query was run with ``count``
+        # (and the first batch is not streamed)
+        self.count = self._envelope.get("count")
+        # Known upfront unless the batch is streamed
+        if self._envelope.get("hasMore") is False:
+            self._fetcher.end_span()
+        elif self._envelope.get("hasMore"):
+            self._fetcher.open(self._envelope["id"])
+        self._batches = self._stopped = self._thread = None
+        if prefetch and not stream and self._envelope["hasMore"]:
+            # The thread holds no reference to the cursor, which can be
+            # collected while the thread waits for room in the queue
+            self._batches = Queue(maxsize=prefetch)
+            self._stopped = Event()
+            self._thread = Thread(
+                target=_prefetch,
+                args=(self._fetcher, self._envelope, self._batches,
+                      self._stopped),
+                name="arango-cursor-prefetch"
+            )
+            self._thread.daemon = True
+            self._thread.start()
+
+    def __del__(self):
+        try:
+            self._release("collected")
+        except Exception:
+            # Left to expire on the server
+            pass
+
+    def __repr__(self):
+        """Return a descriptive string of this instance."""
+        return "<ArangoDB cursor '{}'>".format(self._fetcher.cursor_id)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        """Return the next item, fetching the next batch if necessary.
+
+        :raises: CursorGetNextError, CursorDeleteError,
+            DeadlineExceededError
+        """
+        try:
+            while True:
+                for item in self._batch:
+                    return item
+                items = self._take()
+                if items is None:
+                    raise StopIteration
+                self._batch = iter(items)
+        except StopIteration:
+            raise
+        except Exception as error:
+            self._fail(error)
+            raise
+
+    # Python 2
+    next = __next__
+
+    def batches(self):
+        """Iterate over the rest of the results batch by batch.
+
+        Each batch is the list of its results as the server sent them
+        (decoded, or raw JSON with ``raw``), which is not copied unless
+        the batch is streamed or its first results were already consumed
+        one at a time.
+
+        :returns: the generator of the lists of results
+        :rtype: generator
+        :raises: CursorGetNextError, CursorDeleteError,
+            DeadlineExceededError
+        """
+        try:
+            # The results left in the batch being consumed one at a time
+            items = list(self._batch)
+            self._batch = iter(())
+            while True:
+                if not items:
+                    items = self._take()
+                    if items is None:
+                        return
+                    if not isinstance(items, list):
+                        items = list(items)
+                self.result_count += len(items)
+                yield items
+                items = None
+        except Exception as error:
+            self._fail(error)
+            raise
+
+    def to_columns(self, fields=None, dtypes=None, structured=False):
+        """Read the rest of the results into NumPy columns.
+
+        See ``arango.columns.to_columns``, whose arguments it takes but the
+        cursor.
+
+        :returns: the masked columns by field, or the masked structured
+            array
+        :rtype: dict or numpy.ma.MaskedArray
+        :raises: ImportError if NumPy is not installed, CursorGetNextError,
+            CursorDeleteError, DeadlineExceededError
+        """
+        return to_columns(self, fields, dtypes, structured)
+
+    def close(self):
+        """Stop the cursor, deleting the server cursor unless exhausted.
+
+        The rest of a streamed batch is read first, since the ID of the
+        server cursor comes after its results. Closing a closed cursor
+        does nothing.
+
+        :raises: CursorDeleteError
+        """
+        self._release("closed")
+
+    def _take(self):
+        """Take the results of the next batch, fetching it if necessary.
+
+        :returns: the results (see ``results``), or None if there are none
+        :rtype: list or generator or None
+        """
+        if self._pending is not None:
+            items, self._pending = self._pending, None
+            return items
+        if self._done:
+            return None
+        if self._batches is None:
+            batch = self._fetcher.fetch(self._envelope)
+        else:
+            batch, error = self._batches.get()
+            if error is not None:
+                raise error
+        if batch is None:
+            self._done = True
+            return None
+        items, self._envelope = batch
+        self.batch_index += 1
+        return items
+
+    def _fail(self, error):
+        """Stop the cursor after its failure, like a generator would."""
+        self._done = True
+        self._pending = None
+        self._batch = iter(())
+        self._stop()
+        self._fetcher.end_span(error)
+
+    def _release(self, reason):
+        """Stop the cursor and delete the server cursor, if still held.
+
+        :param reason: the reason of the release, see ``cursor_counts``
+        :type reason: str
+        """
+        self._stop()
+        thread, self._thread = self._thread, None
+        if thread is not None and thread is not current_thread():
+            # Wait for the fetch in progress, if any, to be done with the
+            # server cursor
+            thread.join()
+        fetcher = self._fetcher
+        if not self._done and fetcher.stream:
+            # The ID of the server cursor may follow the results
+            for _ in self._batch if self._pending is None else self._pending:
+                pass
+            if fetcher.cursor_id is None and self._envelope.get("hasMore"):
+                fetcher.open(self._envelope["id"])
+        self._done = True
+        self._pending = None
+        self._batch = iter(())
+        try:
+            fetcher.delete(reason)
+        finally:
+            fetcher.end_span()
+
+    def _stop(self):
+        """Stop the prefetching thread, if any."""
+        if self._stopped is None:
+            return
+        self._stopped.set()
+        # Make room for the batch the thread may be waiting to queue
+        try:
+            while True:
+                self._batches.get_nowait()
+        except Empty:
+            pass
+
+
+# The former generator function, which the class replaces
+cursor = Cursor
+
+
+class CursorRegistry(object):
+    """Thread-safe counts of the server cursors held by this process.
+
+    The server cursors are counted once opened (i.e. once a batch is known
+    to follow the first one), and once released: ``exhausted`` once their
+    last batch has arrived, ``closed`` by ``Cursor.close``, ``collected``
+    on garbage collection and ``exit`` at interpreter exit. A server cursor
+    whose deletion failed is still held, and not counted released. Many
+    collected cursors tell of cursors abandoned without being closed.
+
+    The server cursors of the (synchronous) cursors are also held here to
+    be released at interpreter exit.
+    """
+
+    REASONS = ("exhausted", "closed", "collected", "exit")
+
+    def __init__(self):
+        self._counts = dict.fromkeys(("opened",) + self.REASONS, 0)
+        self._fetchers = set()
+        self._lock = Lock()
+
+    def __repr__(self):
+        """Return a descriptive string of this instance."""
+        return "<ArangoDB cursor registry ({} open)>".format(
+            self.counts()["open"]
+        )
+
+    def opened(self, fetcher=None):
+        """Count a server cursor opened.
+
+        :param fetcher: the fetcher holding it, to release at exit
+        :type fetcher: arango.cursor._Fetcher or None
+        """
+        with self._lock:
+            self._counts["opened"] += 1
+            if fetcher is not None:
+                self._fetchers.add(fetcher)
+
+    def released(self, reason, fetcher=None):
+        """Count a server cursor released.
+
+        :param reason: the reason of the release, one of ``REASONS``
+        :type reason: str
+        :param fetcher: the fetcher which held it
+        :type fetcher: arango.cursor._Fetcher or None
+        """
+        with self._lock:
+            self._counts[reason] += 1
+            self._fetchers.discard(fetcher)
+
+    def counts(self):
+        """Return the counts, and the number of server cursors ``open``.
+
+        :rtype: dict
+        """
+        with self._lock:
+            counts = dict(self._counts)
+        counts["open"] = counts["opened"] - sum(
+            counts[reason] for reason in self.REASONS
+        )
+        return counts
+
+    def release_all(self):
+        """Release the server cursors still held, at interpreter exit."""
+        with self._lock:
+            fetchers = list(self._fetchers)
+        for fetcher in fetchers:
+            try:
+                fetcher.delete("exit")
+            except Exception:
+                # Left to expire on the server
+                pass
+
+
+registry = CursorRegistry()
+atexit.register(registry.release_all)
+
+
+def cursor_counts():
+    """Return the counts of the server cursors held by this process.
+
+    See ``CursorRegistry``.
+
+    :returns: the number of server cursors ``open``, ``opened`` and
+        released, by reason of the release
+    :rtype: dict
+    """
+    return registry.counts()
+
+
+class _Fetcher(object):
+    """The fetches of the next batches of a server cursor.
+
+    Follow-up requests must go to the ``endpoint`` (i.e. coordinator)
+    holding the cursor.
     """
-    for item in response.body["result"]:
-        yield item
-    cursor_id = None
-    while response.body["hasMore"]:
+
+    __slots__ = ("api", "endpoint", "compress", "deadline", "span",
+                 "stream", "raw", "cursor_id")
+
+    def __init__(self, api, endpoint, compress, deadline, span, stream,
+                 raw):
+        self.api = api
+        self.endpoint = endpoint
+        self.compress = compress
+        self.deadline = deadline
+        self.span = span
+        self.stream = stream
+        self.raw = raw
+        self.cursor_id = None
+
+    def fetch(self, envelope):
+        """Fetch the batch following the one of ``envelope``.
+
+        :param envelope: the envelope of the current batch, see ``results``
+        :type envelope: dict
+        :returns: the iterator of the results of the next batch and its
+            envelope, or None if there is none
+        :rtype: tuple or None
+        :raises: CursorGetNextError, CursorDeleteError,
+            DeadlineExceededError
+        """
+        if not envelope["hasMore"]:
+            if self.cursor_id is not None:
+                # The last streamed batch is in
+                self.delete()
+            return None
+        if self.cursor_id is None:
+            self.open(envelope["id"])
+        api = self.api
+        with api.tracer.activate(self.span):
+            res = api.put(
+                "/_api/cursor/{}".format(self.cursor_id),
+                endpoint=self.endpoint,
+                compress=self.compress,
+                deadline=self.deadline,
+                # Sending it again would skip a batch
+                retry=False,
+                stream=self.stream,
+                headers=raw_headers() if self.raw else None
+            )
+        if res.status_code not in HTTP_OK:
+            raise CursorGetNextError(res)
+        envelope = {}
+        items = results(res, envelope, self.raw)
+        # Known upfront unless the batch is streamed
+        if envelope.get("hasMore") is False:
+            self.delete()
+        return items, envelope
+
+    def open(self, cursor_id):
+        """Hold the server cursor, until deleted.
+
+        :param cursor_id: the ID of the server cursor
+        :type cursor_id: str
+        """
+        self.cursor_id = cursor_id
+        registry.opened(self)
+
+    def delete(self, reason="exhausted"):
+        """Delete the server cursor, if held, which ends the operation.
+
+        :param reason: the reason of the deletion, see ``CursorRegistry``
+        :type reason: str
+        :raises: CursorDeleteError
+        """
+        cursor_id, self.cursor_id = self.cursor_id, None
         if cursor_id is None:
-            cursor_id = response.body["id"]
-        response = api.put("/_api/cursor/{}".format(cursor_id))
-        if response.status_code not in HTTP_OK:
-            raise CursorGetNextError(response)
-        for item in response.body["result"]:
-            yield item
-    if cursor_id is not None:
-        response = api.delete("/api/cursor/{}".format(cursor_id))
-        if response.status_code not in {404, 202}:
-            raise CursorDeleteError(response)
+            return
+        try:
+            with self.api.tracer.activate(self.span):
+                res = self.api.delete(
+                    "/_api/cursor/{}".format(cursor_id),
+                    endpoint=self.endpoint
+                )
+            if res.status_code not in {404, 202}:
+                raise CursorDeleteError(res)
+        except BaseException:
+            # Still held, and released again on close, on garbage
+            # collection or at exit
+            self.cursor_id = cursor_id
+            raise
+        registry.released(reason, self)
+        self.end_span()
+
+    def end_span(self, error=None):
+        """End the span of the operation, once, recording its exception."""
+        span, self.span = self.span, None
+        if span is None:
+            return
+        if error is not None:
+            span.record_error(error)
+        span.end()
+
+
+def _prefetch(fetcher, envelope, batches, stopped):
+    """Fetch the next batches into the queue, on a background thread.
+
+    The thread stops after the last batch, after the first failure, or
+    once the cursor is stopped.
+    """
+    while not stopped.is_set():
+        try:
+            batch = fetcher.fetch(envelope)
+        except Exception as error:
+            batches.put((None, error))
+            return
+        batches.put((batch, None))
+        if batch is None:
+            return
+        envelope = batch[1]
+
+
+def is_streamed(response):
+    """Return True if the batch is parsed as it streams in.
+
+    The binary codecs (i.e. VelocyPack) decode the whole batch at once.
+
+    :param response: ArangoDB response object
+    :type response: arango.response.Response
+    :rtype: bool
+    """
+    return response.stream is not None and response.codec is not None \
+        and not response.codec.binary
+
+
+def results(response, envelope, raw=False):
+    """Return the results of a batch.
+
+    The other members of the batch (e.g. ``hasMore`` and ``id``) are
+    stored into ``envelope``, only once the results are consumed if the
+    batch is streamed.
+
+    :param response: ArangoDB response object
+    :type response: arango.response.Response
+    :param envelope: the dict to store the other members into
+    :type envelope: dict
+    :param raw: whether to return the results as raw JSON, never decoded
+    :type raw: bool
+    :returns: the list of the results, or their generator if the batch is
+        streamed
+    :rtype: list or generator
+    """
+    if raw:
+        decode = response.codec.json_codec.decode
+        if response.stream is not None:
+            return iter_results(response.stream, envelope, decode)
+        return raw_results(response.content, envelope, decode)
+    if is_streamed(response):
+        return parse_results(response.stream, envelope, response.codec.decode)
+    envelope.update(response.body)
+    return envelope.pop("result")
@@ -1,15 +1,19 @@
 """ArangoDB Database."""
 
-import json
-import inspect
-
+try:
+    from inspect import getfullargspec as getargspec
+except ImportError:  # Python 2
+    from inspect import getargspec
 
 from arango.utils import uncamelify, stringify_request
 from arango.graph import Graph
 from arango.collection import Collection
-from arango.cursor import cursor
+from arango.cursor import Cursor
+from arango.deadline import Deadline
 from arango.constants import HTTP_OK
 from arango.exceptions import *
+from arango.pipeline import Call, Return, steps
+from arango.streaming import raw_headers
 
 
 class Database(object):
@@ -24,6 +28,11 @@ class Database(object):
     6. Graph Management
     """
 
+    # The wrappers of the collections, graphs and cursors of the database
+    _collection_class = Collection
+    _graph_class = Graph
+    _cursor = Cursor
+
     def __init__(self, name, api):
         """Initialize the wrapper object.
 
@@ -42,24 +51,26 @@ class Database(object):
         return "<ArangoDB database '{}'>".format(self.name)
 
     def _refresh_collection_cache(self):
-        """Invalidate the collection cache."""
-        real_cols = set(self.collections["all"])
-        cached_cols = set(self._collection_cache)
-        for col_name in cached_cols - real_cols:
+        """Return the steps invalidating the collection cache."""
+        real_cols = {}
+        for collection in (yield self._list_collections()):
+            real_cols[collection["name"]] = collection["type"] == 3
+        for col_name in set(self._collection_cache) - set(real_cols):
             del self._collection_cache[col_name]
-        for col_name in real_cols - cached_cols:
-            self._collection_cache[col_name] = Collection(
-                name=col_name, api=self.api
-            )
+        for col_name, is_edge in real_cols.items():
+            if col_name not in self._collection_cache:
+                self._collection_cache[col_name] = self._collection_class(
+                    name=col_name, api=self.api, is_edge=is_edge
+                )
 
     def _refresh_graph_cache(self):
-        """Invalidate the graph cache."""
-        real_graphs = set(self.graphs)
+        """Return the steps invalidating the graph cache."""
+        real_graphs = set((yield self._graphs()))
         cached_graphs = set(self._graph_cache)
         for graph_name in cached_graphs - real_graphs:
             del self._graph_cache[graph_name]
         for graph_name in real_graphs - cached_graphs:
-            self._graph_cache[graph_name] = Graph(
+            self._graph_cache[graph_name] = self._graph_class(
                 name=graph_name, api=self.api
             )
 
@@ -71,10 +82,19 @@ class Database(object):
         :rtype: dict
         :raises: DatabasePropertyError
         """
-        res = self.api.get("/_api/database/current")
+        return self.api.run(self._properties())
+
+    def _properties(self):
+        """Return the steps fetching the properties of this database."""
+        res = yield Call(self.api.get, "/_api/database/current")
         if res.status_code not in HTTP_OK:
             raise DatabasePropertyError(res)
-        return uncamelify(res.body["result"])
+        raise Return(uncamelify(res.body["result"]))
+
+    def _property(self, name):
+        """Return the steps fetching one of the properties of this database."""
+        properties = yield self._properties()
+        raise Return(properties[name])
 
     @property
     def id(self):
@@ -84,7 +104,7 @@ class Database(object):
         :rtype: str
         :raises: DatabasePropertyError
         """
-        return self.properties["id"]
+        return self.api.run(self._property("id"))
 
     @property
     def file_path(self):
@@ -94,7 +114,7 @@ class Database(object):
         :rtype: str
         :raises: DatabasePropertyError
         """
-        return self.properties["path"]
+        return self.api.run(self._property("path"))
 
     @property
     def is_system(self):
@@ -104,14 +124,15 @@ class Database(object):
         :rtype: bool
         :raises: DatabasePropertyError
         """
-        return self.properties["is_system"]
+        return self.api.run(self._property("is_system"))
 
     ###############
     # AQL Queries #
     ###############
 
+    @steps
     def explain_query(self, query, all_plans=False, max_plans=None,
-                      optimizer_rules=None):
+                      optimizer_rules=None, compress=None):
         """Explain the AQL query.
 
         This method does not execute the query, but only inspect it and
@@ -131,6 +152,10 @@ class Database(object):
         :type max_plans: None or int
         :param optimizer_rules: list of optimizer rules
         :type optimizer_rules: list
+        :param compress: whether to compress the request and accept a
+            compressed response ('gzip', 'deflate' or True/False), or None
+            to use the setting of the API wrapper
+        :type compress: str or bool or None
         :returns: the query plan or list of plans (if all_plans is True)
         :rtype: dict or list
         :raises: AQLQueryExplainError
@@ -140,16 +165,20 @@ class Database(object):
             options["maxNumberOfPlans"] = max_plans
         if optimizer_rules is not None:
             options["optimizer"] = {"rules": optimizer_rules}
-        res = self.api.post(
-            "/_api/explain", data={"query": query, "options": options}
+        res = yield Call(
+            self.api.post,
+            "/_api/explain",
+            data={"query": query, "options": options},
+            compress=compress
         )
         if res.status_code not in HTTP_OK:
             raise AQLQueryExplainError(res)
         if "plan" in res.body:
-            return uncamelify(res.body["plan"])
+            raise Return(uncamelify(res.body["plan"]))
         else:
-            return uncamelify(res.body["plans"])
+            raise Return(uncamelify(res.body["plans"]))
 
+    @steps
     def validate_query(self, query):
         """Validate the AQL query.
 
@@ -157,13 +186,15 @@ class Database(object):
         :type query: str
         :raises: AQLQueryValidateError
         """
-        res = self.api.post("/_api/query", data={"query": query})
+        res = yield Call(self.api.post, "/_api/query", data={"query": query})
         if res.status_code not in HTTP_OK:
             raise AQLQueryValidateError(res)
 
+    @steps
     def execute_query(self, query, count=False, batch_size=None, ttl=None,
                       bind_vars=None, full_count=None, max_plans=None,
-                      optimizer_rules=None):
+                      optimizer_rules=None, compress=None, deadline=None,
+                      stream=False, raw=False, prefetch=0):
         """Execute the AQL query and return the result.
 
         For more information on ``full_count`` please refer to:
@@ -184,9 +215,28 @@ class Database(object):
         :type max_plans: None or int
         :param optimizer_rules: list of optimizer rules
         :type optimizer_rules: list
+        :param compress: whether to compress the request and accept a
+            compressed response ('gzip', 'deflate' or True/False), or None
+            to use the setting of the API wrapper
+        :type compress: str or bool or None
+        :param deadline: the seconds the query and the fetches of all its
+            batches may take, or the deadline to share with other calls;
+            the time spent between two batches counts too
+        :type deadline: arango.deadline.Deadline or int or float or None
+        :param stream: whether to parse the batches one result at a time
+            as they are received rather than whole (see ``arango.streaming``)
+        :type stream: bool
+        :param raw: whether to return the results as raw JSON (bytes or
+            memoryview) rather than decoding them, e.g. to relay them as is
+        :type raw: bool
+        :param prefetch: the max number of batches to fetch ahead while
+            the current one is consumed (default: fetch them on demand)
+        :type prefetch: int
         :returns: the cursor from executing the query
-        :raises: AQLQueryExecuteError, CursorDeleteError
+        :raises: AQLQueryExecuteError, CursorDeleteError,
+            DeadlineExceededError
         """
+        deadline = Deadline.of(deadline)
         options = {}
         if full_count is not None:
             options["fullCount"] = full_count
@@ -208,16 +258,39 @@ class Database(object):
         if options:
             data["options"] = options
 
-        res = self.api.post("/_api/cursor", data=data)
-        if res.status_code not in HTTP_OK:
-            raise AQLQueryExecuteError(res)
-        return cursor(self.api, res)
+        with self.api.tracer.span(
+            "ArangoDB execute_query",
+            {
+                "db.system": "arangodb",
+                "db.name": self.api.database,
+                "db.operation": "execute_query",
+                "db.statement": query,
+                "db.arangodb.bind_vars": sorted(bind_vars or ()),
+            },
+            end=False
+        ) as span:
+            res = yield Call(
+                self.api.post,
+                "/_api/cursor",
+                data=data,
+                headers=raw_headers() if raw else None,
+                compress=compress,
+                deadline=deadline,
+                stream=stream
+            )
+            if res.status_code not in HTTP_OK:
+                raise AQLQueryExecuteError(res)
+        raise Return(self._cursor(
+            self.api, res, compress=compress, deadline=deadline, span=span,
+            stream=stream, raw=raw, prefetch=prefetch
+        ))
 
     #########################
     # Collection Management #
     #########################
 
     @property
+    @steps
     def collections(self):
         """Return the names of the collections in this database.
 
@@ -225,27 +298,31 @@ class Database(object):
         :rtype: dict
         :raises: CollectionListError
         """
-        res = self.api.get("/_api/collection")
-        if res.status_code not in HTTP_OK:
-            raise CollectionListError(res)
-
         user_collections = []
         system_collections = []
-        for collection in res.body["result"]:
+        for collection in (yield self._list_collections()):
             if collection["isSystem"]:
                 system_collections.append(collection["name"])
             else:
                 user_collections.append(collection["name"])
-        return {
+        raise Return({
             "user": user_collections,
             "system": system_collections,
             "all": user_collections + system_collections,
-        }
+        })
+
+    def _list_collections(self):
+        """Return the steps fetching the descriptions of the collections."""
+        res = yield Call(self.api.get, "/_api/collection")
+        if res.status_code not in HTTP_OK:
+            raise CollectionListError(res)
+        raise Return(res.body["result"])
 
     def col(self, name):
         """Alias for self.collection."""
         return self.collection(name)
 
+    @steps
     def collection(self, name):
         """Return the Collection object of the specified name.
 
@@ -257,14 +334,13 @@ class Database(object):
         """
         if not isinstance(name, str):
             raise TypeError("Expecting a str.")
-        if name in self._collection_cache:
-            return self._collection_cache[name]
-        else:
-            self._refresh_collection_cache()
+        if name not in self._collection_cache:
+            yield self._refresh_collection_cache()
             if name not in self._collection_cache:
                 raise CollectionNotFoundError(name)
-            return self._collection_cache[name]
+        raise Return(self._collection_cache[name])
 
+    @steps
     def create_collection(self, name, wait_for_sync=False, do_compact=True,
                           journal_size=None, is_system=False, is_edge=False,
                           is_volatile=False, key_generator_type="traditional",
@@ -325,12 +401,14 @@ class Database(object):
         if shard_keys is not None:
             data["shardKeys"] = shard_keys
 
-        res = self.api.post("/_api/collection", data=data)
+        res = yield Call(self.api.post, "/_api/collection", data=data)
         if res.status_code not in HTTP_OK:
             raise CollectionCreateError(res)
-        self._refresh_collection_cache()
-        return self.collection(name)
+        yield self._refresh_collection_cache()
+        collection = yield Call(self.collection, name)
+        raise Return(collection)
 
+    @steps
     def delete_collection(self, name):
         """Delete the specified collection from this database.
 
@@ -338,11 +416,12 @@ class Database(object):
         :type name: str
         :raises: CollectionDeleteError
         """
-        res = self.api.delete("/_api/collection/{}".format(name))
+        res = yield Call(self.api.delete, "/_api/collection/{}".format(name))
         if res.status_code not in HTTP_OK:
             raise CollectionDeleteError(res)
-        self._refresh_collection_cache()
+        yield self._refresh_collection_cache()
 
+    @steps
     def rename_collection(self, name, new_name):
         """Rename the specified collection in this database.
 
@@ -352,14 +431,16 @@ class Database(object):
         :type new_name: str
         :raises: CollectionRenameError
         """
-        res = self.api.put(
+        res = yield Call(
+            self.api.put,
             "/_api/collection/{}/rename".format(name),
             data={"name": new_name}
         )
         if res.status_code not in HTTP_OK:
             raise CollectionRenameError(res)
-        self._refresh_collection_cache()
+        yield self._refresh_collection_cache()
 
+    @steps
     def load_collection(self, name):
         """Load the specified collection into memory.
 
@@ -369,8 +450,10 @@ class Database(object):
         :rtype: str
         :raises: CollectionLoadError
         """
-        self.collection(name).load()
+        collection = yield Call(self.collection, name)
+        yield Call(collection.load)
 
+    @steps
     def unload_collection(self, name):
         """Unload the specified collection from memory.
 
@@ -380,8 +463,10 @@ class Database(object):
         :rtype: str
         :raises: CollectionUnloadError
         """
-        self.collection(name).unload()
+        collection = yield Call(self.collection, name)
+        yield Call(collection.unload)
 
+    @steps
     def truncate_collection(self, name):
         """Delete all documents from the specified collection.
 
@@ -389,17 +474,22 @@ class Database(object):
         :type name: str
         :raises: CollectionTruncateError
         """
-        self.collection(name).truncate()
+        collection = yield Call(self.collection, name)
+        yield Call(collection.truncate)
 
     ##################
     # Batch Requests #
     ##################
 
-    def execute_batch(self, requests):
+    @steps
+    def execute_batch(self, requests, retry=None):
         """Execute ArangoDB API calls in a batch.
 
         :param requests: ArangoDB requests
         :type requests: list
+        :param retry: whether to send the batch again after a transient
+            failure (default: if the retry policy retries POST requests)
+        :type retry: bool or None
         :raises: BatchInvalidError, BatchExecuteError
         """
 
@@ -411,33 +501,54 @@ class Database(object):
                 raise BatchInvalidError(
                     "pos {}: malformed request".format(content_id)
                 )
-            if "_batch" not in inspect.getargspec(func)[0]:
+            # The methods written as steps are wrapped, see arango.pipeline
+            method = getattr(func, "__wrapped__", func)
+            if "_batch" not in getargspec(method)[0]:
                 raise BatchInvalidError(
                     "pos {}: ArangoDB method '{}' does not support "
                     "batch execution".format(content_id, func.__name__)
                 )
             kwargs["_batch"] = True
-            res = func(*args, **kwargs)
+            res = yield Call(func, *args, **kwargs)
             data += "--XXXsubpartXXX\r\n"
             data += "Content-Type: application/x-arango-batchpart\r\n"
             data += "Content-Id: {}\r\n\r\n".format(content_id)
-            data += "{}\r\n".format(stringify_request(**res))
+            data += "{}\r\n".format(
+                stringify_request(codec=self.api.codec.json_codec, **res)
+            )
         data += "--XXXsubpartXXX--\r\n\r\n"
-        res = self.api.post(
-            "/_api/batch",
-            headers={
-                "Content-Type": "multipart/form-data; boundary=XXXsubpartXXX"
-            },
-            data=data,
-        )
-        if res.status_code not in HTTP_OK:
-            raise BatchExecuteError(res)
-        if res.body is None:
-            return []
-        return [
-            json.loads(string) for string in res.body.split("\r\n") if
+        with self.api.tracer.span(
+            "ArangoDB execute_batch",
+            {
+                "db.system": "arangodb",
+                "db.name": self.api.database,
+                "db.operation": "execute_batch",
+                "db.arangodb.batch_size": len(requests),
+            }
+        ):
+            res = yield Call(
+                self.api.post,
+                "/_api/batch",
+                headers={
+                    "Content-Type":
+                        "multipart/form-data; boundary=XXXsubpartXXX"
+                },
+                data=data.encode("utf-8"),
+                retry=retry
+            )
+            if res.status_code not in HTTP_OK:
+                raise BatchExecuteError(res)
+        # The multipart response is not JSON, so parse the raw content
+        content = res.content
+        if isinstance(content, bytes):
+            content = content.decode("utf-8")
+        if not content:
+            raise Return([])
+        raise Return([
+            self.api.codec.json_codec.decode(string)
+            for string in content.split("\r\n") if
             string.startswith("{") and string.endswith("}")
-        ]
+        ])
 
     #################
     # AQL Functions #
@@ -451,11 +562,16 @@ class Database(object):
         :rtype: dict
         :raises: AQLFunctionListError
         """
-        res = self.api.get("/_api/aqlfunction")
+        return self.api.run(self._aql_functions())
+
+    def _aql_functions(self):
+        """Return the steps listing the AQL functions."""
+        res = yield Call(self.api.get, "/_api/aqlfunction")
         if res.status_code not in HTTP_OK:
             raise AQLFunctionListError(res)
-        return {func["name"]: func["code"]for func in res.body}
+        raise Return({func["name"]: func["code"]for func in res.body})
 
+    @steps
     def create_aql_function(self, name, code):
         """Create a new AQL function.
 
@@ -468,11 +584,13 @@ class Database(object):
         :raises: AQLFunctionCreateError
         """
         data = {"name": name, "code": code}
-        res = self.api.post("/_api/aqlfunction", data=data)
+        res = yield Call(self.api.post, "/_api/aqlfunction", data=data)
         if res.status_code not in (200, 201):
             raise AQLFunctionCreateError(res)
-        return self.aql_functions
+        functions = yield self._aql_functions()
+        raise Return(functions)
 
+    @steps
     def delete_aql_function(self, name, group=None):
         """Delete the AQL function of the given name.
 
@@ -489,18 +607,21 @@ class Database(object):
         :rtype: dict
         :raises: AQLFunctionDeleteError
         """
-        res = self.api.delete(
+        res = yield Call(
+            self.api.delete,
             "/_api/aqlfunction/{}".format(name),
             params={"group": group} if group is not None else {}
         )
         if res.status_code not in HTTP_OK:
             raise AQLFunctionDeleteError(res)
-        return self.aql_functions
+        functions = yield self._aql_functions()
+        raise Return(functions)
 
     ################
     # Transactions #
     ################
 
+    @steps
     def execute_transaction(self, action, read_collections=None,
                             write_collections=None, params=None,
                             wait_for_sync=False, lock_timeout=None):
@@ -537,10 +658,12 @@ class Database(object):
             "waitForSync": wait_for_sync,
             "lockTimeout": lock_timeout,
         }
-        res = self.api.post(path=path, data=data, params=http_params)
+        res = yield Call(
+            self.api.post, path=path, data=data, params=http_params
+        )
         if res.status_code not in HTTP_OK:
             raise TransactionExecuteError(res)
-        return res.body["result"]
+        raise Return(res.body["result"])
 
     ####################
     # Graph Management #
@@ -554,11 +677,16 @@ class Database(object):
         :rtype: dict
         :raises: GraphGetError
         """
-        res = self.api.get("/_api/gharial")
+        return self.api.run(self._graphs())
+
+    def _graphs(self):
+        """Return the steps listing the graphs."""
+        res = yield Call(self.api.get, "/_api/gharial")
         if res.status_code not in (200, 202):
             raise GraphListError(res)
-        return [graph["_key"] for graph in res.body["graphs"]]
+        raise Return([graph["_key"] for graph in res.body["graphs"]])
 
+    @steps
     def graph(self, name):
         """Return the Graph object of the specified name.
 
@@ -570,14 +698,13 @@ class Database(object):
         """
         if not isinstance(name, str):
             raise TypeError("Expecting a str.")
-        if name in self._graph_cache:
-            return self._graph_cache[name]
-        else:
-            self._refresh_graph_cache()
+        if name not in self._graph_cache:
+            yield self._refresh_graph_cache()
             if name not in self._graph_cache:
                 raise GraphNotFoundError(name)
-            return self._graph_cache[name]
+        raise Return(self._graph_cache[name])
 
+    @steps
     def create_graph(self, name, edge_definitions=None,
                      orphan_collections=None):
         """Create a new graph in this database.
@@ -600,12 +727,14 @@ class Database(object):
         if orphan_collections is not None:
             data["orphanCollections"] = orphan_collections
 
-        res = self.api.post("/_api/gharial", data=data)
+        res = yield Call(self.api.post, "/_api/gharial", data=data)
         if res.status_code not in HTTP_OK:
             raise GraphCreateError(res)
-        self._refresh_graph_cache()
-        return self.graph(name)
+        yield self._refresh_graph_cache()
+        graph = yield Call(self.graph, name)
+        raise Return(graph)
 
+    @steps
     def delete_graph(self, name):
         """Delete the graph of the given name from this database.
 
@@ -613,7 +742,7 @@ class Database(object):
         :type name: str
         :raises: GraphDeleteError
         """
-        res = self.api.delete("/_api/gharial/{}".format(name))
+        res = yield Call(self.api.delete, "/_api/gharial/{}".format(name))
         if res.status_code not in HTTP_OK:
             raise GraphDeleteError(res)
-        self._refresh_graph_cache()
+        yield self._refresh_graph_cache()
@@ -0,0 +1,58 @@
+"""Deadlines bounding the duration of (multi-request) operations."""
+
+try:
+    from time import monotonic
+except ImportError:  # Python 2
+    from time import time as monotonic
+
+
+class Deadline(object):
+    """Time budget shared by all the requests of an operation.
+
+    For example, the follow-up requests fetching the batches of a cursor
+    share the budget of the query which created the cursor, so the whole
+    iteration fails with ``DeadlineExceededError`` rather than taking up to
+    the client timeouts for every batch.
+
+    :param timeout: the seconds the operation may take from now
+    :type timeout: int or float
+    """
+
+    def __init__(self, timeout):
+        self.timeout = timeout
+        self.expires_at = monotonic() + timeout
+
+    def __repr__(self):
+        """Return a descriptive string of this instance."""
+        return "<ArangoDB deadline ({:.3f}s left)>".format(self.remaining())
+
+    @classmethod
+    def of(cls, deadline):
+        """Return the deadline of an operation given its timeout.
+
+        :param deadline: the seconds the operation may take from now, the
+            deadline itself, or None
+        :type deadline: int or float or arango.deadline.Deadline or None
+        :returns: the deadline, or None if there is none
+        :rtype: arango.deadline.Deadline or None
+        """
+        if deadline is None or isinstance(deadline, cls):
+            return deadline
+        return cls(deadline)
+
+    def remaining(self):
+        """Return the seconds left before the deadline.
+
+        :returns: the seconds left, or 0 if the deadline has passed
+        :rtype: float
+        """
+        return max(0.0, self.expires_at - monotonic())
+
+    @property
+    def expired(self):
+        """Return True if the deadline has passed.
+
+        :returns: True if no time is left
+        :rtype: bool
+        """
+        return monotonic() >= self.expires_at
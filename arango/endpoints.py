@@ -0,0 +1,244 @@
+"""ArangoDB endpoints and client-side load balancing."""
+
+import random
+from threading import Lock
+from time import time
+
+try:
+    from urllib.parse import quote, unquote
+except ImportError:  # Python 2
+    from urllib import quote, unquote
+
+from arango.exceptions import InvalidArgumentError
+
+
+# Valid load balancing strategies
+LOAD_BALANCING_STRATEGIES = {"round_robin", "random", "least_outstanding"}
+
+# URL scheme of the endpoints listening on a Unix domain socket, whose
+# network location is the percent-encoded path of the socket
+UNIX_SCHEME = "http+unix"
+
+
+def endpoint_url(protocol, host, port):
+    """Return the base URL of an ArangoDB server.
+
+    If ``protocol`` is 'unix', ``host`` is the path of the Unix domain
+    socket the server listens on and ``port`` is ignored.
+
+    :param protocol: 'http', 'https' or 'unix'
+    :type protocol: str
+    :param host: the host name, or the path of the Unix domain socket
+    :type host: str
+    :param port: the port
+    :type port: int or str
+    :returns: the base URL
+    :rtype: str
+    """
+    if protocol == "unix":
+        return "{}://{}".format(UNIX_SCHEME, quote(host, safe=""))
+    return "{}://{}:{}".format(protocol, host, port)
+
+
+def unix_socket_path(netloc):
+    """Return the path of the Unix domain socket of an endpoint URL.
+
+    :param netloc: the network location of the URL
+    :type netloc: str
+    :returns: the path of the socket
+    :rtype: str
+    """
+    return unquote(netloc)
+
+
+def is_unix_url(url):
+    """Return True if the URL points to a Unix domain socket.
+
+    :param url: the URL
+    :type url: str
+    :returns: True if the scheme is 'http+unix', False otherwise
+    :rtype: bool
+    """
+    return url.startswith(UNIX_SCHEME + "://")
+
+
+class Endpoint(object):
+    """An ArangoDB server (e.g. a cluster coordinator) to send requests to.
+
+    ArangoDB's own notation of Unix domain socket endpoints (e.g.
+    'unix:///tmp/arangodb.sock') is converted to the 'http+unix' scheme.
+
+    :param url: the base URL of the server (e.g. 'http://localhost:8529')
+    :type url: str
+    """
+
+    def __init__(self, url):
+        if url.startswith("unix://"):
+            url = endpoint_url("unix", url[len("unix://"):], None)
+        self.url = url.rstrip("/")
+        self.outstanding = 0
+        self.failures = 0
+        self.ejected_until = None
+        self.probing = False
+
+    def __repr__(self):
+        """Return a descriptive string of this instance."""
+        return "<ArangoDB endpoint '{}'>".format(self.url)
+
+    @property
+    def is_unix(self):
+        """Return True if this endpoint is a Unix domain socket.
+
+        :returns: True if the server is reached through a Unix socket
+        :rtype: bool
+        """
+        return is_unix_url(self.url)
+
+    @property
+    def is_ejected(self):
+        """Return True if this endpoint is currently taken out of rotation.
+
+        :returns: True if ejected, False otherwise
+        :rtype: bool
+        """
+        return self.ejected_until is not None
+
+
+class EndpointPool(object):
+    """Thread-safe set of endpoints with a load balancing strategy.
+
+    Requests are spread over the endpoints in rotation according to
+    ``strategy``, which must be one of:
+
+    'round_robin': cycle through the endpoints in order
+    'random': pick an endpoint at random
+    'least_outstanding': pick the endpoint with the fewest requests in flight
+
+    An endpoint whose request fails at the transport level is ejected from
+    the rotation. Once ``probe_interval`` seconds have passed it is handed
+    out by ``due_for_probe`` so that the caller can probe it and either
+    ``restore`` it or ``eject`` it again. If every endpoint is ejected, the
+    one ejected the longest is used rather than failing outright.
+
+    :param urls: the base URLs of the servers (e.g. 'http://host:8529')
+    :type urls: list
+    :param strategy: the load balancing strategy (default: 'round_robin')
+    :type strategy: str
+    :param probe_interval: the seconds before probing an ejected endpoint
+    :type probe_interval: int or float
+    :raises: InvalidArgumentError
+    """
+
+    def __init__(self, urls, strategy="round_robin", probe_interval=10):
+        if not urls:
+            raise InvalidArgumentError("at least one endpoint is required")
+        if strategy not in LOAD_BALANCING_STRATEGIES:
+            raise InvalidArgumentError(
+                "load balancing strategy must be one of {}".format(
+                    sorted(LOAD_BALANCING_STRATEGIES)
+                )
+            )
+        self.endpoints = [Endpoint(url) for url in urls]
+        self.strategy = strategy
+        self.probe_interval = probe_interval
+        self._lock = Lock()
+        self._next = 0
+
+    def __repr__(self):
+        """Return a descriptive string of this instance."""
+        return "<ArangoDB endpoint pool {}>".format(
+            [endpoint.url for endpoint in self.endpoints]
+        )
+
+    def __len__(self):
+        """Return the number of endpoints in this pool."""
+        return len(self.endpoints)
+
+    def _select(self):
+        """Return the next endpoint according to the strategy."""
+        healthy = [e for e in self.endpoints if e.ejected_until is None]
+        if not healthy:
+            return min(self.endpoints, key=lambda e: e.ejected_until)
+        if self.strategy == "random":
+            return random.choice(healthy)
+        self._next = (self._next + 1) % len(healthy)
+        if self.strategy == "round_robin":
+            return healthy[self._next]
+        # Rotate the candidates so that ties do not favour the first one
+        rotated = healthy[self._next:] + healthy[:self._next]
+        return min(rotated, key=lambda e: e.outstanding)
+
+    def acquire(self, endpoint=None):
+        """Return the endpoint to send the next request to.
+
+        :param endpoint: the endpoint the request must be sent to (e.g. the
+            coordinator holding a cursor), or None to let the pool choose
+        :type endpoint: arango.endpoints.Endpoint or None
+        :returns: the endpoint, with its outstanding request count bumped
+        :rtype: arango.endpoints.Endpoint
+        """
+        with self._lock:
+            if endpoint is None:
+                endpoint = self._select()
+            endpoint.outstanding += 1
+            return endpoint
+
+    def release(self, endpoint, failed=False):
+        """Mark a request to the endpoint as finished.
+
+        :param endpoint: the endpoint returned by ``acquire``
+        :type endpoint: arango.endpoints.Endpoint
+        :param failed: whether the request failed at the transport level,
+            in which case the endpoint is ejected
+        :type failed: bool
+        """
+        with self._lock:
+            endpoint.outstanding -= 1
+            if failed:
+                self._eject(endpoint)
+
+    def _eject(self, endpoint):
+        endpoint.failures += 1
+        endpoint.ejected_until = time() + self.probe_interval
+        endpoint.probing = False
+
+    def eject(self, endpoint):
+        """Take the endpoint out of the rotation.
+
+        :param endpoint: the endpoint to eject
+        :type endpoint: arango.endpoints.Endpoint
+        """
+        with self._lock:
+            self._eject(endpoint)
+
+    def restore(self, endpoint):
+        """Put the (ejected) endpoint back into the rotation.
+
+        :param endpoint: the endpoint to restore
+        :type endpoint: arango.endpoints.Endpoint
+        """
+        with self._lock:
+            endpoint.ejected_until = None
+            endpoint.probing = False
+
+    def due_for_probe(self):
+        """Return the ejected endpoints which are due to be probed.
+
+        Each endpoint is handed out to a single caller, which must then
+        either ``restore`` or ``eject`` it.
+
+        :returns: the endpoints to probe
+        :rtype: list
+        """
+        if all(e.ejected_until is None for e in self.endpoints):
+            return []
+        now = time()
+        with self._lock:
+            due = [
+                e for e in self.endpoints
+                if e.ejected_until is not None and
+                e.ejected_until <= now and not e.probing
+            ]
+            for endpoint in due:
+                endpoint.probing = True
+            return due
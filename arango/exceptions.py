@@ -46,10 +46,42 @@ class ConnectionError(RequestError):
     """Failed to connect to ArangoDB."""
 
 
+class AuthenticationError(RequestError):
+    """Failed to obtain an authentication token from ArangoDB."""
+
+
 class InvalidArgumentError(Exception):
     """The given argument(s) are invalid."""
 
 
+class DeadlineExceededError(Exception):
+    """The deadline of the operation passed before it completed.
+
+    :param deadline: the deadline of the operation
+    :type deadline: arango.deadline.Deadline
+    """
+
+    def __init__(self, deadline):
+        self.deadline = deadline
+        super(DeadlineExceededError, self).__init__(
+            "deadline of {}s exceeded".format(deadline.timeout)
+        )
+
+
+class CircuitOpenError(Exception):
+    """The circuit breaker of the endpoint rejected the request.
+
+    :param endpoint: the endpoint whose circuit is open
+    :type endpoint: arango.endpoints.Endpoint
+    """
+
+    def __init__(self, endpoint):
+        self.endpoint = endpoint
+        super(CircuitOpenError, self).__init__(
+            "circuit open for {}".format(endpoint.url)
+        )
+
+
 ###########################
 # Miscellaneous Functions #
 ###########################
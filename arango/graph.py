@@ -3,6 +3,7 @@
 from arango.utils import uncamelify
 from arango.exceptions import *
 from arango.constants import HTTP_OK
+from arango.pipeline import Call, Return, steps
 
 
 class Graph(object):
@@ -39,12 +40,22 @@ class Graph(object):
         :rtype: dict
         :raises: GraphPropertiesError
         """
-        res = self.api.get(
+        return self.api.run(self._properties())
+
+    def _properties(self):
+        """Return the steps fetching the properties of this graph."""
+        res = yield Call(
+            self.api.get,
             "/_api/gharial/{}".format(self.name)
         )
         if res.status_code not in HTTP_OK:
             raise GraphPropertyError(res)
-        return uncamelify(res.body["graph"])
+        raise Return(uncamelify(res.body["graph"]))
+
+    def _property(self, name):
+        """Return the steps fetching one of the properties of this graph."""
+        properties = yield self._properties()
+        raise Return(properties[name])
 
     @property
     def id(self):
@@ -54,7 +65,7 @@ class Graph(object):
         :rtype: str
         :raises: GraphPropertiesError
         """
-        return self.properties["_id"]
+        return self.api.run(self._property("_id"))
 
     @property
     def revision(self):
@@ -64,7 +75,7 @@ class Graph(object):
         :rtype: str
         :raises: GraphPropertiesError
         """
-        return self.properties["_rev"]
+        return self.api.run(self._property("_rev"))
 
     ################################
     # Vertex Collection Management #
@@ -78,7 +89,7 @@ class Graph(object):
         :rtype: list
         :raises: GraphPropertiesError
         """
-        return self.properties["orphan_collections"]
+        return self.api.run(self._property("orphan_collections"))
 
     @property
     def vertex_collections(self):
@@ -88,13 +99,19 @@ class Graph(object):
         :rtype: list
         :raises: VertexCollectionListError
         """
-        res = self.api.get(
+        return self.api.run(self._vertex_collections())
+
+    def _vertex_collections(self):
+        """Return the steps fetching the vertex collections of this graph."""
+        res = yield Call(
+            self.api.get,
             "/_api/gharial/{}/vertex".format(self.name)
         )
         if res.status_code not in HTTP_OK:
             raise VertexCollectionListError(res)
-        return res.body["collections"]
+        raise Return(res.body["collections"])
 
+    @steps
     def create_vertex_collection(self, collection):
         """Create a vertex collection to this graph.
 
@@ -104,14 +121,17 @@ class Graph(object):
         :rtype: list
         :raises: VertexCollectionCreateError
         """
-        res = self.api.post(
+        res = yield Call(
+            self.api.post,
             "/_api/gharial/{}/vertex".format(self.name),
             data={"collection": collection}
         )
         if res.status_code not in HTTP_OK:
             raise VertexCollectionCreateError(res)
-        return self.vertex_collections
+        collections = yield self._vertex_collections()
+        raise Return(collections)
 
+    @steps
     def delete_vertex_collection(self, collection,
                                  drop_collection=False):
         """Delete a vertex collection from this graph.
@@ -124,13 +144,15 @@ class Graph(object):
         :rtype: list
         :raises: VertexCollectionDeleteError
         """
-        res = self.api.delete(
+        res = yield Call(
+            self.api.delete,
             "/_api/gharial/{}/vertex/{}".format(self.name, collection),
             params={"dropCollection": drop_collection}
         )
         if res.status_code not in HTTP_OK:
             raise VertexCollectionDeleteError(res)
-        return self.vertex_collections
+        collections = yield self._vertex_collections()
+        raise Return(collections)
 
     ##############################
     # Edge Definition Management #
@@ -144,8 +166,9 @@ class Graph(object):
         :rtype: list
         :raises: GraphPropertiesError
         """
-        return self.properties["edge_definitions"]
+        return self.api.run(self._property("edge_definitions"))
 
+    @steps
     def create_edge_definition(self, edge_collection, from_vertex_collections,
                                to_vertex_collections):
         """Create a edge definition to this graph.
@@ -160,7 +183,8 @@ class Graph(object):
         :rtype: list
         :raises: EdgeDefinitionCreateError
         """
-        res = self.api.post(
+        res = yield Call(
+            self.api.post,
             "/_api/gharial/{}/edge".format(self.name),
             data={
                 "collection": edge_collection,
@@ -170,8 +194,9 @@ class Graph(object):
         )
         if res.status_code not in HTTP_OK:
             raise EdgeDefinitionCreateError(res)
-        return res.body["graph"]["edgeDefinitions"]
+        raise Return(res.body["graph"]["edgeDefinitions"])
 
+    @steps
     def replace_edge_definition(self, edge_collection,
                                 from_vertex_collections,
                                 to_vertex_collections):
@@ -187,7 +212,8 @@ class Graph(object):
         :rtype: list
         :raises: EdgeDefinitionReplaceError
         """
-        res = self.api.put(
+        res = yield Call(
+            self.api.put,
             "/_api/gharial/{}/edge/{}".format(
                 self.name, edge_collection
             ),
@@ -199,8 +225,9 @@ class Graph(object):
         )
         if res.status_code not in HTTP_OK:
             raise EdgeDefinitionReplaceError(res)
-        return res.body["graph"]["edgeDefinitions"]
+        raise Return(res.body["graph"]["edgeDefinitions"])
 
+    @steps
     def delete_edge_definition(self, collection,
                                drop_collection=False):
         """Delete the specified edge definition from this graph.
@@ -213,18 +240,20 @@ class Graph(object):
         :rtype: list
         :raises: EdgeDefinitionDeleteError
         """
-        res = self.api.delete(
+        res = yield Call(
+            self.api.delete,
             "/_api/gharial/{}/edge/{}".format(self.name, collection),
             params={"dropCollection": drop_collection}
         )
         if res.status_code not in HTTP_OK:
             raise EdgeDefinitionDeleteError(res)
-        return res.body["graph"]["edgeDefinitions"]
+        raise Return(res.body["graph"]["edgeDefinitions"])
 
     #####################
     # Vertex Management #
     #####################
 
+    @steps
     def get_vertex(self, vertex_id, rev=None):
         """Return the vertex of the specified ID in this graph.
 
@@ -239,18 +268,20 @@ class Graph(object):
         :rtype: dict or None
         :raises: VertexRevisionError, VertexGetError
         """
-        res = self.api.get(
+        res = yield Call(
+            self.api.get,
             "/_api/gharial/{}/vertex/{}".format(self.name, vertex_id),
             params={"rev": rev} if rev is not None else {}
         )
         if res.status_code == 412:
             raise VertexRevisionError(res)
         elif res.status_code == 404:
-            return None
+            raise Return(None)
         elif res.status_code not in HTTP_OK:
             raise VertexGetError(res)
-        return res.body["vertex"]
+        raise Return(res.body["vertex"])
 
+    @steps
     def create_vertex(self, collection, data, wait_for_sync=False,
                       _batch=False):
         """Create a vertex to the specified vertex collection if this graph.
@@ -271,17 +302,18 @@ class Graph(object):
         path = "/_api/gharial/{}/vertex/{}".format(self.name, collection)
         params = {"waitForSync": wait_for_sync}
         if _batch:
-            return {
+            raise Return({
                 "method": "post",
                 "path": path,
                 "data": data,
                 "params": params,
-            }
-        res = self.api.post(path=path, data=data, params=params)
+            })
+        res = yield Call(self.api.post, path=path, data=data, params=params)
         if res.status_code not in HTTP_OK:
             raise VertexCreateError(res)
-        return res.body["vertex"]
+        raise Return(res.body["vertex"])
 
+    @steps
     def update_vertex(self, vertex_id, data, rev=None, keep_none=True,
                       wait_for_sync=False, _batch=False):
         """Update a vertex of the specified ID in this graph.
@@ -319,19 +351,20 @@ class Graph(object):
         elif "_rev" in data:
             params["rev"] = data["_rev"]
         if _batch:
-            return {
+            raise Return({
                 "method": "patch",
                 "path": path,
                 "data": data,
                 "params": params,
-            }
-        res = self.api.patch(path=path, data=data, params=params)
+            })
+        res = yield Call(self.api.patch, path=path, data=data, params=params)
         if res.status_code == 412:
             raise VertexRevisionError(res)
         elif res.status_code not in {200, 202}:
             raise VertexUpdateError(res)
-        return res.body["vertex"]
+        raise Return(res.body["vertex"])
 
+    @steps
     def replace_vertex(self, vertex_id, data, rev=None, wait_for_sync=False,
                        _batch=False):
         """Replace a vertex of the specified ID in this graph.
@@ -361,19 +394,20 @@ class Graph(object):
         if "_rev" in data:
             params["rev"] = data["_rev"]
         if _batch:
-            return {
+            raise Return({
                 "method": "put",
                 "path": path,
                 "data": data,
                 "params": params,
-            }
-        res = self.api.put(path=path, params=params, data=data)
+            })
+        res = yield Call(self.api.put, path=path, params=params, data=data)
         if res.status_code == 412:
             raise VertexRevisionError(res)
         elif res.status_code not in {200, 202}:
             raise VertexReplaceError(res)
-        return res.body["vertex"]
+        raise Return(res.body["vertex"])
 
+    @steps
     def delete_vertex(self, vertex_id, rev=None, wait_for_sync=False,
                       _batch=False):
         """Delete the vertex of the specified ID from this graph.
@@ -389,12 +423,12 @@ class Graph(object):
         if rev is not None:
             params["rev"] = rev
         if _batch:
-            return {
+            raise Return({
                 "method": "delete",
                 "path": path,
                 "params": params,
-            }
-        res = self.api.delete(path=path, params=params)
+            })
+        res = yield Call(self.api.delete, path=path, params=params)
         if res.status_code == 412:
             raise VertexRevisionError(res)
         if res.status_code not in {200, 202}:
@@ -404,6 +438,7 @@ class Graph(object):
     # Edge Management #
     ###################
 
+    @steps
     def get_edge(self, edge_id, rev=None):
         """Return the edge of the specified ID in this graph.
 
@@ -418,18 +453,20 @@ class Graph(object):
         :rtype: dict or None
         :raises: EdgeRevisionError, EdgeGetError
         """
-        res = self.api.get(
+        res = yield Call(
+            self.api.get,
             "/_api/gharial/{}/edge/{}".format(self.name, edge_id),
             params={} if rev is None else {"rev": rev}
         )
         if res.status_code == 412:
             raise EdgeRevisionError(res)
         elif res.status_code == 404:
-            return None
+            raise Return(None)
         elif res.status_code not in HTTP_OK:
             raise EdgeGetError(res)
-        return res.body["edge"]
+        raise Return(res.body["edge"])
 
+    @steps
     def create_edge(self, collection, data, wait_for_sync=False, _batch=False):
         """Create an edge to the specified edge collection of this graph.
 
@@ -456,17 +493,18 @@ class Graph(object):
         path = "/_api/gharial/{}/edge/{}".format(self.name, collection)
         params = {"waitForSync": wait_for_sync}
         if _batch:
-            return {
+            raise Return({
                 "method": "post",
                 "path": path,
                 "data": data,
                 "params": params,
-            }
-        res = self.api.post(path=path, data=data, params=params)
+            })
+        res = yield Call(self.api.post, path=path, data=data, params=params)
         if res.status_code not in HTTP_OK:
             raise EdgeCreateError(res)
-        return res.body["edge"]
+        raise Return(res.body["edge"])
 
+    @steps
     def update_edge(self, edge_id, data, rev=None, keep_none=True,
                     wait_for_sync=False, _batch=False):
         """Update the edge of the specified ID in this graph.
@@ -507,19 +545,20 @@ class Graph(object):
         elif "_rev" in data:
             params["rev"] = data["_rev"]
         if _batch:
-            return {
+            raise Return({
                 "method": "patch",
                 "path": path,
                 "data": data,
                 "params": params,
-            }
-        res = self.api.patch(path=path, data=data, params=params)
+            })
+        res = yield Call(self.api.patch, path=path, data=data, params=params)
         if res.status_code == 412:
             raise EdgeRevisionError(res)
         elif res.status_code not in {200, 202}:
             raise EdgeUpdateError(res)
-        return res.body["edge"]
+        raise Return(res.body["edge"])
 
+    @steps
     def replace_edge(self, edge_id, data, rev=None, wait_for_sync=False,
                      _batch=False):
         """Replace the edge of the specified ID in this graph.
@@ -552,19 +591,20 @@ class Graph(object):
         elif "_rev" in data:
             params["rev"] = data["_rev"]
         if _batch:
-            return {
+            raise Return({
                 "method": "put",
                 "path": path,
                 "data": data,
                 "params": params,
-            }
-        res = self.api.put(path=path, params=params, data=data)
+            })
+        res = yield Call(self.api.put, path=path, params=params, data=data)
         if res.status_code == 412:
             raise EdgeRevisionError(res)
         elif res.status_code not in {200, 202}:
             raise EdgeReplaceError(res)
-        return res.body["edge"]
+        raise Return(res.body["edge"])
 
+    @steps
     def delete_edge(self, edge_id, rev=None, wait_for_sync=False,
                     _batch=False):
         """Delete the edge of the specified ID from this graph.
@@ -578,14 +618,14 @@ class Graph(object):
         path = "/_api/gharial/{}/edge/{}".format(self.name, edge_id)
         params = {"waitForSync": wait_for_sync}
         if _batch:
-            return {
+            raise Return({
                 "method": "delete",
                 "path": path,
                 "params": params,
-            }
+            })
         if rev is not None:
             params["rev"] = rev
-        res = self.api.delete(path=path, params=params)
+        res = yield Call(self.api.delete, path=path, params=params)
         if res.status_code == 412:
             raise EdgeRevisionError(res)
         elif res.status_code not in {200, 202}:
@@ -595,6 +635,7 @@ class Graph(object):
     # Graph Traversals #
     ####################
 
+    @steps
     def execute_traversal(self, start_vertex, direction=None, strategy=None,
                           order=None, item_order=None, uniqueness=None,
                           max_iterations=None, min_depth=None, max_depth=None,
@@ -656,7 +697,7 @@ class Graph(object):
             "sort": sort
         }
         data = {k: v for k, v in data.items() if v is not None}
-        res = self.api.post("/_api/traversal", data=data)
+        res = yield Call(self.api.post, "/_api/traversal", data=data)
         if res.status_code not in HTTP_OK:
             raise GraphTraversalError(res)
-        return res.body["result"]
+        raise Return(res.body["result"])
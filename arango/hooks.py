@@ -0,0 +1,288 @@
+"""Request lifecycle hooks for instrumenting the API calls."""
+
+import re
+from threading import Lock
+
+from arango.deadline import monotonic
+from arango.exceptions import InvalidArgumentError
+
+# The events which hooks can be registered for
+HOOK_EVENTS = ("before_request", "after_response", "on_error")
+
+# The variable parts of the API paths, replaced in the path templates so
+# that the requests to e.g. different documents are grouped together
+PATH_TEMPLATES = [
+    (re.compile(pattern), template) for pattern, template in (
+        (r"^/_api/(document|edge)/[^/]+/[^/]+$",
+         r"/_api/\1/{collection}/{key}"),
+        (r"^/_api/(document|edge)/[^/]+$",
+         r"/_api/\1/{collection}"),
+        (r"^/_api/collection/[^/]+(/[^/]+)?$",
+         r"/_api/collection/{name}\1"),
+        (r"^/_api/cursor/[^/]+$",
+         r"/_api/cursor/{id}"),
+        (r"^/_api/gharial/[^/]+/(vertex|edge)/[^/]+/[^/]+$",
+         r"/_api/gharial/{graph}/\1/{collection}/{key}"),
+        (r"^/_api/gharial/[^/]+/(vertex|edge)/[^/]+$",
+         r"/_api/gharial/{graph}/\1/{collection}"),
+        (r"^/_api/gharial/[^/]+(/vertex|/edge)?$",
+         r"/_api/gharial/{graph}\1"),
+        (r"^/_api/index/[^/]+/[^/]+$",
+         r"/_api/index/{collection}/{id}"),
+        (r"^/_api/user/[^/]+$",
+         r"/_api/user/{user}"),
+        (r"^/_api/database/(?!user$|current$)[^/]+$",
+         r"/_api/database/{name}"),
+        (r"^/_api/aqlfunction/[^/]+$",
+         r"/_api/aqlfunction/{name}"),
+    )
+]
+
+
+def path_template(path):
+    """Return the template of an API path, for grouping the requests.
+
+    :param path: the API path (e.g. '/_api/document/users/123')
+    :type path: str
+    :returns: the path with its variable parts replaced by placeholders
+        and without the query string (e.g.
+        '/_api/document/{collection}/{key}')
+    :rtype: str
+    """
+    path = path.split("?", 1)[0]
+    for pattern, template in PATH_TEMPLATES:
+        if pattern.match(path):
+            return pattern.sub(template, path)
+    return path
+
+
+def request_collection(path, params=None):
+    """Return the collection a request is bound to.
+
+    :param path: the API path
+    :type path: str
+    :param params: the request parameters
+    :type params: dict or None
+    :returns: the name of the collection, or '' if there is none
+    :rtype: str
+    """
+    if params and "collection" in params:
+        return params["collection"]
+    parts = path.split("?", 1)[0].split("/")
+    # e.g. /_api/document/{collection}/{key}, /_api/collection/{name}/count
+    if len(parts) > 3 and parts[2] in ("document", "edge", "collection"):
+        return parts[3]
+    return ""
+
+
+class RequestEvent(object):
+    """The request passed to the hooks.
+
+    The times are in seconds: ``encode_time`` is spent serializing (and
+    compressing) the payload, ``network_time`` waiting for the HTTP client
+    and ``decode_time`` decoding the response body. The fields describing
+    the response are None until it arrives. The body is only decoded once
+    read, usually after the hooks fired, so ``decode_time`` is None until
+    then, and for good if it is never read (e.g. raw results) or decoded
+    as it is consumed (streamed results). The ``bytes_received`` of a
+    streamed response are None unless the server sent their length.
+    """
+
+    __slots__ = (
+        "method",
+        "path",
+        "path_template",
+        "database",
+        "endpoint",
+        "params",
+        "bytes_sent",
+        "bytes_received",
+        "status_code",
+        "error",
+        "encode_time",
+        "network_time",
+        "response",
+        "started",
+    )
+
+    def __init__(self, method, path, database, endpoint, params, bytes_sent,
+                 encode_time):
+        self.method = method
+        self.path = path
+        self.path_template = path_template(path)
+        self.database = database
+        self.endpoint = endpoint
+        self.params = params
+        self.bytes_sent = bytes_sent
+        self.bytes_received = None
+        self.status_code = None
+        self.error = None
+        self.encode_time = encode_time
+        self.network_time = None
+        self.response = None
+        self.started = None
+
+    def __repr__(self):
+        """Return a descriptive string of this instance."""
+        return "<ArangoDB request {} {} ({})>".format(
+            self.method.upper(), self.path_template, self.status_code
+        )
+
+    @property
+    def decode_time(self):
+        """Return the seconds spent decoding the response body.
+
+        :returns: the decode time, or None if the body was not decoded
+        :rtype: float or None
+        """
+        if self.response is None:
+            return None
+        return self.response.decode_time
+
+    @property
+    def duration(self):
+        """Return the seconds spent on the request so far.
+
+        :returns: the sum of the encode, network and decode times
+        :rtype: float
+        """
+        return (self.encode_time or 0) + (self.network_time or 0) + \
+            (self.decode_time or 0)
+
+
+def payload_size(data):
+    """Return the size in bytes of a serialized request payload.
+
+    :param data: the payload, if any
+    :type data: bytes or str or None
+    :returns: the size in bytes
+    :rtype: int
+    """
+    if data is None:
+        return 0
+    if isinstance(data, bytes):
+        return len(data)
+    return len(data.encode("utf-8"))
+
+
+class Hooks(object):
+    """Registry of the callbacks observing the requests.
+
+    The callbacks are called with the ``RequestEvent`` of every HTTP
+    request sent (each retry included):
+
+    ``before_request``: before the request is handed to the HTTP client
+    ``after_response``: once the response arrived, before its body is
+    decoded
+    ``on_error``: when the HTTP client raised an exception, available as
+    ``event.error``
+
+    The callbacks run on the thread (or event loop) making the request and
+    must not raise. Without any callback registered the requests are not
+    timed at all. The bodies are decoded lazily either way.
+    """
+
+    def __init__(self):
+        self.active = False
+        self._callbacks = {event: () for event in HOOK_EVENTS}
+        self._lock = Lock()
+
+    def __repr__(self):
+        """Return a descriptive string of this instance."""
+        return "<ArangoDB hooks ({})>".format(
+            sum(len(callbacks) for callbacks in self._callbacks.values())
+        )
+
+    def add(self, event, callback):
+        """Register a callback.
+
+        :param event: 'before_request', 'after_response' or 'on_error'
+        :type event: str
+        :param callback: the callable taking the request event
+        :type callback: callable
+        :raises: InvalidArgumentError
+        """
+        if event not in self._callbacks:
+            raise InvalidArgumentError(
+                "unknown hook event '{}'".format(event)
+            )
+        with self._lock:
+            # Copied on write so that the requests iterate without locking
+            self._callbacks[event] += (callback,)
+            self.active = True
+
+    def remove(self, event, callback):
+        """Unregister a callback.
+
+        :param event: the event it was registered for
+        :type event: str
+        :param callback: the registered callable
+        :type callback: callable
+        :raises: InvalidArgumentError
+        """
+        with self._lock:
+            callbacks = list(self._callbacks.get(event, ()))
+            if callback not in callbacks:
+                raise InvalidArgumentError(
+                    "{!r} is not registered for '{}'".format(callback, event)
+                )
+            callbacks.remove(callback)
+            self._callbacks[event] = tuple(callbacks)
+            self.active = any(self._callbacks.values())
+
+    def start(self, method, path, database, endpoint, params, data,
+              encode_time):
+        """Fire the ``before_request`` hooks and start the network timer.
+
+        :param method: the name of the HTTP client method (e.g. 'get')
+        :type method: str
+        :param path: the API path
+        :type path: str
+        :param database: the name of the database
+        :type database: str
+        :param endpoint: the endpoint the request is sent to
+        :type endpoint: arango.endpoints.Endpoint
+        :param params: the request parameters
+        :type params: dict or None
+        :param data: the serialized request payload, if any
+        :type data: bytes or str or None
+        :param encode_time: the seconds spent serializing the payload
+        :type encode_time: float
+        :returns: the request event, to be passed to ``finish`` or ``fail``
+        :rtype: arango.hooks.RequestEvent
+        """
+        event = RequestEvent(method, path, database, endpoint.url, params,
+                             payload_size(data), encode_time)
+        for callback in self._callbacks["before_request"]:
+            callback(event)
+        event.started = monotonic()
+        return event
+
+    def finish(self, event, response):
+        """Time the response and fire the ``after_response`` hooks.
+
+        :param event: the event returned by ``start``
+        :type event: arango.hooks.RequestEvent
+        :param response: the response
+        :type response: arango.response.Response
+        """
+        event.network_time = monotonic() - event.started
+        event.status_code = response.status_code
+        event.bytes_received = response.content_length
+        # Which times its decoding, if it is ever decoded
+        event.response = response
+        for callback in self._callbacks["after_response"]:
+            callback(event)
+
+    def fail(self, event, error):
+        """Fire the ``on_error`` hooks for an exception of the HTTP client.
+
+        :param event: the event returned by ``start``
+        :type event: arango.hooks.RequestEvent
+        :param error: the exception
+        :type error: Exception
+        """
+        event.network_time = monotonic() - event.started
+        event.error = error
+        for callback in self._callbacks["on_error"]:
+            callback(event)
@@ -0,0 +1,431 @@
+"""Client-side admission control: concurrency limits and rate limiting."""
+
+from collections import deque
+from threading import Lock
+
+from arango.deadline import monotonic
+from arango.exceptions import DeadlineExceededError, InvalidArgumentError
+from arango.pipeline import NEW_EVENT, Call, Return, Sleep, run
+
+
+class _Waiter(object):
+    """A request queued for a slot of a concurrency limiter."""
+
+    __slots__ = ("wake", "granted")
+
+    def __init__(self, wake):
+        self.wake = wake
+        self.granted = False
+
+
+class ConcurrencyLimiter(object):
+    """Thread-safe, fair limit on the number of requests in flight.
+
+    The requests above the limit are queued and let through in the order
+    they arrived: a released slot is handed over to the oldest waiter
+    rather than grabbed by whichever thread asks next.
+
+    :param max_concurrent: the max number of requests in flight
+    :type max_concurrent: int
+    :raises: InvalidArgumentError
+    """
+
+    def __init__(self, max_concurrent):
+        if max_concurrent < 1:
+            raise InvalidArgumentError("max_concurrent must be at least 1")
+        self.max_concurrent = max_concurrent
+        self.in_flight = 0
+        self._waiters = deque()
+        self._lock = Lock()
+
+    def __repr__(self):
+        """Return a descriptive string of this instance."""
+        return "<ArangoDB concurrency limiter ({}/{}, {} queued)>".format(
+            self.in_flight, self.max_concurrent, self.queued
+        )
+
+    @property
+    def queued(self):
+        """Return the number of requests waiting for a slot.
+
+        :returns: the number of waiters
+        :rtype: int
+        """
+        return len(self._waiters)
+
+    def try_acquire(self):
+        """Take a slot if one is free and no request is waiting for it.
+
+        :returns: True if a slot was taken
+        :rtype: bool
+        """
+        with self._lock:
+            if self._waiters or self.in_flight >= self.max_concurrent:
+                return False
+            self.in_flight += 1
+            return True
+
+    def enqueue(self, wake):
+        """Take a slot, or queue up for the next one.
+
+        :param wake: the callable invoked (from the releasing thread) once
+            the slot is handed over to the waiter
+        :type wake: callable
+        :returns: None if a slot was taken, else the waiter, which holds a
+            slot once ``granted``
+        """
+        with self._lock:
+            if not self._waiters and self.in_flight < self.max_concurrent:
+                self.in_flight += 1
+                return None
+            waiter = _Waiter(wake)
+            self._waiters.append(waiter)
+            return waiter
+
+    def cancel(self, waiter):
+        """Take the waiter out of the queue.
+
+        :param waiter: the waiter returned by ``enqueue``
+        :returns: True if it was removed, False if it was granted a slot
+            meanwhile (which the caller must then use or release)
+        :rtype: bool
+        """
+        with self._lock:
+            if waiter.granted:
+                return False
+            self._waiters.remove(waiter)
+            return True
+
+    def acquire(self, timeout=None):
+        """Take a slot, waiting for one in turn if need be.
+
+        :param timeout: the max seconds to wait, or None to wait forever
+        :type timeout: int or float or None
+        :returns: True if a slot was taken, False on timeout
+        :rtype: bool
+        """
+        return run(self.acquire_steps(timeout))
+
+    def acquire_steps(self, timeout=None):
+        """Return the steps of ``acquire``, see ``arango.pipeline``.
+
+        :returns: the steps whose result is whether a slot was taken
+        :rtype: generator
+        """
+        event = yield NEW_EVENT
+        waiter = self.enqueue(event.set)
+        if waiter is None:
+            raise Return(True)
+        try:
+            woken = yield Call(event.wait, timeout)
+        except BaseException:
+            if not self.cancel(waiter):
+                self.release()
+            raise
+        raise Return(woken or not self.cancel(waiter))
+
+    def release(self):
+        """Free a slot, handing it over to the oldest waiter if any."""
+        with self._lock:
+            if not self._waiters:
+                self.in_flight -= 1
+                return
+            waiter = self._waiters.popleft()
+            waiter.granted = True
+        waiter.wake()
+
+
+class TokenBucket(object):
+    """Thread-safe token bucket spacing the requests out.
+
+    The bucket holds up to ``burst`` tokens and is refilled at ``rate``
+    tokens per second. Every request takes a token, and the requests
+    finding the bucket empty reserve the next tokens in the order they
+    arrived, i.e. the waits are queued fairly too.
+
+    :param rate: the sustained number of requests per second
+    :type rate: int or float
+    :param burst: the max number of requests let through at once (default:
+        one second worth of requests)
+    :type burst: int or None
+    :raises: InvalidArgumentError
+    """
+
+    def __init__(self, rate, burst=None):
+        if rate <= 0:
+            raise InvalidArgumentError("rate must be positive")
+        self.rate = float(rate)
+        self.burst = max(1, int(rate)) if burst is None else burst
+        if self.burst < 1:
+            raise InvalidArgumentError("burst must be at least 1")
+        self.tokens = float(self.burst)
+        self.updated = monotonic()
+        self._lock = Lock()
+
+    def __repr__(self):
+        """Return a descriptive string of this instance."""
+        return "<ArangoDB token bucket ({}/s, burst {})>".format(
+            self.rate, self.burst
+        )
+
+    def reserve(self, max_wait=None):
+        """Reserve a token and return the seconds to wait for it.
+
+        :param max_wait: the max seconds the caller is willing to wait, or
+            None for no limit
+        :type max_wait: int or float or None
+        :returns: the seconds to wait before sending the request, or None
+            (and nothing is reserved) if that would be more than
+            ``max_wait``
+        :rtype: float or None
+        """
+        with self._lock:
+            now = monotonic()
+            tokens = min(
+                self.burst,
+                self.tokens + (now - self.updated) * self.rate
+            )
+            self.updated = now
+            # The tokens go negative while requests are waiting for them
+            delay = max(0.0, (1 - tokens) / self.rate)
+            if max_wait is not None and delay > max_wait:
+                self.tokens = tokens
+                return None
+            self.tokens = tokens - 1
+            return delay
+
+
+class LimitStats(object):
+    """Thread-safe counters of the admission control layer.
+
+    ``admitted`` counts the requests let through, ``queued`` those which
+    had to wait, ``rejected`` those whose deadline passed while waiting,
+    and ``wait_time`` and ``max_wait_time`` sum up and bound the seconds
+    the admitted requests waited for.
+    """
+
+    COUNTERS = ("admitted", "queued", "rejected", "wait_time",
+                "max_wait_time")
+
+    def __init__(self):
+        self._lock = Lock()
+        self.reset()
+
+    def reset(self):
+        """Reset all counters to zero."""
+        with self._lock:
+            for counter in self.COUNTERS:
+                setattr(self, counter, 0)
+
+    def admit(self, wait, queued):
+        """Count an admitted request.
+
+        :param wait: the seconds the request waited for
+        :type wait: float
+        :param queued: whether the request had to wait
+        :type queued: bool
+        """
+        with self._lock:
+            self.admitted += 1
+            if queued:
+                self.queued += 1
+                self.wait_time += wait
+                self.max_wait_time = max(self.max_wait_time, wait)
+
+    def reject(self):
+        """Count a request rejected for lack of time."""
+        with self._lock:
+            self.rejected += 1
+
+    def to_dict(self):
+        """Return a snapshot of the counters.
+
+        :returns: the counters by name
+        :rtype: dict
+        """
+        with self._lock:
+            return {counter: getattr(self, counter)
+                    for counter in self.COUNTERS}
+
+
+class Limits(object):
+    """Admission control capping the load put on the servers.
+
+    The requests are let through at most ``rate`` per second, and with at
+    most ``max_per_endpoint`` of them in flight to any endpoint and
+    ``max_per_database`` to any database. The requests above the limits
+    wait for their turn on the client, in the order they arrived, instead
+    of all hitting the server at once. A request whose deadline passes
+    while waiting fails with ``DeadlineExceededError``.
+
+    The limits are shared by all the API wrapper objects (and threads)
+    using this instance.
+
+    :param max_per_endpoint: the max number of requests in flight to an
+        endpoint, or None for no limit
+    :type max_per_endpoint: int or None
+    :param max_per_database: the max number of requests in flight to a
+        database, or None for no limit
+    :type max_per_database: int or None
+    :param rate: the max number of requests per second, or None for no
+        limit
+    :type rate: int or float or None
+    :param burst: the max number of requests let through at once by the
+        rate limit (default: one second worth of requests)
+    :type burst: int or None
+    :raises: InvalidArgumentError
+    """
+
+    def __init__(self, max_per_endpoint=None, max_per_database=None,
+                 rate=None, burst=None):
+        for limit in (max_per_endpoint, max_per_database):
+            if limit is not None and limit < 1:
+                raise InvalidArgumentError("limits must be at least 1")
+        self.max_per_endpoint = max_per_endpoint
+        self.max_per_database = max_per_database
+        self.bucket = None if rate is None else TokenBucket(rate, burst)
+        self._stats = LimitStats()
+        self._limiters = {}
+        self._lock = Lock()
+
+    def __repr__(self):
+        """Return a descriptive string of this instance."""
+        return "<ArangoDB limits (endpoint={}, database={}, rate={})>".format(
+            self.max_per_endpoint,
+            self.max_per_database,
+            None if self.bucket is None else self.bucket.rate
+        )
+
+    @property
+    def stats(self):
+        """Return the admission counters.
+
+        :returns: the ``admitted``, ``queued``, ``rejected``, ``wait_time``
+            and ``max_wait_time`` values
+        :rtype: dict
+        """
+        return self._stats.to_dict()
+
+    def reset_stats(self):
+        """Reset the admission counters to zero."""
+        self._stats.reset()
+
+    def _limiter(self, key, max_concurrent):
+        limiter = self._limiters.get(key)
+        if limiter is None:
+            with self._lock:
+                limiter = self._limiters.setdefault(
+                    key, ConcurrencyLimiter(max_concurrent)
+                )
+        return limiter
+
+    def limiters(self, endpoint, database):
+        """Return the concurrency limiters a request must get through.
+
+        They are always acquired in the returned order, so that no two
+        requests hold a slot the other is waiting for.
+
+        :param endpoint: the endpoint the request is sent to
+        :type endpoint: arango.endpoints.Endpoint
+        :param database: the name of the database the request is sent to
+        :type database: str
+        :returns: the concurrency limiters
+        :rtype: list
+        """
+        limiters = []
+        if self.max_per_database is not None:
+            limiters.append(
+                self._limiter(("database", database), self.max_per_database)
+            )
+        if self.max_per_endpoint is not None:
+            limiters.append(
+                self._limiter(("endpoint", endpoint.url),
+                              self.max_per_endpoint)
+            )
+        return limiters
+
+    def reserve(self, deadline=None):
+        """Reserve the rate limit token of a request.
+
+        :param deadline: the deadline of the request, if any
+        :type deadline: arango.deadline.Deadline or None
+        :returns: the seconds to wait before sending the request
+        :rtype: float
+        :raises: DeadlineExceededError
+        """
+        if self.bucket is None:
+            return 0.0
+        delay = self.bucket.reserve(
+            None if deadline is None else deadline.remaining()
+        )
+        if delay is None:
+            self.reject(deadline)
+        return delay
+
+    def admit(self, wait, queued):
+        """Count an admitted request, see ``LimitStats.admit``."""
+        self._stats.admit(wait, queued)
+
+    def reject(self, deadline):
+        """Count a request which ran out of time and raise the error.
+
+        :param deadline: the deadline of the request
+        :type deadline: arango.deadline.Deadline
+        :raises: DeadlineExceededError
+        """
+        self._stats.reject()
+        raise DeadlineExceededError(deadline)
+
+    def acquire(self, endpoint, database, deadline=None):
+        """Wait until the request may be sent.
+
+        :param endpoint: the endpoint the request is sent to
+        :type endpoint: arango.endpoints.Endpoint
+        :param database: the name of the database the request is sent to
+        :type database: str
+        :param deadline: the deadline of the request, if any
+        :type deadline: arango.deadline.Deadline or None
+        :returns: the limiters holding a slot for the request, to be given
+            back to ``release`` once it completes
+        :rtype: list
+        :raises: DeadlineExceededError
+        """
+        return run(self.acquire_steps(endpoint, database, deadline))
+
+    def acquire_steps(self, endpoint, database, deadline=None):
+        """Return the steps of ``acquire``, see ``arango.pipeline``.
+
+        :returns: the steps whose result is the limiters holding a slot
+        :rtype: generator
+        """
+        start = monotonic()
+        delay = self.reserve(deadline)
+        queued = delay > 0
+        if queued:
+            yield Sleep(delay)
+        held = []
+        try:
+            for limiter in self.limiters(endpoint, database):
+                if not limiter.try_acquire():
+                    queued = True
+                    acquired = yield limiter.acquire_steps(
+                        None if deadline is None else deadline.remaining()
+                    )
+                    if not acquired:
+                        self.reject(deadline)
+                held.append(limiter)
+        except BaseException:
+            self.release(held)
+            raise
+        self.admit(monotonic() - start, queued)
+        raise Return(held)
+
+    @staticmethod
+    def release(held):
+        """Free the slots taken by ``acquire``.
+
+        :param held: the limiters returned by ``acquire``
+        :type held: list
+        """
+        for limiter in reversed(held):
+            limiter.release()
@@ -0,0 +1,298 @@
+"""Latency histograms and error counters of the requests."""
+
+from threading import Lock
+
+from arango.hooks import request_collection
+
+# The quantiles rendered for every latency histogram
+QUANTILES = (0.5, 0.9, 0.99, 0.999)
+
+# The operations of the requests by HTTP method and path template
+OPERATIONS = {
+    ("get", "/_api/document/{collection}/{key}"): "document_get",
+    ("head", "/_api/document/{collection}/{key}"): "document_head",
+    ("post", "/_api/document"): "document_insert",
+    ("put", "/_api/document/{collection}/{key}"): "document_replace",
+    ("patch", "/_api/document/{collection}/{key}"): "document_update",
+    ("delete", "/_api/document/{collection}/{key}"): "document_delete",
+    ("get", "/_api/edge/{collection}/{key}"): "edge_get",
+    ("head", "/_api/edge/{collection}/{key}"): "edge_head",
+    ("post", "/_api/edge"): "edge_insert",
+    ("put", "/_api/edge/{collection}/{key}"): "edge_replace",
+    ("patch", "/_api/edge/{collection}/{key}"): "edge_update",
+    ("delete", "/_api/edge/{collection}/{key}"): "edge_delete",
+    ("post", "/_api/import"): "import",
+    ("post", "/_api/export"): "export",
+    ("post", "/_api/cursor"): "query",
+    ("put", "/_api/cursor/{id}"): "cursor_fetch",
+    ("delete", "/_api/cursor/{id}"): "cursor_delete",
+    ("post", "/_api/batch"): "batch",
+    ("post", "/_api/transaction"): "transaction",
+}
+
+# The collection label of the series folded together past ``max_series``
+OVERFLOW_COLLECTION = "__other__"
+
+
+class LatencyHistogram(object):
+    """Thread-safe, fixed-size latency histogram.
+
+    The latencies are counted in log-linear buckets like HDR histograms do:
+    every power of two of microseconds is split into ``2 ** precision``
+    linear buckets, so that the quantiles are exact within a relative error
+    of ``2 ** -precision`` (about 6% by default) while the memory taken
+    stays fixed whatever the number and spread of the latencies. Latencies
+    above ``max_seconds`` are counted in the last bucket.
+
+    :param precision: the number of bits of precision of the buckets
+    :type precision: int
+    :param max_seconds: the highest latency told apart
+    :type max_seconds: int or float
+    """
+
+    def __init__(self, precision=4, max_seconds=3600):
+        self.precision = precision
+        self._linear = 2 ** (precision + 1)
+        self._half = 2 ** precision
+        # The index of the bucket of the highest latency, plus one
+        self._size = self._index(int(max_seconds * 1e6)) + 1
+        self.counts = [0] * self._size
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self._lock = Lock()
+
+    def __repr__(self):
+        """Return a descriptive string of this instance."""
+        return "<ArangoDB latency histogram ({} values)>".format(self.count)
+
+    def _index(self, micros):
+        """Return the index of the bucket of a latency in microseconds."""
+        if micros < self._linear:
+            return micros
+        shift = micros.bit_length() - self.precision - 1
+        return self._linear + (shift - 1) * self._half + \
+            (micros >> shift) - self._half
+
+    def _upper_bound(self, index):
+        """Return the highest latency in seconds counted in a bucket."""
+        if index < self._linear:
+            return (index + 1) / 1e6
+        shift, offset = divmod(index - self._linear, self._half)
+        shift += 1
+        return ((self._half + offset + 1) << shift) / 1e6
+
+    def record(self, seconds):
+        """Count a latency.
+
+        :param seconds: the latency in seconds
+        :type seconds: float
+        """
+        index = min(self._index(int(seconds * 1e6)), self._size - 1)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.sum += seconds
+            if seconds > self.max:
+                self.max = seconds
+
+    def quantile(self, quantile):
+        """Return a quantile of the latencies.
+
+        :param quantile: the quantile, between 0 and 1 (e.g. 0.99)
+        :type quantile: float
+        :returns: the latency in seconds below which the given fraction of
+            the latencies fall (0 if there are none)
+        :rtype: float
+        """
+        with self._lock:
+            if self.count == 0:
+                return 0.0
+            # The rank of the latency, counting from 1
+            rank = max(1, int(quantile * self.count + 0.5))
+            seen = 0
+            for index, count in enumerate(self.counts):
+                seen += count
+                if seen >= rank:
+                    if index == self._size - 1:
+                        # Counts the latencies above max_seconds too
+                        return self.max
+                    return min(self._upper_bound(index), self.max)
+            return self.max
+
+
+class Metrics(object):
+    """Registry of the request latencies and errors per operation.
+
+    The requests are recorded through the hooks of the API wrappers (see
+    ``install``), keyed by operation (e.g. 'document_get', 'import',
+    'cursor_fetch', 'batch' or 'transaction', see ``OPERATIONS``; the
+    other requests are recorded as 'other') and by collection (empty for
+    the requests not bound to one).
+
+    Every series takes a fixed-size ``LatencyHistogram``, and the series
+    past ``max_series`` are folded into the collection '__other__' of
+    their operation, so that the memory taken stays bounded.
+
+    :param max_series: the max number of (operation, collection) series
+    :type max_series: int
+    :param namespace: the prefix of the names of the metrics
+    :type namespace: str
+    """
+
+    def __init__(self, max_series=1000, namespace="arango"):
+        self.max_series = max_series
+        self.namespace = namespace
+        self._histograms = {}
+        self._errors = {}
+        self._lock = Lock()
+
+    def __repr__(self):
+        """Return a descriptive string of this instance."""
+        return "<ArangoDB metrics ({} series)>".format(len(self._histograms))
+
+    def install(self, hooks):
+        """Start recording the requests observed by the hooks.
+
+        :param hooks: the hooks of the API wrappers (e.g. ``Arango.hooks``)
+        :type hooks: arango.hooks.Hooks
+        """
+        hooks.add("after_response", self.observe)
+        hooks.add("on_error", self.observe)
+
+    def uninstall(self, hooks):
+        """Stop recording the requests observed by the hooks.
+
+        :param hooks: the hooks passed to ``install``
+        :type hooks: arango.hooks.Hooks
+        """
+        hooks.remove("after_response", self.observe)
+        hooks.remove("on_error", self.observe)
+
+    def reset(self):
+        """Forget everything recorded so far."""
+        with self._lock:
+            self._histograms = {}
+            self._errors = {}
+
+    def observe(self, event):
+        """Record a request, as the ``after_response`` or ``on_error`` hook.
+
+        :param event: the request event
+        :type event: arango.hooks.RequestEvent
+        """
+        operation = OPERATIONS.get(
+            (event.method, event.path_template), "other"
+        )
+        collection = request_collection(event.path, event.params)
+        if event.error is not None:
+            status = "error"
+        elif event.status_code >= 400:
+            status = str(event.status_code)
+        else:
+            status = None
+        self.record(operation, collection, event.duration, status)
+
+    def record(self, operation, collection, seconds, status=None):
+        """Record a request.
+
+        :param operation: the operation (e.g. 'document_get')
+        :type operation: str
+        :param collection: the collection, or '' if there is none
+        :type collection: str
+        :param seconds: the latency of the request
+        :type seconds: float
+        :param status: the HTTP status code of a failed request, 'error' if
+            the HTTP client raised an exception, or None if it succeeded
+        :type status: str or None
+        """
+        key = (operation, collection)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                if key not in self._histograms and \
+                        len(self._histograms) >= self.max_series:
+                    key = (operation, OVERFLOW_COLLECTION)
+                histogram = self._histograms.get(key)
+                if histogram is None:
+                    histogram = self._histograms[key] = LatencyHistogram()
+        histogram.record(seconds)
+        if status is not None:
+            key += (status,)
+            with self._lock:
+                self._errors[key] = self._errors.get(key, 0) + 1
+
+    def snapshot(self):
+        """Return the latency quantiles and error counts of every series.
+
+        :returns: the ``count``, ``errors``, ``p50``, ``p90``, ``p99``,
+            ``p999`` and ``max`` (in seconds) by (operation, collection)
+        :rtype: dict
+        """
+        with self._lock:
+            histograms = list(self._histograms.items())
+            errors = list(self._errors.items())
+        result = {}
+        for key, histogram in histograms:
+            series = {"count": histogram.count, "errors": 0,
+                      "max": histogram.max}
+            for quantile in QUANTILES:
+                name = "p" + "{:g}".format(quantile * 100).replace(".", "")
+                series[name] = histogram.quantile(quantile)
+            result[key] = series
+        for (operation, collection, _), count in errors:
+            result[(operation, collection)]["errors"] += count
+        return result
+
+    def render(self):
+        """Render the metrics in the Prometheus text exposition format.
+
+        :returns: the latency summaries (with their quantiles) and the error
+            counters, by operation and collection
+        :rtype: str
+        """
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+            errors = sorted(self._errors.items())
+        name = self.namespace + "_request_duration_seconds"
+        lines = [
+            "# HELP {} Latency of the ArangoDB requests.".format(name),
+            "# TYPE {} summary".format(name),
+        ]
+        for (operation, collection), histogram in histograms:
+            labels = _labels(operation=operation, collection=collection)
+            for quantile in QUANTILES:
+                lines.append("{}{{{},quantile=\"{:g}\"}} {!r}".format(
+                    name, labels, quantile, histogram.quantile(quantile)
+                ))
+            lines.append("{}_sum{{{}}} {!r}".format(
+                name, labels, histogram.sum
+            ))
+            lines.append("{}_count{{{}}} {}".format(
+                name, labels, histogram.count
+            ))
+        name = self.namespace + "_request_errors_total"
+        lines.extend([
+            "# HELP {} Failed ArangoDB requests.".format(name),
+            "# TYPE {} counter".format(name),
+        ])
+        for (operation, collection, status), count in errors:
+            lines.append("{}{{{}}} {}".format(
+                name,
+                _labels(operation=operation, collection=collection,
+                        status=status),
+                count
+            ))
+        return "\n".join(lines) + "\n"
+
+
+def _labels(**labels):
+    """Render the labels of a sample, escaping their values."""
+    return ",".join(
+        "{}=\"{}\"".format(
+            name,
+            str(value).replace("\\", "\\\\").replace("\"", "\\\"")
+            .replace("\n", "\\n")
+        )
+        for name, value in sorted(labels.items())
+    )
@@ -0,0 +1,163 @@
+"""The steps of sending a request, shared by the sync and async wrappers.
+
+The features of the request pipeline (retries, deadlines, admission
+control, hooks, tracing and coalescing) are written once, as generators
+yielding the blocking calls they need rather than making them. ``run``
+makes the calls on the calling thread, and ``arango.aio.pipeline.run``
+awaits them on the event loop.
+
+A step yields:
+
+- ``Call(function, *args, **kwargs)``: the call to make (and await, if
+  the steps are run on the event loop), whose result is sent back
+- ``Sleep(seconds)``: the time to wait for
+- ``NEW_EVENT``: for an event to be sent back, whose ``set`` may be
+  called from any thread and whose ``wait(timeout)`` returns whether it
+  was set in time (and is made with ``Call``)
+- another step (i.e. generator), which is run through and whose result is
+  sent back, or whose exception is raised into the step
+
+A step ends by raising ``Return`` with its result (Python 2 generators
+cannot return values), or by running out, which returns None.
+"""
+
+from functools import wraps
+from threading import Event
+from time import sleep
+from types import GeneratorType
+
+
+class Return(BaseException):
+    """Raised by a step to end with its result.
+
+    It is not an ``Exception`` so that it goes through the ``except
+    Exception`` clauses of the steps.
+
+    :param value: the result of the step
+    """
+
+    def __init__(self, value=None):
+        super(Return, self).__init__(value)
+        self.value = value
+
+
+class Call(object):
+    """A call for the runner to make, see ``arango.pipeline``."""
+
+    __slots__ = ("function", "args", "kwargs")
+
+    def __init__(self, function, *args, **kwargs):
+        self.function = function
+        self.args = args
+        self.kwargs = kwargs
+
+
+class Sleep(object):
+    """A wait for the runner to make, see ``arango.pipeline``."""
+
+    __slots__ = ("seconds",)
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+
+
+# The request for a new event, see ``arango.pipeline``
+NEW_EVENT = object()
+
+
+class Runner(object):
+    """The stack of the steps being run, driven by ``run``.
+
+    :param steps: the outermost step
+    :type steps: generator
+    """
+
+    __slots__ = ("stack", "result")
+
+    def __init__(self, steps):
+        self.stack = [steps]
+        self.result = None
+
+    def send(self, value=None, error=None):
+        """Resume the steps with the outcome of the last call made.
+
+        :param value: the result of the call
+        :param error: the exception the call raised instead, if any
+        :type error: BaseException or None
+        :returns: the next call, sleep or ``NEW_EVENT`` to make, or None
+            once the steps have ended (with their result in ``result``)
+        :raises: the exception the steps ended with
+        """
+        stack = self.stack
+        while True:
+            step = stack[-1]
+            try:
+                if error is None:
+                    effect = step.send(value)
+                else:
+                    effect = step.throw(error)
+            except Return as returned:
+                value, error = returned.value, None
+            except StopIteration:
+                value, error = None, None
+            except BaseException as raised:
+                stack.pop()
+                if not stack:
+                    raise
+                value, error = None, raised
+                continue
+            else:
+                value = error = None
+                if isinstance(effect, GeneratorType):
+                    stack.append(effect)
+                    continue
+                return effect
+            # The step has ended, resume its caller with its result
+            stack.pop()
+            if not stack:
+                self.result = value
+                return None
+
+
+def run(steps):
+    """Run the steps on the calling thread.
+
+    :param steps: the steps, see ``arango.pipeline``
+    :type steps: generator
+    :returns: the result of the steps
+    """
+    runner = Runner(steps)
+    effect = runner.send()
+    while effect is not None:
+        try:
+            if isinstance(effect, Call):
+                value = effect.function(*effect.args, **effect.kwargs)
+            elif isinstance(effect, Sleep):
+                value = sleep(effect.seconds)
+            else:
+                value = Event()
+        except BaseException as error:
+            effect = runner.send(error=error)
+        else:
+            effect = runner.send(value)
+    return runner.result
+
+
+def steps(method):
+    """Decorate a method written as steps to run them with its ``api``.
+
+    The decorated method returns the result of the steps if its object
+    wraps ``arango.api.API``, and an awaitable of it if it wraps
+    ``arango.aio.api.AsyncAPI``.
+
+    :param method: the method returning the steps
+    :type method: callable
+    :returns: the method running the steps
+    :rtype: callable
+    """
+    @wraps(method)
+    def run_steps(self, *args, **kwargs):
+        return self.api.run(method(self, *args, **kwargs))
+    # Set on Python 2 too, see ``Database.execute_batch``
+    run_steps.__wrapped__ = method
+    return run_steps
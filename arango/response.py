@@ -2,32 +2,141 @@
 
 from json import loads
 
+from arango.deadline import monotonic
+
+# Sentinel for a body which has not been decoded yet
+_NOT_DECODED = object()
+
 
 class Response(object):
     """ArangoDB HTTP Response class.
 
     The clients in arango.clients must return an instance of this class.
 
+    The raw content is kept as is and only decoded from JSON the first time
+    ``body`` is accessed, so responses which are only checked for their
+    status code (e.g. HEAD requests and most writes) are never parsed. The
+    seconds spent decoding it are then in ``decode_time``.
+
+    A streamed response (see ``arango.clients.base.BaseClient``) has no
+    content upfront but the ``stream`` of its raw content chunks instead,
+    which ``arango.streaming`` parses as they arrive. Accessing ``content``
+    (or ``body``) reads whatever is left of the stream.
+
     :param method: the HTTP method
     :type method: str
     :param url: the request URL
     :type url: str
     :param status_code: the HTTP status code
     :type status_code: int
-    :param content: the HTTP response content
-    :type content: basestring or str
+    :param content: the raw HTTP response content
+    :type content: bytes or str
+    :param headers: the HTTP response headers (not copied)
+    :type headers: dict
     :param status_text: the HTTP status description if any
     :type status_text: str or None
+    :param stream: the iterator of the raw content chunks if the response
+        is streamed, in which case ``content`` is None
+    :type stream: collections.Iterator or None
     """
 
+    __slots__ = (
+        "method",
+        "url",
+        "status_code",
+        "headers",
+        "status_text",
+        "stream",
+        "endpoint",
+        "codec",
+        "decode_time",
+        "_content",
+        "_body",
+    )
+
     def __init__(self, method, url, status_code, content, headers,
-                 status_text=None):
+                 status_text=None, stream=None):
         self.method = method
         self.url = url
         self.status_code = status_code
+        self._content = content
+        self.stream = stream
         self.headers = headers
         self.status_text = status_text
-        try:
-            self.body = loads(content) if content else None
-        except ValueError:
-            self.body = None
+        # The endpoint which served the request (set by arango.api.API)
+        self.endpoint = None
+        # The JSON codec decoding the body (set by arango.api.API)
+        self.codec = None
+        self.decode_time = None
+        self._body = _NOT_DECODED
+
+    @property
+    def content(self):
+        """Return the raw content, reading the rest of the stream if any.
+
+        :returns: the raw content
+        :rtype: bytes or str
+        """
+        if self.stream is not None:
+            stream, self.stream = self.stream, None
+            self._content = b"".join(stream)
+        return self._content
+
+    @content.setter
+    def content(self, value):
+        self._content = value
+
+    @property
+    def content_length(self):
+        """Return the size of the content without reading the stream.
+
+        :returns: the size in bytes, or None if the response is streamed
+            without a Content-Length header
+        :rtype: int or None
+        """
+        if self.stream is None:
+            return len(self._content or b"")
+        headers = self.headers or {}
+        length = headers.get("Content-Length") or \
+            headers.get("content-length")
+        return None if length is None else int(length)
+
+    @property
+    def body(self):
+        """Return the JSON decoded content, or None if it is not JSON.
+
+        :returns: the decoded content
+        :rtype: dict or list or None
+        """
+        if self._body is _NOT_DECODED:
+            content = self.content
+            started = monotonic()
+            if not content:
+                self._body = None
+            else:
+                codec = self.codec
+                if codec is not None and codec.binary and \
+                        codec.content_type not in self._content_type():
+                    # e.g. error responses which the server sent as JSON
+                    codec = codec.json_codec
+                try:
+                    if codec is not None:
+                        self._body = codec.decode(content)
+                    else:
+                        if isinstance(content, bytes):
+                            content = content.decode("utf-8")
+                        self._body = loads(content)
+                except ValueError:
+                    self._body = None
+            self.decode_time = monotonic() - started
+        return self._body
+
+    @body.setter
+    def body(self, value):
+        self._body = value
+
+    def _content_type(self):
+        """Return the Content-Type header of the response."""
+        headers = self.headers or {}
+        return headers.get("Content-Type") or \
+            headers.get("content-type") or ""
@@ -0,0 +1,307 @@
+"""Retry policy with exponential backoff and per-endpoint circuit breakers."""
+
+import random
+from threading import Lock
+from time import time
+
+from arango.exceptions import InvalidArgumentError
+
+
+# HTTP methods which are safe to send again (the other methods are retried
+# only on request)
+IDEMPOTENT_METHODS = {"head", "get", "options"}
+
+# HTTP status codes of the transient server conditions
+RETRYABLE_STATUS_CODES = {408, 429, 502, 503, 504}
+
+# ArangoDB error numbers of the transient server conditions: lock timeout
+# (18) and cluster timeout (1457)
+RETRYABLE_ERROR_CODES = {18, 1457}
+
+
+class RetryStats(object):
+    """Thread-safe counters of the retry layer.
+
+    ``retries`` counts the requests sent again, ``recovered`` the calls
+    which succeeded after at least one retry, ``exhausted`` the calls which
+    failed after using up their attempts, ``rejected`` the calls failed
+    fast by an open circuit breaker and ``opened`` the times a circuit
+    breaker opened.
+    """
+
+    COUNTERS = ("retries", "recovered", "exhausted", "rejected", "opened")
+
+    def __init__(self):
+        self._lock = Lock()
+        self.reset()
+
+    def reset(self):
+        """Reset all counters to zero."""
+        with self._lock:
+            for counter in self.COUNTERS:
+                setattr(self, counter, 0)
+
+    def increment(self, counter):
+        """Increment the given counter by one.
+
+        :param counter: one of ``RetryStats.COUNTERS``
+        :type counter: str
+        """
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def to_dict(self):
+        """Return a snapshot of the counters.
+
+        :returns: the counters by name
+        :rtype: dict
+        """
+        with self._lock:
+            return {counter: getattr(self, counter)
+                    for counter in self.COUNTERS}
+
+
+class CircuitBreaker(object):
+    """Thread-safe circuit breaker of a single endpoint.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    the requests to the endpoint are rejected for ``reset_timeout``
+    seconds. The first request after that is let through as a trial: the
+    circuit closes if it succeeds and opens again if it fails. Further
+    requests are rejected while the trial is in flight.
+
+    :param failure_threshold: the consecutive failures opening the circuit
+    :type failure_threshold: int
+    :param reset_timeout: the seconds before letting a trial request through
+    :type reset_timeout: int or float
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.open_until = None
+        self._lock = Lock()
+
+    def __repr__(self):
+        """Return a descriptive string of this instance."""
+        return "<ArangoDB circuit breaker ({})>".format(self.state)
+
+    @property
+    def state(self):
+        """Return the state of the circuit.
+
+        :returns: 'closed', 'open' or 'half_open' (i.e. open but due for a
+            trial request)
+        :rtype: str
+        """
+        with self._lock:
+            if self.open_until is None:
+                return "closed"
+            return "open" if time() < self.open_until else "half_open"
+
+    def allow(self):
+        """Return True if a request may be sent to the endpoint.
+
+        :returns: False if the circuit is open
+        :rtype: bool
+        """
+        with self._lock:
+            if self.open_until is None:
+                return True
+            now = time()
+            if now < self.open_until:
+                return False
+            # Let this trial request through, and hold the others back until
+            # it completes (or for another reset_timeout if it never does)
+            self.open_until = now + self.reset_timeout
+            return True
+
+    def record_success(self):
+        """Close the circuit after a successful request."""
+        with self._lock:
+            self.failures = 0
+            self.open_until = None
+
+    def record_failure(self):
+        """Count a failed request, opening the circuit if need be.
+
+        :returns: True if the circuit was closed and has just opened
+        :rtype: bool
+        """
+        with self._lock:
+            self.failures += 1
+            if self.open_until is not None:
+                # The trial request failed
+                self.open_until = time() + self.reset_timeout
+                return False
+            if self.failures >= self.failure_threshold:
+                self.open_until = time() + self.reset_timeout
+                return True
+            return False
+
+
+class RetryPolicy(object):
+    """Policy for retrying the requests which failed transiently.
+
+    A request is retried when the HTTP client raises an exception (e.g. the
+    connection was refused or reset), or when ArangoDB answers with one of
+    ``status_codes`` or ``error_codes``. Only the ``methods`` which are
+    safe to repeat are retried, unless the caller opts in per request.
+
+    The n-th retry waits for ``backoff * 2 ** (n - 1)`` seconds, capped at
+    ``max_backoff`` and raised to the delay asked for by a Retry-After
+    header. With ``jitter`` the actual wait is drawn uniformly between zero
+    and that delay, so that the clients hit by the same hiccup do not retry
+    in lockstep.
+
+    Every endpoint gets a ``CircuitBreaker`` counting the failures above.
+    The requests to an endpoint whose circuit is open fail fast with
+    ``CircuitOpenError`` instead of piling onto a struggling server, and
+    the endpoint is taken out of the load balancing rotation.
+
+    :param max_attempts: the max number of times a request is sent
+    :type max_attempts: int
+    :param backoff: the seconds to wait before the first retry
+    :type backoff: int or float
+    :param max_backoff: the max seconds to wait between two attempts
+    :type max_backoff: int or float
+    :param jitter: randomize the waits
+    :type jitter: bool
+    :param methods: the (lowercase) HTTP methods to retry by default
+    :type methods: set
+    :param status_codes: the HTTP status codes to retry
+    :type status_codes: set
+    :param error_codes: the ArangoDB error numbers to retry
+    :type error_codes: set
+    :param failure_threshold: the consecutive failures opening the circuit
+        of an endpoint, or None to disable the circuit breakers
+    :type failure_threshold: int or None
+    :param reset_timeout: the seconds an open circuit rejects requests
+    :type reset_timeout: int or float
+    :raises: InvalidArgumentError
+    """
+
+    def __init__(self, max_attempts=3, backoff=0.1, max_backoff=5,
+                 jitter=True, methods=IDEMPOTENT_METHODS,
+                 status_codes=RETRYABLE_STATUS_CODES,
+                 error_codes=RETRYABLE_ERROR_CODES,
+                 failure_threshold=5, reset_timeout=30):
+        if max_attempts < 1:
+            raise InvalidArgumentError("max_attempts must be at least 1")
+        if backoff < 0 or max_backoff < 0:
+            raise InvalidArgumentError("backoff must not be negative")
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.methods = set(methods)
+        self.status_codes = set(status_codes)
+        self.error_codes = set(error_codes)
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._stats = RetryStats()
+        self._breakers = {}
+        self._lock = Lock()
+
+    def __repr__(self):
+        """Return a descriptive string of this instance."""
+        return "<ArangoDB retry policy (max_attempts={})>".format(
+            self.max_attempts
+        )
+
+    @property
+    def stats(self):
+        """Return the retry counters.
+
+        :returns: the ``retries``, ``recovered``, ``exhausted``,
+            ``rejected`` and ``opened`` counts
+        :rtype: dict
+        """
+        return self._stats.to_dict()
+
+    def reset_stats(self):
+        """Reset the retry counters to zero."""
+        self._stats.reset()
+
+    def count(self, counter):
+        """Increment one of the retry counters.
+
+        :param counter: one of ``RetryStats.COUNTERS``
+        :type counter: str
+        """
+        self._stats.increment(counter)
+
+    def attempts(self, method, retry=None):
+        """Return the max number of times to send a request.
+
+        :param method: the (lowercase) HTTP method
+        :type method: str
+        :param retry: True to retry the request whatever its method, False
+            to never retry it, or None to retry it if its method is
+            in ``methods``
+        :type retry: bool or None
+        :returns: the max number of attempts
+        :rtype: int
+        """
+        if retry is None:
+            retry = method in self.methods
+        return self.max_attempts if retry else 1
+
+    def is_retryable(self, response):
+        """Return True if the response reports a transient failure.
+
+        :param response: the ArangoDB http response
+        :type response: arango.response.Response
+        :returns: True if the request should be sent again
+        :rtype: bool
+        """
+        status_code = response.status_code
+        if status_code in self.status_codes:
+            return True
+        if status_code < 400 or not self.error_codes:
+            return False
+        body = response.body
+        return isinstance(body, dict) and \
+            body.get("errorNum") in self.error_codes
+
+    def delay(self, attempt, response=None):
+        """Return the seconds to wait before the next attempt.
+
+        :param attempt: the number of attempts made so far
+        :type attempt: int
+        :param response: the response to the last attempt, if any
+        :type response: arango.response.Response or None
+        :returns: the seconds to wait
+        :rtype: float
+        """
+        delay = min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        if response is not None and response.headers:
+            try:
+                retry_after = float(response.headers.get("Retry-After"))
+            except (TypeError, ValueError):
+                pass
+            else:
+                delay = max(delay, min(retry_after, self.max_backoff))
+        return delay
+
+    def breaker(self, endpoint):
+        """Return the circuit breaker of the endpoint.
+
+        :param endpoint: the endpoint
+        :type endpoint: arango.endpoints.Endpoint
+        :returns: the circuit breaker, or None if they are disabled
+        :rtype: arango.retry.CircuitBreaker or None
+        """
+        if self.failure_threshold is None:
+            return None
+        breaker = self._breakers.get(endpoint.url)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.setdefault(
+                    endpoint.url,
+                    CircuitBreaker(self.failure_threshold, self.reset_timeout)
+                )
+        return breaker
@@ -0,0 +1,243 @@
+"""Coalescing of the identical concurrent read requests."""
+
+from threading import Lock
+
+from arango.exceptions import DeadlineExceededError
+from arango.pipeline import NEW_EVENT, Call, Return
+from arango.response import Response
+
+
+class SingleFlightStats(object):
+    """Thread-safe counters of the coalescing layer.
+
+    ``flights`` counts the requests sent on behalf of every caller which
+    asked for them, and ``coalesced`` the calls answered by a request
+    another caller had in flight instead of sending their own.
+    """
+
+    COUNTERS = ("flights", "coalesced")
+
+    def __init__(self):
+        self._lock = Lock()
+        self.reset()
+
+    def reset(self):
+        """Reset all counters to zero."""
+        with self._lock:
+            for counter in self.COUNTERS:
+                setattr(self, counter, 0)
+
+    def increment(self, counter):
+        """Increment the given counter by one.
+
+        :param counter: one of ``SingleFlightStats.COUNTERS``
+        :type counter: str
+        """
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def to_dict(self):
+        """Return a snapshot of the counters.
+
+        :returns: the counters by name
+        :rtype: dict
+        """
+        with self._lock:
+            return {counter: getattr(self, counter)
+                    for counter in self.COUNTERS}
+
+
+class Flight(object):
+    """A request in flight, whose outcome its callers wait for.
+
+    ``aborted`` is set if the request was interrupted or ran out of the
+    time of the caller which sent it, in which case the other callers send
+    their own request.
+    """
+
+    __slots__ = ("response", "error", "aborted", "_wakers")
+
+    def __init__(self):
+        self.response = None
+        self.error = None
+        self.aborted = False
+        self._wakers = []
+
+    def __repr__(self):
+        """Return a descriptive string of this instance."""
+        return "<ArangoDB flight ({})>".format(
+            "landed" if self.landed else "in flight"
+        )
+
+    @property
+    def landed(self):
+        """Return True once the outcome of the request is in.
+
+        :returns: whether the flight has landed
+        :rtype: bool
+        """
+        return self._wakers is None
+
+    def result(self):
+        """Return the response of the landed request or raise its error.
+
+        Every caller gets a response of its own, decoding the shared
+        content, so that the callers do not see each other's changes to
+        the body.
+
+        :returns: the response
+        :rtype: arango.response.Response
+        """
+        if self.error is not None:
+            raise self.error
+        res = self.response
+        copy = Response(res.method, res.url, res.status_code, res.content,
+                        res.headers, res.status_text)
+        copy.endpoint = res.endpoint
+        copy.codec = res.codec
+        return copy
+
+
+class SingleFlight(object):
+    """Coalescing of the identical concurrent read requests.
+
+    A request made while an identical one (same database, path,
+    parameters, headers and credentials) is in flight is not sent: its
+    caller waits for the request in flight and gets its response, or its
+    exception. Only the idempotent ``methods`` are coalesced, and the
+    requests are never cached once they landed.
+
+    The instance can be shared by the API wrappers of every database, and
+    by the threads and event loops using them.
+
+    :param methods: the HTTP methods to coalesce (default: GET only)
+    :type methods: collections.Iterable
+    """
+
+    def __init__(self, methods=("get",)):
+        self.methods = set(methods)
+        self._flights = {}
+        self._stats = SingleFlightStats()
+        self._lock = Lock()
+
+    def __repr__(self):
+        """Return a descriptive string of this instance."""
+        return "<ArangoDB single flight ({} in flight)>".format(
+            len(self._flights)
+        )
+
+    @property
+    def stats(self):
+        """Return the coalescing counters.
+
+        :returns: the ``flights`` and ``coalesced`` counts
+        :rtype: dict
+        """
+        return self._stats.to_dict()
+
+    def reset_stats(self):
+        """Reset the coalescing counters to zero."""
+        self._stats.reset()
+
+    def join(self, key):
+        """Join the flight of a request, starting it if there is none.
+
+        The caller starting the flight must send the request and pass its
+        outcome to ``land``; the others wait for it.
+
+        :param key: the hashable identity of the request
+        :type key: tuple
+        :returns: the flight, and whether the caller started it
+        :rtype: tuple
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is None:
+                flight = self._flights[key] = Flight()
+                started = True
+            else:
+                started = False
+        self._stats.increment("flights" if started else "coalesced")
+        return flight, started
+
+    def land(self, key, flight, response=None, error=None, aborted=False):
+        """Hand the outcome of a request to the callers waiting for it.
+
+        :param key: the key the flight was joined with
+        :type key: tuple
+        :param flight: the flight started by ``join``
+        :type flight: arango.singleflight.Flight
+        :param response: the response, if any
+        :type response: arango.response.Response or None
+        :param error: the exception raised instead, if any
+        :type error: Exception or None
+        :param aborted: whether the callers must send their own request
+        :type aborted: bool
+        """
+        with self._lock:
+            # The requests made from now on start another flight
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+            flight.response = response
+            flight.error = error
+            flight.aborted = aborted
+            wakers, flight._wakers = flight._wakers, None
+        for wake in wakers:
+            wake()
+
+    def subscribe(self, flight, wake):
+        """Call back once a flight has landed, e.g. to wake an event loop.
+
+        :param flight: the flight joined
+        :type flight: arango.singleflight.Flight
+        :param wake: the callable taking no arguments, called from the
+            thread landing the flight
+        :type wake: callable
+        :returns: False if the flight has already landed, in which case
+            ``wake`` is not called
+        :rtype: bool
+        """
+        with self._lock:
+            if flight._wakers is None:
+                return False
+            flight._wakers.append(wake)
+            return True
+
+    def do(self, key, send, deadline=None):
+        """Send a request, unless an identical one is in flight.
+
+        :param key: the hashable identity of the request
+        :type key: tuple
+        :param send: the callable returning the steps sending the request
+            (see ``arango.pipeline``)
+        :type send: callable
+        :param deadline: the deadline of the caller, if any
+        :type deadline: arango.deadline.Deadline or None
+        :returns: the steps whose result is the response
+        :rtype: generator
+        :raises: DeadlineExceededError
+        """
+        flight, started = self.join(key)
+        if started:
+            try:
+                res = yield send()
+            except DeadlineExceededError as error:
+                self.land(key, flight, error=error, aborted=True)
+                raise
+            except Exception as error:
+                self.land(key, flight, error=error)
+                raise
+            except BaseException:
+                self.land(key, flight, aborted=True)
+                raise
+            self.land(key, flight, response=res)
+            raise Return(res)
+        event = yield NEW_EVENT
+        if self.subscribe(flight, event.set):
+            timeout = None if deadline is None else deadline.remaining()
+            if not (yield Call(event.wait, timeout)):
+                raise DeadlineExceededError(deadline)
+        if flight.aborted:
+            res = yield send()
+            raise Return(res)
+        raise Return(flight.result())
@@ -0,0 +1,310 @@
+"""Client-side log of the slow operations, with AQL query fingerprints."""
+
+import re
+import time
+from collections import deque
+from threading import Lock
+
+from arango.deadline import monotonic
+from arango.metrics import OPERATIONS
+from arango.tracing import NOOP_SPAN, NOOP_TRACER, Span, Tracer
+
+# The parts of an AQL query: the comments and the literals are stripped
+# from the fingerprints, the names (including the bind parameters and the
+# quoted names) are kept
+AQL_TOKENS = re.compile(
+    r"(?P<comment>//[^\n]*|/\*.*?\*/)"
+    r"|(?P<string>'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\")"
+    r"|(?P<name>`(?:[^`\\]|\\.)*`|@{0,2}[A-Za-z_$][\w$]*)"
+    r"|(?P<number>\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)"
+    r"|(?P<space>\s+)"
+    r"|(?P<other>.)",
+    re.DOTALL
+)
+
+# The keywords which are literals themselves
+AQL_LITERALS = frozenset(["TRUE", "FALSE", "NULL"])
+
+# The keywords after which a '-' is a unary minus
+AQL_KEYWORDS = frozenset([
+    "AGGREGATE", "ALL", "AND", "ANY", "ASC", "AT", "COLLECT", "COUNT",
+    "DESC", "DISTINCT", "FILTER", "FOR", "GRAPH", "IN", "INBOUND", "INSERT",
+    "INTO", "KEEP", "LEAST", "LET", "LIKE", "LIMIT", "NONE", "NOT",
+    "OPTIONS", "OR", "OUTBOUND", "PRUNE", "REMOVE", "REPLACE", "RETURN",
+    "SEARCH", "SORT", "UPDATE", "UPSERT", "WITH",
+])
+
+# Lists of stripped literals, folded so that e.g. the 'IN' lists of any
+# length have the same fingerprint
+LITERAL_LISTS = re.compile(r"\[\s*\?(?:\s*,\s*\?)*\s*\]")
+
+
+def fingerprint(query):
+    """Return the fingerprint of an AQL query.
+
+    The literals (including the negative numbers and the ``true``,
+    ``false`` and ``null`` keywords) are replaced by '?', the lists of
+    literals folded into '[?]' and the comments and extra whitespace
+    removed, so that the queries differing only by their literals share
+    their fingerprint.
+
+    :param query: the AQL query
+    :type query: str
+    :returns: the normalized query
+    :rtype: str
+    """
+    parts = []
+    # Whether a '-' would negate the next operand rather than subtract
+    unary = True
+    # The index in parts of the unary minus just before, if any
+    minus = None
+    for match in AQL_TOKENS.finditer(query):
+        kind, token = match.lastgroup, match.group()
+        if kind in ("comment", "space"):
+            parts.append(" ")
+            continue
+        if kind == "name" and token.upper() in AQL_LITERALS and \
+                not (parts and parts[-1] == "."):
+            kind = "literal"
+        if kind in ("string", "number", "literal"):
+            if minus is not None and kind == "number":
+                del parts[minus:]
+            parts.append("?")
+        else:
+            parts.append(token)
+        minus = len(parts) - 1 if token == "-" and unary else None
+        if kind == "other":
+            unary = token not in ")]}"
+        else:
+            unary = kind == "name" and token.upper() in AQL_KEYWORDS
+    query = re.sub(r"\s+", " ", "".join(parts)).strip()
+    return LITERAL_LISTS.sub("[?]", query)
+
+
+class SlowLogEntry(object):
+    """An operation which took at least the threshold of the slow log.
+
+    ``duration`` is the seconds spent in the round trips of the operation
+    (e.g. the query and the fetches of its cursor batches), which leaves
+    out the time the application took to consume the batches meanwhile.
+    ``batches`` is the number of round trips the operation took, besides
+    deleting its cursor (e.g. 1 plus the cursor fetches of a query), and
+    ``bytes_sent`` and ``bytes_received`` are summed over them.
+    """
+
+    __slots__ = (
+        "operation",
+        "database",
+        "collection",
+        "duration",
+        "fingerprint",
+        "bind_vars",
+        "batches",
+        "bytes_sent",
+        "bytes_received",
+        "error",
+        "started",
+    )
+
+    def __init__(self, operation, database, collection, duration,
+                 fingerprint, bind_vars, batches, bytes_sent,
+                 bytes_received, error, started):
+        self.operation = operation
+        self.database = database
+        self.collection = collection
+        self.duration = duration
+        self.fingerprint = fingerprint
+        self.bind_vars = bind_vars
+        self.batches = batches
+        self.bytes_sent = bytes_sent
+        self.bytes_received = bytes_received
+        self.error = error
+        self.started = started
+
+    def __repr__(self):
+        """Return a descriptive string of this instance."""
+        return "<ArangoDB slow {} ({:.3f}s)>".format(
+            self.operation, self.duration
+        )
+
+    def __str__(self):
+        """Return the log line of the entry."""
+        line = "slow {} on '{}'{}: {:.3f}s, {} batches, {} bytes".format(
+            self.operation,
+            self.database,
+            "/'{}'".format(self.collection) if self.collection else "",
+            self.duration,
+            self.batches,
+            self.bytes_sent + self.bytes_received
+        )
+        if self.error is not None:
+            line += ", failed with {!r}".format(self.error)
+        if self.fingerprint is not None:
+            line += ": {}".format(self.fingerprint)
+            if self.bind_vars:
+                line += " (bind vars: {})".format(", ".join(self.bind_vars))
+        return line
+
+
+class _TimedSpan(Span):
+    """Span timed by the slow log, wrapping the span of the inner tracer."""
+
+    def __init__(self, slow_log, attributes, parent, inner):
+        self.slow_log = slow_log
+        self.attributes = dict(attributes or {})
+        self.parent = parent
+        self.inner = inner
+        self.error = None
+        self.batches = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.round_trips = 0
+        self.round_trip_time = 0.0
+        self.started = time.time()
+        self._started = monotonic()
+        self._ended = False
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+        self.inner.set_attribute(key, value)
+
+    def record_error(self, error):
+        self.error = error
+        self.inner.record_error(error)
+
+    def headers(self):
+        return self.inner.headers()
+
+    def end(self):
+        if self._ended:
+            return
+        self._ended = True
+        self.inner.end()
+        attributes = self.attributes
+        if "http.method" in attributes:
+            # An HTTP round trip, accounted to itself first
+            if attributes["http.method"] != "DELETE":
+                self.batches += 1
+            self.round_trips += 1
+            self.round_trip_time += monotonic() - self._started
+            self.bytes_sent += attributes["http.request_content_length"]
+            self.bytes_received += attributes.get(
+                "http.response_content_length", 0
+            )
+        parent = self.parent
+        if parent is None:
+            if self.round_trips:
+                duration = self.round_trip_time
+            else:
+                # e.g. failed before sending any request
+                duration = monotonic() - self._started
+            self.slow_log.finish(self, duration)
+        else:
+            parent.batches += self.batches
+            parent.round_trips += self.round_trips
+            parent.round_trip_time += self.round_trip_time
+            parent.bytes_sent += self.bytes_sent
+            parent.bytes_received += self.bytes_received
+
+
+class SlowLog(Tracer):
+    """Log of the operations taking at least ``threshold`` seconds.
+
+    The slow log is a tracer (pass it as the ``tracer`` of ``Arango``)
+    timing the operations: ``execute_query`` (with the fetches of all the
+    batches of its cursor), ``export_documents`` and ``execute_batch``, and
+    the requests made on their own, e.g. ``execute_transaction``,
+    ``import_documents`` or the document calls. The slow ones are kept in
+    ``entries`` (the last ``max_entries`` of them) and logged to
+    ``logger``, if given, with the fingerprint of their AQL query.
+
+    To trace the operations too, pass the tracer to wrap as ``tracer``.
+
+    :param threshold: the min duration in seconds of the operations logged
+    :type threshold: int or float
+    :param max_entries: the max number of entries kept
+    :type max_entries: int
+    :param logger: the logger to log the entries to at WARNING level, or
+        None (default) to only keep them
+    :type logger: logging.Logger or None
+    :param operations: the names of the operations to log (e.g.
+        'execute_query', 'transaction', 'import' or 'document_get', see
+        ``arango.metrics.OPERATIONS``), or None (default) for all of them
+    :type operations: collections.Iterable or None
+    :param tracer: the tracer to forward the spans to
+    :type tracer: arango.tracing.Tracer or None
+    """
+
+    enabled = True
+
+    def __init__(self, threshold=1.0, max_entries=100, logger=None,
+                 operations=None, tracer=None):
+        self.threshold = threshold
+        self.entries = deque(maxlen=max_entries)
+        self.logger = logger
+        self.operations = None if operations is None else set(operations)
+        self.tracer = NOOP_TRACER if tracer is None else tracer
+        self._lock = Lock()
+
+    def __repr__(self):
+        """Return a descriptive string of this instance."""
+        return "<ArangoDB slow log ({} entries)>".format(len(self.entries))
+
+    def start_span(self, name, attributes=None, parent=None):
+        if parent is None:
+            parent = self.current_span()
+        if isinstance(parent, _TimedSpan):
+            inner_parent = parent.inner
+        else:
+            # e.g. the span of another service, parenting the operation
+            inner_parent, parent = parent, None
+        if self.tracer.enabled:
+            inner = self.tracer.start_span(name, attributes, inner_parent)
+        else:
+            inner = NOOP_SPAN
+        return _TimedSpan(self, attributes, parent, inner)
+
+    def clear(self):
+        """Forget the entries kept so far."""
+        with self._lock:
+            self.entries.clear()
+
+    def finish(self, span, duration):
+        """Log an ended operation if it was slow.
+
+        :param span: the span of the operation
+        :type span: arango.slowlog._TimedSpan
+        :param duration: the seconds the operation took
+        :type duration: float
+        """
+        if duration < self.threshold:
+            return
+        attributes = span.attributes
+        operation = attributes.get("db.operation")
+        if operation is None:
+            operation = OPERATIONS.get(
+                (attributes.get("http.method", "").lower(),
+                 attributes.get("http.route")),
+                "other"
+            )
+        if self.operations is not None and \
+                operation not in self.operations:
+            return
+        query = attributes.get("db.statement")
+        entry = SlowLogEntry(
+            operation=operation,
+            database=attributes.get("db.name"),
+            collection=attributes.get("db.collection", ""),
+            duration=duration,
+            fingerprint=None if query is None else fingerprint(query),
+            bind_vars=attributes.get("db.arangodb.bind_vars", []),
+            batches=span.batches,
+            bytes_sent=span.bytes_sent,
+            bytes_received=span.bytes_received,
+            error=span.error,
+            started=span.started
+        )
+        with self._lock:
+            self.entries.append(entry)
+        if self.logger is not None:
+            self.logger.warning("%s", entry)
@@ -0,0 +1,258 @@
+"""Incremental parsing of the JSON responses streamed by the server.
+
+The batches of the cursors are JSON objects whose ``result`` member holds
+the documents. Rather than decoding the whole batch at once, the documents
+are cut out of the raw content one at a time as its chunks arrive, so that
+at most one document (and one chunk) is held in memory, and the documents
+can be processed while the rest of the batch is still on its way.
+
+The documents cut out can also be returned as raw JSON, never decoded, for
+the applications relaying them as is.
+"""
+
+import re
+
+from arango.codec import JSONCodec
+
+# The bytes delimiting the nested values and the strings
+_STRUCTURE = re.compile(br'["\[\]{}]')
+# The bytes ending a string or escaping its next byte
+_STRING = re.compile(br'["\\]')
+# The bytes ending a number, a boolean or null
+_SCALAR_END = re.compile(br'[,\]}\s]')
+
+_WHITESPACE = frozenset(bytearray(b" \t\r\n"))
+_OPENERS = frozenset(bytearray(b"[{"))
+_QUOTE, _BACKSLASH = bytearray(b'"\\')
+_COMMA, _COLON = bytearray(b",:")
+_OPEN_ARRAY, _CLOSE_ARRAY, _OPEN_OBJECT, _CLOSE_OBJECT = bytearray(b"[]{}")
+
+
+class _Reader(object):
+    """The buffer of the content chunks not parsed yet.
+
+    :param chunks: the raw content chunks
+    :type chunks: collections.Iterable
+    """
+
+    __slots__ = ("chunks", "buffer", "pos", "view")
+
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.buffer = bytearray()
+        self.pos = 0
+        # The view of the buffer to slice the values out of, if it is never
+        # refilled (which a view would prevent)
+        self.view = None
+
+    def fill(self):
+        """Append the next chunk, dropping the bytes already parsed.
+
+        :returns: the number of bytes dropped from the start of the buffer
+        :rtype: int
+        :raises: ValueError if the content is truncated
+        """
+        for chunk in self.chunks:
+            if chunk:
+                break
+        else:
+            raise ValueError("truncated JSON content")
+        dropped = self.pos
+        del self.buffer[:dropped]
+        self.pos = 0
+        self.buffer += chunk
+        return dropped
+
+    def peek(self):
+        """Return the next byte which is not whitespace, without taking it.
+
+        :returns: the byte
+        :rtype: int
+        """
+        while True:
+            buffer, pos = self.buffer, self.pos
+            end = len(buffer)
+            while pos < end and buffer[pos] in _WHITESPACE:
+                pos += 1
+            self.pos = pos
+            if pos < end:
+                return buffer[pos]
+            self.fill()
+
+    def expect(self, *expected):
+        """Take the next byte which is not whitespace, one of ``expected``.
+
+        :returns: the byte
+        :rtype: int
+        :raises: ValueError
+        """
+        byte = self.peek()
+        if byte not in expected:
+            raise ValueError(
+                "unexpected {!r} in JSON content".format(chr(byte))
+            )
+        self.pos += 1
+        return byte
+
+    def take(self, view=True):
+        """Take the next JSON value, scanned but not decoded.
+
+        :param view: whether to slice the value out of the view, if any
+        :type view: bool
+        :returns: the raw JSON value
+        :rtype: bytes or memoryview
+        :raises: ValueError if the content is truncated
+        """
+        first = self.peek()
+        depth = 1 if first in _OPENERS else 0
+        in_string = first == _QUOTE
+        scalar = not depth and not in_string
+        # The scan resumes from ``i`` whenever the buffer is refilled
+        i = self.pos + 1
+        while True:
+            buffer = self.buffer
+            if scalar:
+                match = _SCALAR_END.search(buffer, i)
+                if match is not None:
+                    end = match.start()
+                    break
+            elif in_string:
+                match = _STRING.search(buffer, i)
+                if match is not None:
+                    i = match.end()
+                    if buffer[i - 1] == _BACKSLASH:
+                        # The escaped byte may not have arrived yet
+                        i += 1
+                        continue
+                    in_string = False
+                    if not depth:
+                        end = i
+                        break
+                    continue
+            else:
+                match = _STRUCTURE.search(buffer, i)
+                if match is not None:
+                    i = match.end()
+                    byte = buffer[i - 1]
+                    if byte == _QUOTE:
+                        in_string = True
+                    elif byte in _OPENERS:
+                        depth += 1
+                    else:
+                        depth -= 1
+                        if not depth:
+                            end = i
+                            break
+                    continue
+            i = max(i, len(buffer)) - self.fill()
+        if view and self.view is not None:
+            value = self.view[self.pos:end]
+        else:
+            value = bytes(buffer[self.pos:end])
+        self.pos = end
+        return value
+
+    def drain(self):
+        """Read the chunks left, e.g. for the connection to be reused."""
+        for _ in self.chunks:
+            pass
+
+
+def raw_headers(headers=None):
+    """Return the request headers asking for a JSON response.
+
+    The raw results are JSON even if the API wrapper uses a binary codec.
+
+    :param headers: the other request headers
+    :type headers: dict or None
+    :returns: the request headers
+    :rtype: dict
+    """
+    headers = dict(headers or {})
+    headers["Accept"] = JSONCodec.content_type
+    return headers
+
+
+def iter_results(chunks, envelope, decode, key="result"):
+    """Yield the raw JSON of the elements of the ``key`` array.
+
+    The other members of the JSON object (e.g. ``hasMore`` and ``id``) are
+    decoded into ``envelope`` as they are parsed, i.e. the members after
+    the array only once all its elements have been yielded.
+
+    :param chunks: the raw content chunks of a JSON object
+    :type chunks: collections.Iterable
+    :param envelope: the dict to store the other members into
+    :type envelope: dict
+    :param decode: the function decoding the other members
+    :type decode: callable
+    :param key: the name of the array member
+    :type key: str
+    :returns: the generator of the raw elements
+    :rtype: generator
+    :raises: ValueError if the content is not a JSON object
+    """
+    return _results(_Reader(chunks), envelope, decode, key)
+
+
+def raw_results(content, envelope, decode, key="result"):
+    """Return the raw JSON of the elements of the ``key`` array.
+
+    Unlike ``iter_results``, the content is scanned at once and the
+    elements are memoryview slices of (one copy of) it, rather than copies
+    of their own.
+
+    :param content: the raw content of a JSON object
+    :type content: bytes
+    :param envelope: the dict to store the other members into
+    :type envelope: dict
+    :param decode: the function decoding the other members
+    :type decode: callable
+    :param key: the name of the array member
+    :type key: str
+    :returns: the raw elements
+    :rtype: list
+    :raises: ValueError if the content is not a JSON object
+    """
+    reader = _Reader(())
+    reader.buffer += content
+    reader.view = memoryview(reader.buffer)
+    return list(_results(reader, envelope, decode, key))
+
+
+def _results(reader, envelope, decode, key):
+    """Yield the raw elements of the ``key`` array, see ``iter_results``."""
+    reader.expect(_OPEN_OBJECT)
+    if reader.peek() == _CLOSE_OBJECT:
+        reader.pos += 1
+    else:
+        while True:
+            name = decode(reader.take(view=False))
+            reader.expect(_COLON)
+            if name == key and reader.peek() == _OPEN_ARRAY:
+                reader.pos += 1
+                if reader.peek() == _CLOSE_ARRAY:
+                    reader.pos += 1
+                else:
+                    while True:
+                        yield reader.take()
+                        if reader.expect(_COMMA, _CLOSE_ARRAY) != _COMMA:
+                            break
+            else:
+                envelope[name] = decode(reader.take(view=False))
+            if reader.expect(_COMMA, _CLOSE_OBJECT) != _COMMA:
+                break
+    reader.drain()
+
+
+def parse_results(chunks, envelope, decode):
+    """Yield the decoded elements of the ``result`` array one at a time.
+
+    See ``iter_results``, whose arguments it takes.
+
+    :returns: the generator of the decoded elements
+    :rtype: generator
+    :raises: ValueError if the content is not a JSON object
+    """
+    for raw in iter_results(chunks, envelope, decode):
+        yield decode(raw)
@@ -0,0 +1,50 @@
+"""Utility functions used for testing the asynchronous API.
+
+This module requires Python 3, the test modules import it conditionally.
+"""
+
+import asyncio
+import gc
+
+from arango.aio import AsyncArango
+from arango.tests.utils import FakeClient
+
+
+class AsyncFakeClient(FakeClient):
+    """Asynchronous variant of ``arango.tests.utils.FakeClient``.
+
+    The gate is not waited for, so as not to block the event loop, and the
+    responses are not streamed, like with the asynchronous clients.
+    """
+
+    streaming = False
+
+    async def _request(self, method, url, **kwargs):
+        outcome, delay = self._start(method, url, kwargs)
+        await asyncio.sleep(delay)
+        return self._finish(method, url, outcome)
+
+
+async def gather(*awaitables):
+    """Await the awaitables concurrently and return their results."""
+    return await asyncio.gather(*awaitables)
+
+
+async def collect(cursor):
+    """Return the items of the asynchronous cursor."""
+    return [item async for item in cursor]
+
+
+async def abandon(cursor):
+    """Await the asynchronous cursor, then drop it and collect it."""
+    cursor = await cursor
+    del cursor
+    gc.collect()
+    # Let the tasks scheduled by its finalization run
+    await asyncio.sleep(0.01)
+
+
+async def open_database(name):
+    """Connect to the server and return the client and the database."""
+    arango = await AsyncArango.connect()
+    return arango, await arango.database(name)
@@ -0,0 +1,187 @@
+"""Tests for the asynchronous ArangoDB API."""
+
+import unittest
+
+try:
+    import asyncio
+    from arango.aio.api import AsyncAPI
+    from arango.aio.collection import AsyncCollection
+    from arango.aio.database import AsyncDatabase
+    from arango.tests.aio_utils import (
+        AsyncFakeClient,
+        collect,
+        gather,
+        open_database
+    )
+except (ImportError, SyntaxError):  # Python 2
+    asyncio = None
+
+from arango import Arango
+from arango.exceptions import (
+    CollectionNotFoundError,
+    DocumentRevisionError,
+)
+from arango.tests.utils import (
+    generate_col_name,
+    generate_db_name
+)
+
+
+COLLECTIONS = b"""{"result": [
+    {"name": "students", "type": 2, "isSystem": false},
+    {"name": "_users", "type": 2, "isSystem": true}
+]}"""
+
+PROPERTIES = b"""{
+    "id": "42", "name": "students", "type": 2, "status": 3,
+    "doCompact": true, "isSystem": false, "isVolatile": false,
+    "journalSize": 1048576, "waitForSync": false,
+    "keyOptions": {"type": "traditional", "allowUserKeys": true}
+}"""
+
+
+@unittest.skipIf(asyncio is None, "requires Python 3")
+class AsyncWrapperTest(unittest.TestCase):
+    """Tests for the asynchronous wrappers, without a server."""
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.addCleanup(self.loop.close)
+
+    def run_async(self, awaitable):
+        return self.loop.run_until_complete(awaitable)
+
+    def test_shared_methods(self):
+        client = AsyncFakeClient([
+            (200, COLLECTIONS),
+            (200, b'{"count": 2}'),
+            (200, PROPERTIES),
+        ])
+        database = AsyncDatabase("db", AsyncAPI(client=client))
+        col = self.run_async(database.collection("students"))
+        self.assertIsInstance(col, AsyncCollection)
+        self.assertEqual(col.type, "document")
+        self.assertEqual(self.run_async(col.count()), 2)
+        self.assertEqual(self.run_async(col.id), "42")
+        self.assertEqual(
+            [url.rsplit("/_api/", 1)[1] for _, url, _ in client.calls],
+            [
+                "collection",
+                "collection/students/count",
+                "collection/students/properties",
+            ]
+        )
+
+    def test_composed_methods(self):
+        client = AsyncFakeClient([(200, COLLECTIONS)])
+        database = AsyncDatabase("db", AsyncAPI(client=client))
+        self.assertEqual(
+            self.run_async(database.collections)["system"], ["_users"]
+        )
+        self.assertRaises(
+            CollectionNotFoundError,
+            self.run_async,
+            database.load_collection("missing")
+        )
+
+    def test_blocking_protocols(self):
+        col = AsyncCollection("students", AsyncAPI(client=AsyncFakeClient()))
+        self.assertRaises(TypeError, len, col)
+        self.assertRaises(TypeError, iter, col)
+        self.assertRaises(TypeError, lambda: "key" in col)
+        self.assertRaises(AttributeError, setattr, col, "journal_size", 1)
+        self.assertEqual(col.api.client.calls, [])
+
+
+@unittest.skipIf(asyncio is None, "requires Python 3")
+class AsyncAPITest(unittest.TestCase):
+    """Tests for the asynchronous ArangoDB API."""
+
+    def setUp(self):
+        self.arango = Arango()
+        self.db_name = generate_db_name(self.arango)
+        self.db = self.arango.create_database(self.db_name)
+        self.col_name = generate_col_name(self.db)
+        self.db.create_collection(self.col_name)
+        self.loop = asyncio.new_event_loop()
+
+        # Test database cleanup
+        self.addCleanup(self.arango.delete_database,
+                        name=self.db_name, safe_delete=True)
+        self.addCleanup(self.loop.close)
+
+    def run_async(self, awaitable):
+        return self.loop.run_until_complete(awaitable)
+
+    def async_database(self):
+        arango, database = self.run_async(open_database(self.db_name))
+        self.addCleanup(self.run_async, arango.close())
+        return database
+
+    def async_collection(self):
+        database = self.async_database()
+        return self.run_async(database.collection(self.col_name))
+
+    def test_collection_not_found(self):
+        database = self.async_database()
+        self.assertRaises(
+            CollectionNotFoundError,
+            self.run_async,
+            database.collection("missing_collection")
+        )
+
+    def test_collection_properties(self):
+        col = self.async_collection()
+        self.assertEqual(self.run_async(col.properties)["name"], self.col_name)
+        self.assertFalse(self.run_async(col.is_edge))
+        self.run_async(col.set_properties(wait_for_sync=True))
+        self.assertTrue(self.run_async(col.wait_for_sync))
+
+    def test_concurrent_document_management(self):
+        col = self.async_collection()
+        self.run_async(gather(*[
+            col.create_document({"_key": "doc{:02d}".format(i), "value": i})
+            for i in range(20)
+        ]))
+        self.assertEqual(self.run_async(col.count()), 20)
+        self.assertTrue(self.run_async(col.has("doc05")))
+        self.assertFalse(self.run_async(col.has("missing")))
+
+        documents = self.run_async(gather(*[
+            col.document("doc{:02d}".format(i)) for i in range(20)
+        ]))
+        self.assertEqual([doc["value"] for doc in documents], list(range(20)))
+        self.assertIsNone(self.run_async(col.document("missing")))
+
+        self.run_async(col.update_document("doc01", {"new": True}))
+        self.assertTrue(self.run_async(col.document("doc01"))["new"])
+        self.run_async(col.replace_document("doc02", {"value": 42}))
+        self.assertEqual(self.run_async(col.document("doc02"))["value"], 42)
+        self.assertRaises(
+            DocumentRevisionError,
+            self.run_async,
+            col.delete_document("doc03", rev="wrong_revision")
+        )
+        self.run_async(col.delete_document("doc03"))
+        self.assertEqual(self.run_async(col.count()), 19)
+
+    def test_execute_query(self):
+        col = self.async_collection()
+        self.run_async(col.import_documents([
+            {"_key": "doc01"},
+            {"_key": "doc02"},
+            {"_key": "doc03"},
+        ]))
+        database = self.async_database()
+        cursor = self.run_async(database.execute_query(
+            "FOR d IN {} RETURN d".format(self.col_name),
+            batch_size=1
+        ))
+        self.assertEqual(
+            sorted(doc["_key"] for doc in self.run_async(collect(cursor))),
+            ["doc01", "doc02", "doc03"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,166 @@
+"""Tests for the JWT authentication."""
+
+import base64
+import json
+import time
+import unittest
+
+from requests import Request
+
+try:
+    import asyncio
+    from arango.aio.api import AsyncAPI
+    from arango.tests.aio_utils import AsyncFakeClient
+except (ImportError, SyntaxError):  # Python 2
+    asyncio = None
+
+from arango.api import API
+from arango.auth import JWTAuth, token_expiry
+from arango.clients.default import BasicAuth
+from arango.exceptions import AuthenticationError
+from arango.tests.utils import FakeClient
+
+
+OK = (200, b'{"ok": true}')
+UNAUTHORIZED = (401, b'{"error": true, "errorNum": 11}')
+
+
+def make_token(name, expires_in=None):
+    """Return a JSON web token expiring in the given seconds, if any."""
+    claims = {"iss": "arangodb", "name": name}
+    if expires_in is not None:
+        claims["exp"] = int(time.time() + expires_in)
+    payload = base64.urlsafe_b64encode(
+        json.dumps(claims).encode("utf-8")
+    ).decode("ascii").rstrip("=")
+    return "e30.{}.signature".format(payload)
+
+
+def login(token):
+    """Return the outcome of a successful login with the token."""
+    return 200, json.dumps({"jwt": token}).encode("utf-8")
+
+
+class JWTAuthTest(unittest.TestCase):
+    """Tests for the JWT authentication of the API wrapper."""
+
+    def api(self, outcomes, **kwargs):
+        self.client = FakeClient(outcomes)
+        return API(client=self.client, jwt=JWTAuth(**kwargs))
+
+    def paths(self):
+        return [url.split("8529", 1)[1] for _, url, _ in self.client.calls]
+
+    def authorizations(self):
+        return [(headers or {}).get("Authorization")
+                for headers in self.client.arguments("headers")]
+
+    def test_token_expiry(self):
+        self.assertIsNone(token_expiry("not a token"))
+        self.assertIsNone(token_expiry(make_token("first")))
+        expiry = token_expiry(make_token("first", expires_in=100))
+        self.assertAlmostEqual(expiry - token_expiry(make_token("", 0)),
+                               100, delta=2)
+
+    def test_cached_token(self):
+        token = make_token("first", expires_in=3600)
+        api = self.api([login(token), OK])
+        for _ in range(3):
+            self.assertEqual(api.get("/_api/version").status_code, 200)
+        self.assertEqual(self.paths(), [
+            "/_open/auth",
+            "/_db/_system/_api/version",
+            "/_db/_system/_api/version",
+            "/_db/_system/_api/version",
+        ])
+        self.assertEqual(json.loads(self.client.arguments("data")[0]), {
+            "username": "root", "password": ""
+        })
+        self.assertEqual(self.authorizations()[1:],
+                         ["bearer " + token] * 3)
+        self.assertNotIn("auth", self.client.calls[1][2])
+
+    def test_refresh_before_expiry(self):
+        first = make_token("first", expires_in=30)
+        second = make_token("second", expires_in=3600)
+        api = self.api([login(first), OK, login(second), OK],
+                       refresh_margin=60)
+        api.get("/_api/version")
+        api.get("/_api/version")
+        api.get("/_api/version")
+        # The first token is within the margin of its expiry, not the second
+        self.assertEqual(self.paths(), [
+            "/_open/auth",
+            "/_db/_system/_api/version",
+            "/_open/auth",
+            "/_db/_system/_api/version",
+            "/_db/_system/_api/version",
+        ])
+        self.assertEqual(self.authorizations()[3:],
+                         ["bearer " + second] * 2)
+
+    def test_reauthenticate_once(self):
+        first, second = make_token("first"), make_token("second")
+        api = self.api([login(first), UNAUTHORIZED, login(second), OK])
+        self.assertEqual(api.get("/_api/version").status_code, 200)
+        self.assertEqual(self.authorizations()[1::2],
+                         ["bearer " + first, "bearer " + second])
+
+        # Rejected again with the new token
+        api = self.api([login(first), UNAUTHORIZED, login(second),
+                        UNAUTHORIZED])
+        self.assertEqual(api.get("/_api/version").status_code, 401)
+        self.assertEqual(len(self.client.calls), 4)
+
+    def test_login_failure(self):
+        api = self.api([UNAUTHORIZED])
+        self.assertRaises(AuthenticationError, api.get, "/_api/version")
+        self.assertEqual(self.paths(), ["/_open/auth"])
+        # The endpoint is neither taken out of the rotation nor leaked
+        endpoint = api.endpoints.endpoints[0]
+        self.assertFalse(endpoint.is_ejected)
+        self.assertEqual(endpoint.outstanding, 0)
+
+    def test_shared_by_credentials(self):
+        jwt = JWTAuth()
+        token = make_token("first")
+        client = FakeClient([login(token), OK, OK, login(token), OK])
+        API(client=client, jwt=jwt, database="one").get("/_api/version")
+        API(client=client, jwt=jwt, database="two").get("/_api/version")
+        API(client=client, jwt=jwt, password="other").get("/_api/version")
+        self.assertEqual(
+            [url.endswith("/_open/auth") for _, url, _ in client.calls],
+            [True, False, False, True, False]
+        )
+
+    def test_client_keeps_token(self):
+        auth = BasicAuth("root", "")
+        request = Request("GET", "http://localhost:8529/", headers={
+            "Authorization": "bearer token"
+        }).prepare()
+        self.assertEqual(auth(request).headers["Authorization"],
+                         "bearer token")
+        request = Request("GET", "http://localhost:8529/").prepare()
+        self.assertTrue(
+            auth(request).headers["Authorization"].startswith("Basic ")
+        )
+
+    @unittest.skipIf(asyncio is None, "requires Python 3")
+    def test_async_token(self):
+        token = make_token("first")
+        client = AsyncFakeClient([login(token), UNAUTHORIZED, login(token),
+                                  OK])
+        api = AsyncAPI(client=client, jwt=JWTAuth())
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+        res = loop.run_until_complete(api.get("/_api/version"))
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(
+            [(headers or {}).get("Authorization")
+             for headers in client.arguments("headers")],
+            [None, "bearer " + token, None, "bearer " + token]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,291 @@
+"""Tests for the ArangoDB HTTP clients."""
+
+import json
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import time
+import unittest
+
+try:
+    from http.client import HTTPException
+    from http.server import BaseHTTPRequestHandler
+    from socketserver import ThreadingMixIn, UnixStreamServer
+except ImportError:  # Python 2
+    from httplib import HTTPException
+    from BaseHTTPServer import BaseHTTPRequestHandler
+    from SocketServer import ThreadingMixIn, UnixStreamServer
+
+try:
+    import asyncio
+    from arango.aio.api import AsyncAPI
+    from arango.clients.aio import AsyncClient
+except (ImportError, SyntaxError):  # Python 2
+    asyncio = None
+
+from arango import Arango
+from arango.api import API
+from arango.clients import HTTPClient, UnixSocketClient
+from arango.endpoints import endpoint_url
+from arango.tests.utils import (
+    generate_col_name,
+    generate_db_name
+)
+
+
+class DefaultClientTest(unittest.TestCase):
+    """Tests for the default (requests based) HTTP client."""
+
+    def test_pool_warm_up(self):
+        arango = Arango(pool_maxsize=4, pool_warm_up=4)
+        # The connection check in the constructor reuses a warm connection
+        self.assertEqual(
+            arango.client.pool_stats,
+            {"hits": 1, "misses": 0, "discarded": 0}
+        )
+
+    def test_pool_stats(self):
+        arango = Arango(pool_maxsize=2)
+        for _ in range(5):
+            arango.version
+        stats = arango.client.pool_stats
+        self.assertEqual(stats["hits"] + stats["misses"], 6)
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["discarded"], 0)
+
+
+class HTTPClientTest(unittest.TestCase):
+    """Tests for the http.client based HTTP client."""
+
+    def setUp(self):
+        self.client = HTTPClient({"auth": ("root", "")})
+        self.arango = Arango(client=self.client)
+        self.db_name = generate_db_name(self.arango)
+        self.db = self.arango.create_database(self.db_name)
+        self.col_name = generate_col_name(self.db)
+        self.col = self.db.create_collection(self.col_name)
+
+        # Test database cleanup
+        self.addCleanup(self.client.close)
+        self.addCleanup(self.arango.delete_database,
+                        name=self.db_name, safe_delete=True)
+
+    def test_document_management(self):
+        self.col.create_document({"_key": "doc01", "value": 1})
+        self.assertEqual(self.col.document("doc01")["value"], 1)
+        self.assertIsNone(self.col.document("missing"))
+        self.assertIn("doc01", self.col)
+        self.col.update_document("doc01", {"value": 2})
+        self.assertEqual(self.col.document("doc01")["value"], 2)
+        self.col.delete_document("doc01")
+        self.assertEqual(len(self.col), 0)
+
+    def test_cursor(self):
+        self.col.import_documents([{"_key": str(i)} for i in range(10)])
+        cursor = self.db.execute_query(
+            "FOR d IN {} RETURN d._key".format(self.col_name),
+            batch_size=3
+        )
+        self.assertEqual(sorted(cursor), sorted(str(i) for i in range(10)))
+
+    def test_connection_per_thread(self):
+        def read():
+            for _ in range(5):
+                self.arango.version
+        threads = [threading.Thread(target=read) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # One connection for the main thread and one for each other thread
+        self.assertEqual(len(self.client._connections), 5)
+
+        # Closed connections are re-opened on the next request
+        self.client.close()
+        self.assertIsNotNone(self.arango.version)
+
+
+class DroppingServer(object):
+    """HTTP server dropping the connections after their first request.
+
+    With ``respond`` set, the first request of a connection is answered
+    and the connection closed once idle; otherwise the second request of
+    a connection is read and the connection closed without an answer.
+    """
+
+    def __init__(self, respond=False):
+        self.respond = respond
+        self.requests = []
+        self._sock = socket.socket()
+        self._sock.bind(("127.0.0.1", 0))
+        self._sock.listen(8)
+        self.url = "http://127.0.0.1:{}".format(self._sock.getsockname()[1])
+        thread = threading.Thread(target=self._serve)
+        thread.daemon = True
+        thread.start()
+
+    def _read(self, sock):
+        data = b""
+        while b"\r\n\r\n" not in data:
+            chunk = sock.recv(65536)
+            if not chunk:
+                return False
+            data += chunk
+        self.requests.append(data.split(b" ", 1)[0].decode())
+        return True
+
+    def _serve(self):
+        while True:
+            try:
+                sock, _ = self._sock.accept()
+            except EnvironmentError:
+                return
+            if self._read(sock):
+                sock.sendall(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\n{}")
+                if not self.respond:
+                    self._read(sock)
+            sock.close()
+
+    def close(self):
+        self._sock.close()
+
+
+class HTTPClientResendTest(unittest.TestCase):
+    """Tests for the requests failing on a reused connection."""
+
+    def setUp(self):
+        self.client = HTTPClient({"auth": ("root", "")})
+        self.addCleanup(self.client.close)
+
+    def server(self, respond=False):
+        server = DroppingServer(respond)
+        self.addCleanup(server.close)
+        return server
+
+    def test_idempotent_request_resent(self):
+        server = self.server()
+        self.client.get(server.url)
+        self.assertEqual(self.client.get(server.url).status_code, 200)
+        self.assertEqual(server.requests, ["GET", "GET", "GET"])
+
+    def test_write_not_resent(self):
+        server = self.server()
+        self.client.post(server.url, data="{}")
+        # The server may have processed the request it dropped
+        self.assertRaises((HTTPException, EnvironmentError),
+                          self.client.post, server.url, data="{}")
+        self.assertEqual(server.requests, ["POST", "POST"])
+
+    def test_idle_connection_dropped(self):
+        server = self.server(respond=True)
+        self.client.post(server.url, data="{}")
+        time.sleep(0.05)
+        # The connection closed while idle is re-opened before writing
+        self.assertEqual(
+            self.client.post(server.url, data="{}").status_code, 200
+        )
+        self.assertEqual(server.requests, ["POST", "POST"])
+
+
+class EchoHandler(BaseHTTPRequestHandler):
+    """Answers the requests with their method, path and payload."""
+
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        BaseHTTPRequestHandler.setup(self)
+        self.server.connections += 1
+
+    def _echo(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        content = json.dumps({
+            "method": self.command,
+            "path": self.path,
+            "data": self.rfile.read(length).decode("utf-8"),
+        }).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    do_GET = do_POST = _echo
+
+    def log_message(self, *args):
+        pass
+
+
+class UnixServer(ThreadingMixIn, UnixStreamServer):
+    """Echo server on a Unix domain socket in a temporary directory.
+
+    ``connections`` is the number of connections accepted so far.
+    """
+
+    daemon_threads = True
+
+    def __init__(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "arangodb.sock")
+        self.url = endpoint_url("unix", self.path, None)
+        self.connections = 0
+        UnixStreamServer.__init__(self, self.path, EchoHandler)
+        thread = threading.Thread(target=self.serve_forever, args=(0.01,))
+        thread.daemon = True
+        thread.start()
+
+    def close(self):
+        self.shutdown()
+        self.server_close()
+        shutil.rmtree(self.directory)
+
+
+class UnixSocketClientTest(unittest.TestCase):
+    """Tests for the round trips over a Unix domain socket."""
+
+    def setUp(self):
+        self.server = UnixServer()
+        self.addCleanup(self.server.close)
+
+    def test_round_trips(self):
+        client = UnixSocketClient({"auth": ("root", "")})
+        self.addCleanup(client.close)
+        res = client.get(self.server.url + "/_api/version",
+                         params={"details": "true"})
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.body, {"method": "GET", "data": "",
+                                    "path": "/_api/version?details=true"})
+        res = client.post(self.server.url + "/_api/cursor", data="{}")
+        self.assertEqual(res.body, {"method": "POST", "data": "{}",
+                                    "path": "/_api/cursor"})
+        # The connection is kept alive
+        self.assertEqual(self.server.connections, 1)
+
+    def test_unix_endpoint(self):
+        api = API(protocol="unix", host=self.server.path)
+        self.addCleanup(api.client.close)
+        self.assertIsInstance(api.client, UnixSocketClient)
+        self.assertEqual(api.get("/_api/version").body["path"],
+                         "/_db/_system/_api/version")
+
+    @unittest.skipIf(asyncio is None, "requires Python 3")
+    def test_async_round_trips(self):
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+        client = AsyncClient({"auth": ("root", "")})
+        api = AsyncAPI(client=client, endpoints=[self.server.url])
+        for method in ("get", "post"):
+            res = loop.run_until_complete(
+                getattr(api, method)("/_api/version")
+            )
+            self.assertEqual(res.status_code, 200)
+            self.assertEqual(res.body["method"], method.upper())
+            self.assertEqual(res.body["path"], "/_db/_system/_api/version")
+        # Over the connection opened with asyncio.open_unix_connection
+        self.assertEqual(self.server.connections, 1)
+        loop.run_until_complete(client.close())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+"""Tests for the JSON codecs."""
+
+import unittest
+
+from arango.codec import (
+    CODECS,
+    JSONCodec,
+    StdlibCodec,
+    VPackCodec,
+    get_codec
+)
+from arango.exceptions import InvalidArgumentError
+from arango.response import Response
+from arango.utils import stringify_request
+
+
+DOCUMENT = {"_key": "doc01", "name": u"Andr\u00e9", "values": [1, 2.5, None]}
+
+
+class CodecTest(unittest.TestCase):
+    """Tests for the JSON codecs."""
+
+    def test_get_codec(self):
+        self.assertIsInstance(get_codec(), StdlibCodec)
+        self.assertIsInstance(get_codec("auto"), JSONCodec)
+        codec = StdlibCodec()
+        self.assertIs(get_codec(codec), codec)
+        self.assertRaises(InvalidArgumentError, get_codec, "simplejson")
+
+    def test_round_trip(self):
+        for name, _ in CODECS:
+            # Falls back to the stdlib codec if the library is not installed
+            codec = get_codec(name)
+            encoded = codec.encode(DOCUMENT)
+            self.assertIsInstance(encoded, bytes)
+            self.assertEqual(codec.decode(encoded), DOCUMENT)
+            self.assertEqual(codec.decode(encoded.decode("utf-8")), DOCUMENT)
+            self.assertEqual(codec.decode(codec.dumps(DOCUMENT)), DOCUMENT)
+            self.assertRaises(ValueError, codec.decode, b"{invalid")
+
+    def test_response_decoding(self):
+        for name, _ in CODECS:
+            res = Response("get", "/_api/document/c/doc01", 200,
+                           StdlibCodec().encode(DOCUMENT), {})
+            res.codec = get_codec(name)
+            self.assertEqual(res.body, DOCUMENT)
+
+    def test_vpack_codec(self):
+        codec = get_codec("vpack")
+        self.assertIsInstance(codec, VPackCodec)
+        self.assertTrue(codec.binary)
+        self.assertEqual(codec.decode(codec.encode(DOCUMENT)), DOCUMENT)
+        self.assertEqual(codec.dumps({"value": 1}), '{"value": 1}')
+        self.assertIsInstance(codec.json_codec, StdlibCodec)
+
+        # The response is decoded according to its content type
+        res = Response("get", "/_api/document/c/doc01", 200,
+                       codec.encode(DOCUMENT),
+                       {"Content-Type": "application/x-velocypack"})
+        res.codec = codec
+        self.assertEqual(res.body, DOCUMENT)
+        res = Response("get", "/_api/document/c/doc02", 404,
+                       b'{"error": true, "errorNum": 1202}',
+                       {"Content-Type": "application/json"})
+        res.codec = codec
+        self.assertEqual(res.body, {"error": True, "errorNum": 1202})
+
+    def test_stringify_request(self):
+        request = stringify_request(
+            "POST", "/_api/document", data={"value": 1},
+            codec=get_codec("auto")
+        )
+        self.assertEqual(request.split("\r\n\r\n")[1].replace(" ", ""),
+                         '{"value":1}')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -107,6 +107,9 @@ class CollectionManagementTest(unittest.TestCase):
         col.journal_size = 8884208
         self.assertTrue(col.wait_for_sync)
         self.assertEqual(col.journal_size, 8884208)
+        col.set_properties(wait_for_sync=False, journal_size=7774208)
+        self.assertFalse(col.wait_for_sync)
+        self.assertEqual(col.journal_size, 7774208)
 
     def test_collection_load_unload(self):
         col = self.db.create_collection(generate_col_name(self.db))
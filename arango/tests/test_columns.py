@@ -0,0 +1,143 @@
+"""Tests for the materialization of the cursor results into NumPy columns."""
+
+import json
+import unittest
+
+try:
+    import asyncio
+    from arango.aio.api import AsyncAPI
+    from arango.aio.database import AsyncDatabase
+    from arango.tests.aio_utils import AsyncFakeClient
+except (ImportError, SyntaxError):  # Python 2
+    asyncio = None
+
+try:
+    import numpy
+except ImportError:  # numpy is an optional dependency
+    numpy = None
+
+from arango.api import API
+from arango.columns import ColumnBuilder, infer_dtype
+from arango.database import Database
+from arango.exceptions import InvalidArgumentError
+from arango.tests.utils import FakeClient
+
+
+def batch(documents, has_more=True, **extra):
+    body = dict(extra, result=documents, hasMore=has_more, id="5")
+    return 200, json.dumps(body).encode("utf-8")
+
+
+BATCHES = [
+    batch([{"a": 1, "b": 0.5, "c": "x"}, {"a": 2, "c": None}], count=5),
+    batch([{"a": 3, "b": 2}, {"a": 4, "b": 1.5, "c": "y"}]),
+    batch([{"a": 5, "b": 3.5, "d": True}], has_more=False),
+    (202, b"{}"),
+]
+
+
+@unittest.skipIf(numpy is None, "requires NumPy")
+class ColumnsTest(unittest.TestCase):
+    """Tests for the cursor results read into NumPy columns."""
+
+    def setUp(self):
+        self.client = FakeClient(BATCHES)
+        self.database = Database("db", API(client=self.client))
+
+    def check(self, column, values, mask):
+        self.assertEqual(column.compressed().tolist(), values)
+        self.assertEqual(column.mask.tolist(), mask)
+
+    def test_inferred(self):
+        cursor = self.database.execute_query("RETURN 1", count=True)
+        self.assertEqual(cursor.count, 5)
+        columns = cursor.to_columns()
+        # The fields of the first batch only
+        self.assertEqual(sorted(columns), ["a", "b", "c"])
+        self.assertEqual(columns["a"].dtype, numpy.int64)
+        self.assertEqual(columns["b"].dtype, numpy.float64)
+        self.assertEqual(columns["c"].dtype, object)
+        self.check(columns["a"], [1, 2, 3, 4, 5], [False] * 5)
+        self.check(columns["b"], [0.5, 2.0, 1.5, 3.5],
+                   [False, True, False, False, False])
+        self.check(columns["c"], ["x", "y"],
+                   [False, True, True, False, True])
+        self.assertEqual(self.client.calls[-1][0], "delete")
+
+    def test_given_fields(self):
+        cursor = self.database.execute_query("RETURN 1")
+        columns = cursor.to_columns(["d", "a"], {"a": "int32"})
+        self.assertEqual(columns["a"].dtype, numpy.int32)
+        self.check(columns["a"], [1, 2, 3, 4, 5], [False] * 5)
+        # Missing from the first batch, so inferred as objects
+        self.check(columns["d"], [True], [True] * 4 + [False])
+
+    def test_structured(self):
+        cursor = self.database.execute_query("RETURN 1")
+        array = cursor.to_columns(["a", "b"], structured=True)
+        self.assertEqual(array.dtype.names, ("a", "b"))
+        self.assertEqual(array["a"].tolist(), [1, 2, 3, 4, 5])
+        self.assertEqual(array["b"].mask.tolist(),
+                         [False, True, False, False, False])
+        self.assertEqual(array[3]["b"], 1.5)
+
+    def test_growth(self):
+        builder = ColumnBuilder(capacity=1)
+        for i in range(10):
+            builder.add([{"a": i}] * 3)
+        self.assertEqual(builder.build()["a"].tolist(),
+                         [i for i in range(10) for _ in range(3)])
+
+    def test_empty(self):
+        self.assertEqual(ColumnBuilder().build(), {})
+        array = ColumnBuilder(["a"], {"a": float}).build(structured=True)
+        self.assertEqual(len(array), 0)
+
+    def test_not_documents(self):
+        self.assertRaises(InvalidArgumentError, ColumnBuilder().add, [1, 2])
+        builder = ColumnBuilder()
+        builder.add([{"a": 1}])
+        self.assertRaises(InvalidArgumentError, builder.add, [{"a": 2}, 3])
+
+    def test_values_not_fitting(self):
+        builder = ColumnBuilder()
+        builder.add([{"a": 1, "b": True, "c": 0.5}])
+        # Neither truncated nor cast to True
+        self.assertRaises(TypeError, builder.add, [{"a": 1.5}])
+        self.assertRaises(TypeError, builder.add, [{"b": 2}])
+        self.assertRaises(TypeError, builder.add, [{"c": "x"}])
+        builder = ColumnBuilder(["s"], {"s": "U2"})
+        builder.add([{"s": "ab"}])
+        self.assertRaises(TypeError, builder.add, [{"s": "abc"}])
+
+    def test_values_fitting(self):
+        builder = ColumnBuilder(["a", "b", "d"],
+                                {"a": "int32", "d": "datetime64[D]"})
+        builder.add([{"a": 1, "b": 0.5, "d": "2020-01-02"}])
+        builder.add([])
+        builder.add([{"a": True, "b": 2}, {"b": None}])
+        columns = builder.build()
+        self.assertEqual(columns["a"].compressed().tolist(), [1, 1])
+        self.assertEqual(columns["b"].compressed().tolist(), [0.5, 2.0])
+        self.assertEqual(str(columns["d"][0]), "2020-01-02")
+
+    def test_infer_dtype(self):
+        self.assertEqual(infer_dtype([True, None]), numpy.bool_)
+        self.assertEqual(infer_dtype([1, 2]), numpy.int64)
+        self.assertEqual(infer_dtype([1, 2.5]), numpy.float64)
+        self.assertEqual(infer_dtype([1, True]), object)
+        self.assertEqual(infer_dtype([None]), object)
+
+    @unittest.skipIf(asyncio is None, "requires Python 3")
+    def test_async(self):
+        client = AsyncFakeClient(BATCHES)
+        database = AsyncDatabase("db", AsyncAPI(client=client))
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+        cursor = loop.run_until_complete(database.execute_query("RETURN 1"))
+        columns = loop.run_until_complete(cursor.to_columns(["a"]))
+        self.check(columns["a"], [1, 2, 3, 4, 5], [False] * 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
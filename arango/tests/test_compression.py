@@ -0,0 +1,73 @@
+"""Tests for the compression of the request and response bodies."""
+
+import unittest
+import zlib
+
+from arango.api import API
+from arango.compression import Decompressor, check_compression, compress
+from arango.exceptions import InvalidArgumentError
+
+
+PAYLOAD = b'{"_key": "doc01", "value": "' + b"x" * 4096 + b'"}'
+
+
+class CompressionTest(unittest.TestCase):
+    """Tests for the compression helpers."""
+
+    def test_check_compression(self):
+        self.assertIsNone(check_compression(None))
+        self.assertEqual(check_compression("gzip"), "gzip")
+        self.assertRaises(InvalidArgumentError, check_compression, "br")
+
+    def test_round_trip(self):
+        for method in ("gzip", "deflate"):
+            compressed = compress(PAYLOAD, method)
+            self.assertLess(len(compressed), len(PAYLOAD))
+            decompressor = Decompressor(method)
+            chunks = [
+                decompressor.decompress(compressed[i:i + 7])
+                for i in range(0, len(compressed), 7)
+            ]
+            chunks.append(decompressor.flush())
+            self.assertEqual(b"".join(chunks), PAYLOAD)
+
+    def test_raw_deflate(self):
+        compressor = zlib.compressobj(6, zlib.DEFLATED, -zlib.MAX_WBITS)
+        compressed = compressor.compress(PAYLOAD) + compressor.flush()
+        decompressor = Decompressor("deflate")
+        self.assertEqual(
+            decompressor.decompress(compressed) + decompressor.flush(),
+            PAYLOAD
+        )
+
+    def test_request_compression(self):
+        api = API(compression="gzip", compression_threshold=1024)
+        kwargs = {"data": PAYLOAD, "headers": {"x-arango-async": "true"}}
+        api._compress(kwargs, None)
+        self.assertEqual(kwargs["headers"]["Content-Encoding"], "gzip")
+        self.assertEqual(kwargs["headers"]["Accept-Encoding"], "gzip, deflate")
+        self.assertEqual(kwargs["headers"]["x-arango-async"], "true")
+        self.assertEqual(zlib.decompress(kwargs["data"], 31), PAYLOAD)
+
+        # Small payloads are sent as is
+        kwargs = {"data": "{}", "headers": None}
+        api._compress(kwargs, "deflate")
+        self.assertEqual(kwargs["data"], "{}")
+        self.assertNotIn("Content-Encoding", kwargs["headers"])
+
+        # Compression can be disabled per call
+        kwargs = {"data": PAYLOAD, "headers": None}
+        api._compress(kwargs, False)
+        self.assertEqual(kwargs, {"data": PAYLOAD, "headers": None})
+
+    def test_compression_disabled_by_default(self):
+        api = API()
+        kwargs = {"data": PAYLOAD, "headers": None}
+        api._compress(kwargs, None)
+        self.assertEqual(kwargs, {"data": PAYLOAD, "headers": None})
+        api._compress(kwargs, True)
+        self.assertEqual(kwargs["headers"]["Content-Encoding"], "gzip")
+
+
+if __name__ == "__main__":
+    unittest.main()
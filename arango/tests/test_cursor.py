@@ -0,0 +1,313 @@
+"""Tests for the cursors, without a server."""
+
+import gc
+import sys
+import threading
+import time
+import unittest
+
+try:
+    import asyncio
+    from arango.aio.api import AsyncAPI
+    from arango.aio.database import AsyncDatabase
+    from arango.tests.aio_utils import (
+        AsyncFakeClient,
+        abandon,
+        collect,
+    )
+except (ImportError, SyntaxError):  # Python 2
+    asyncio = None
+
+from arango.api import API
+from arango.cursor import Cursor, cursor_counts, registry
+from arango.database import Database
+from arango.exceptions import CursorDeleteError, CursorGetNextError
+from arango.tests.utils import FakeClient
+
+
+def batch(items, has_more=True):
+    return (200, '{{"result": {}, "hasMore": {}, "id": "5"}}'.format(
+        items, "true" if has_more else "false"
+    ).encode("utf-8"))
+
+
+CLOSED = (202, b"{}")
+BATCHES = [
+    batch([1, 2]),
+    batch([3, 4]),
+    batch([5, 6]),
+    batch([7], has_more=False),
+    CLOSED,
+]
+
+
+def wait_for(condition, timeout=1.0):
+    """Wait for the condition to hold, and return whether it did."""
+    deadline = time.time() + timeout
+    while not condition():
+        if time.time() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def counted(function):
+    """Return the changes of the cursor counts over a call."""
+    before = cursor_counts()
+    function()
+    after = cursor_counts()
+    return {name: after[name] - before[name] for name in after
+            if after[name] != before[name]}
+
+
+def prefetching():
+    """Return the number of prefetching threads running."""
+    return len([thread for thread in threading.enumerate()
+                if thread.name == "arango-cursor-prefetch"])
+
+
+class CursorTest(unittest.TestCase):
+    """Tests for the cursors fetching their batches on a thread."""
+
+    def setUp(self):
+        self.client = FakeClient(BATCHES)
+        self.database = Database("db", API(client=self.client))
+
+    def test_on_demand(self):
+        cursor = self.database.execute_query("RETURN 1")
+        self.assertIsInstance(cursor, Cursor)
+        self.assertIs(iter(cursor), cursor)
+        self.assertEqual([next(cursor), next(cursor)], [1, 2])
+        self.assertEqual(len(self.client.calls), 1)
+        self.assertEqual(list(cursor), [3, 4, 5, 6, 7])
+        self.assertEqual(len(self.client.calls), 5)
+        self.assertEqual(list(cursor), [])
+
+    def test_prefetch(self):
+        cursor = self.database.execute_query("RETURN 1", prefetch=1)
+        # One batch is queued while the thread holds the next one
+        self.assertTrue(wait_for(lambda: len(self.client.calls) == 3))
+        time.sleep(0.05)
+        self.assertEqual(len(self.client.calls), 3)
+        self.assertEqual(list(cursor), [1, 2, 3, 4, 5, 6, 7])
+        self.assertEqual(self.client.calls[-1][0], "delete")
+        self.assertTrue(wait_for(lambda: prefetching() == 0))
+
+    def test_prefetch_error(self):
+        self.client.outcomes = [BATCHES[0], (500, b'{"error": true}')]
+        cursor = self.database.execute_query("RETURN 1", prefetch=2)
+        self.assertEqual([next(cursor), next(cursor)], [1, 2])
+        self.assertRaises(CursorGetNextError, next, cursor)
+        self.assertEqual(list(cursor), [])
+
+    def test_prefetch_stopped(self):
+        self.client.outcomes = BATCHES[:3] + [CLOSED]
+        cursor = self.database.execute_query("RETURN 1", prefetch=1)
+        self.assertTrue(wait_for(lambda: len(self.client.calls) == 3))
+        del cursor
+        gc.collect()
+        # The thread waiting for room in the queue is let go
+        self.assertTrue(wait_for(lambda: prefetching() == 0))
+        self.assertLessEqual(len(self.client.calls), 4)
+
+    def test_batches(self):
+        cursor = self.database.execute_query("RETURN 1")
+        self.assertEqual(next(cursor), 1)
+        batches = []
+        for items in cursor.batches():
+            batches.append((cursor.batch_index, cursor.result_count, items))
+        # The rest of the batch being consumed comes first
+        self.assertEqual(batches, [
+            (0, 1, [2]),
+            (1, 3, [3, 4]),
+            (2, 5, [5, 6]),
+            (3, 6, [7]),
+        ])
+        self.assertEqual(list(cursor), [])
+
+    def test_batches_not_copied(self):
+        cursor = self.database.execute_query("RETURN 1", prefetch=1)
+        first = cursor._pending
+        batches = list(cursor.batches())
+        self.assertIs(batches[0], first)
+        self.assertEqual(batches[1:], [[3, 4], [5, 6], [7]])
+
+    def test_streamed_batches(self):
+        self.client.chunk_size = 4
+        cursor = self.database.execute_query("RETURN 1", stream=True)
+        self.assertEqual(list(cursor.batches()),
+                         [[1, 2], [3, 4], [5, 6], [7]])
+        self.assertEqual(self.client.calls[-1][0], "delete")
+
+    def deleted(self):
+        """Return the paths of the cursors deleted."""
+        return ["/".join(url.split("/")[-3:])
+                for method, url, _ in self.client.calls if method == "delete"]
+
+    def test_close(self):
+        self.client.outcomes = [BATCHES[0], CLOSED]
+        counts = cursor_counts()
+        with self.database.execute_query("RETURN 1") as cursor:
+            self.assertEqual(next(cursor), 1)
+            self.assertEqual(cursor_counts()["open"], counts["open"] + 1)
+        self.assertEqual(cursor_counts()["closed"], counts["closed"] + 1)
+        self.assertEqual(self.deleted(), ["_api/cursor/5"])
+        self.assertEqual(list(cursor), [])
+        cursor.close()
+        self.assertEqual(len(self.client.calls), 2)
+
+    def test_close_exhausted(self):
+        def read():
+            with self.database.execute_query("RETURN 1") as cursor:
+                self.assertEqual(len(list(cursor)), 7)
+
+        self.assertEqual(counted(read), {"opened": 1, "exhausted": 1})
+        self.assertEqual(self.deleted(), ["_api/cursor/5"])
+
+    def test_close_prefetching(self):
+        self.client.outcomes = BATCHES[:3] + [CLOSED]
+        cursor = self.database.execute_query("RETURN 1", prefetch=1)
+        self.assertTrue(wait_for(lambda: len(self.client.calls) == 3))
+        self.assertEqual(counted(cursor.close), {"closed": 1, "open": -1})
+        self.assertEqual(prefetching(), 0)
+        self.assertEqual(self.deleted(), ["_api/cursor/5"])
+
+    def test_close_streamed(self):
+        self.client.chunk_size = 4
+        self.client.outcomes = [BATCHES[0], CLOSED]
+        cursor = self.database.execute_query("RETURN 1", stream=True)
+        self.assertEqual(next(cursor), 1)
+        # The ID of the server cursor follows the results
+        self.assertEqual(counted(cursor.close), {"opened": 1, "closed": 1})
+        self.assertEqual(self.deleted(), ["_api/cursor/5"])
+
+    def test_collected(self):
+        self.client.outcomes = [BATCHES[0], CLOSED]
+
+        def abandon():
+            cursor = self.database.execute_query("RETURN 1")
+            next(cursor)
+            del cursor
+            gc.collect()
+
+        self.assertEqual(counted(abandon), {"opened": 1, "collected": 1})
+        self.assertEqual(self.deleted(), ["_api/cursor/5"])
+
+    def test_released_at_exit(self):
+        self.client.outcomes = [BATCHES[0], CLOSED]
+        cursor = self.database.execute_query("RETURN 1")
+        self.assertEqual(counted(registry.release_all),
+                         {"exit": 1, "open": -1})
+        self.assertEqual(self.deleted(), ["_api/cursor/5"])
+        cursor.close()
+        self.assertEqual(len(self.client.calls), 2)
+
+    def test_release_failed(self):
+        self.client.outcomes = [BATCHES[0], (500, b"{}"), CLOSED]
+        cursor = self.database.execute_query("RETURN 1")
+        counts = cursor_counts()
+        self.assertRaises(CursorDeleteError, cursor.close)
+        # Still held on the server, so released again at exit
+        self.assertEqual(cursor_counts(), counts)
+        self.assertEqual(counted(registry.release_all),
+                         {"exit": 1, "open": -1})
+        self.assertEqual(self.deleted(), ["_api/cursor/5"] * 2)
+
+    @unittest.skipIf(asyncio is None, "requires Python 3")
+    def test_async_close(self):
+        client = AsyncFakeClient([BATCHES[0], CLOSED])
+        database = AsyncDatabase("db", AsyncAPI(client=client))
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+
+        def read():
+            cursor = loop.run_until_complete(
+                database.execute_query("RETURN 1")
+            )
+            loop.run_until_complete(cursor.__aenter__())
+            loop.run_until_complete(cursor.__anext__())
+            loop.run_until_complete(cursor.__aexit__(None, None, None))
+
+        self.assertEqual(counted(read), {"opened": 1, "closed": 1})
+        self.assertEqual(client.calls[-1][0], "delete")
+        self.assertTrue(client.calls[-1][1].endswith("/_api/cursor/5"))
+
+    @unittest.skipIf(asyncio is None, "requires Python 3")
+    def test_async_release_failed(self):
+        client = AsyncFakeClient([BATCHES[0], (500, b"{}"), CLOSED])
+        database = AsyncDatabase("db", AsyncAPI(client=client))
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+        cursor = loop.run_until_complete(database.execute_query("RETURN 1"))
+        counts = cursor_counts()
+        self.assertRaises(CursorDeleteError, loop.run_until_complete,
+                          cursor.close())
+        self.assertEqual(cursor_counts(), counts)
+        self.assertEqual(
+            counted(lambda: loop.run_until_complete(cursor.close())),
+            {"closed": 1, "open": -1}
+        )
+        self.assertEqual(len(client.calls), 3)
+
+    @unittest.skipIf(asyncio is None, "requires Python 3")
+    def test_async_collected(self):
+        client = AsyncFakeClient([BATCHES[0], CLOSED])
+        database = AsyncDatabase("db", AsyncAPI(client=client))
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+
+        self.assertEqual(
+            counted(lambda: loop.run_until_complete(
+                abandon(database.execute_query("RETURN 1"))
+            )),
+            {"opened": 1, "collected": 1}
+        )
+        self.assertEqual(client.calls[-1][0], "delete")
+        self.assertTrue(client.calls[-1][1].endswith("/_api/cursor/5"))
+
+    @unittest.skipIf(not hasattr(sys, "unraisablehook"),
+                     "requires Python 3.8")
+    def test_async_collected_unfinished(self):
+        # The envelope misses "hasMore", failing the creation of the cursor
+        client = AsyncFakeClient([(201, b'{"result": [1]}')])
+        database = AsyncDatabase("db", AsyncAPI(client=client))
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+        unraisable = []
+        self.addCleanup(setattr, sys, "unraisablehook", sys.unraisablehook)
+        sys.unraisablehook = unraisable.append
+
+        with self.assertRaises(KeyError):
+            loop.run_until_complete(database.execute_query("RETURN 1"))
+        gc.collect()
+        self.assertEqual(unraisable, [])
+
+    @unittest.skipIf(asyncio is None, "requires Python 3")
+    def test_async_batches(self):
+        client = AsyncFakeClient(BATCHES)
+        database = AsyncDatabase("db", AsyncAPI(client=client))
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+        cursor = loop.run_until_complete(database.execute_query("RETURN 1"))
+        self.assertEqual(loop.run_until_complete(collect(cursor.batches())),
+                         [[1, 2], [3, 4], [5, 6], [7]])
+        self.assertEqual((cursor.batch_index, cursor.result_count), (3, 7))
+
+    @unittest.skipIf(asyncio is None, "requires Python 3")
+    def test_async_prefetch(self):
+        client = AsyncFakeClient(BATCHES)
+        database = AsyncDatabase("db", AsyncAPI(client=client))
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+        cursor = loop.run_until_complete(
+            database.execute_query("RETURN 1", prefetch=1)
+        )
+        loop.run_until_complete(asyncio.sleep(0.05))
+        self.assertEqual(len(client.calls), 3)
+        self.assertEqual(loop.run_until_complete(collect(cursor)),
+                         [1, 2, 3, 4, 5, 6, 7])
+        self.assertEqual(client.calls[-1][0], "delete")
+
+
+if __name__ == "__main__":
+    unittest.main()
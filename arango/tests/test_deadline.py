@@ -0,0 +1,86 @@
+"""Tests for the timeouts and the per-operation deadlines."""
+
+import time
+import unittest
+
+from arango.api import API
+from arango.clients.base import resolve_timeout
+from arango.cursor import cursor
+from arango.deadline import Deadline
+from arango.exceptions import DeadlineExceededError
+from arango.retry import RetryPolicy
+from arango.tests.utils import FakeClient
+
+
+BATCH = (200, b'{"result": [1, 2], "hasMore": true, "id": "1"}')
+LAST_BATCH = (200, b'{"result": [3], "hasMore": false, "id": "1"}')
+
+
+class DeadlineTest(unittest.TestCase):
+    """Tests for the deadlines of the API wrapper."""
+
+    def test_deadline(self):
+        self.assertIsNone(Deadline.of(None))
+        deadline = Deadline.of(10)
+        self.assertIs(Deadline.of(deadline), deadline)
+        self.assertFalse(deadline.expired)
+        self.assertTrue(9 < deadline.remaining() <= 10)
+        deadline = Deadline(0)
+        self.assertTrue(deadline.expired)
+        self.assertEqual(deadline.remaining(), 0)
+
+    def test_resolve_timeout(self):
+        self.assertEqual(resolve_timeout(None), (None, None))
+        self.assertEqual(resolve_timeout(5), (5, 5))
+        self.assertEqual(resolve_timeout((1, 5), 2), (1, 2))
+        self.assertEqual(resolve_timeout((None, 5), 2), (2, 2))
+
+    def test_timeout_passed_to_client(self):
+        client = FakeClient()
+        api = API(client=client)
+        api.get("/_api/version")
+        api.get("/_api/version", deadline=5)
+        # No timeout is passed without a deadline
+        timeouts = client.arguments("timeout")
+        self.assertIsNone(timeouts[0])
+        self.assertTrue(4 < timeouts[1] <= 5)
+
+    def test_deadline_exceeded(self):
+        api = API(client=FakeClient(delay=0.1))
+        self.assertRaises(DeadlineExceededError, api.get, "/_api/version",
+                          deadline=0.05)
+        # The endpoint is not blamed for the lack of time
+        self.assertFalse(api.endpoints.endpoints[0].is_ejected)
+        self.assertRaises(DeadlineExceededError, api.get, "/_api/version",
+                          deadline=Deadline(0))
+
+    def test_no_retry_past_deadline(self):
+        client = FakeClient([(503, b"{}")])
+        policy = RetryPolicy(max_attempts=5, backoff=0.2, jitter=False,
+                             failure_threshold=None)
+        api = API(client=client, retry_policy=policy)
+        start = time.time()
+        res = api.get("/_api/version", deadline=0.3)
+        # The second retry would have waited past the deadline
+        self.assertEqual(res.status_code, 503)
+        self.assertLess(time.time() - start, 0.3)
+        self.assertEqual(len(client.calls), 2)
+        self.assertEqual(policy.stats["exhausted"], 1)
+
+    def test_cursor_shares_deadline(self):
+        client = FakeClient([BATCH, BATCH, LAST_BATCH, (202, b"{}")],
+                            delay=0.05)
+        api = API(client=client)
+        deadline = Deadline(0.12)
+        res = api.post("/_api/cursor", deadline=deadline)
+        items = cursor(api, res, deadline=deadline)
+        self.assertEqual([next(items), next(items)], [1, 2])
+        self.assertEqual([next(items), next(items)], [1, 2])
+        # The third batch is not fetched within what is left of the budget
+        self.assertRaises(DeadlineExceededError, next, items)
+        timeouts = client.arguments("timeout")
+        self.assertTrue(timeouts[0] > timeouts[1] > timeouts[2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -33,7 +33,10 @@ class DocumentManagementTest(unittest.TestCase):
         self.assertEqual(len(self.col), 0)
         self.col.create_document({"_key": "test_doc"})
         self.assertEqual(len(self.col), 1)
+        self.assertEqual(self.col.count(), 1)
         self.assertIn("test_doc", self.col)
+        self.assertTrue(self.col.has("test_doc"))
+        self.assertFalse(self.col.has("missing_doc"))
 
     def test_delete_document(self):
         rev = self.col.create_document({"_key": "test_doc"})["_rev"]
@@ -0,0 +1,178 @@
+"""Tests for the client-side load balancing across endpoints."""
+
+import threading
+import time
+import unittest
+
+try:
+    import asyncio
+    from arango.aio.api import AsyncAPI
+    from arango.tests.aio_utils import AsyncFakeClient
+except (ImportError, SyntaxError):  # Python 2
+    asyncio = None
+
+from arango.api import API, PROBE_TIMEOUT
+from arango.endpoints import (
+    EndpointPool,
+    endpoint_url,
+    unix_socket_path
+)
+from arango.exceptions import InvalidArgumentError
+from arango.tests.utils import FakeClient
+
+
+URLS = ["http://host1:8529", "http://host2:8529/", "http://host3:8529"]
+
+
+class EndpointPoolTest(unittest.TestCase):
+    """Tests for the endpoint pool."""
+
+    def test_invalid_arguments(self):
+        self.assertRaises(InvalidArgumentError, EndpointPool, [])
+        self.assertRaises(
+            InvalidArgumentError,
+            EndpointPool,
+            URLS,
+            strategy="fastest"
+        )
+
+    def test_round_robin(self):
+        pool = EndpointPool(URLS)
+        urls = []
+        for _ in range(6):
+            endpoint = pool.acquire()
+            pool.release(endpoint)
+            urls.append(endpoint.url)
+        self.assertEqual(sorted(urls[:3]), sorted(u.rstrip("/") for u in URLS))
+        self.assertEqual(urls[:3], urls[3:])
+
+    def test_least_outstanding(self):
+        pool = EndpointPool(URLS, strategy="least_outstanding")
+        busy = [pool.acquire(), pool.acquire()]
+        self.assertEqual(len(set(busy)), 2)
+        idle = pool.acquire()
+        self.assertNotIn(idle, busy)
+        self.assertEqual(
+            [endpoint.outstanding for endpoint in pool.endpoints],
+            [1, 1, 1]
+        )
+
+    def test_pinned_endpoint(self):
+        pool = EndpointPool(URLS, strategy="random")
+        endpoint = pool.endpoints[1]
+        for _ in range(5):
+            self.assertIs(pool.acquire(endpoint), endpoint)
+        self.assertEqual(endpoint.outstanding, 5)
+
+    def test_eject_and_restore(self):
+        pool = EndpointPool(URLS, probe_interval=0)
+        failed = pool.acquire()
+        pool.release(failed, failed=True)
+        self.assertTrue(failed.is_ejected)
+        self.assertEqual(failed.failures, 1)
+        for _ in range(4):
+            endpoint = pool.acquire()
+            pool.release(endpoint)
+            self.assertIsNot(endpoint, failed)
+
+        # The ejected endpoint is handed out for probing only once
+        self.assertEqual(pool.due_for_probe(), [failed])
+        self.assertEqual(pool.due_for_probe(), [])
+        pool.restore(failed)
+        self.assertFalse(failed.is_ejected)
+        self.assertEqual(pool.due_for_probe(), [])
+
+    def test_all_endpoints_ejected(self):
+        pool = EndpointPool(URLS[:2])
+        first, second = pool.endpoints
+        pool.eject(second)
+        pool.eject(first)
+        self.assertIs(pool.acquire(), second)
+
+    def test_unix_socket_endpoints(self):
+        url = endpoint_url("unix", "/tmp/ArangoDB.sock", 8529)
+        self.assertEqual(url, "http+unix://%2Ftmp%2FArangoDB.sock")
+        self.assertEqual(endpoint_url("https", "host", 8530),
+                         "https://host:8530")
+
+        # ArangoDB's own notation of the socket endpoints is converted
+        pool = EndpointPool(["unix:///tmp/ArangoDB.sock", URLS[0]])
+        unix, tcp = pool.endpoints
+        self.assertEqual(unix.url, url)
+        self.assertTrue(unix.is_unix)
+        self.assertFalse(tcp.is_unix)
+        self.assertEqual(
+            unix_socket_path(url.partition("://")[2]),
+            "/tmp/ArangoDB.sock"
+        )
+
+
+class HangingProbeClient(FakeClient):
+    """Fake client whose HEAD requests (i.e. the probes) hang until let go."""
+
+    def __init__(self):
+        super(HangingProbeClient, self).__init__()
+        self.let_go = threading.Event()
+
+    def head(self, url, **kwargs):
+        self.let_go.wait()
+        return self._request("head", url, **kwargs)
+
+
+if asyncio is not None:
+    class AsyncHangingProbeClient(AsyncFakeClient):
+        """Asynchronous fake client whose HEAD requests never complete."""
+
+        def head(self, url, **kwargs):
+            self.calls.append(("head", url, kwargs))
+            return asyncio.get_running_loop().create_future()
+
+
+class ProbeTest(unittest.TestCase):
+    """Tests for the probes of the ejected endpoints."""
+
+    def test_probe_off_request_path(self):
+        client = HangingProbeClient()
+        api = API(client=client, endpoints=URLS[:2], probe_interval=0)
+        ejected = api.endpoints.endpoints[1]
+        api.endpoints.eject(ejected)
+        # The request does not wait for the probe
+        self.assertEqual(api.get("/_api/version", deadline=1).status_code,
+                         200)
+        self.assertTrue(ejected.probing)
+        client.let_go.set()
+        deadline = time.time() + 1
+        while ejected.is_ejected and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertFalse(ejected.is_ejected)
+        probes = [kwargs for method, _, kwargs in client.calls
+                  if method == "head"]
+        self.assertEqual([kwargs["timeout"] for kwargs in probes],
+                         [PROBE_TIMEOUT])
+
+    @unittest.skipIf(asyncio is None, "requires Python 3")
+    def test_async_probe_cancelled(self):
+        client = AsyncHangingProbeClient()
+        api = AsyncAPI(client=client, endpoints=URLS[:2], probe_interval=0)
+        ejected = api.endpoints.endpoints[1]
+        api.endpoints.eject(ejected)
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+        res = loop.run_until_complete(asyncio.wait_for(
+            api.get("/_api/version", deadline=0.2), 1
+        ))
+        self.assertEqual(res.status_code, 200)
+        self.assertTrue(ejected.probing)
+        probes = asyncio.all_tasks(loop)
+        for task in probes:
+            task.cancel()
+        loop.run_until_complete(
+            asyncio.gather(*probes, return_exceptions=True)
+        )
+        # The endpoint is due for another probe
+        self.assertTrue(ejected.is_ejected)
+        self.assertFalse(ejected.probing)
+
+
+if __name__ == "__main__":
+    unittest.main()
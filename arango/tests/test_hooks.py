@@ -0,0 +1,120 @@
+"""Tests for the request lifecycle hooks."""
+
+import unittest
+
+try:
+    import asyncio
+    from arango.aio.api import AsyncAPI
+    from arango.tests.aio_utils import AsyncFakeClient
+except (ImportError, SyntaxError):  # Python 2
+    asyncio = None
+
+from arango.api import API
+from arango.exceptions import InvalidArgumentError
+from arango.hooks import Hooks, path_template
+from arango.response import _NOT_DECODED
+from arango.tests.utils import FakeClient
+
+
+RESULT = (200, b'{"result": [1, 2, 3]}')
+
+
+class HooksTest(unittest.TestCase):
+    """Tests for the hooks of the API wrapper."""
+
+    def setUp(self):
+        self.events = []
+
+    def record(self, name):
+        return lambda event: self.events.append((name, event))
+
+    def test_path_template(self):
+        self.assertEqual(path_template("/_api/document/users/123"),
+                         "/_api/document/{collection}/{key}")
+        self.assertEqual(path_template("/_api/collection/users/count"),
+                         "/_api/collection/{name}/count")
+        self.assertEqual(path_template("/_api/cursor/42"),
+                         "/_api/cursor/{id}")
+        self.assertEqual(path_template("/_api/index?collection=users"),
+                         "/_api/index")
+        self.assertEqual(path_template("/_api/database/current"),
+                         "/_api/database/current")
+
+    def test_no_hooks(self):
+        api = API(client=FakeClient([RESULT]))
+        self.assertFalse(api.hooks.active)
+        res = api.get("/_api/version")
+        # The body is still decoded lazily
+        self.assertIs(res._body, _NOT_DECODED)
+        self.assertEqual(res.body, {"result": [1, 2, 3]})
+
+    def test_events(self):
+        api = API(client=FakeClient([RESULT]), database="db")
+        api.hooks.add("before_request", self.record("before"))
+        api.hooks.add("after_response", self.record("after"))
+        res = api.put("/_api/document/users/123", data={"name": "john"})
+        self.assertEqual([name for name, _ in self.events],
+                         ["before", "after"])
+        event = self.events[1][1]
+        # The body is still decoded lazily
+        self.assertIs(res._body, _NOT_DECODED)
+        self.assertIsNone(event.decode_time)
+        res.body
+        self.assertEqual(event.method, "put")
+        self.assertEqual(event.path, "/_api/document/users/123")
+        self.assertEqual(event.path_template,
+                         "/_api/document/{collection}/{key}")
+        self.assertEqual(event.database, "db")
+        self.assertEqual(event.endpoint, "http://localhost:8529")
+        self.assertEqual(event.status_code, 200)
+        self.assertEqual(event.bytes_sent, len(b'{"name": "john"}'))
+        self.assertEqual(event.bytes_received, 21)
+        self.assertIsNone(event.error)
+        for phase in ("encode_time", "network_time", "decode_time"):
+            self.assertGreaterEqual(getattr(event, phase), 0)
+        self.assertGreaterEqual(event.duration, event.network_time)
+
+    def test_on_error(self):
+        error = IOError("reset")
+        api = API(client=FakeClient([error]))
+        api.hooks.add("on_error", self.record("error"))
+        self.assertRaises(IOError, api.get, "/_api/version")
+        name, event = self.events[0]
+        self.assertIs(event.error, error)
+        self.assertIsNone(event.status_code)
+        self.assertGreaterEqual(event.network_time, 0)
+
+    def test_remove(self):
+        hooks = Hooks()
+        callback = self.record("after")
+        self.assertRaises(InvalidArgumentError, hooks.add, "after", callback)
+        hooks.add("after_response", callback)
+        self.assertTrue(hooks.active)
+        hooks.remove("after_response", callback)
+        self.assertFalse(hooks.active)
+        self.assertRaises(InvalidArgumentError, hooks.remove,
+                          "after_response", callback)
+
+    def test_shared(self):
+        hooks = Hooks()
+        hooks.add("after_response", self.record("after"))
+        for database in ("one", "two"):
+            API(client=FakeClient([RESULT]), database=database,
+                hooks=hooks).get("/_api/version")
+        self.assertEqual([event.database for _, event in self.events],
+                         ["one", "two"])
+
+    @unittest.skipIf(asyncio is None, "requires Python 3")
+    def test_async(self):
+        api = AsyncAPI(client=AsyncFakeClient([RESULT]))
+        api.hooks.add("after_response", self.record("after"))
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+        loop.run_until_complete(api.get("/_api/cursor/1"))
+        event = self.events[0][1]
+        self.assertEqual(event.path_template, "/_api/cursor/{id}")
+        self.assertEqual(event.bytes_received, 21)
+
+
+if __name__ == "__main__":
+    unittest.main()
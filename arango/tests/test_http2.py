@@ -0,0 +1,225 @@
+"""Tests for the HTTP/2 client against a local HTTP/2 server."""
+
+import json
+import socket
+import threading
+import time
+import unittest
+
+try:
+    import asyncio
+    import h2.config
+    import h2.connection
+    import h2.events
+    import h2.exceptions
+    from arango.aio.api import AsyncAPI
+    from arango.clients.http2 import AsyncHTTP2Client, HTTP2Client
+    from arango.tests.aio_utils import gather
+except (ImportError, SyntaxError):  # Python 2 or h2 not installed
+    h2 = None
+
+from arango.api import API
+
+
+# The seconds taken by the server to answer the requests to /slow
+DELAY = 0.2
+
+
+class H2Server(object):
+    """Minimal HTTP/2 server over cleartext with prior knowledge.
+
+    GET /slow answers after ``DELAY`` seconds, PUT /echo sends the request
+    body back, and every other request is answered with a JSON description
+    of the request. Each connection is served on its own thread, and the
+    delayed responses are sent from timer threads, so that the streams of
+    a connection are answered out of order.
+    """
+
+    def __init__(self):
+        self.connections = 0
+        self._sock = socket.socket()
+        self._sock.bind(("127.0.0.1", 0))
+        self._sock.listen(16)
+        self.port = self._sock.getsockname()[1]
+        thread = threading.Thread(target=self._accept)
+        thread.daemon = True
+        thread.start()
+
+    def _accept(self):
+        while True:
+            try:
+                sock, _ = self._sock.accept()
+            except EnvironmentError:
+                return
+            self.connections += 1
+            thread = threading.Thread(target=self._serve, args=(sock,))
+            thread.daemon = True
+            thread.start()
+
+    def _serve(self, sock):
+        conn = h2.connection.H2Connection(
+            config=h2.config.H2Configuration(
+                client_side=False,
+                header_encoding="utf-8"
+            )
+        )
+        lock = threading.Lock()
+        requests = {}
+
+        def respond(stream_id, status, body):
+            with lock:
+                try:
+                    conn.send_headers(stream_id, [
+                        (":status", str(status)),
+                        ("content-type", "application/json"),
+                        ("content-length", str(len(body))),
+                    ])
+                except h2.exceptions.StreamClosedError:
+                    return  # reset by the client
+                # The client grants a window larger than the test bodies
+                offset = 0
+                while True:
+                    chunk = body[offset:offset + conn.max_outbound_frame_size]
+                    offset += len(chunk)
+                    conn.send_data(stream_id, chunk,
+                                   end_stream=offset >= len(body))
+                    if offset >= len(body):
+                        break
+                sock.sendall(conn.data_to_send())
+
+        with lock:
+            conn.initiate_connection()
+            sock.sendall(conn.data_to_send())
+        while True:
+            try:
+                data = sock.recv(65536)
+            except EnvironmentError:
+                break
+            if not data:
+                break
+            with lock:
+                events = conn.receive_data(data)
+            for event in events:
+                if isinstance(event, h2.events.RequestReceived):
+                    requests[event.stream_id] = (dict(event.headers), [])
+                elif isinstance(event, h2.events.DataReceived):
+                    requests[event.stream_id][1].append(event.data)
+                    with lock:
+                        conn.acknowledge_received_data(
+                            event.flow_controlled_length, event.stream_id
+                        )
+                elif isinstance(event, h2.events.StreamEnded):
+                    headers, chunks = requests.pop(event.stream_id)
+                    path = headers[":path"]
+                    if path.endswith("/slow"):
+                        threading.Timer(
+                            DELAY, respond,
+                            (event.stream_id, 200, b'{"slow": true}')
+                        ).start()
+                    elif path.endswith("/echo"):
+                        respond(event.stream_id, 200, b"".join(chunks))
+                    else:
+                        respond(event.stream_id, 200, json.dumps({
+                            "method": headers[":method"],
+                            "path": path,
+                            "authorization": headers.get("authorization"),
+                        }).encode("utf-8"))
+            with lock:
+                sock.sendall(conn.data_to_send())
+        sock.close()
+
+    def stop(self):
+        # Shutting the socket down wakes the accepting thread up
+        self._sock.shutdown(socket.SHUT_RDWR)
+        self._sock.close()
+
+
+@unittest.skipIf(h2 is None, "requires Python 3 and the h2 library")
+class HTTP2ClientTest(unittest.TestCase):
+    """Tests for the HTTP/2 client."""
+
+    def setUp(self):
+        self.server = H2Server()
+        self.client = HTTP2Client({"auth": ("root", ""), "timeout": 5})
+        self.api = API(port=self.server.port, client=self.client)
+        self.addCleanup(self.server.stop)
+        self.addCleanup(self.client.close)
+
+    def test_request(self):
+        res = self.api.get("/_api/version", params={"details": True})
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.status_text, "OK")
+        self.assertEqual(res.headers["Content-Type"], "application/json")
+        self.assertEqual(res.body, {
+            "method": "GET",
+            "path": "/_db/_system/_api/version?details=True",
+            "authorization": "Basic cm9vdDo=",
+        })
+
+    def test_flow_control(self):
+        # Larger than the default flow control window of 64KB
+        document = {"value": "x" * 300000}
+        res = self.api.put("/echo", data=document)
+        self.assertEqual(res.body, document)
+
+    def test_multiplexed_threads(self):
+        results = []
+
+        def request():
+            results.append(self.api.get("/slow").body)
+
+        threads = [threading.Thread(target=request) for _ in range(10)]
+        start = time.time()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # The requests were in flight at once over a single connection
+        self.assertLess(time.time() - start, DELAY * 5)
+        self.assertEqual(results, [{"slow": True}] * 10)
+        self.assertEqual(self.server.connections, 1)
+
+    def test_reconnect_after_close(self):
+        self.api.get("/_api/version")
+        self.client.close()
+        self.assertEqual(self.api.get("/_api/version").status_code, 200)
+        self.assertEqual(self.server.connections, 2)
+
+    def test_async(self):
+        client = AsyncHTTP2Client({"auth": ("root", "")})
+        api = AsyncAPI(port=self.server.port, client=client)
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+        self.addCleanup(loop.run_until_complete, client.close())
+        start = time.time()
+        responses = loop.run_until_complete(
+            gather(*[api.get("/slow") for _ in range(10)])
+        )
+        self.assertLess(time.time() - start, DELAY * 5)
+        self.assertEqual([res.body for res in responses],
+                         [{"slow": True}] * 10)
+        self.assertEqual(self.server.connections, 1)
+
+    def test_async_does_not_block_loop(self):
+        client = AsyncHTTP2Client({"auth": ("root", "")})
+        connection = client._connection
+
+        def slow_connection(*args):
+            time.sleep(DELAY)
+            return connection(*args)
+
+        client._connection = slow_connection
+        api = AsyncAPI(port=self.server.port, client=client)
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+        self.addCleanup(loop.run_until_complete, client.close())
+        ticks = []
+        loop.call_later(DELAY / 4, lambda: ticks.append(time.time()))
+        start = time.time()
+        loop.run_until_complete(api.get("/_api/version"))
+        # The timer fired while the connection was being opened
+        self.assertLess(ticks[0] - start, DELAY / 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+"""Tests for the concurrency limits and the rate limiting."""
+
+import threading
+import time
+import unittest
+
+try:
+    import asyncio
+    from arango.aio.api import AsyncAPI
+    from arango.tests.aio_utils import AsyncFakeClient, gather
+except (ImportError, SyntaxError):  # Python 2
+    asyncio = None
+
+from arango.api import API
+from arango.deadline import Deadline
+from arango.exceptions import DeadlineExceededError, InvalidArgumentError
+from arango.limits import ConcurrencyLimiter, Limits, TokenBucket
+from arango.tests.utils import FakeClient
+
+
+class LimitsTest(unittest.TestCase):
+    """Tests for the admission control layer."""
+
+    def test_invalid_arguments(self):
+        self.assertRaises(InvalidArgumentError, ConcurrencyLimiter, 0)
+        self.assertRaises(InvalidArgumentError, TokenBucket, 0)
+        self.assertRaises(InvalidArgumentError, Limits, max_per_endpoint=0)
+
+    def test_fifo_order(self):
+        limiter = ConcurrencyLimiter(1)
+        self.assertTrue(limiter.acquire())
+        order = []
+
+        def worker(number):
+            limiter.acquire()
+            order.append(number)
+            limiter.release()
+
+        threads = []
+        for number in range(5):
+            thread = threading.Thread(target=worker, args=(number,))
+            thread.start()
+            threads.append(thread)
+            # Queue the workers up one after the other
+            while limiter.queued <= number:
+                time.sleep(0.001)
+        self.assertFalse(limiter.try_acquire())
+        limiter.release()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(order, [0, 1, 2, 3, 4])
+        self.assertEqual(limiter.in_flight, 0)
+
+    def test_acquire_timeout(self):
+        limiter = ConcurrencyLimiter(1)
+        limiter.acquire()
+        self.assertFalse(limiter.acquire(timeout=0.01))
+        self.assertEqual(limiter.queued, 0)
+        limiter.release()
+        self.assertTrue(limiter.acquire(timeout=0))
+
+    def test_token_bucket(self):
+        bucket = TokenBucket(rate=100, burst=2)
+        self.assertEqual(bucket.reserve(), 0)
+        self.assertEqual(bucket.reserve(), 0)
+        # The next tokens are reserved in turn, 10ms apart
+        self.assertAlmostEqual(bucket.reserve(), 0.01, delta=0.002)
+        self.assertAlmostEqual(bucket.reserve(), 0.02, delta=0.002)
+        self.assertIsNone(bucket.reserve(max_wait=0.01))
+
+    def test_concurrency_per_endpoint(self):
+        client = FakeClient(delay=0.02)
+        limits = Limits(max_per_endpoint=3)
+        api = API(client=client, limits=limits)
+        threads = [
+            threading.Thread(target=api.get, args=("/_api/version",))
+            for _ in range(10)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(client.peak, 3)
+        stats = limits.stats
+        self.assertEqual(stats["admitted"], 10)
+        self.assertEqual(stats["queued"], 7)
+        self.assertGreater(stats["max_wait_time"], 0)
+        self.assertGreaterEqual(stats["wait_time"], stats["max_wait_time"])
+
+    def test_concurrency_per_database(self):
+        client = FakeClient(delay=0.02)
+        limits = Limits(max_per_database=1)
+        apis = [API(client=client, database=name, limits=limits)
+                for name in ("one", "one", "two")]
+        threads = [
+            threading.Thread(target=api.get, args=("/_api/version",))
+            for api in apis
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # The databases have a limit each
+        self.assertEqual(client.peak, 2)
+
+    def test_rate(self):
+        limits = Limits(rate=100, burst=1)
+        api = API(client=FakeClient(), limits=limits)
+        start = time.time()
+        for _ in range(5):
+            api.get("/_api/version")
+        self.assertGreaterEqual(time.time() - start, 0.035)
+        # A token may refill between two requests on a loaded machine
+        self.assertGreaterEqual(limits.stats["queued"], 3)
+
+    def test_deadline_while_queued(self):
+        limits = Limits(max_per_endpoint=1)
+        api = API(client=FakeClient(delay=0.1), limits=limits)
+        thread = threading.Thread(target=api.get, args=("/_api/version",))
+        thread.start()
+        time.sleep(0.02)
+        self.assertRaises(DeadlineExceededError, api.get, "/_api/version",
+                          deadline=Deadline(0.02))
+        thread.join()
+        self.assertEqual(limits.stats["rejected"], 1)
+        self.assertEqual(api.endpoints.endpoints[0].outstanding, 0)
+
+    @unittest.skipIf(asyncio is None, "requires Python 3")
+    def test_async(self):
+        client = AsyncFakeClient(delay=0.02)
+        limits = Limits(max_per_endpoint=2)
+        api = AsyncAPI(client=client, limits=limits)
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+        loop.run_until_complete(
+            gather(*[api.get("/_api/version") for _ in range(6)])
+        )
+        self.assertEqual(client.peak, 2)
+        self.assertEqual(limits.stats["queued"], 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+"""Tests for the latency histograms and the Prometheus rendering."""
+
+import random
+import unittest
+
+from arango.api import API
+from arango.metrics import LatencyHistogram, Metrics
+from arango.tests.utils import FakeClient
+
+
+class MetricsTest(unittest.TestCase):
+    """Tests for the metrics registry."""
+
+    def test_histogram_quantiles(self):
+        histogram = LatencyHistogram()
+        latencies = [random.uniform(0.0001, 2.0) for _ in range(10000)]
+        for latency in latencies:
+            histogram.record(latency)
+        latencies.sort()
+        for quantile in (0.5, 0.99, 0.999):
+            exact = latencies[int(quantile * len(latencies)) - 1]
+            self.assertAlmostEqual(histogram.quantile(quantile), exact,
+                                   delta=exact * 0.07)
+        self.assertEqual(histogram.quantile(1), latencies[-1])
+        self.assertEqual(histogram.count, 10000)
+        self.assertAlmostEqual(histogram.sum, sum(latencies))
+
+    def test_histogram_bounded(self):
+        histogram = LatencyHistogram(max_seconds=1)
+        size = len(histogram.counts)
+        histogram.record(0)
+        histogram.record(1e6)
+        self.assertEqual(len(histogram.counts), size)
+        self.assertEqual(histogram.quantile(0.5), 1e-6)
+        self.assertEqual(histogram.quantile(1), 1e6)
+        self.assertEqual(LatencyHistogram().quantile(0.5), 0)
+
+    def test_operations(self):
+        metrics = Metrics()
+        api = API(client=FakeClient())
+        metrics.install(api.hooks)
+        api.get("/_api/document/users/1")
+        api.get("/_api/document/users/2")
+        api.post("/_api/document", params={"collection": "users"})
+        api.post("/_api/import", params={"collection": "logs"})
+        api.put("/_api/cursor/12")
+        api.post("/_api/transaction")
+        api.get("/_api/version")
+        snapshot = metrics.snapshot()
+        self.assertEqual(sorted(snapshot), [
+            ("cursor_fetch", ""),
+            ("document_get", "users"),
+            ("document_insert", "users"),
+            ("import", "logs"),
+            ("other", ""),
+            ("transaction", ""),
+        ])
+        series = snapshot[("document_get", "users")]
+        self.assertEqual(series["count"], 2)
+        self.assertEqual(series["errors"], 0)
+        self.assertTrue(0 < series["p50"] <= series["p999"] <= series["max"])
+        metrics.uninstall(api.hooks)
+        self.assertFalse(api.hooks.active)
+
+    def test_errors(self):
+        metrics = Metrics()
+        api = API(client=FakeClient([(404, b"{}")]))
+        metrics.install(api.hooks)
+        api.get("/_api/document/users/1")
+        metrics.record("document_get", "users", 0.5, "error")
+        series = metrics.snapshot()[("document_get", "users")]
+        self.assertEqual((series["count"], series["errors"]), (2, 2))
+        text = metrics.render()
+        self.assertIn(
+            'arango_request_errors_total{collection="users",'
+            'operation="document_get",status="404"} 1', text
+        )
+        self.assertIn(
+            'arango_request_errors_total{collection="users",'
+            'operation="document_get",status="error"} 1', text
+        )
+
+    def test_bounded_series(self):
+        metrics = Metrics(max_series=2)
+        for collection in ("a", "b", "c", "d"):
+            metrics.record("document_get", collection, 0.001)
+        self.assertEqual(sorted(metrics.snapshot()), [
+            ("document_get", "__other__"),
+            ("document_get", "a"),
+            ("document_get", "b"),
+        ])
+
+    def test_render(self):
+        metrics = Metrics(namespace="db")
+        metrics.record("document_get", 'we"ird', 0.25)
+        self.assertEqual(metrics.render().splitlines(), [
+            "# HELP db_request_duration_seconds Latency of the ArangoDB "
+            "requests.",
+            "# TYPE db_request_duration_seconds summary",
+            'db_request_duration_seconds{collection="we\\"ird",'
+            'operation="document_get",quantile="0.5"} 0.25',
+            'db_request_duration_seconds{collection="we\\"ird",'
+            'operation="document_get",quantile="0.9"} 0.25',
+            'db_request_duration_seconds{collection="we\\"ird",'
+            'operation="document_get",quantile="0.99"} 0.25',
+            'db_request_duration_seconds{collection="we\\"ird",'
+            'operation="document_get",quantile="0.999"} 0.25',
+            'db_request_duration_seconds_sum{collection="we\\"ird",'
+            'operation="document_get"} 0.25',
+            'db_request_duration_seconds_count{collection="we\\"ird",'
+            'operation="document_get"} 1',
+            "# HELP db_request_errors_total Failed ArangoDB requests.",
+            "# TYPE db_request_errors_total counter",
+        ])
+
+
+if __name__ == "__main__":
+    unittest.main()
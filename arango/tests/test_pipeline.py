@@ -0,0 +1,65 @@
+"""Tests for running the steps of the requests."""
+
+import unittest
+
+from arango.pipeline import NEW_EVENT, Call, Return, Sleep, run
+
+
+def double(value):
+    result = yield Call(lambda: value * 2)
+    raise Return(result)
+
+
+def fail():
+    yield Sleep(0)
+    raise ValueError("failed")
+
+
+class PipelineTest(unittest.TestCase):
+
+    def test_calls(self):
+        def steps():
+            first = yield Call(lambda a, b=0: a + b, 1, b=2)
+            second = yield double(first)
+            raise Return((first, second))
+        self.assertEqual(run(steps()), (3, 6))
+
+    def test_no_result(self):
+        def steps():
+            yield Sleep(0)
+        self.assertIsNone(run(steps()))
+
+    def test_errors(self):
+        caught = []
+
+        def steps():
+            try:
+                yield fail()
+            except ValueError as error:
+                caught.append(error)
+            yield Call(int, "not a number")
+        self.assertRaises(ValueError, run, steps())
+        self.assertEqual(len(caught), 1)
+
+    def test_cleanup(self):
+        released = []
+
+        def steps():
+            try:
+                yield Call(int, "not a number")
+            finally:
+                released.append(True)
+        self.assertRaises(ValueError, run, steps())
+        self.assertEqual(released, [True])
+
+    def test_event(self):
+        def steps():
+            event = yield NEW_EVENT
+            timed_out = not (yield Call(event.wait, 0))
+            event.set()
+            raise Return((timed_out, (yield Call(event.wait, 0))))
+        self.assertEqual(run(steps()), (True, True))
+
+
+if __name__ == "__main__":
+    unittest.main()
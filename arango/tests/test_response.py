@@ -0,0 +1,55 @@
+"""Tests for the ArangoDB HTTP response."""
+
+import unittest
+
+from arango.response import Response
+
+
+def make_response(content, status_code=200):
+    return Response(
+        method="get",
+        url="http://localhost:8529/_api/version",
+        status_code=status_code,
+        content=content,
+        headers={"content-type": "application/json"},
+    )
+
+
+class ResponseTest(unittest.TestCase):
+    """Tests for the lazily decoded response."""
+
+    def test_lazy_body(self):
+        res = make_response(b'{"server": "arango", "version": "2.7.0"}')
+        self.assertIsInstance(res.content, bytes)
+        self.assertEqual(res.body, {"server": "arango", "version": "2.7.0"})
+        self.assertIs(res.body, res.body)
+
+    def test_empty_and_invalid_body(self):
+        self.assertIsNone(make_response(b"").body)
+        self.assertIsNone(make_response(None).body)
+        self.assertIsNone(make_response(b"<html></html>", 502).body)
+        self.assertIsNone(make_response(b"\xff\xfe", 502).body)
+
+    def test_text_content(self):
+        content = u'{"key": "\u00e9"}'
+        self.assertEqual(make_response(content).body, {"key": u"\u00e9"})
+        self.assertEqual(
+            make_response(content.encode("utf-8")).body,
+            {"key": u"\u00e9"}
+        )
+
+    def test_streamed_content(self):
+        res = Response("get", "url", 200, None, {"Content-Length": "8"},
+                       stream=iter([b'{"a"', b": 1}"]))
+        self.assertEqual(res.content_length, 8)
+        self.assertEqual(res.body, {"a": 1})
+        self.assertEqual(res.content, b'{"a": 1}')
+        self.assertIsNone(res.stream)
+
+    def test_slots(self):
+        res = make_response(b"{}")
+        self.assertRaises(AttributeError, setattr, res, "unknown", 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+"""Tests for the retry policy and the circuit breakers."""
+
+import time
+import unittest
+
+from arango.api import API
+from arango.exceptions import CircuitOpenError, InvalidArgumentError
+from arango.response import Response
+from arango.retry import CircuitBreaker, RetryPolicy
+from arango.tests.utils import FakeClient
+
+
+OK = (200, b'{"ok": true}')
+UNAVAILABLE = (503, b'{"error": true, "errorNum": 503}')
+LOCK_TIMEOUT = (500, b'{"error": true, "errorNum": 18}')
+CONFLICT = (409, b'{"error": true, "errorNum": 1200}')
+
+
+class RetryPolicyTest(unittest.TestCase):
+    """Tests for the retry layer of the API wrapper."""
+
+    def api(self, outcomes, **kwargs):
+        kwargs.setdefault("backoff", 0)
+        self.policy = RetryPolicy(**kwargs)
+        self.client = FakeClient(outcomes)
+        return API(client=self.client, retry_policy=self.policy)
+
+    def test_invalid_arguments(self):
+        self.assertRaises(InvalidArgumentError, RetryPolicy, max_attempts=0)
+        self.assertRaises(InvalidArgumentError, RetryPolicy, backoff=-1)
+
+    def test_retry_transient_failures(self):
+        api = self.api([IOError("reset"), UNAVAILABLE, LOCK_TIMEOUT, OK],
+                       max_attempts=4)
+        res = api.get("/_api/version")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(len(self.client.calls), 4)
+        self.assertEqual(self.policy.stats, {
+            "retries": 3, "recovered": 1, "exhausted": 0,
+            "rejected": 0, "opened": 0
+        })
+
+    def test_no_retry_on_other_errors(self):
+        api = self.api([CONFLICT, OK])
+        self.assertEqual(api.get("/_api/version").status_code, 409)
+        self.assertEqual(self.policy.stats["retries"], 0)
+
+    def test_attempts_exhausted(self):
+        api = self.api([UNAVAILABLE] * 3 + [IOError("reset")] * 3,
+                       failure_threshold=None)
+        self.assertEqual(api.get("/_api/version").status_code, 503)
+        self.assertRaises(IOError, api.get, "/_api/version")
+        self.assertEqual(self.policy.stats["retries"], 4)
+        self.assertEqual(self.policy.stats["exhausted"], 2)
+
+    def test_writes_are_opt_in(self):
+        api = self.api([UNAVAILABLE, UNAVAILABLE, OK])
+        self.assertEqual(api.post("/_api/document").status_code, 503)
+        self.assertEqual(
+            api.post("/_api/document", retry=True).status_code, 200
+        )
+        api = self.api([UNAVAILABLE, OK])
+        self.assertEqual(api.get("/_api/version", retry=False).status_code,
+                         503)
+
+    def test_backoff(self):
+        policy = RetryPolicy(backoff=0.1, max_backoff=0.3, jitter=False)
+        self.assertEqual(
+            [policy.delay(attempt) for attempt in range(1, 5)],
+            [0.1, 0.2, 0.3, 0.3]
+        )
+        policy.jitter = True
+        for attempt in range(1, 5):
+            self.assertTrue(0 <= policy.delay(attempt) <= 0.3)
+
+        # The Retry-After header raises the delay up to max_backoff
+        res = Response("get", "url", 503, b"", {"Retry-After": "1"})
+        self.assertEqual(policy.delay(1, res), 0.3)
+
+    def test_circuit_breaker(self):
+        api = self.api([UNAVAILABLE] * 2 + [OK], max_attempts=1,
+                       failure_threshold=2, reset_timeout=0.05)
+        endpoint = api.endpoints.endpoints[0]
+        api.get("/_api/version")
+        api.get("/_api/version")
+        self.assertEqual(self.policy.breaker(endpoint).state, "open")
+        self.assertRaises(CircuitOpenError, api.get, "/_api/version")
+        self.assertEqual(len(self.client.calls), 2)
+
+        # A trial request closes the circuit again once it succeeds
+        time.sleep(0.05)
+        self.assertEqual(api.get("/_api/version").status_code, 200)
+        self.assertEqual(self.policy.breaker(endpoint).state, "closed")
+        self.assertEqual(self.policy.stats["opened"], 1)
+        self.assertEqual(self.policy.stats["rejected"], 1)
+
+    def test_circuit_breaker_trial(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+        self.assertTrue(breaker.record_failure())
+        self.assertFalse(breaker.allow())
+        time.sleep(0.05)
+        self.assertEqual(breaker.state, "half_open")
+        # Only one trial request is let through at a time
+        self.assertTrue(breaker.allow())
+        self.assertFalse(breaker.allow())
+        self.assertFalse(breaker.record_failure())
+        self.assertEqual(breaker.state, "open")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+"""Tests for the coalescing of the identical concurrent requests."""
+
+import threading
+import time
+import unittest
+
+try:
+    import asyncio
+    from arango.aio.api import AsyncAPI
+    from arango.tests.aio_utils import AsyncFakeClient, gather
+except (ImportError, SyntaxError):  # Python 2
+    asyncio = None
+
+from arango.api import API
+from arango.exceptions import DeadlineExceededError
+from arango.singleflight import SingleFlight
+from arango.tests.utils import FakeClient
+
+
+DOCUMENT = (200, b'{"_key": "1"}')
+
+
+def gated_client(outcome=DOCUMENT):
+    """Return a client answering the requests once its gate is set."""
+    return FakeClient([outcome], gate=threading.Event())
+
+
+class SingleFlightTest(unittest.TestCase):
+    """Tests for the single flight of the API wrapper."""
+
+    def run_concurrently(self, api, calls):
+        """Make the calls on threads of their own, once all are waiting."""
+        results = [None] * len(calls)
+
+        def run(index, call):
+            try:
+                results[index] = call()
+            except Exception as error:
+                results[index] = error
+
+        threads = [
+            threading.Thread(target=run, args=(index, call))
+            for index, call in enumerate(calls)
+        ]
+        for thread in threads:
+            thread.start()
+        # Every call either reached the client or joined a flight
+        while len(api.client.calls) + \
+                api.singleflight.stats["coalesced"] < len(calls):
+            time.sleep(0.001)
+        api.client.gate.set()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_coalesced(self):
+        api = API(client=gated_client(), singleflight=SingleFlight())
+        results = self.run_concurrently(
+            api, [lambda: api.get("/_api/document/users/1")] * 5
+        )
+        self.assertEqual(len(api.client.calls), 1)
+        self.assertEqual(api.singleflight.stats,
+                         {"flights": 1, "coalesced": 4})
+        for res in results:
+            self.assertEqual(res.body, {"_key": "1"})
+        # Every caller gets a response (and a body) of its own
+        self.assertEqual(len(set(id(res) for res in results)), 5)
+        results[0].body["_key"] = "2"
+        self.assertEqual(results[1].body, {"_key": "1"})
+        # Nothing is cached once the request landed
+        api.get("/_api/document/users/1")
+        self.assertEqual(len(api.client.calls), 2)
+
+    def test_distinct_requests(self):
+        api = API(client=gated_client(), singleflight=SingleFlight())
+        self.run_concurrently(api, [
+            lambda: api.get("/_api/document/users/1"),
+            lambda: api.get("/_api/document/users/2"),
+            lambda: api.get("/_api/document/users/1",
+                            headers={"If-None-Match": "x"}),
+            lambda: api.post("/_api/document/users/1"),
+        ])
+        self.assertEqual(len(api.client.calls), 4)
+
+    def test_error(self):
+        error = IOError("reset")
+        api = API(client=gated_client(error), singleflight=SingleFlight())
+        results = self.run_concurrently(
+            api, [lambda: api.get("/_api/version")] * 3
+        )
+        self.assertEqual(results, [error] * 3)
+        self.assertEqual(len(api.client.calls), 1)
+
+    def test_deadline(self):
+        api = API(client=gated_client(), singleflight=SingleFlight())
+        leader = threading.Thread(target=api.get, args=("/_api/version",))
+        leader.start()
+        while not api.client.calls:
+            time.sleep(0.001)
+        self.assertRaises(DeadlineExceededError, api.get, "/_api/version",
+                          deadline=0.05)
+        api.client.gate.set()
+        leader.join()
+
+    @unittest.skipIf(asyncio is None, "requires Python 3")
+    def test_async(self):
+        client = AsyncFakeClient([DOCUMENT], delay=0.01)
+        api = AsyncAPI(client=client, singleflight=SingleFlight())
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+        results = loop.run_until_complete(
+            gather(*[api.get("/_api/document/users/1") for _ in range(3)])
+        )
+        self.assertEqual([res.body for res in results], [{"_key": "1"}] * 3)
+        self.assertEqual(len(client.calls), 1)
+        self.assertEqual(api.singleflight.stats,
+                         {"flights": 1, "coalesced": 2})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,155 @@
+"""Tests for the slow operation log."""
+
+import gc
+import time
+import unittest
+
+from arango.api import API
+from arango.database import Database
+from arango.slowlog import SlowLog, fingerprint
+from arango.tests.utils import FakeClient
+from arango.tracing import RecordingTracer
+
+
+BATCH = (200, b'{"result": [1, 2], "hasMore": true, "id": "7"}')
+LAST_BATCH = (200, b'{"result": [3], "hasMore": false, "id": "7"}')
+DELETED = (202, b"{}")
+
+
+class Logger(object):
+    """Logger keeping the messages logged."""
+
+    def __init__(self):
+        self.messages = []
+
+    def warning(self, message, *args):
+        self.messages.append(message % args)
+
+
+class SlowLogTest(unittest.TestCase):
+    """Tests for the slow log."""
+
+    def test_fingerprint(self):
+        self.assertEqual(
+            fingerprint("FOR d IN @@col // the users\n"
+                        "  FILTER d.age > 21 AND d.name == 'jo\\'e'\n"
+                        "  LIMIT 0, 10 RETURN d.@attr"),
+            "FOR d IN @@col FILTER d.age > ? AND d.name == ? "
+            "LIMIT ?, ? RETURN d.@attr"
+        )
+        self.assertEqual(
+            fingerprint('FOR i IN 1..10 FILTER i IN [1, 2.5, "x"] /* */ '
+                        'RETURN `my col2`'),
+            "FOR i IN ?..? FILTER i IN [?] RETURN `my col2`"
+        )
+        self.assertEqual(fingerprint("RETURN [1]"), fingerprint("RETURN [2]"))
+        # Negative numbers and the boolean and null keywords are literals
+        self.assertEqual(
+            fingerprint("FILTER d.x IN [-1, -2.5] AND d.y != null "
+                        "AND d.z == TRUE RETURN d.x - 1"),
+            "FILTER d.x IN [?] AND d.y != ? AND d.z == ? RETURN d.x - ?"
+        )
+        self.assertEqual(fingerprint("RETURN [-1, 2, -3]"),
+                         fingerprint("RETURN [4]"))
+        # Whatever their spacing, over lines too
+        for query in ("FILTER d.x IN [ 1, 2 ]", "FILTER d.x IN [ 1 , 2, 3 ]",
+                      "FILTER d.x IN [\n  1,\n  2,\n  3\n]"):
+            self.assertEqual(fingerprint(query), "FILTER d.x IN [?]")
+
+    def test_query(self):
+        logger = Logger()
+        slow_log = SlowLog(threshold=0, logger=logger)
+        database = Database("db", API(
+            client=FakeClient([BATCH, LAST_BATCH, DELETED]), tracer=slow_log
+        ))
+        result = database.execute_query(
+            "FOR d IN users FILTER d.age > 21 RETURN d",
+            bind_vars={"b": 1, "a": 2}
+        )
+        self.assertEqual(len(slow_log.entries), 0)
+        self.assertEqual(list(result), [1, 2, 3])
+        entry, = slow_log.entries
+        self.assertEqual(entry.operation, "execute_query")
+        self.assertEqual(entry.database, "_system")
+        self.assertEqual(entry.fingerprint,
+                         "FOR d IN users FILTER d.age > ? RETURN d")
+        self.assertEqual(entry.bind_vars, ["a", "b"])
+        self.assertEqual(entry.batches, 2)
+        self.assertEqual(entry.bytes_received,
+                         len(BATCH[1]) + len(LAST_BATCH[1]) + 2)
+        self.assertGreater(entry.bytes_sent, 0)
+        self.assertGreaterEqual(entry.duration, 0)
+        self.assertEqual(logger.messages, [str(entry)])
+
+    def test_consumer_not_timed(self):
+        slow_log = SlowLog(threshold=0)
+        database = Database("db", API(
+            client=FakeClient([BATCH, LAST_BATCH, DELETED]), tracer=slow_log
+        ))
+        for _ in database.execute_query("RETURN 1"):
+            time.sleep(0.05)
+        entry, = slow_log.entries
+        # Only the round trips are timed, not the sleeps in between
+        self.assertLess(entry.duration, 0.05)
+
+    def test_query_not_iterated(self):
+        slow_log = SlowLog(threshold=0)
+        database = Database("db", API(
+            client=FakeClient([LAST_BATCH]), tracer=slow_log
+        ))
+        database.execute_query("RETURN 1")
+        self.assertEqual(slow_log.entries[0].batches, 1)
+        slow_log.clear()
+        database.api.client.outcomes = [BATCH]
+        result = database.execute_query("RETURN 1")
+        self.assertEqual(len(slow_log.entries), 0)
+        del result
+        gc.collect()
+        self.assertEqual(slow_log.entries[0].batches, 1)
+
+    def test_request(self):
+        slow_log = SlowLog(threshold=0)
+        api = API(client=FakeClient(), tracer=slow_log)
+        api.get("/_api/document/users/1")
+        api.post("/_api/import", data=[{}], params={"collection": "logs"})
+        document, imported = slow_log.entries
+        self.assertEqual((document.operation, document.collection),
+                         ("document_get", "users"))
+        self.assertIsNone(document.fingerprint)
+        self.assertEqual((imported.operation, imported.collection),
+                         ("import", "logs"))
+        self.assertEqual((imported.batches, imported.bytes_sent), (1, 4))
+
+    def test_threshold(self):
+        slow_log = SlowLog(threshold=60)
+        API(client=FakeClient(), tracer=slow_log).get("/_api/version")
+        self.assertEqual(len(slow_log.entries), 0)
+        slow_log = SlowLog(threshold=0, operations=["document_get"])
+        API(client=FakeClient(), tracer=slow_log).get("/_api/version")
+        self.assertEqual(len(slow_log.entries), 0)
+
+    def test_bounded(self):
+        slow_log = SlowLog(threshold=0, max_entries=2)
+        api = API(client=FakeClient(), tracer=slow_log)
+        for key in range(3):
+            api.get("/_api/document/users/{}".format(key))
+        self.assertEqual(len(slow_log.entries), 2)
+        slow_log.clear()
+        self.assertEqual(len(slow_log.entries), 0)
+
+    def test_inner_tracer(self):
+        tracer = RecordingTracer()
+        slow_log = SlowLog(threshold=60, tracer=tracer)
+        database = Database("db", API(
+            client=FakeClient([BATCH, LAST_BATCH, DELETED]), tracer=slow_log
+        ))
+        list(database.execute_query("RETURN 1"))
+        query = tracer.spans[-1]
+        self.assertEqual(query.name, "ArangoDB execute_query")
+        self.assertEqual(len(tracer.spans), 4)
+        for span in list(tracer.spans)[:-1]:
+            self.assertEqual(span.parent_id, query.span_id)
+
+
+if __name__ == "__main__":
+    unittest.main()
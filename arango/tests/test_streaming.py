@@ -0,0 +1,159 @@
+"""Tests for the incremental parsing of the streamed batches."""
+
+import json
+import unittest
+
+from arango.api import API
+from arango.collection import Collection
+from arango.exceptions import SimpleQueryAllError
+from arango.streaming import iter_results, parse_results, raw_results
+from arango.tests.utils import FakeClient
+
+
+def decode(content):
+    return json.loads(content.decode("utf-8"))
+
+
+def split(content, size):
+    return [content[i:i + size] for i in range(0, len(content), size)]
+
+
+RESULT = [
+    {"_key": "1", "text": "with \"quotes\", ]brackets} and \\", "n": [1, {}]},
+    12.5,
+    "\\",
+    True,
+    None,
+    [],
+    {},
+]
+BATCH = json.dumps(
+    {"result": RESULT, "hasMore": False, "extra": {"id": [1, "2"]}},
+    indent=1
+).encode("utf-8")
+FIRST = (200, b'{"hasMore": true, "id": "9", "result": [{"a": 1}, {"a": 2}]}')
+LAST = (200, b'{"result": [{"a": 3}], "hasMore": false, "id": "9"}')
+
+
+class ParserTest(unittest.TestCase):
+    """Tests for the parsing of the streamed content."""
+
+    def test_chunk_boundaries(self):
+        for size in range(1, 32):
+            envelope = {}
+            items = list(parse_results(split(BATCH, size), envelope, decode))
+            self.assertEqual(items, RESULT)
+            self.assertEqual(envelope,
+                             {"hasMore": False, "extra": {"id": [1, "2"]}})
+
+    def test_raw_results(self):
+        raw = list(iter_results([b'{"result": [ {"a" : 1},2 ]}'], {}, decode))
+        self.assertEqual(raw, [b'{"a" : 1}', b"2"])
+        self.assertEqual(list(iter_results([b' {} '], {}, decode)), [])
+        self.assertEqual(list(iter_results([b'{"result":[]}'], {}, decode)),
+                         [])
+
+    def test_memoryview_results(self):
+        envelope = {}
+        raw = raw_results(b'{"code": 200, "documents": [{"a": 1}, "]"]}',
+                          envelope, decode, "documents")
+        self.assertTrue(all(isinstance(item, memoryview) for item in raw))
+        self.assertEqual([item.tobytes() for item in raw],
+                         [b'{"a": 1}', b'"]"'])
+        self.assertEqual(envelope, {"code": 200})
+
+    def test_incremental(self):
+        chunks = iter(split(BATCH, 8))
+        items = parse_results(chunks, {}, decode)
+        self.assertEqual(next(items), RESULT[0])
+        # The rest of the batch has not been read yet
+        self.assertTrue(list(chunks))
+
+    def test_invalid_content(self):
+        for content in (BATCH[:-2], b'[1, 2]', b'{"result": [1 2]}'):
+            self.assertRaises(ValueError, list,
+                              parse_results(split(content, 4), {}, decode))
+
+
+class StreamingCursorTest(unittest.TestCase):
+    """Tests for the cursors reading streamed batches."""
+
+    def setUp(self):
+        self.client = FakeClient([FIRST, LAST, (202, b"{}")], chunk_size=8)
+        self.col = Collection("students", API(client=self.client),
+                              is_edge=False)
+
+    def test_streamed_batches(self):
+        items = self.col.all(stream=True)
+        self.assertEqual(next(items), {"a": 1})
+        self.assertLess(self.client.chunks_read, len(FIRST[1]) // 8)
+        self.assertEqual(list(items), [{"a": 2}, {"a": 3}])
+        self.assertEqual(
+            [(method, "/".join(url.split("/")[-2:]), kwargs.get("stream"))
+             for method, url, kwargs in self.client.calls],
+            [("put", "simple/all", True), ("put", "cursor/9", True),
+             ("delete", "cursor/9", None)]
+        )
+
+    def test_not_streamed(self):
+        self.assertEqual(list(self.col.all()), [{"a": 1}, {"a": 2}, {"a": 3}])
+        self.assertEqual(self.client.chunks_read, 0)
+
+    def test_client_without_streaming(self):
+        self.client.streaming = False
+        self.assertEqual(list(self.col.all(stream=True)),
+                         [{"a": 1}, {"a": 2}, {"a": 3}])
+        self.assertEqual(self.client.arguments("stream"), [None] * 3)
+
+    def test_error_response(self):
+        self.client.outcomes = [(400, b'{"errorMessage": "bad"}')]
+        with self.assertRaises(SimpleQueryAllError) as context:
+            self.col.all(stream=True)
+        # The error body is read whole
+        self.assertEqual(str(context.exception), "bad")
+
+
+
+class RawResultsTest(unittest.TestCase):
+    """Tests for the results returned as raw JSON."""
+
+    def setUp(self):
+        self.client = FakeClient([FIRST, LAST, (202, b"{}")])
+        # The raw results are JSON even with a binary codec
+        api = API(client=self.client, codec="vpack")
+        self.col = Collection("students", api, is_edge=False)
+
+    def accepted(self):
+        return [(headers or {}).get("Accept")
+                for headers in self.client.arguments("headers")]
+
+    def test_raw_cursor(self):
+        for stream in (False, True):
+            self.client.outcomes = [FIRST, LAST, (202, b"{}")]
+            self.client.calls = []
+            items = self.col.export_documents(raw=True, stream=stream)
+            self.assertEqual([memoryview(item).tobytes() for item in items],
+                             [b'{"a": 1}', b'{"a": 2}', b'{"a": 3}'])
+            self.assertEqual(self.accepted()[:2], ["application/json"] * 2)
+
+    def test_raw_document(self):
+        self.client.outcomes = [(200, b'{"_key": "1"}')]
+        self.assertEqual(self.col.document("1", rev="2", raw=True),
+                         b'{"_key": "1"}')
+        self.assertEqual(self.client.arguments("headers")[0],
+                         {"If-Match": "2", "Accept": "application/json"})
+
+    def test_raw_lookup(self):
+        self.client.outcomes = [
+            (200, b'{"documents": [{"_key": "1"}, {"_key": "2"}]}')
+        ]
+        self.assertEqual(
+            [item.tobytes() for item in self.col.lookup_by_keys(["1", "2"],
+                                                                raw=True)],
+            [b'{"_key": "1"}', b'{"_key": "2"}']
+        )
+        self.assertEqual(self.accepted(), ["application/json"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+"""Tests for the tracing spans of the driver operations."""
+
+import unittest
+
+try:
+    import asyncio
+    from arango.aio.api import AsyncAPI
+    from arango.aio.database import AsyncDatabase
+    from arango.tests.aio_utils import AsyncFakeClient, collect
+except (ImportError, SyntaxError):  # Python 2
+    asyncio = None
+
+from arango.api import API
+from arango.database import Database
+from arango.exceptions import AQLQueryExecuteError
+from arango.tests.utils import FakeClient
+from arango.tracing import NOOP_TRACER, RecordingTracer
+
+
+QUERY = [
+    (201, b'{"result": [1, 2], "hasMore": true, "id": "7"}'),
+    (200, b'{"result": [3], "hasMore": false, "id": "7"}'),
+    (202, b'{}'),
+]
+
+
+class TracingTest(unittest.TestCase):
+    """Tests for the spans of the API wrapper."""
+
+    def test_no_tracer(self):
+        client = FakeClient([(200, b"{}")])
+        api = API(client=client)
+        self.assertIs(api.tracer, NOOP_TRACER)
+        api.get("/_api/version")
+        self.assertEqual(client.arguments("headers"), [None])
+
+    def test_request_span(self):
+        tracer = RecordingTracer()
+        client = FakeClient([(404, b"{}")])
+        api = API(client=client, database="db", tracer=tracer)
+        api.get("/_api/document/users/1", headers={"x-test": "1"})
+        span, = tracer.spans
+        self.assertEqual(span.name,
+                         "ArangoDB GET /_api/document/{collection}/{key}")
+        self.assertIsNone(span.parent_id)
+        self.assertEqual(span.attributes["db.name"], "db")
+        self.assertEqual(span.attributes["http.status_code"], 404)
+        self.assertGreaterEqual(span.duration, 0)
+        self.assertEqual(client.arguments("headers"), [{
+            "x-test": "1",
+            "traceparent": "00-{}-{}-01".format(span.trace_id, span.span_id),
+        }])
+
+    def test_request_error(self):
+        tracer = RecordingTracer()
+        error = IOError("reset")
+        api = API(client=FakeClient([error]), tracer=tracer)
+        self.assertRaises(IOError, api.get, "/_api/version")
+        self.assertIs(tracer.spans[0].error, error)
+
+    def test_query_spans(self):
+        tracer = RecordingTracer()
+        client = FakeClient(QUERY)
+        database = Database("db", API(client=client, tracer=tracer))
+        result = database.execute_query("FOR d IN docs RETURN d")
+        self.assertEqual(len(tracer.spans), 1)
+        self.assertEqual(list(result), [1, 2, 3])
+        names = [span.name.split(" /")[0] for span in tracer.spans]
+        self.assertEqual(names, [
+            "ArangoDB POST",
+            "ArangoDB PUT",
+            "ArangoDB DELETE",
+            "ArangoDB execute_query",
+        ])
+        query = tracer.spans[-1]
+        self.assertEqual(query.attributes["db.statement"],
+                         "FOR d IN docs RETURN d")
+        for span in list(tracer.spans)[:-1]:
+            self.assertEqual(span.trace_id, query.trace_id)
+            self.assertEqual(span.parent_id, query.span_id)
+        # Nothing is left active once the cursor is exhausted
+        self.assertIsNone(tracer.current_span())
+
+    def test_query_error(self):
+        tracer = RecordingTracer()
+        database = Database("db", API(
+            client=FakeClient([(400, b'{"error": true}')]), tracer=tracer
+        ))
+        self.assertRaises(AQLQueryExecuteError, database.execute_query,
+                          "RETURN")
+        query = tracer.spans[-1]
+        self.assertEqual(query.name, "ArangoDB execute_query")
+        self.assertIsInstance(query.error, AQLQueryExecuteError)
+
+    def test_batch_span(self):
+        tracer = RecordingTracer()
+        database = Database("db", API(
+            client=FakeClient([(200, b"")]), tracer=tracer
+        ))
+        self.assertEqual(database.execute_batch([]), [])
+        batch, request = tracer.spans[1], tracer.spans[0]
+        self.assertEqual(batch.name, "ArangoDB execute_batch")
+        self.assertEqual(request.parent_id, batch.span_id)
+
+    def test_remote_parent(self):
+        tracer = RecordingTracer()
+        api = API(client=FakeClient([(200, b"{}")]), tracer=tracer)
+        parent = tracer.extract({
+            "Traceparent": "00-{}-{}-01".format("a" * 32, "b" * 16)
+        })
+        with tracer.activate(parent):
+            api.get("/_api/version")
+        self.assertEqual(tracer.spans[0].trace_id, "a" * 32)
+        self.assertEqual(tracer.spans[0].parent_id, "b" * 16)
+        self.assertIsNone(tracer.extract({"traceparent": "garbage"}))
+
+    @unittest.skipIf(asyncio is None, "requires Python 3")
+    def test_async_query_spans(self):
+        tracer = RecordingTracer()
+        database = AsyncDatabase("db", AsyncAPI(
+            client=AsyncFakeClient(QUERY), tracer=tracer
+        ))
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+        cursor = loop.run_until_complete(database.execute_query("RETURN 1"))
+        self.assertEqual(loop.run_until_complete(collect(cursor)), [1, 2, 3])
+        query = tracer.spans[-1]
+        self.assertEqual(query.name, "ArangoDB execute_query")
+        self.assertEqual(len(tracer.spans), 4)
+        for span in list(tracer.spans)[:-1]:
+            self.assertEqual(span.parent_id, query.span_id)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+"""Tests for the VelocyPack encoder and decoder."""
+
+import unittest
+
+from arango import vpack
+
+
+def unhex(string):
+    return bytes(bytearray(int(b, 16) for b in string.split()))
+
+
+class VelocyPackTest(unittest.TestCase):
+    """Tests for the VelocyPack encoder and decoder."""
+
+    def test_scalars(self):
+        for value, encoded in [
+            (None, "18"),
+            (False, "19"),
+            (True, "1a"),
+            (0, "30"),
+            (9, "39"),
+            (-1, "3f"),
+            (-6, "3a"),
+            (10, "28 0a"),
+            (256, "29 00 01"),
+            (-7, "20 f9"),
+            (-129, "21 7f ff"),
+            (2 ** 64 - 1, "2f ff ff ff ff ff ff ff ff"),
+            (1.5, "1b 00 00 00 00 00 00 f8 3f"),
+            (u"", "40"),
+            (u"xyz", "43 78 79 7a"),
+        ]:
+            self.assertEqual(vpack.encode(value), unhex(encoded))
+            self.assertEqual(vpack.decode(unhex(encoded)), value)
+
+    def test_long_string(self):
+        value = u"\u00e9" * 100
+        encoded = vpack.encode(value)
+        self.assertEqual(encoded[:1], b"\xbf")
+        self.assertEqual(vpack.decode(encoded), value)
+
+    def test_compact_containers(self):
+        self.assertEqual(vpack.encode([]), b"\x01")
+        self.assertEqual(vpack.encode({}), b"\x0a")
+        self.assertEqual(vpack.encode([1, 16]), unhex("13 06 31 28 10 02"))
+        self.assertEqual(
+            vpack.encode({"a": 1}),
+            unhex("14 06 41 61 31 01")
+        )
+
+    def test_spec_examples(self):
+        # Array without index table
+        self.assertEqual(vpack.decode(unhex("02 05 31 32 33")), [1, 2, 3])
+        # Array with index table
+        self.assertEqual(
+            vpack.decode(unhex("06 0a 02 31 43 78 79 7a 03 04")),
+            [1, "xyz"]
+        )
+        # Sorted object with index table
+        self.assertEqual(
+            vpack.decode(unhex(
+                "0b 13 03 41 61 28 0c 41 62 1a 41 63 43 78 79 7a 03 07 0a"
+            )),
+            {"a": 12, "b": True, "c": "xyz"}
+        )
+        # Translated attribute names
+        self.assertEqual(
+            vpack.decode(unhex("14 0a 31 43 61 62 63 32 30 02")),
+            {"_key": "abc", "_rev": 0}
+        )
+
+    def test_round_trip(self):
+        document = {
+            "_key": "doc01",
+            "name": u"Andr\u00e9",
+            "values": [1, -300, 2.5, 2 ** 40, -2 ** 40, None, True],
+            "nested": {"list": [[], {}, [1, [2, [3]]]], "empty": ""},
+            "long": list(range(200)),
+        }
+        self.assertEqual(vpack.decode(vpack.encode(document)), document)
+
+    def test_invalid(self):
+        self.assertRaises(TypeError, vpack.encode, {1: "a"})
+        self.assertRaises(TypeError, vpack.encode, object())
+        self.assertRaises(OverflowError, vpack.encode, 2 ** 64)
+        self.assertRaises(ValueError, vpack.decode, b"\x43ab")
+        self.assertRaises(ValueError, vpack.decode, b"\x17")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,10 @@
 """Utility functions used for testing."""
 
 import collections
+import threading
+import time
+
+from arango.response import Response
 
 
 def generate_db_name(arango):
@@ -86,3 +90,95 @@ def strip_system_keys(obj):
             {k: v for k, v in document.items() if not k.startswith("_")}
             for document in obj
         ]
+
+
+class FakeClient(object):
+    """HTTP client answering the requests without a server.
+
+    The requests are answered with the outcomes in order, the last outcome
+    answering every request left. An outcome is either the status code and
+    the content of the response, or the exception to raise. The requests
+    are recorded in ``calls`` as (method, url, keyword arguments) tuples,
+    and the peak number of requests in flight in ``peak``.
+
+    The responses requested with ``stream=True`` are streamed in chunks of
+    ``chunk_size`` bytes, whose number read so far is in ``chunks_read``.
+
+    :param outcomes: the outcomes (default: a 200 with an empty object)
+    :type outcomes: list
+    :param delay: the seconds taken to answer every request; a request
+        whose timeout is shorter fails like a socket timeout would
+    :type delay: int or float
+    :param gate: the event to wait for before answering the requests
+    :type gate: threading.Event or None
+    :param chunk_size: the size of the chunks of the streamed responses
+    :type chunk_size: int
+    """
+
+    streaming = True
+
+    def __init__(self, outcomes=((200, b"{}"),), delay=0.0, gate=None,
+                 chunk_size=16):
+        self.outcomes = list(outcomes)
+        self.delay = delay
+        self.gate = gate
+        self.chunk_size = chunk_size
+        self.chunks_read = 0
+        self.calls = []
+        self.in_flight = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def __getattr__(self, method):
+        return lambda url, **kwargs: self._request(method, url, **kwargs)
+
+    def arguments(self, name):
+        """Return the given keyword argument of every request made.
+
+        :param name: the name of the argument (e.g. 'headers')
+        :type name: str
+        :returns: the values, None for the requests made without it
+        :rtype: list
+        """
+        return [kwargs.get(name) for _, _, kwargs in self.calls]
+
+    def _start(self, method, url, kwargs):
+        """Record the request and return its outcome and duration."""
+        with self._lock:
+            self.calls.append((method, url, kwargs))
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+            if len(self.outcomes) > 1:
+                outcome = self.outcomes.pop(0)
+            else:
+                outcome = self.outcomes[0]
+        timeout = kwargs.get("timeout")
+        if timeout is not None and timeout < self.delay:
+            return IOError("timed out"), timeout
+        return outcome, self.delay
+
+    def _finish(self, method, url, outcome, stream=False):
+        """Return the response of the request, or raise its exception."""
+        with self._lock:
+            self.in_flight -= 1
+        if isinstance(outcome, Exception):
+            raise outcome
+        status_code, content = outcome
+        if stream:
+            return Response(method, url, status_code, None, {},
+                            stream=self._chunks(content))
+        return Response(method, url, status_code, content, {})
+
+    def _chunks(self, content):
+        """Yield the chunks of a streamed response."""
+        for start in range(0, len(content), self.chunk_size):
+            self.chunks_read += 1
+            yield content[start:start + self.chunk_size]
+
+    def _request(self, method, url, **kwargs):
+        outcome, delay = self._start(method, url, kwargs)
+        if delay:
+            time.sleep(delay)
+        if self.gate is not None:
+            self.gate.wait()
+        return self._finish(method, url, outcome, kwargs.get("stream"))
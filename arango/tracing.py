@@ -0,0 +1,319 @@
+"""Tracing spans for the driver operations and their HTTP round trips."""
+
+import random
+import re
+import time
+from collections import deque
+from contextlib import contextmanager
+from threading import local
+
+from arango.deadline import monotonic
+
+try:
+    from contextvars import ContextVar
+except ImportError:  # Python < 3.7
+    ContextVar = None
+
+# The W3C trace context header of the requests
+TRACEPARENT_HEADER = "traceparent"
+
+TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$")
+
+
+class _ThreadLocalVar(object):
+    """Fallback for ``contextvars.ContextVar`` tracking a value per thread.
+
+    The values are not isolated between coroutines, so the spans of the
+    concurrent asynchronous operations may nest wrongly without
+    ``contextvars``.
+    """
+
+    def __init__(self, name, default=None):
+        self._local = local()
+        self._default = default
+
+    def get(self):
+        return getattr(self._local, "value", self._default)
+
+    def set(self, value):
+        token = self.get()
+        self._local.value = value
+        return token
+
+    def reset(self, token):
+        self._local.value = token
+
+
+if ContextVar is None:
+    _current_span = _ThreadLocalVar("arango_span")
+else:
+    _current_span = ContextVar("arango_span", default=None)
+
+
+class Span(object):
+    """A traced operation, doing nothing unless subclassed.
+
+    The tracers return the spans from ``Tracer.start_span``; the driver
+    sets their attributes, records the exception which failed them, copies
+    their ``headers`` into the HTTP requests and ends them.
+    """
+
+    def set_attribute(self, key, value):
+        """Set an attribute of the span.
+
+        :param key: the name of the attribute (e.g. 'http.status_code')
+        :type key: str
+        :param value: the value of the attribute
+        :type value: str or int or float or bool
+        """
+
+    def record_error(self, error):
+        """Record the exception which failed the operation.
+
+        :param error: the exception
+        :type error: Exception
+        """
+
+    def headers(self):
+        """Return the headers propagating the span to the server.
+
+        :returns: the trace context headers (e.g. 'traceparent')
+        :rtype: dict
+        """
+        return {}
+
+    def end(self):
+        """End the span; it is called once, when the operation is over."""
+
+
+# The span returned by the no-op tracer
+NOOP_SPAN = Span()
+
+
+class Tracer(object):
+    """Tracer creating the spans of the driver operations, which does nothing.
+
+    The driver starts a span per logical operation (e.g. 'execute_query',
+    spanning the fetches of all the batches of its cursor, or
+    'execute_batch') and a child span per HTTP round trip (each retry
+    included), whose trace context is propagated in the request headers.
+
+    This base class is the default, no-op tracer: its ``enabled`` flag is
+    off so that the requests skip tracing altogether. Tracers bridging to
+    a tracing system (e.g. OpenTelemetry) set it and override
+    ``start_span``; the current span is tracked per thread or per
+    coroutine (with ``contextvars``) by the methods below.
+    """
+
+    enabled = False
+
+    def __repr__(self):
+        """Return a descriptive string of this instance."""
+        return "<ArangoDB {}>".format(type(self).__name__)
+
+    def start_span(self, name, attributes=None, parent=None):
+        """Start a span.
+
+        :param name: the name of the span (e.g. 'ArangoDB execute_query')
+        :type name: str
+        :param attributes: the initial attributes of the span
+        :type attributes: dict or None
+        :param parent: the parent span, or None for the current span
+        :type parent: arango.tracing.Span or None
+        :returns: the started span
+        :rtype: arango.tracing.Span
+        """
+        return NOOP_SPAN
+
+    def current_span(self):
+        """Return the active span of the thread or coroutine.
+
+        :returns: the span made current by ``activate``, if any
+        :rtype: arango.tracing.Span or None
+        """
+        return _current_span.get()
+
+    @contextmanager
+    def activate(self, span):
+        """Make a span the parent of the spans started in the block.
+
+        The span is not ended on leaving the block.
+
+        :param span: the span, or None to leave the current span as is
+        :type span: arango.tracing.Span or None
+        """
+        if span is None or span is NOOP_SPAN:
+            yield span
+            return
+        token = _current_span.set(span)
+        try:
+            yield span
+        finally:
+            _current_span.reset(token)
+
+    @contextmanager
+    def span(self, name, attributes=None, end=True):
+        """Start a span, active within the block, recording its exception.
+
+        :param name: the name of the span
+        :type name: str
+        :param attributes: the initial attributes of the span
+        :type attributes: dict or None
+        :param end: whether to end the span on leaving the block, else only
+            if an exception leaves it (e.g. when a cursor carries it on)
+        :type end: bool
+        """
+        if not self.enabled:
+            yield NOOP_SPAN
+            return
+        span = self.start_span(name, attributes)
+        try:
+            with self.activate(span):
+                yield span
+        except Exception as error:
+            span.record_error(error)
+            span.end()
+            raise
+        except BaseException:
+            span.end()
+            raise
+        if end:
+            span.end()
+
+
+# The default tracer of the API wrappers
+NOOP_TRACER = Tracer()
+
+
+def _random_id(bits):
+    """Return a random, non-zero trace or span ID in hexadecimal."""
+    return "{:0{}x}".format(random.getrandbits(bits) or 1, bits // 4)
+
+
+class RecordedSpan(Span):
+    """Span recorded by ``RecordingTracer``.
+
+    :param tracer: the tracer recording the span once ended
+    :type tracer: arango.tracing.RecordingTracer
+    :param name: the name of the span
+    :type name: str
+    :param attributes: the initial attributes of the span
+    :type attributes: dict or None
+    :param parent: the parent span, if any
+    :type parent: arango.tracing.RecordedSpan or None
+    """
+
+    def __init__(self, tracer, name, attributes=None, parent=None):
+        self.tracer = tracer
+        self.name = name
+        self.attributes = dict(attributes or {})
+        if parent is None:
+            self.trace_id = _random_id(128)
+            self.parent_id = None
+        else:
+            self.trace_id = parent.trace_id
+            self.parent_id = parent.span_id
+        self.span_id = _random_id(64)
+        self.error = None
+        self.start_time = time.time()
+        self.duration = None
+        self._started = monotonic()
+
+    def __repr__(self):
+        """Return a descriptive string of this instance."""
+        return "<ArangoDB span '{}' ({})>".format(self.name, self.span_id)
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def record_error(self, error):
+        self.error = error
+
+    def headers(self):
+        return {
+            TRACEPARENT_HEADER: "00-{}-{}-01".format(
+                self.trace_id, self.span_id
+            )
+        }
+
+    def end(self):
+        if self.duration is None:
+            self.duration = monotonic() - self._started
+            self.tracer.record(self)
+
+
+class RemoteSpan(Span):
+    """The span of another service, to parent the spans of the driver.
+
+    :param trace_id: the trace ID in hexadecimal
+    :type trace_id: str
+    :param span_id: the span ID in hexadecimal
+    :type span_id: str
+    """
+
+    def __init__(self, trace_id, span_id):
+        self.trace_id = trace_id
+        self.span_id = span_id
+
+    def __repr__(self):
+        """Return a descriptive string of this instance."""
+        return "<ArangoDB remote span ({})>".format(self.span_id)
+
+    def headers(self):
+        return {
+            TRACEPARENT_HEADER: "00-{}-{}-01".format(
+                self.trace_id, self.span_id
+            )
+        }
+
+
+class RecordingTracer(Tracer):
+    """Tracer keeping the last ended spans in memory, with W3C propagation.
+
+    The requests carry the W3C ``traceparent`` header of their span. The
+    ended spans are kept in ``spans`` (the last ``max_spans`` of them) and
+    passed to ``on_end``, e.g. to export them.
+
+    :param max_spans: the max number of ended spans kept
+    :type max_spans: int
+    :param on_end: the callable taking every ended span, if any
+    :type on_end: callable or None
+    """
+
+    enabled = True
+
+    def __init__(self, max_spans=1000, on_end=None):
+        self.spans = deque(maxlen=max_spans)
+        self.on_end = on_end
+
+    def start_span(self, name, attributes=None, parent=None):
+        if parent is None:
+            parent = self.current_span()
+        return RecordedSpan(self, name, attributes, parent)
+
+    def extract(self, headers):
+        """Return the remote span of an incoming request, if it has one.
+
+        Activate it (see ``activate``) to parent the spans of the driver.
+
+        :param headers: the headers of the incoming request
+        :type headers: dict
+        :returns: the span of the caller, or None
+        :rtype: arango.tracing.RemoteSpan or None
+        """
+        for key, value in headers.items():
+            if key.lower() == TRACEPARENT_HEADER:
+                match = TRACEPARENT.match(value.strip().lower())
+                if match is not None:
+                    return RemoteSpan(*match.groups())
+        return None
+
+    def record(self, span):
+        """Keep an ended span and pass it to ``on_end``.
+
+        :param span: the ended span
+        :type span: arango.tracing.RecordedSpan
+        """
+        self.spans.append(span)
+        if self.on_end is not None:
+            self.on_end(span)
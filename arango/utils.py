@@ -2,7 +2,6 @@
 
 import importlib
 from re import sub
-from json import dumps
 from collections import Mapping, Iterable
 try:
     urllib = importlib.import_module('urllib.parse')
@@ -13,6 +12,8 @@ try:
 except ImportError:
     builtins = importlib.import_module('builtins')
 
+from arango.codec import get_codec
+
 
 def is_string(obj):
     """Return True iff ``obj`` is an instance of str or unicode.
@@ -98,7 +99,8 @@ def filter_keys(dictionary, filtered):
     return {k: v for k, v in dictionary.items() if k not in filtered}
 
 
-def stringify_request(method, path, params=None, headers=None, data=None):
+def stringify_request(method, path, params=None, headers=None, data=None,
+                      codec=None):
     """Stringify the HTTP request into a string for batch requests.
 
     :param method: the HTTP method
@@ -111,6 +113,8 @@ def stringify_request(method, path, params=None, headers=None, data=None):
     :type headers: dict or None
     :param data: the request payload
     :type data: dict or None
+    :param codec: the JSON codec serializing the payload (default: stdlib)
+    :type codec: arango.codec.JSONCodec or None
     :returns: the stringified request
     :rtype: str
     """
@@ -123,5 +127,7 @@ def stringify_request(method, path, params=None, headers=None, data=None):
                 key=key, value=value
             )
     if data:
-        request_string += "\r\n\r\n{}".format(dumps(data))
+        if codec is None:
+            codec = get_codec()
+        request_string += "\r\n\r\n{}".format(codec.dumps(data))
     return request_string
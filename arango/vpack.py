@@ -0,0 +1,322 @@
+"""Pure Python VelocyPack encoder and decoder.
+
+VelocyPack is ArangoDB's binary serialization format, documented at
+https://github.com/arangodb/velocypack/blob/master/VelocyPack.md.
+
+The encoder produces compact arrays and objects, the smallest integer
+representations and 8-byte doubles. The decoder reads all the value types
+ArangoDB sends over HTTP, except for BCD numbers, external values and
+custom types. Dates are decoded into milliseconds since the epoch, binary
+blobs into bytes and the min/max keys into None.
+"""
+
+import struct
+
+try:
+    _TEXT_TYPES = (str, unicode)
+    _INT_TYPES = (int, long)
+except NameError:  # Python 3
+    _TEXT_TYPES = (str,)
+    _INT_TYPES = (int,)
+
+# Indexing bytes returns a str on Python 2 but an int on Python 3
+_BYTES_ARE_STR = bytes is str
+
+# Single byte strings by value
+_BYTE = [struct.pack("B", i) for i in range(256)]
+
+_DOUBLE = struct.Struct("<d")
+_INT64 = struct.Struct("<q")
+_UINT64 = struct.Struct("<Q")
+_UINTS = {
+    1: struct.Struct("<B"),
+    2: struct.Struct("<H"),
+    4: struct.Struct("<I"),
+    8: struct.Struct("<Q"),
+}
+
+# Object keys which ArangoDB translates into small integers
+_TRANSLATED_KEYS = {1: "_key", 2: "_rev", 3: "_id", 4: "_from", 5: "_to"}
+
+
+###########
+# Encoder #
+###########
+
+def _varint(value):
+    """Return the value as a variable length integer (7 bits per byte)."""
+    out = bytearray()
+    while value >= 0x80:
+        out.append((value & 0x7f) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def _compact(type_byte, payload, count):
+    """Return a compact array or object with the encoded members."""
+    nr_items = _varint(count)[::-1]
+    size = 1 + len(payload) + len(nr_items)
+    # The byte length includes the variable length byte length itself
+    width = 1
+    while True:
+        byte_length = _varint(size + width)
+        if len(byte_length) == width:
+            break
+        width = len(byte_length)
+    return type_byte + byte_length + payload + nr_items
+
+
+def _encode_int(value):
+    if 0 <= value <= 9:
+        return _BYTE[0x30 + value]
+    if -6 <= value < 0:
+        return _BYTE[0x40 + value]
+    if value > 0:
+        size = (value.bit_length() + 7) // 8
+        if size > 8:
+            raise OverflowError("int too large for VelocyPack")
+        return _BYTE[0x27 + size] + _UINT64.pack(value)[:size]
+    size = ((~value).bit_length() + 8) // 8
+    if size > 8:
+        raise OverflowError("int too large for VelocyPack")
+    return _BYTE[0x1f + size] + _INT64.pack(value)[:size]
+
+
+def _encode_string(value):
+    value = value.encode("utf-8")
+    length = len(value)
+    if length <= 126:
+        return _BYTE[0x40 + length] + value
+    return b"\xbf" + _UINT64.pack(length) + value
+
+
+def _encode(obj):
+    """Return the VelocyPack encoding of the object."""
+    if obj is None:
+        return b"\x18"
+    if obj is True:
+        return b"\x1a"
+    if obj is False:
+        return b"\x19"
+    if isinstance(obj, _TEXT_TYPES):
+        return _encode_string(obj)
+    if isinstance(obj, _INT_TYPES):
+        return _encode_int(obj)
+    if isinstance(obj, float):
+        return b"\x1b" + _DOUBLE.pack(obj)
+    if isinstance(obj, dict):
+        if not obj:
+            return b"\x0a"
+        parts = []
+        for key, value in obj.items():
+            if not isinstance(key, _TEXT_TYPES):
+                raise TypeError(
+                    "object keys must be strings, not {}".format(
+                        type(key).__name__
+                    )
+                )
+            parts.append(_encode_string(key))
+            parts.append(_encode(value))
+        return _compact(b"\x14", b"".join(parts), len(obj))
+    if isinstance(obj, (list, tuple)):
+        if not obj:
+            return b"\x01"
+        return _compact(b"\x13", b"".join([_encode(v) for v in obj]),
+                        len(obj))
+    raise TypeError(
+        "{!r} is not VelocyPack serializable".format(obj)
+    )
+
+
+def encode(obj):
+    """Serialize the object into VelocyPack.
+
+    :param obj: the object to serialize (None, bool, int, float, str, list,
+        tuple or dict with string keys)
+    :type obj: object
+    :returns: the VelocyPack value
+    :rtype: bytes
+    :raises: TypeError, OverflowError
+    """
+    return _encode(obj)
+
+
+###########
+# Decoder #
+###########
+
+def _uint(data, pos, size):
+    """Return the unsigned little endian integer of the given size."""
+    if size in _UINTS:
+        return _UINTS[size].unpack_from(data, pos)[0]
+    value = 0
+    for i in range(size):
+        value |= data[pos + i] << (8 * i)
+    return value
+
+
+def _decode_key(data, pos):
+    """Return an object key and the position of its value."""
+    head = data[pos]
+    if 0x40 <= head <= 0xbe:
+        end = pos + 1 + head - 0x40
+        return data[pos + 1:end].decode("utf-8"), end
+    key, end = _decode(data, pos)
+    if isinstance(key, _INT_TYPES):
+        if key not in _TRANSLATED_KEYS:
+            raise ValueError("unknown translated key {}".format(key))
+        return _TRANSLATED_KEYS[key], end
+    return key, end
+
+
+def _decode_indexed(data, pos, head, base, is_object):
+    """Decode an array or object with an index table."""
+    width = 1 << (head - base)
+    byte_length = _uint(data, pos + 1, width)
+    if width < 8:
+        count = _uint(data, pos + 1 + width, width)
+        index = pos + byte_length - count * width
+    else:
+        count = _uint(data, pos + byte_length - 8, 8)
+        index = pos + byte_length - 8 - count * width
+    offsets = [
+        _uint(data, index + i * width, width) for i in range(count)
+    ]
+    if is_object:
+        result = {}
+        for offset in offsets:
+            key, value_pos = _decode_key(data, pos + offset)
+            result[key] = _decode(data, value_pos)[0]
+    else:
+        result = [_decode(data, pos + offset)[0] for offset in offsets]
+    return result, pos + byte_length
+
+
+def _decode_compact(data, pos, is_object):
+    """Decode a compact array or object."""
+    byte_length = 0
+    shift = 0
+    cursor = pos + 1
+    while True:
+        byte = data[cursor]
+        cursor += 1
+        byte_length |= (byte & 0x7f) << shift
+        shift += 7
+        if byte < 0x80:
+            break
+    end = pos + byte_length
+    count = 0
+    shift = 0
+    tail = end - 1
+    while True:
+        byte = data[tail]
+        tail -= 1
+        count |= (byte & 0x7f) << shift
+        shift += 7
+        if byte < 0x80:
+            break
+    if is_object:
+        result = {}
+        for _ in range(count):
+            key, cursor = _decode_key(data, cursor)
+            result[key], cursor = _decode(data, cursor)
+    else:
+        result = []
+        append = result.append
+        for _ in range(count):
+            value, cursor = _decode(data, cursor)
+            append(value)
+    return result, end
+
+
+def _decode(data, pos):
+    """Return the value at ``pos`` and the position after it."""
+    head = data[pos]
+    # Short strings are by far the most common, so check them first
+    if 0x40 <= head <= 0xbe:
+        end = pos + 1 + head - 0x40
+        return data[pos + 1:end].decode("utf-8"), end
+    if 0x30 <= head <= 0x39:
+        return head - 0x30, pos + 1
+    if head == 0x14:
+        return _decode_compact(data, pos, True)
+    if head == 0x13:
+        return _decode_compact(data, pos, False)
+    if head == 0x1b:
+        return _DOUBLE.unpack_from(data, pos + 1)[0], pos + 9
+    if 0x28 <= head <= 0x2f:
+        size = head - 0x27
+        return _uint(data, pos + 1, size), pos + 1 + size
+    if 0x20 <= head <= 0x27:
+        size = head - 0x1f
+        value = _uint(data, pos + 1, size)
+        if value >= 1 << (8 * size - 1):
+            value -= 1 << (8 * size)
+        return value, pos + 1 + size
+    if 0x3a <= head <= 0x3f:
+        return head - 0x40, pos + 1
+    if head == 0x18:
+        return None, pos + 1
+    if head == 0x19:
+        return False, pos + 1
+    if head == 0x1a:
+        return True, pos + 1
+    if head == 0x01:
+        return [], pos + 1
+    if head == 0x0a:
+        return {}, pos + 1
+    if 0x0b <= head <= 0x0e:
+        return _decode_indexed(data, pos, head, 0x0b, True)
+    if 0x0f <= head <= 0x12:
+        return _decode_indexed(data, pos, head, 0x0f, True)
+    if 0x06 <= head <= 0x09:
+        return _decode_indexed(data, pos, head, 0x06, False)
+    if 0x02 <= head <= 0x05:
+        # Array of equally sized members without an index table
+        width = 1 << (head - 0x02)
+        end = pos + _uint(data, pos + 1, width)
+        cursor = pos + 1 + width
+        while data[cursor] == 0:  # skip the padding
+            cursor += 1
+        result = []
+        while cursor < end:
+            value, cursor = _decode(data, cursor)
+            result.append(value)
+        return result, end
+    if head == 0xbf:
+        length = _UINT64.unpack_from(data, pos + 1)[0]
+        end = pos + 9 + length
+        return data[pos + 9:end].decode("utf-8"), end
+    if head == 0x1c:
+        return _INT64.unpack_from(data, pos + 1)[0], pos + 9
+    if head in (0x1e, 0x1f):
+        return None, pos + 1
+    if 0xc0 <= head <= 0xc7:
+        size = head - 0xbf
+        start = pos + 1 + size
+        end = start + _uint(data, pos + 1, size)
+        return bytes(data[start:end]), end
+    raise ValueError(
+        "unsupported VelocyPack type 0x{:02x} at offset {}".format(head, pos)
+    )
+
+
+def decode(content):
+    """Deserialize the VelocyPack value.
+
+    :param content: the VelocyPack value
+    :type content: bytes or bytearray
+    :returns: the deserialized object
+    :rtype: object
+    :raises: ValueError
+    """
+    if _BYTES_ARE_STR and not isinstance(content, bytearray):
+        content = bytearray(content)
+    try:
+        value, end = _decode(content, 0)
+    except (IndexError, struct.error):
+        end = None
+    if end is None or end > len(content):
+        raise ValueError("truncated VelocyPack value")
+    return value
@@ -0,0 +1,94 @@
+"""Compare document reads through the sync and asyncio drivers.
+
+Starts a fake ArangoDB server (see ``fake_server.py``) unless ``--port`` is
+given, then times ``--requests`` document reads issued:
+
+* sequentially through ``arango.Arango``,
+* from a pool of ``--concurrency`` threads sharing one ``arango.Arango``,
+* concurrently from one event loop through ``arango.aio.AsyncArango``.
+
+Run from the repository root with ``PYTHONPATH=. python benchmarks/...``.
+Requires Python 3.7 or later.
+"""
+
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from fake_server import FakeServer
+
+from arango import Arango
+from arango.aio import AsyncArango
+
+
+def report(label, count, elapsed):
+    print("{:<24} {:>8.0f} req/s  ({:.3f}s)".format(
+        label, count / elapsed, elapsed
+    ))
+
+
+def bench_sync(collection, keys):
+    start = time.time()
+    for key in keys:
+        collection.document(key)
+    return time.time() - start
+
+
+def bench_threads(collection, keys, concurrency):
+    with ThreadPoolExecutor(concurrency) as pool:
+        start = time.time()
+        list(pool.map(collection.document, keys))
+        return time.time() - start
+
+
+async def bench_async(port, name, keys, concurrency):
+    arango = await AsyncArango.connect(
+        port=port, max_connections=concurrency
+    )
+    collection = await arango.collection(name)
+    start = time.time()
+    await asyncio.gather(*[collection.document(key) for key in keys])
+    elapsed = time.time() - start
+    await arango.close()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=None)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    args = parser.parse_args()
+
+    server = None
+    port = args.port
+    if port is None:
+        server = FakeServer().start()
+        port = server.port
+
+    arango = Arango(port=port)
+    name = "bench_async"
+    if name not in arango.collections["all"]:
+        arango.create_collection(name)
+    collection = arango.collection(name)
+    collection.import_documents(
+        [{"_key": str(i), "value": i} for i in range(100)]
+    )
+    keys = [str(i % 100) for i in range(args.requests)]
+
+    report("sync", len(keys), bench_sync(collection, keys))
+    report("sync ({} threads)".format(args.concurrency), len(keys),
+           bench_threads(collection, keys, args.concurrency))
+    loop = asyncio.get_event_loop()
+    report("asyncio ({} in flight)".format(args.concurrency), len(keys),
+           loop.run_until_complete(
+               bench_async(port, name, keys, args.concurrency)
+           ))
+
+    if server is not None:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Compare the latency and throughput of the synchronous HTTP clients.
+
+Starts a fake ArangoDB server (see ``fake_server.py``) unless ``--port`` is
+given, then for each client times ``--requests`` document reads issued:
+
+* sequentially, reporting the per-request latency percentiles,
+* from ``--concurrency`` threads sharing one ``arango.Arango``, reporting
+  the throughput.
+
+Run from the repository root with ``PYTHONPATH=. python benchmarks/...``.
+"""
+
+import argparse
+import threading
+import time
+
+from fake_server import FakeServer
+
+from arango import Arango
+from arango.clients import DefaultClient, HTTPClient
+
+
+CLIENTS = [
+    ("default", DefaultClient),
+    ("http", HTTPClient),
+]
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[int(fraction * (len(sorted_values) - 1))]
+
+
+def bench_latency(collection, keys):
+    latencies = []
+    for key in keys:
+        start = time.time()
+        collection.document(key)
+        latencies.append(time.time() - start)
+    latencies.sort()
+    return [percentile(latencies, f) * 1e6 for f in (0.5, 0.9, 0.99)]
+
+
+def bench_throughput(collection, keys, concurrency):
+    def worker(chunk):
+        for key in chunk:
+            collection.document(key)
+
+    threads = [
+        threading.Thread(target=worker, args=(keys[i::concurrency],))
+        for i in range(concurrency)
+    ]
+    start = time.time()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return len(keys) / (time.time() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=None)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    server = None
+    port = args.port
+    if port is None:
+        server = FakeServer().start()
+        port = server.port
+
+    name = "bench_clients"
+    keys = ["doc{}".format(i % 100) for i in range(args.requests)]
+    setup = Arango(port=port)
+    if name not in setup.collections["all"]:
+        setup.create_collection(name)
+    collection = setup.collection(name)
+    collection.truncate()
+    collection.import_documents([
+        {"_key": "doc{}".format(i), "value": i} for i in range(100)
+    ])
+
+    print("{:<8} {:>9} {:>9} {:>9} {:>14}".format(
+        "client", "p50", "p90", "p99",
+        "{} threads".format(args.concurrency)
+    ))
+    try:
+        for label, client_class in CLIENTS:
+            client = client_class({
+                "auth": ("root", ""),
+                "pool_maxsize": args.concurrency
+            })
+            arango = Arango(port=port, client=client)
+            collection = arango.collection(name)
+            collection.document(keys[0])  # open the connection
+            p50, p90, p99 = bench_latency(collection, keys)
+            throughput = bench_throughput(collection, keys, args.concurrency)
+            print("{:<8} {:>7.0f}us {:>7.0f}us {:>7.0f}us {:>8.0f} req/s"
+                  .format(label, p50, p90, p99, throughput))
+            client.close()
+    finally:
+        setup.delete_collection(name)
+        if server is not None:
+            server.stop()
+
+
+if __name__ == "__main__":
+    main()
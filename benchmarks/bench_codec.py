@@ -0,0 +1,80 @@
+"""Compare the JSON codecs on the driver's encode and decode paths.
+
+Times, for each installed codec (see ``arango.codec``):
+
+* encoding ``--documents`` documents into an NDJSON import payload, as done
+  by ``Collection.import_documents``,
+* decoding a cursor batch of ``--documents`` documents, as done by
+  ``Response.body``.
+
+Run from the repository root with ``PYTHONPATH=. python benchmarks/...``.
+"""
+
+import argparse
+import time
+
+from arango.codec import CODECS, get_codec
+from arango.response import Response
+
+
+def make_documents(count):
+    return [
+        {
+            "_key": "doc{}".format(i),
+            "name": "user {}".format(i),
+            "email": "user{}@example.com".format(i),
+            "age": i % 90,
+            "score": i * 0.5,
+            "active": i % 2 == 0,
+            "tags": ["alpha", "beta", "gamma"][:i % 4],
+            "address": {"city": "Berlin", "zip": "{:05d}".format(i)},
+        }
+        for i in range(count)
+    ]
+
+
+def best_of(repeat, func):
+    timings = []
+    for _ in range(repeat):
+        start = time.time()
+        func()
+        timings.append(time.time() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    documents = make_documents(args.documents)
+    batch = get_codec().encode({"result": documents, "hasMore": False})
+    print("{} documents, {:.1f} MB cursor batch, best of {}".format(
+        args.documents, len(batch) / 1e6, args.repeat
+    ))
+    print("{:<8} {:>12} {:>12}".format("codec", "encode", "decode"))
+
+    for name, _ in CODECS:
+        codec = get_codec(name)
+        if codec.name != name:
+            print("{:<8} not installed".format(name))
+            continue
+
+        def encode():
+            b"\r\n".join([codec.encode(d) for d in documents])
+
+        def decode():
+            res = Response("put", "/_api/cursor/1", 200, batch, {})
+            res.codec = codec
+            return res.body
+
+        print("{:<8} {:>10.1f}ms {:>10.1f}ms".format(
+            name,
+            best_of(args.repeat, encode) * 1000,
+            best_of(args.repeat, decode) * 1000
+        ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Measure the overhead of the request hooks on the API call path.
+
+Times ``--requests`` calls of ``API.get`` and ``API.put`` against an HTTP
+client answering instantly, so that only the driver's own work is timed:
+
+* without any hook registered (the fast path every call takes by default),
+* with a no-op ``after_response`` hook, which also times the phases of the
+  requests and decodes their bodies eagerly.
+
+Run from the repository root with ``PYTHONPATH=. python benchmarks/...``.
+"""
+
+import argparse
+import time
+
+from arango.api import API
+from arango.response import Response
+
+
+class InstantClient(object):
+    """HTTP client answering every request at once."""
+
+    content = b'{"_id": "users/1", "_key": "1", "_rev": "1"}'
+
+    def _request(self, method, url, **kwargs):
+        return Response(method, url, 200, self.content, {})
+
+    def __getattr__(self, method):
+        return lambda url, **kwargs: self._request(method, url, **kwargs)
+
+
+def best_of(repeat, func):
+    timings = []
+    for _ in range(repeat):
+        start = time.time()
+        func()
+        timings.append(time.time() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    api = API(client=InstantClient())
+    document = {"name": "john", "age": 42}
+
+    def calls():
+        for i in range(args.requests):
+            api.get("/_api/document/users/{}".format(i))
+            api.put("/_api/document/users/{}".format(i), data=document)
+
+    print("{} GET + PUT calls, best of {}".format(
+        args.requests, args.repeat
+    ))
+    baseline = best_of(args.repeat, calls)
+    api.hooks.add("after_response", lambda event: None)
+    hooked = best_of(args.repeat, calls)
+    per_call = 1e6 / (2 * args.requests)
+    print("{:<12} {:>8.2f}us per call".format("no hooks", baseline * per_call))
+    print("{:<12} {:>8.2f}us per call".format("one hook", hooked * per_call))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Compare a Unix domain socket with loopback TCP to reach a local server.
+
+Starts two fake ArangoDB servers (see ``fake_server.py``), one listening on
+127.0.0.1 and one on a Unix domain socket, then for each transport times
+``--requests`` document reads issued:
+
+* sequentially, reporting the per-request latency percentiles,
+* from ``--concurrency`` threads sharing one ``arango.Arango``, reporting
+  the throughput.
+
+Both transports use the same http.client based client, so the difference
+is down to the socket alone.
+
+Run from the repository root with ``PYTHONPATH=. python benchmarks/...``.
+"""
+
+import argparse
+import os
+import tempfile
+
+from bench_clients import bench_latency, bench_throughput
+from fake_server import FakeServer, UnixFakeServer
+
+from arango import Arango
+from arango.clients import UnixSocketClient
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "arangodb.sock")
+    servers = [FakeServer().start(), UnixFakeServer(path).start()]
+    transports = [
+        ("tcp", {"port": servers[0].port}),
+        ("unix", {"protocol": "unix", "host": path}),
+    ]
+
+    name = "bench_unix"
+    keys = ["doc{}".format(i % 100) for i in range(args.requests)]
+    print("{:<8} {:>9} {:>9} {:>9} {:>14}".format(
+        "socket", "p50", "p90", "p99",
+        "{} threads".format(args.concurrency)
+    ))
+    try:
+        for label, kwargs in transports:
+            client = UnixSocketClient({"auth": ("root", "")})
+            arango = Arango(client=client, **kwargs)
+            collection = arango.create_collection(name)
+            collection.import_documents([
+                {"_key": "doc{}".format(i), "value": i} for i in range(100)
+            ])
+            collection.document(keys[0])
+            p50, p90, p99 = bench_latency(collection, keys)
+            throughput = bench_throughput(collection, keys, args.concurrency)
+            print("{:<8} {:>7.0f}us {:>7.0f}us {:>7.0f}us {:>8.0f} req/s"
+                  .format(label, p50, p90, p99, throughput))
+            client.close()
+    finally:
+        for server in servers:
+            server.stop()
+        os.rmdir(os.path.dirname(path))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Compare VelocyPack with the JSON codecs on representative documents.
+
+Times encoding and decoding a cursor batch of ``--documents`` documents, and
+reports the payload sizes, for two kinds of documents:
+
+* "mixed": the string-heavy user profiles of ``bench_codec.py``,
+* "numeric": measurements with many integer and float attributes.
+
+Run from the repository root with ``PYTHONPATH=. python benchmarks/...``.
+"""
+
+import argparse
+
+from bench_codec import best_of, make_documents
+
+from arango.codec import CODECS, get_codec
+
+
+def make_numeric_documents(count):
+    return [
+        {
+            "_key": str(i),
+            "sensor": i % 64,
+            "timestamp": 1446000000000 + i * 250,
+            "values": [i * 0.25, -i * 0.5, i % 7, i % 1000, -(i % 300)],
+            "min": -i * 1.5,
+            "max": i * 2.5,
+            "count": i * 1000,
+            "ok": i % 3 != 0,
+        }
+        for i in range(count)
+    ]
+
+
+def bench(label, documents, codecs, repeat):
+    batch = {"result": documents, "hasMore": False, "count": len(documents)}
+    print("\n{} documents ({}), best of {}".format(
+        len(documents), label, repeat
+    ))
+    print("{:<8} {:>10} {:>12} {:>12}".format(
+        "codec", "size", "encode", "decode"
+    ))
+    for codec in codecs:
+        payload = codec.encode(batch)
+        assert codec.decode(payload) == batch
+        print("{:<8} {:>8.0f}kB {:>10.1f}ms {:>10.1f}ms".format(
+            codec.name,
+            len(payload) / 1e3,
+            best_of(repeat, lambda: codec.encode(batch)) * 1000,
+            best_of(repeat, lambda: codec.decode(payload)) * 1000
+        ))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    codecs = [get_codec("vpack")]
+    for name, _ in CODECS:
+        codec = get_codec(name)
+        if codec.name == name:
+            codecs.append(codec)
+
+    bench("mixed", make_documents(args.documents), codecs, args.repeat)
+    bench("numeric", make_numeric_documents(args.documents), codecs,
+          args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,319 @@
+"""In-memory stand-in for an ArangoDB server, used by the benchmarks.
+
+Only the handful of endpoints exercised by the benchmarks are implemented,
+and only to the extent needed to drive the driver's hot paths (document
+CRUD, imports and cursors). It is NOT a faithful ArangoDB emulation.
+
+Requests and responses can be JSON or VelocyPack (following the
+Content-Type and Accept headers), and gzip compressed.
+
+Run it standalone from the repository root with::
+
+    PYTHONPATH=. python benchmarks/fake_server.py --port 8529
+
+or with ``--unix /path/to/arangodb.sock`` to listen on a Unix domain socket.
+"""
+
+import argparse
+import itertools
+import json
+import os
+import re
+import threading
+import zlib
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn, UnixStreamServer
+    from urllib.parse import urlsplit, parse_qs
+except ImportError:  # Python 2
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn, UnixStreamServer
+    from urlparse import urlsplit, parse_qs
+
+from arango import vpack
+
+
+VPACK = "application/x-velocypack"
+QUERY_COLLECTION = re.compile(r"FOR\s+\w+\s+IN\s+(\w+)", re.IGNORECASE)
+
+
+class Store(object):
+    """Thread-safe in-memory document store."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.collections = {}
+        self.cursors = {}
+        self.revisions = itertools.count(1)
+        self.cursor_ids = itertools.count(1)
+
+    def collection(self, name):
+        with self.lock:
+            return self.collections.setdefault(name, {})
+
+    def next_rev(self):
+        return str(next(self.revisions))
+
+    def open_cursor(self, documents, batch_size):
+        first, rest = documents[:batch_size], documents[batch_size:]
+        body = {"result": first, "hasMore": bool(rest), "error": False,
+                "code": 201, "count": len(documents)}
+        if rest:
+            cursor_id = str(next(self.cursor_ids))
+            with self.lock:
+                self.cursors[cursor_id] = (rest, batch_size)
+            body["id"] = cursor_id
+        return body
+
+    def next_batch(self, cursor_id):
+        with self.lock:
+            documents, batch_size = self.cursors.pop(cursor_id)
+            first, rest = documents[:batch_size], documents[batch_size:]
+            if rest:
+                self.cursors[cursor_id] = (rest, batch_size)
+        body = {"result": first, "hasMore": bool(rest), "error": False,
+                "code": 200}
+        if rest:
+            body["id"] = cursor_id
+        return body
+
+
+class Handler(BaseHTTPRequestHandler):
+    """Request handler dispatching on (method, path)."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    store = None
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body=None):
+        content_type = "application/json; charset=utf-8"
+        if body is None:
+            payload = b""
+        elif VPACK in (self.headers.get("Accept") or ""):
+            payload = vpack.encode(body)
+            content_type = VPACK
+        else:
+            payload = json.dumps(body).encode("utf-8")
+        accepted = self.headers.get("Accept-Encoding") or ""
+        self.send_response(status)
+        if "gzip" in accepted and len(payload) >= 1024:
+            gzip = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+            payload = gzip.compress(payload) + gzip.flush()
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(payload)
+
+    def _read_body(self):
+        return self.body
+
+    def _json_body(self):
+        raw = self._read_body()
+        if self.headers.get("Content-Type") == VPACK:
+            data = vpack.decode(raw) if raw else {}
+        else:
+            data = json.loads(raw.decode("utf-8")) if raw else {}
+        return {} if data is None else data
+
+    def _dispatch(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        self.body = self.rfile.read(length) if length else b""
+        if self.headers.get("Content-Encoding") in ("gzip", "deflate"):
+            self.body = zlib.decompress(self.body, 47)  # auto-detect header
+        url = urlsplit(self.path)
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        path = re.sub(r"^/_db/[^/]+", "", url.path)
+        parts = [p for p in path.split("/") if p]
+        method = self.command
+        store = self.store
+
+        if parts[:2] == ["_api", "version"]:
+            return self._send(200, {"server": "arango", "version": "2.7.0",
+                                    "details": {"mode": "fake"}})
+        if parts[:2] == ["_api", "database"]:
+            return self._send(200, {"result": ["_system"]})
+
+        if parts == ["_api", "collection"]:
+            if method == "POST":
+                data = self._json_body()
+                store.collection(data["name"])
+                return self._send(200, {"name": data["name"], "type": 2})
+            with store.lock:
+                names = list(store.collections)
+            return self._send(200, {"result": [
+                {"name": name, "isSystem": False, "type": 2}
+                for name in names
+            ]})
+        if parts[:2] == ["_api", "collection"] and len(parts) == 3 and \
+                method == "DELETE":
+            with store.lock:
+                found = store.collections.pop(parts[2], None) is not None
+            return self._send(200 if found else 404, {"id": parts[2]})
+        if parts[:2] == ["_api", "collection"] and len(parts) == 4:
+            documents = store.collection(parts[2])
+            if parts[3] == "count":
+                return self._send(200, {"count": len(documents)})
+            if parts[3] == "truncate":
+                documents.clear()
+                return self._send(200, {"name": parts[2]})
+            return self._send(200, {
+                "id": parts[2], "name": parts[2], "type": 2, "status": 3,
+                "doCompact": True, "isSystem": False, "isVolatile": False,
+                "journalSize": 1048576, "waitForSync": False,
+                "keyOptions": {"type": "traditional", "allowUserKeys": True},
+            })
+
+        if parts[:2] == ["_api", "document"] and len(parts) == 2:
+            collection = params["collection"]
+            data = self._json_body()
+            key = data.get("_key") or store.next_rev()
+            data.update(_key=key, _rev=store.next_rev(),
+                        _id="{}/{}".format(collection, key))
+            store.collection(collection)[key] = data
+            return self._send(202, {
+                "_id": data["_id"], "_key": key, "_rev": data["_rev"],
+                "error": False
+            })
+        if parts[:2] == ["_api", "document"] and len(parts) == 4:
+            documents = store.collection(parts[2])
+            key = parts[3]
+            if method in ("GET", "HEAD"):
+                if key not in documents:
+                    return self._send(404, {"error": True, "code": 404,
+                                            "errorNum": 1202})
+                return self._send(200, documents[key])
+            if key not in documents:
+                return self._send(404, {"error": True, "code": 404,
+                                        "errorNum": 1202})
+            if method == "DELETE":
+                document = documents.pop(key)
+            else:
+                data = self._json_body()
+                if method == "PATCH":
+                    document = dict(documents[key], **data)
+                else:
+                    document = data
+                document.update(_key=key, _rev=store.next_rev(),
+                                _id="{}/{}".format(parts[2], key))
+                documents[key] = document
+            return self._send(202, {
+                "_id": document["_id"], "_key": key,
+                "_rev": document["_rev"], "error": False
+            })
+
+        if parts == ["_api", "import"]:
+            documents = store.collection(params["collection"])
+            created = 0
+            for line in self._read_body().decode("utf-8").splitlines():
+                if line.strip():
+                    data = json.loads(line)
+                    key = data.get("_key") or store.next_rev()
+                    data.update(_key=key, _rev=store.next_rev())
+                    documents[key] = data
+                    created += 1
+            return self._send(201, {"error": False, "created": created,
+                                    "errors": 0, "empty": 0})
+
+        if parts == ["_api", "cursor"]:
+            data = self._json_body()
+            match = QUERY_COLLECTION.search(data.get("query", ""))
+            documents = list(store.collection(match.group(1)).values()) \
+                if match else []
+            batch_size = data.get("batchSize") or 1000
+            return self._send(201, store.open_cursor(documents, batch_size))
+        if parts == ["_api", "export"]:
+            data = self._json_body()
+            documents = list(store.collection(params["collection"]).values())
+            batch_size = data.get("options", {}).get("batchSize") or 1000
+            return self._send(201, store.open_cursor(documents, batch_size))
+        if parts == ["_api", "simple", "all"]:
+            data = self._json_body()
+            documents = list(store.collection(data["collection"]).values())
+            return self._send(201, store.open_cursor(documents, 1000))
+        if parts[:2] == ["_api", "cursor"] and len(parts) == 3:
+            if method == "DELETE":
+                with store.lock:
+                    found = store.cursors.pop(parts[2], None) is not None
+                return self._send(202 if found else 404, {"id": parts[2]})
+            if parts[2] not in store.cursors:
+                return self._send(404, {"error": True, "code": 404,
+                                        "errorNum": 1600})
+            return self._send(200, store.next_batch(parts[2]))
+
+        return self._send(404, {"error": True, "code": 404,
+                                "errorMessage": "unknown path"})
+
+    do_HEAD = do_GET = do_POST = do_PUT = _dispatch
+    do_PATCH = do_DELETE = do_OPTIONS = _dispatch
+
+
+class _ServerMixin(object):
+    """Start and stop methods shared by the fake servers."""
+
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def start(self):
+        """Serve requests on a daemon thread and return self."""
+        thread = threading.Thread(target=self.serve_forever)
+        thread.daemon = True
+        thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and close the listening socket."""
+        self.shutdown()
+        self.server_close()
+
+
+class FakeServer(_ServerMixin, ThreadingMixIn, HTTPServer):
+    """Threaded fake ArangoDB server."""
+
+    def __init__(self, host="127.0.0.1", port=0):
+        handler = type("BoundHandler", (Handler,), {"store": Store()})
+        HTTPServer.__init__(self, (host, port), handler)
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+
+class UnixFakeServer(_ServerMixin, ThreadingMixIn, UnixStreamServer):
+    """Threaded fake ArangoDB server listening on a Unix domain socket."""
+
+    def __init__(self, path):
+        if os.path.exists(path):
+            os.remove(path)
+        # TCP_NODELAY cannot be set on Unix domain sockets
+        handler = type("BoundHandler", (Handler,), {
+            "store": Store(),
+            "disable_nagle_algorithm": False,
+        })
+        UnixStreamServer.__init__(self, path, handler)
+
+    @property
+    def path(self):
+        return self.server_address
+
+    def stop(self):
+        super(UnixFakeServer, self).stop()
+        os.remove(self.path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8529)
+    parser.add_argument("--unix", metavar="PATH", default=None,
+                        help="listen on this Unix domain socket instead")
+    args = parser.parse_args()
+    if args.unix is not None:
+        UnixFakeServer(args.unix).serve_forever()
+    else:
+        FakeServer(args.host, args.port).serve_forever()